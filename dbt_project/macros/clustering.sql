@@ -0,0 +1,28 @@
+-- Clustering helpers
+-- Large date-filtered models set `cluster_by` to the date column their
+-- reporting queries filter on, so a date range reads only the micro-partitions
+-- (Snowflake) or row groups (DuckDB) whose min/max covers it.
+-- dbt-snowflake acts on cluster_by itself: the first build is sorted by it,
+-- it becomes the table's clustering key, and `automatic_clustering` keeps the
+-- table clustered as merges land. Other adapters ignore it, so models end with
+-- cluster_order(), which sorts every build by cluster_by; incremental batches
+-- are appended in that order. scripts/check_clustering.py reports how well
+-- the built tables are clustered.
+
+-- ORDER BY the model's cluster_by columns, on adapters without clustering keys
+{% macro cluster_order() -%}
+    {{ return(adapter.dispatch('cluster_order')()) }}
+{%- endmacro %}
+
+{% macro default__cluster_order() -%}
+    {%- set cluster_by = config.get('cluster_by') -%}
+    {%- if cluster_by is string -%}
+        {%- set cluster_by = [cluster_by] -%}
+    {%- endif -%}
+    {%- if cluster_by -%}
+ORDER BY {{ cluster_by | join(', ') }}
+    {%- endif -%}
+{%- endmacro %}
+
+{% macro snowflake__cluster_order() -%}
+{%- endmacro %}
@@ -0,0 +1,38 @@
+-- Cross-database macros
+-- Snowflake functions the models use that DuckDB spells differently. Date
+-- arithmetic and load timestamps use dbt's own cross-database macros
+-- (dbt.datediff, dbt.dateadd, dbt.current_timestamp); these cover the rest.
+
+-- Today's date
+{% macro today() %}
+    {{ return(adapter.dispatch('today')()) }}
+{% endmacro %}
+
+{% macro default__today() %}CURRENT_DATE(){% endmacro %}
+
+{% macro duckdb__today() %}CURRENT_DATE{% endmacro %}
+
+
+-- Three-letter day name ('Mon' .. 'Sun'), as Snowflake's DAYNAME returns
+{% macro day_name(expression) %}
+    {{ return(adapter.dispatch('day_name')(expression)) }}
+{% endmacro %}
+
+{% macro default__day_name(expression) %}DAYNAME({{ expression }}){% endmacro %}
+
+{% macro duckdb__day_name(expression) %}STRFTIME({{ expression }}, '%a'){% endmacro %}
+
+
+-- Replace every match of a regular expression (DuckDB replaces only the
+-- first match unless given the 'g' option)
+{% macro regexp_replace_all(expression, pattern, replacement) %}
+    {{ return(adapter.dispatch('regexp_replace_all')(expression, pattern, replacement)) }}
+{% endmacro %}
+
+{% macro default__regexp_replace_all(expression, pattern, replacement) -%}
+    REGEXP_REPLACE({{ expression }}, {{ pattern }}, {{ replacement }})
+{%- endmacro %}
+
+{% macro duckdb__regexp_replace_all(expression, pattern, replacement) -%}
+    REGEXP_REPLACE({{ expression }}, {{ pattern }}, {{ replacement }}, 'g')
+{%- endmacro %}
@@ -0,0 +1,110 @@
+-- Data Vault query helpers
+-- Point-in-time (PIT) tables resolve, once per snapshot date, which version of
+-- each satellite was current for every hub key, so readers join satellites on
+-- (hash key, load_date) equality instead of filtering on end_date ranges.
+
+-- PIT table for one hub: a row per hub key per snapshot period (grain 'day',
+-- 'week' or 'month'; var pit_snapshot_grain) from the hub's first load up to
+-- the current period, with the load_date of each satellite's version current
+-- at the end of that period (NULL when the key has no satellite row yet).
+-- Snapshots older than retention_days (var pit_retention_days; none keeps
+-- every period) are not built, and pit_expire_snapshots deletes them from
+-- incremental tables. Incremental runs rebuild from the period of the
+-- earliest satellite load_date newer than the table holds, or from the
+-- newest snapshot when there is none (it may have been taken part-way
+-- through its period), and add the periods after it.
+{% macro pit_table(hub, hash_key, satellites, grain=none, retention_days=none) %}
+{%- set grain = grain or var('pit_snapshot_grain', 'week') -%}
+{%- if grain not in ('day', 'week', 'month') -%}
+    {{ exceptions.raise_compiler_error("pit_table grain must be day, week or month, not " ~ grain) }}
+{%- endif -%}
+{%- set retention_start = pit_retention_start(grain, retention_days) -%}
+{%- if is_incremental() -%}
+    {%- set latest_snapshot = '(SELECT MAX(snapshot_date) FROM ' ~ this ~ ')' -%}
+    {%- set new_loads -%}
+        (SELECT CAST({{ dbt.date_trunc(grain, 'MIN(load_date)') }} AS DATE) FROM (
+        {%- for satellite in satellites %}
+            SELECT load_date FROM {{ source('stage', satellite) }}
+            WHERE load_date > {{ watermark(satellite ~ '_load_date') }}
+            {%- if not loop.last %} UNION ALL{% endif %}
+        {%- endfor %}
+        ) new_loads)
+    {%- endset -%}
+    {%- set first_snapshot = 'LEAST(' ~ latest_snapshot ~ ', COALESCE(' ~ new_loads ~ ', '
+        ~ latest_snapshot ~ '))' -%}
+{%- else -%}
+    {%- set first_snapshot = '(SELECT CAST(' ~ dbt.date_trunc(grain, 'MIN(load_date)')
+        ~ ' AS DATE) FROM ' ~ source('stage', hub) ~ ')' -%}
+{%- endif -%}
+{%- if retention_start is not none -%}
+    {%- set first_snapshot = 'GREATEST(' ~ first_snapshot ~ ', ' ~ retention_start ~ ')' -%}
+{%- endif %}
+
+WITH snapshots AS (
+    SELECT
+        CAST(date_{{ grain }} AS DATE) AS snapshot_date,
+        {{ dbt.dateadd(grain, 1, 'CAST(date_' ~ grain ~ ' AS DATE)') }} AS snapshot_end
+    FROM (
+        {{ dbt.date_spine(
+            grain,
+            first_snapshot,
+            dbt.dateadd(grain, 1, 'CAST(' ~ dbt.date_trunc(grain, today()) ~ ' AS DATE)')
+        ) }}
+    ) spine
+),
+
+hub AS (
+    SELECT
+        {{ hash_key }},
+        load_date
+    FROM {{ source('stage', hub) }}
+){% for satellite in satellites %},
+
+{{ satellite }} AS (
+    SELECT
+        {{ hash_key }},
+        load_date,
+        end_date
+    FROM {{ source('stage', satellite) }}
+){% endfor %}
+
+SELECT
+    s.snapshot_date,
+    h.{{ hash_key }}{% for satellite in satellites %},
+    {{ satellite }}.load_date AS {{ satellite }}_load_date{% endfor %}
+FROM snapshots s
+INNER JOIN hub h
+    ON h.load_date < s.snapshot_end
+{%- for satellite in satellites %}
+LEFT JOIN {{ satellite }}
+    ON {{ satellite }}.{{ hash_key }} = h.{{ hash_key }}
+    AND {{ satellite }}.load_date < s.snapshot_end
+    AND ({{ satellite }}.end_date IS NULL OR {{ satellite }}.end_date >= s.snapshot_end)
+{%- endfor %}
+
+{% endmacro %}
+
+
+-- First snapshot_date a PIT table keeps: the start of the period holding the
+-- day retention_days (default var pit_retention_days) before today, or none
+-- when every period is kept
+{% macro pit_retention_start(grain, retention_days=none) %}
+    {%- set retention_days = retention_days if retention_days is not none
+        else var('pit_retention_days', none) -%}
+    {%- if retention_days is none -%}
+        {{ return(none) }}
+    {%- endif -%}
+    {{ return('CAST(' ~ dbt.date_trunc(grain, dbt.dateadd('day', -(retention_days | int), today()))
+        ~ ' AS DATE)') }}
+{% endmacro %}
+
+
+-- Post-hook for PIT models: delete the snapshots retention has expired
+{% macro pit_expire_snapshots(grain=none, retention_days=none) %}
+    {%- set retention_start = pit_retention_start(
+        grain or var('pit_snapshot_grain', 'week'), retention_days
+    ) -%}
+    {%- if retention_start is not none -%}
+        DELETE FROM {{ this }} WHERE snapshot_date < {{ retention_start }}
+    {%- endif -%}
+{% endmacro %}
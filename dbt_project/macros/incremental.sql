@@ -0,0 +1,13 @@
+-- Incremental load helpers
+-- Bronze and silver models merge only the rows whose vault load date is newer
+-- than the newest one they already hold. Gold models recompute only the keys
+-- (days, customers, accounts) touched by upstream rows that were (re)built
+-- since the gold model last ran, found by comparing each upstream row's
+-- dbt_loaded_at with the model's own. `dbt run --full-refresh` rebuilds every
+-- model from full history.
+
+-- Newest value of a column in the model being built ({{ this }}); 1900-01-01
+-- when the model is empty. Only valid inside an is_incremental() block.
+{% macro watermark(column) -%}
+    (SELECT COALESCE(MAX({{ column }}), CAST('1900-01-01' AS TIMESTAMP)) FROM {{ this }})
+{%- endmacro %}
@@ -0,0 +1,49 @@
+-- Daily rollup helpers
+-- Rollup models hold one row per day and dimension combination with counts,
+-- sums and min/max, which add up across days. Distinct counts do not, so
+-- rollups also keep a mergeable sketch of the values; readers combine the
+-- sketches of the rows they select and estimate the distinct count from them.
+
+-- Aggregate: a sketch of the distinct values of `expr`. Snowflake exports an
+-- HLL state (HLL_ACCUMULATE); DuckDB has no exportable sketch, so it keeps the
+-- exact set of values, which stays small at day-and-dimension grain.
+{% macro distinct_sketch(expr) -%}
+    {{ return(adapter.dispatch('distinct_sketch')(expr)) }}
+{%- endmacro %}
+
+{% macro default__distinct_sketch(expr) -%}
+    LIST(DISTINCT {{ expr }})
+{%- endmacro %}
+
+{% macro snowflake__distinct_sketch(expr) -%}
+    HLL_EXPORT(HLL_ACCUMULATE({{ expr }}))
+{%- endmacro %}
+
+-- Aggregate: the distinct count across the sketches in `column`; approximate
+-- (HLL) on Snowflake, exact elsewhere. NULLs are not counted.
+{% macro sketch_distinct_count(column) -%}
+    {{ return(adapter.dispatch('sketch_distinct_count')(column)) }}
+{%- endmacro %}
+
+{% macro default__sketch_distinct_count(column) -%}
+    COALESCE(LEN(LIST_DISTINCT(FLATTEN(LIST({{ column }})))), 0)
+{%- endmacro %}
+
+{% macro snowflake__sketch_distinct_count(column) -%}
+    HLL_ESTIMATE(HLL_COMBINE(HLL_IMPORT({{ column }})))
+{%- endmacro %}
+
+-- Days an incremental daily rollup of silver `model` must rebuild: days of
+-- versions loaded since the rollup's newest sat_load_date, plus the days the
+-- versions they replaced in `satellite` were dated. Rollups delete these days
+-- in a pre-hook before rebuilding them, so a day whose rows all moved away is
+-- emptied too. Only valid inside an is_incremental() block.
+{% macro rollup_affected_days(model, day_column, satellite, date_column) -%}
+    SELECT {{ day_column }}
+    FROM {{ ref(model) }}
+    WHERE sat_load_date > {{ watermark('sat_load_date') }}
+    UNION
+    SELECT CAST({{ date_column }} AS DATE)
+    FROM {{ source('stage', satellite) }}
+    WHERE end_date > {{ watermark('sat_load_date') }}
+{%- endmacro %}
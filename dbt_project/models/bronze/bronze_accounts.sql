@@ -1,14 +1,24 @@
 -- Bronze Layer: Raw Finance Accounts
 -- Ingests account data from Data Vault hub and satellite
+-- Current satellite rows come from the latest PIT snapshot
 
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='account_hk',
         tags=['bronze', 'finance', 'accounts']
     )
 }}
 
-WITH account_hub AS (
+WITH account_pit AS (
+    SELECT
+        account_hk,
+        sat_account_load_date
+    FROM {{ ref('pit_account') }}
+    WHERE snapshot_date = (SELECT MAX(snapshot_date) FROM {{ ref('pit_account') }})
+),
+
+account_hub AS (
     SELECT
         account_hk,
         account_id,
@@ -21,7 +31,6 @@ account_sat AS (
     SELECT
         account_hk,
         load_date,
-        end_date,
         account_number,
         account_type,
         account_status,
@@ -30,7 +39,6 @@ account_sat AS (
         open_date,
         record_source
     FROM {{ source('stage', 'sat_account') }}
-    WHERE end_date IS NULL  -- Get current records only
 )
 
 SELECT
@@ -45,7 +53,15 @@ SELECT
     h.hub_load_date,
     s.load_date AS sat_load_date,
     COALESCE(s.record_source, h.record_source) AS record_source,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM account_hub h
-LEFT JOIN account_sat s ON h.account_hk = s.account_hk
-
+INNER JOIN account_pit p
+    ON h.account_hk = p.account_hk
+LEFT JOIN account_sat s
+    ON p.account_hk = s.account_hk
+    AND p.sat_account_load_date = s.load_date
+{% if is_incremental() %}
+-- Only keys whose hub or current satellite row was loaded since the last run
+WHERE h.hub_load_date > {{ watermark('hub_load_date') }}
+    OR s.load_date > {{ watermark('sat_load_date') }}
+{% endif %}
@@ -1,14 +1,24 @@
 -- Bronze Layer: Raw CRM Customers
 -- Ingests customer data from Data Vault hub and satellite
+-- Current satellite rows come from the latest PIT snapshot
 
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='customer_hk',
         tags=['bronze', 'crm', 'customers']
     )
 }}
 
-WITH customer_hub AS (
+WITH customer_pit AS (
+    SELECT
+        customer_hk,
+        sat_customer_load_date
+    FROM {{ ref('pit_customer') }}
+    WHERE snapshot_date = (SELECT MAX(snapshot_date) FROM {{ ref('pit_customer') }})
+),
+
+customer_hub AS (
     SELECT
         customer_hk,
         customer_id,
@@ -21,7 +31,6 @@ customer_sat AS (
     SELECT
         customer_hk,
         load_date,
-        end_date,
         first_name,
         last_name,
         email,
@@ -39,7 +48,6 @@ customer_sat AS (
         lifetime_value,
         record_source
     FROM {{ source('stage', 'sat_customer') }}
-    WHERE end_date IS NULL  -- Get current records only
 )
 
 SELECT
@@ -63,7 +71,15 @@ SELECT
     h.hub_load_date,
     s.load_date AS sat_load_date,
     COALESCE(s.record_source, h.record_source) AS record_source,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM customer_hub h
-LEFT JOIN customer_sat s ON h.customer_hk = s.customer_hk
-
+INNER JOIN customer_pit p
+    ON h.customer_hk = p.customer_hk
+LEFT JOIN customer_sat s
+    ON p.customer_hk = s.customer_hk
+    AND p.sat_customer_load_date = s.load_date
+{% if is_incremental() %}
+-- Only keys whose hub or current satellite row was loaded since the last run
+WHERE h.hub_load_date > {{ watermark('hub_load_date') }}
+    OR s.load_date > {{ watermark('sat_load_date') }}
+{% endif %}
@@ -1,14 +1,24 @@
 -- Bronze Layer: Raw Operations Orders
 -- Ingests order data from Data Vault hub and satellite
+-- Current satellite rows come from the latest PIT snapshot
 
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='order_hk',
         tags=['bronze', 'operations', 'orders']
     )
 }}
 
-WITH order_hub AS (
+WITH order_pit AS (
+    SELECT
+        order_hk,
+        sat_order_load_date
+    FROM {{ ref('pit_order') }}
+    WHERE snapshot_date = (SELECT MAX(snapshot_date) FROM {{ ref('pit_order') }})
+),
+
+order_hub AS (
     SELECT
         order_hk,
         order_id,
@@ -21,7 +31,6 @@ order_sat AS (
     SELECT
         order_hk,
         load_date,
-        end_date,
         order_date,
         order_status,
         order_total,
@@ -32,7 +41,6 @@ order_sat AS (
         priority,
         record_source
     FROM {{ source('stage', 'sat_order') }}
-    WHERE end_date IS NULL  -- Get current records only
 )
 
 SELECT
@@ -49,7 +57,15 @@ SELECT
     h.hub_load_date,
     s.load_date AS sat_load_date,
     COALESCE(s.record_source, h.record_source) AS record_source,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM order_hub h
-LEFT JOIN order_sat s ON h.order_hk = s.order_hk
-
+INNER JOIN order_pit p
+    ON h.order_hk = p.order_hk
+LEFT JOIN order_sat s
+    ON p.order_hk = s.order_hk
+    AND p.sat_order_load_date = s.load_date
+{% if is_incremental() %}
+-- Only keys whose hub or current satellite row was loaded since the last run
+WHERE h.hub_load_date > {{ watermark('hub_load_date') }}
+    OR s.load_date > {{ watermark('sat_load_date') }}
+{% endif %}
@@ -1,14 +1,24 @@
 -- Bronze Layer: Raw Finance Transactions
 -- Ingests transaction data from Data Vault hub and satellite
+-- Current satellite rows come from the latest PIT snapshot
 
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='transaction_hk',
         tags=['bronze', 'finance', 'transactions']
     )
 }}
 
-WITH transaction_hub AS (
+WITH transaction_pit AS (
+    SELECT
+        transaction_hk,
+        sat_transaction_load_date
+    FROM {{ ref('pit_transaction') }}
+    WHERE snapshot_date = (SELECT MAX(snapshot_date) FROM {{ ref('pit_transaction') }})
+),
+
+transaction_hub AS (
     SELECT
         transaction_hk,
         transaction_id,
@@ -21,7 +31,6 @@ transaction_sat AS (
     SELECT
         transaction_hk,
         load_date,
-        end_date,
         transaction_type,
         amount,
         currency,
@@ -32,7 +41,6 @@ transaction_sat AS (
         status,
         record_source
     FROM {{ source('stage', 'sat_transaction') }}
-    WHERE end_date IS NULL  -- Get current records only
 )
 
 SELECT
@@ -49,7 +57,15 @@ SELECT
     h.hub_load_date,
     s.load_date AS sat_load_date,
     COALESCE(s.record_source, h.record_source) AS record_source,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM transaction_hub h
-LEFT JOIN transaction_sat s ON h.transaction_hk = s.transaction_hk
-
+INNER JOIN transaction_pit p
+    ON h.transaction_hk = p.transaction_hk
+LEFT JOIN transaction_sat s
+    ON p.transaction_hk = s.transaction_hk
+    AND p.sat_transaction_load_date = s.load_date
+{% if is_incremental() %}
+-- Only keys whose hub or current satellite row was loaded since the last run
+WHERE h.hub_load_date > {{ watermark('hub_load_date') }}
+    OR s.load_date > {{ watermark('sat_load_date') }}
+{% endif %}
@@ -0,0 +1,27 @@
+-- Business Vault: Customer -> Account -> Transaction Bridge
+-- Pre-resolves the two-hop link path so readers reach a customer's
+-- transactions with one equi-join instead of chaining both links
+
+{{
+    config(
+        materialized='incremental',
+        unique_key=['customer_account_lk', 'account_transaction_lk'],
+        tags=['business_vault', 'cross-domain', 'bridge']
+    )
+}}
+
+SELECT
+    lca.customer_hk,
+    lca.account_hk,
+    lat.transaction_hk,
+    lca.customer_account_lk,
+    lat.account_transaction_lk,
+    GREATEST(lca.load_date, lat.load_date) AS load_date
+FROM {{ source('stage', 'link_customer_account') }} lca
+INNER JOIN {{ source('stage', 'link_account_transaction') }} lat
+    ON lca.account_hk = lat.account_hk
+{% if is_incremental() %}
+-- Links are insert-only, so new paths always involve a link loaded since the last run
+WHERE lca.load_date > {{ watermark('load_date') }}
+    OR lat.load_date > {{ watermark('load_date') }}
+{% endif %}
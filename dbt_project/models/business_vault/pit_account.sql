@@ -0,0 +1,13 @@
+-- Business Vault: Finance Accounts Point-in-Time Table
+-- Current sat_account version per account key per snapshot date
+
+{{
+    config(
+        materialized='incremental',
+        unique_key=['snapshot_date', 'account_hk'],
+        post_hook="{{ pit_expire_snapshots() }}",
+        tags=['business_vault', 'finance', 'accounts']
+    )
+}}
+
+{{ pit_table('hub_account', 'account_hk', ['sat_account']) }}
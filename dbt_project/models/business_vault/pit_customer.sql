@@ -0,0 +1,13 @@
+-- Business Vault: CRM Customers Point-in-Time Table
+-- Current sat_customer version per customer key per snapshot date
+
+{{
+    config(
+        materialized='incremental',
+        unique_key=['snapshot_date', 'customer_hk'],
+        post_hook="{{ pit_expire_snapshots() }}",
+        tags=['business_vault', 'crm', 'customers']
+    )
+}}
+
+{{ pit_table('hub_customer', 'customer_hk', ['sat_customer']) }}
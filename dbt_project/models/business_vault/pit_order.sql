@@ -0,0 +1,13 @@
+-- Business Vault: Operations Orders Point-in-Time Table
+-- Current sat_order version per order key per snapshot date
+
+{{
+    config(
+        materialized='incremental',
+        unique_key=['snapshot_date', 'order_hk'],
+        post_hook="{{ pit_expire_snapshots() }}",
+        tags=['business_vault', 'operations', 'orders']
+    )
+}}
+
+{{ pit_table('hub_order', 'order_hk', ['sat_order']) }}
@@ -0,0 +1,13 @@
+-- Business Vault: Finance Transactions Point-in-Time Table
+-- Current sat_transaction version per transaction key per snapshot date
+
+{{
+    config(
+        materialized='incremental',
+        unique_key=['snapshot_date', 'transaction_hk'],
+        post_hook="{{ pit_expire_snapshots() }}",
+        tags=['business_vault', 'finance', 'transactions']
+    )
+}}
+
+{{ pit_table('hub_transaction', 'transaction_hk', ['sat_transaction']) }}
@@ -3,13 +3,40 @@
 
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='customer_id',
         tags=['gold', 'cross-domain', 'analytics']
     )
 }}
 
-WITH customers AS (
+WITH
+{% if is_incremental() %}
+-- Customers to recompute: customers, their accounts or their accounts'
+-- transactions rebuilt since the last run
+affected_customers AS (
+    SELECT customer_hk
+    FROM {{ ref('silver_customers') }}
+    WHERE dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+    UNION
+    SELECT lca.customer_hk
+    FROM {{ source('stage', 'link_customer_account') }} lca
+    INNER JOIN {{ ref('bronze_accounts') }} a
+        ON lca.account_hk = a.account_hk
+    WHERE a.dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+    UNION
+    SELECT b.customer_hk
+    FROM {{ ref('bridge_customer_account_transaction') }} b
+    INNER JOIN {{ ref('silver_transactions') }} t
+        ON b.transaction_hk = t.transaction_hk
+    WHERE t.dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+),
+{% endif %}
+
+customers AS (
     SELECT * FROM {{ ref('silver_customers') }}
+    {% if is_incremental() %}
+    WHERE customer_hk IN (SELECT customer_hk FROM affected_customers)
+    {% endif %}
 ),
 
 accounts AS (
@@ -23,10 +50,12 @@ transactions AS (
 -- Link customers to accounts
 customer_accounts AS (
     SELECT
+        c.customer_hk,
         c.customer_id,
         c.full_name,
         c.customer_segment,
         c.customer_status_clean AS customer_status,
+        a.account_hk,
         a.account_id,
         a.account_type,
         a.balance
@@ -47,10 +76,11 @@ customer_transactions AS (
         AVG(t.amount) AS avg_transaction_amount,
         MAX(t.transaction_date) AS last_transaction_date
     FROM customer_accounts ca
-    INNER JOIN {{ source('stage', 'link_account_transaction') }} lat
-        ON ca.account_id = lat.account_hk
+    INNER JOIN {{ ref('bridge_customer_account_transaction') }} b
+        ON ca.customer_hk = b.customer_hk
+        AND ca.account_hk = b.account_hk
     INNER JOIN transactions t
-        ON lat.transaction_hk = t.transaction_hk
+        ON b.transaction_hk = t.transaction_hk
     WHERE t.status_clean = 'COMPLETED'
     GROUP BY ca.customer_id
 )
@@ -87,7 +117,7 @@ SELECT
         WHEN SUM(ca.balance) < 5000 AND COALESCE(ct.total_transactions, 0) < 10 THEN 'MEDIUM_RISK'
         ELSE 'LOW_RISK'
     END AS churn_risk,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM customer_accounts ca
 LEFT JOIN customer_transactions ct ON ca.customer_id = ct.customer_id
 GROUP BY
@@ -1,15 +1,38 @@
 -- Gold Layer: Customer Summary
 -- Business-ready customer analytics with aggregated metrics
 
+-- Incremental runs skip unchanged customers, so the post-hook moves the
+-- recency of every customer on to today
+
 {{
     config(
-        materialized='table',
-        tags=['gold', 'crm', 'summary']
+        materialized='incremental',
+        unique_key='customer_id',
+        tags=['gold', 'crm', 'summary'],
+        post_hook="
+            UPDATE {{ this }}
+            SET days_since_last_order = {{ dbt.datediff('last_order_date', today(), 'day') }}
+            WHERE last_order_date IS NOT NULL
+        "
     )
 }}
 
 WITH customer_base AS (
     SELECT * FROM {{ ref('silver_customers') }}
+    {% if is_incremental() %}
+    -- Recompute only customers rebuilt since the last run or with orders that were
+    WHERE customer_hk IN (
+        SELECT customer_hk
+        FROM {{ ref('silver_customers') }}
+        WHERE dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+        UNION
+        SELECT lco.customer_hk
+        FROM {{ source('stage', 'link_customer_order') }} lco
+        INNER JOIN {{ ref('silver_orders') }} o
+            ON lco.order_hk = o.order_hk
+        WHERE o.dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+    )
+    {% endif %}
 ),
 
 -- Aggregate customer orders
@@ -65,11 +88,11 @@ SELECT
         ELSE 'MINIMAL_VALUE'
     END AS value_tier,
     -- Recency calculation
-    DATEDIFF(DAY, co.last_order_date, CURRENT_DATE()) AS days_since_last_order,
+    {{ dbt.datediff('co.last_order_date', today(), 'day') }} AS days_since_last_order,
     -- Data quality flags
     c.is_missing_email,
     c.is_missing_phone,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM customer_base c
 LEFT JOIN customer_orders co ON c.customer_id = co.customer_id
 
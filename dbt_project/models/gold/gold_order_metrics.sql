@@ -1,64 +1,76 @@
 -- Gold Layer: Order Metrics
--- Business-ready order analytics with time-based aggregations
+-- Business-ready order analytics with time-based aggregations, summed from
+-- the daily order rollup
+-- Days left without orders are not recomputed, so the post-hook removes them
 
 {{
     config(
-        materialized='table',
-        tags=['gold', 'operations', 'metrics']
+        materialized='incremental',
+        unique_key='order_date_only',
+        cluster_by=['order_date_only'],
+        tags=['gold', 'operations', 'metrics'],
+        post_hook="
+            DELETE FROM {{ this }}
+            WHERE order_date_only NOT IN (
+                SELECT order_date_only FROM {{ ref('rollup_orders_daily') }}
+            )
+        "
     )
 }}
 
-WITH orders AS (
-    SELECT * FROM {{ ref('silver_orders') }}
+WITH daily_orders AS (
+    SELECT * FROM {{ ref('rollup_orders_daily') }}
+    {% if is_incremental() %}
+    -- Recompute only the days whose rollup was rebuilt since the last run
+    WHERE order_date_only IN (
+        SELECT order_date_only
+        FROM {{ ref('rollup_orders_daily') }}
+        WHERE dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+    )
+    {% endif %}
 )
 
 SELECT
     -- Time dimensions
-    order_year,
-    order_month,
+    EXTRACT(YEAR FROM order_date_only) AS order_year,
+    EXTRACT(MONTH FROM order_date_only) AS order_month,
     order_date_only,
     -- Order counts by status
-    COUNT(DISTINCT order_id) AS total_orders,
-    COUNT(DISTINCT CASE WHEN order_status_clean = 'PENDING' THEN order_id END) AS pending_orders,
-    COUNT(DISTINCT CASE WHEN order_status_clean = 'PROCESSING' THEN order_id END) AS processing_orders,
-    COUNT(DISTINCT CASE WHEN order_status_clean = 'SHIPPED' THEN order_id END) AS shipped_orders,
-    COUNT(DISTINCT CASE WHEN order_status_clean = 'DELIVERED' THEN order_id END) AS delivered_orders,
-    COUNT(DISTINCT CASE WHEN order_status_clean = 'CANCELLED' THEN order_id END) AS cancelled_orders,
+    SUM(order_count) AS total_orders,
+    SUM(CASE WHEN order_status_clean = 'PENDING' THEN order_count ELSE 0 END) AS pending_orders,
+    SUM(CASE WHEN order_status_clean = 'PROCESSING' THEN order_count ELSE 0 END) AS processing_orders,
+    SUM(CASE WHEN order_status_clean = 'SHIPPED' THEN order_count ELSE 0 END) AS shipped_orders,
+    SUM(CASE WHEN order_status_clean = 'DELIVERED' THEN order_count ELSE 0 END) AS delivered_orders,
+    SUM(CASE WHEN order_status_clean = 'CANCELLED' THEN order_count ELSE 0 END) AS cancelled_orders,
     -- Order values
-    SUM(order_total) AS total_order_value,
-    AVG(order_total) AS avg_order_value,
-    MIN(order_total) AS min_order_value,
-    MAX(order_total) AS max_order_value,
+    SUM(order_total_sum) AS total_order_value,
+    SUM(order_total_sum) / NULLIF(SUM(order_total_count), 0) AS avg_order_value,
+    MIN(order_total_min) AS min_order_value,
+    MAX(order_total_max) AS max_order_value,
     -- Priority breakdown
-    COUNT(DISTINCT CASE WHEN priority_clean = 'URGENT' THEN order_id END) AS urgent_orders,
-    COUNT(DISTINCT CASE WHEN priority_clean = 'HIGH' THEN order_id END) AS high_priority_orders,
-    COUNT(DISTINCT CASE WHEN priority_clean = 'MEDIUM' THEN order_id END) AS medium_priority_orders,
-    COUNT(DISTINCT CASE WHEN priority_clean = 'LOW' THEN order_id END) AS low_priority_orders,
+    SUM(CASE WHEN priority_clean = 'URGENT' THEN order_count ELSE 0 END) AS urgent_orders,
+    SUM(CASE WHEN priority_clean = 'HIGH' THEN order_count ELSE 0 END) AS high_priority_orders,
+    SUM(CASE WHEN priority_clean = 'MEDIUM' THEN order_count ELSE 0 END) AS medium_priority_orders,
+    SUM(CASE WHEN priority_clean = 'LOW' THEN order_count ELSE 0 END) AS low_priority_orders,
     -- Payment method breakdown
-    COUNT(DISTINCT CASE WHEN payment_method = 'CREDIT_CARD' THEN order_id END) AS credit_card_orders,
-    COUNT(DISTINCT CASE WHEN payment_method = 'DEBIT_CARD' THEN order_id END) AS debit_card_orders,
-    COUNT(DISTINCT CASE WHEN payment_method = 'BANK_TRANSFER' THEN order_id END) AS bank_transfer_orders,
-    COUNT(DISTINCT CASE WHEN payment_method = 'PAYPAL' THEN order_id END) AS paypal_orders,
+    SUM(CASE WHEN payment_method = 'CREDIT_CARD' THEN order_count ELSE 0 END) AS credit_card_orders,
+    SUM(CASE WHEN payment_method = 'DEBIT_CARD' THEN order_count ELSE 0 END) AS debit_card_orders,
+    SUM(CASE WHEN payment_method = 'BANK_TRANSFER' THEN order_count ELSE 0 END) AS bank_transfer_orders,
+    SUM(CASE WHEN payment_method = 'PAYPAL' THEN order_count ELSE 0 END) AS paypal_orders,
     -- Fulfillment rate
     ROUND(
-        COUNT(DISTINCT CASE WHEN order_status_clean = 'DELIVERED' THEN order_id END) * 100.0 /
-        NULLIF(COUNT(DISTINCT order_id), 0),
+        SUM(CASE WHEN order_status_clean = 'DELIVERED' THEN order_count ELSE 0 END) * 100.0 /
+        NULLIF(SUM(order_count), 0),
         2
     ) AS fulfillment_rate_pct,
     -- Cancellation rate
     ROUND(
-        COUNT(DISTINCT CASE WHEN order_status_clean = 'CANCELLED' THEN order_id END) * 100.0 /
-        NULLIF(COUNT(DISTINCT order_id), 0),
+        SUM(CASE WHEN order_status_clean = 'CANCELLED' THEN order_count ELSE 0 END) * 100.0 /
+        NULLIF(SUM(order_count), 0),
         2
     ) AS cancellation_rate_pct,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
-FROM orders
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
+FROM daily_orders
 GROUP BY
-    order_year,
-    order_month,
     order_date_only
-ORDER BY
-    order_year DESC,
-    order_month DESC,
-    order_date_only DESC
-
+{{ cluster_order() }}
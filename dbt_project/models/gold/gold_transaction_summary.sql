@@ -1,90 +1,104 @@
 -- Gold Layer: Transaction Summary by Account
--- Business-ready transaction analytics aggregated by account
+-- Business-ready transaction analytics aggregated by account, summed from
+-- the daily transaction rollup
+-- Accounts left without completed transactions are not recomputed, so the
+-- post-hook removes them
 
 {{
     config(
-        materialized='table',
-        tags=['gold', 'finance', 'summary']
+        materialized='incremental',
+        unique_key='account_id',
+        tags=['gold', 'finance', 'summary'],
+        post_hook="
+            DELETE FROM {{ this }}
+            WHERE account_id NOT IN (
+                SELECT account_id
+                FROM {{ ref('rollup_transactions_daily') }}
+                WHERE status_clean = 'COMPLETED'
+            )
+        "
     )
 }}
 
-WITH accounts AS (
-    SELECT * FROM {{ ref('bronze_accounts') }}
+WITH
+{% if is_incremental() %}
+-- Accounts to recompute: accounts or daily rollups rebuilt since the last run,
+-- plus accounts with transactions dated within 90 days of it, whose 30-day
+-- and dormancy metrics move with the date
+affected_accounts AS (
+    SELECT account_hk
+    FROM {{ ref('bronze_accounts') }}
+    WHERE dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+    UNION
+    SELECT account_hk
+    FROM {{ ref('rollup_transactions_daily') }}
+    WHERE dbt_loaded_at > {{ watermark('dbt_loaded_at') }}
+        OR transaction_date_only >= CAST({{ dbt.dateadd('day', -90, watermark('dbt_loaded_at')) }} AS DATE)
 ),
+{% endif %}
 
-transactions AS (
-    SELECT * FROM {{ ref('silver_transactions') }}
+accounts AS (
+    SELECT * FROM {{ ref('bronze_accounts') }}
+    {% if is_incremental() %}
+    WHERE account_hk IN (SELECT account_hk FROM affected_accounts)
+    {% endif %}
 ),
 
--- Link accounts to transactions
-account_transactions AS (
-    SELECT
-        a.account_id,
-        a.account_type,
-        a.account_status,
-        a.balance AS current_balance,
-        t.transaction_id,
-        t.transaction_type,
-        t.amount,
-        t.transaction_date,
-        t.transaction_year,
-        t.transaction_month,
-        t.category,
-        t.status_clean AS transaction_status
-    FROM accounts a
-    LEFT JOIN {{ source('stage', 'link_account_transaction') }} lat
-        ON a.account_hk = lat.account_hk
-    LEFT JOIN transactions t
-        ON lat.transaction_hk = t.transaction_hk
-    WHERE t.status_clean = 'COMPLETED'
+-- Completed transactions per account per day, from the daily rollup
+daily_transactions AS (
+    SELECT *
+    FROM {{ ref('rollup_transactions_daily') }}
+    WHERE status_clean = 'COMPLETED'
 )
 
 SELECT
-    account_id,
-    account_type,
-    account_status,
-    current_balance,
+    a.account_id,
+    a.account_type,
+    a.account_status,
+    a.balance AS current_balance,
     -- Transaction counts
-    COUNT(DISTINCT transaction_id) AS total_transactions,
-    COUNT(DISTINCT CASE WHEN transaction_type = 'DEPOSIT' THEN transaction_id END) AS deposit_count,
-    COUNT(DISTINCT CASE WHEN transaction_type = 'WITHDRAWAL' THEN transaction_id END) AS withdrawal_count,
-    COUNT(DISTINCT CASE WHEN transaction_type = 'PAYMENT' THEN transaction_id END) AS payment_count,
+    SUM(d.transaction_count) AS total_transactions,
+    SUM(CASE WHEN d.transaction_type = 'DEPOSIT' THEN d.transaction_count ELSE 0 END) AS deposit_count,
+    SUM(CASE WHEN d.transaction_type = 'WITHDRAWAL' THEN d.transaction_count ELSE 0 END) AS withdrawal_count,
+    SUM(CASE WHEN d.transaction_type = 'PAYMENT' THEN d.transaction_count ELSE 0 END) AS payment_count,
     -- Transaction amounts
-    SUM(amount) AS total_transaction_amount,
-    SUM(CASE WHEN transaction_type = 'DEPOSIT' THEN amount ELSE 0 END) AS total_deposits,
-    SUM(CASE WHEN transaction_type = 'WITHDRAWAL' THEN amount ELSE 0 END) AS total_withdrawals,
-    SUM(CASE WHEN transaction_type = 'PAYMENT' THEN amount ELSE 0 END) AS total_payments,
-    SUM(CASE WHEN transaction_type = 'FEE' THEN amount ELSE 0 END) AS total_fees,
+    SUM(d.amount_sum) AS total_transaction_amount,
+    SUM(CASE WHEN d.transaction_type = 'DEPOSIT' THEN d.amount_sum ELSE 0 END) AS total_deposits,
+    SUM(CASE WHEN d.transaction_type = 'WITHDRAWAL' THEN d.amount_sum ELSE 0 END) AS total_withdrawals,
+    SUM(CASE WHEN d.transaction_type = 'PAYMENT' THEN d.amount_sum ELSE 0 END) AS total_payments,
+    SUM(CASE WHEN d.transaction_type = 'FEE' THEN d.amount_sum ELSE 0 END) AS total_fees,
     -- Average transaction size
-    AVG(amount) AS avg_transaction_amount,
+    SUM(d.amount_sum) / SUM(d.transaction_count) AS avg_transaction_amount,
     -- Date ranges
-    MIN(transaction_date) AS first_transaction_date,
-    MAX(transaction_date) AS last_transaction_date,
-    DATEDIFF(DAY, MIN(transaction_date), MAX(transaction_date)) AS account_age_days,
+    MIN(d.first_transaction_at) AS first_transaction_date,
+    MAX(d.last_transaction_at) AS last_transaction_date,
+    {{ dbt.datediff('MIN(d.first_transaction_at)', 'MAX(d.last_transaction_at)', 'day') }} AS account_age_days,
     -- Recent activity
-    COUNT(DISTINCT CASE
-        WHEN transaction_date >= DATEADD(DAY, -30, CURRENT_DATE())
-        THEN transaction_id
+    SUM(CASE
+        WHEN d.transaction_date_only >= {{ dbt.dateadd('day', -30, today()) }}
+        THEN d.transaction_count
+        ELSE 0
     END) AS transactions_last_30_days,
     SUM(CASE
-        WHEN transaction_date >= DATEADD(DAY, -30, CURRENT_DATE())
-        THEN amount
+        WHEN d.transaction_date_only >= {{ dbt.dateadd('day', -30, today()) }}
+        THEN d.amount_sum
         ELSE 0
     END) AS transaction_amount_last_30_days,
     -- Activity flags
     CASE
-        WHEN MAX(transaction_date) >= DATEADD(DAY, -30, CURRENT_DATE()) THEN TRUE
+        WHEN MAX(d.last_transaction_at) >= {{ dbt.dateadd('day', -30, today()) }} THEN TRUE
         ELSE FALSE
     END AS is_active_last_30_days,
     CASE
-        WHEN MAX(transaction_date) < DATEADD(DAY, -90, CURRENT_DATE()) THEN TRUE
+        WHEN MAX(d.last_transaction_at) < {{ dbt.dateadd('day', -90, today()) }} THEN TRUE
         ELSE FALSE
     END AS is_dormant,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
-FROM account_transactions
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
+FROM accounts a
+INNER JOIN daily_transactions d
+    ON a.account_hk = d.account_hk
 GROUP BY
-    account_id,
-    account_type,
-    account_status,
-    current_balance
-
+    a.account_id,
+    a.account_type,
+    a.account_status,
+    a.balance
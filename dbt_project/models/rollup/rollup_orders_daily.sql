@@ -0,0 +1,69 @@
+-- Rollup Layer: Daily Orders
+-- One row per day, customer, status, priority and payment method with the
+-- additive measures gold models and dashboards aggregate, so a year of
+-- reporting reads about 365 rows per combination instead of every order
+
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='order_date_only',
+        cluster_by=['order_date_only'],
+        tags=['rollup', 'operations', 'orders'],
+        pre_hook="
+            {% if is_incremental() %}
+            DELETE FROM {{ this }}
+            WHERE order_date_only IN (
+                {{ rollup_affected_days('silver_orders', 'order_date_only', 'sat_order', 'order_date') }}
+            )
+            {% endif %}
+        "
+    )
+}}
+
+WITH
+{% if is_incremental() %}
+-- Days to rebuild. The pre-hook emptied them, and no remaining day holds a
+-- version newer than the watermark, so these are the days it deleted
+affected_days AS (
+    {{ rollup_affected_days('silver_orders', 'order_date_only', 'sat_order', 'order_date') }}
+),
+{% endif %}
+
+orders AS (
+    SELECT * FROM {{ ref('silver_orders') }}
+    {% if is_incremental() %}
+    WHERE order_date_only IN (SELECT order_date_only FROM affected_days)
+    {% endif %}
+)
+
+SELECT
+    o.order_date_only,
+    lco.customer_hk,
+    hc.customer_id,
+    o.order_status_clean,
+    o.priority_clean,
+    o.payment_method,
+    -- Additive measures; order_total_count excludes orders without a total
+    COUNT(*) AS order_count,
+    COUNT(o.order_total) AS order_total_count,
+    SUM(o.order_total) AS order_total_sum,
+    MIN(o.order_total) AS order_total_min,
+    MAX(o.order_total) AS order_total_max,
+    MIN(o.order_date) AS first_order_at,
+    MAX(o.order_date) AS last_order_at,
+    MAX(o.sat_load_date) AS sat_load_date,
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
+FROM orders o
+LEFT JOIN {{ source('stage', 'link_customer_order') }} lco
+    ON o.order_hk = lco.order_hk
+LEFT JOIN {{ source('stage', 'hub_customer') }} hc
+    ON lco.customer_hk = hc.customer_hk
+GROUP BY
+    o.order_date_only,
+    lco.customer_hk,
+    hc.customer_id,
+    o.order_status_clean,
+    o.priority_clean,
+    o.payment_method
+{{ cluster_order() }}
@@ -0,0 +1,78 @@
+-- Rollup Layer: Daily Transactions
+-- One row per day, account, customer, category, type and status with the
+-- additive measures gold models and dashboards aggregate, so a year of
+-- reporting reads about 365 rows per combination instead of every transaction
+
+{{
+    config(
+        materialized='incremental',
+        incremental_strategy='delete+insert',
+        unique_key='transaction_date_only',
+        cluster_by=['transaction_date_only'],
+        tags=['rollup', 'finance', 'transactions'],
+        pre_hook="
+            {% if is_incremental() %}
+            DELETE FROM {{ this }}
+            WHERE transaction_date_only IN (
+                {{ rollup_affected_days('silver_transactions', 'transaction_date_only', 'sat_transaction', 'transaction_date') }}
+            )
+            {% endif %}
+        "
+    )
+}}
+
+WITH
+{% if is_incremental() %}
+-- Days to rebuild. The pre-hook emptied them, and no remaining day holds a
+-- version newer than the watermark, so these are the days it deleted
+affected_days AS (
+    {{ rollup_affected_days('silver_transactions', 'transaction_date_only', 'sat_transaction', 'transaction_date') }}
+),
+{% endif %}
+
+transactions AS (
+    SELECT * FROM {{ ref('silver_transactions') }}
+    {% if is_incremental() %}
+    WHERE transaction_date_only IN (SELECT transaction_date_only FROM affected_days)
+    {% endif %}
+)
+
+SELECT
+    t.transaction_date_only,
+    lat.account_hk,
+    ha.account_id,
+    lca.customer_hk,
+    hc.customer_id,
+    t.category,
+    t.transaction_type,
+    t.status_clean,
+    -- Additive measures
+    COUNT(*) AS transaction_count,
+    SUM(t.amount) AS amount_sum,
+    MIN(t.amount) AS amount_min,
+    MAX(t.amount) AS amount_max,
+    MIN(t.transaction_date) AS first_transaction_at,
+    MAX(t.transaction_date) AS last_transaction_at,
+    -- Distinct-count sketch, combined across rows with sketch_distinct_count()
+    {{ distinct_sketch('t.merchant') }} AS merchant_sketch,
+    MAX(t.sat_load_date) AS sat_load_date,
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
+FROM transactions t
+INNER JOIN {{ source('stage', 'link_account_transaction') }} lat
+    ON t.transaction_hk = lat.transaction_hk
+INNER JOIN {{ source('stage', 'hub_account') }} ha
+    ON lat.account_hk = ha.account_hk
+LEFT JOIN {{ source('stage', 'link_customer_account') }} lca
+    ON lat.account_hk = lca.account_hk
+LEFT JOIN {{ source('stage', 'hub_customer') }} hc
+    ON lca.customer_hk = hc.customer_hk
+GROUP BY
+    t.transaction_date_only,
+    lat.account_hk,
+    ha.account_id,
+    lca.customer_hk,
+    hc.customer_id,
+    t.category,
+    t.transaction_type,
+    t.status_clean
+{{ cluster_order() }}
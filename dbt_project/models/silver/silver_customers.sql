@@ -1,10 +1,19 @@
 -- Silver Layer: Cleansed and Conformed Customers
 -- Applies data quality rules and standardization
+-- Incremental runs skip unchanged customers, so the post-hook ages customers
+-- whose birthday passed and marks them rebuilt for the gold models
 
 {{
     config(
-        materialized='table',
-        tags=['silver', 'crm', 'customers']
+        materialized='incremental',
+        unique_key='customer_hk',
+        tags=['silver', 'crm', 'customers'],
+        post_hook="
+            UPDATE {{ this }}
+            SET age = {{ dbt.datediff('date_of_birth', today(), 'year') }},
+                dbt_loaded_at = {{ dbt.current_timestamp() }}
+            WHERE age <> {{ dbt.datediff('date_of_birth', today(), 'year') }}
+        "
     )
 }}
 
@@ -18,10 +27,10 @@ SELECT
     -- Standardize email
     LOWER(TRIM(email)) AS email,
     -- Clean phone number
-    REGEXP_REPLACE(phone, '[^0-9]', '') AS phone_clean,
+    {{ regexp_replace_all('phone', "'[^0-9]'", "''") }} AS phone_clean,
     date_of_birth,
     -- Calculate age
-    DATEDIFF(YEAR, date_of_birth, CURRENT_DATE()) AS age,
+    {{ dbt.datediff('date_of_birth', today(), 'year') }} AS age,
     -- Standardize customer type
     CASE
         WHEN customer_type IN ('INDIVIDUAL', 'RETAIL') THEN 'INDIVIDUAL'
@@ -61,7 +70,10 @@ SELECT
     record_source,
     hub_load_date,
     sat_load_date,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM {{ ref('bronze_customers') }}
 WHERE customer_id IS NOT NULL  -- Filter out invalid records
-
+{% if is_incremental() %}
+    -- Only rows whose satellite was loaded since the last run
+    AND sat_load_date > {{ watermark('sat_load_date') }}
+{% endif %}
@@ -3,7 +3,10 @@
 
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='order_hk',
+        cluster_by=['order_date_only'],
+        automatic_clustering=true,
         tags=['silver', 'operations', 'orders']
     )
 }}
@@ -13,7 +16,7 @@ SELECT
     order_id,
     order_date,
     -- Extract date components
-    DATE(order_date) AS order_date_only,
+    CAST(order_date AS DATE) AS order_date_only,
     EXTRACT(YEAR FROM order_date) AS order_year,
     EXTRACT(MONTH FROM order_date) AS order_month,
     EXTRACT(DAY FROM order_date) AS order_day,
@@ -56,8 +59,12 @@ SELECT
     record_source,
     hub_load_date,
     sat_load_date,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM {{ ref('bronze_orders') }}
 WHERE order_id IS NOT NULL
     AND order_date IS NOT NULL
-
+{% if is_incremental() %}
+    -- Only rows whose satellite was loaded since the last run
+    AND sat_load_date > {{ watermark('sat_load_date') }}
+{% endif %}
+{{ cluster_order() }}
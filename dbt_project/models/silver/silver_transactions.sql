@@ -3,7 +3,10 @@
 
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='transaction_hk',
+        cluster_by=['transaction_date_only'],
+        automatic_clustering=true,
         tags=['silver', 'finance', 'transactions']
     )
 }}
@@ -22,11 +25,11 @@ SELECT
     UPPER(TRIM(currency)) AS currency,
     transaction_date,
     -- Extract date components for analysis
-    DATE(transaction_date) AS transaction_date_only,
+    CAST(transaction_date AS DATE) AS transaction_date_only,
     EXTRACT(YEAR FROM transaction_date) AS transaction_year,
     EXTRACT(MONTH FROM transaction_date) AS transaction_month,
     EXTRACT(DAY FROM transaction_date) AS transaction_day,
-    DAYNAME(transaction_date) AS transaction_day_name,
+    {{ day_name('transaction_date') }} AS transaction_day_name,
     TRIM(description) AS description,
     TRIM(merchant) AS merchant,
     -- Standardize category
@@ -50,8 +53,12 @@ SELECT
     record_source,
     hub_load_date,
     sat_load_date,
-    CURRENT_TIMESTAMP() AS dbt_loaded_at
+    {{ dbt.current_timestamp() }} AS dbt_loaded_at
 FROM {{ ref('bronze_transactions') }}
 WHERE transaction_id IS NOT NULL
     AND transaction_date IS NOT NULL
-
+{% if is_incremental() %}
+    -- Only rows whose satellite was loaded since the last run
+    AND sat_load_date > {{ watermark('sat_load_date') }}
+{% endif %}
+{{ cluster_order() }}
@@ -97,16 +97,16 @@ ORDER BY current_balance DESC
 LIMIT 50;
 
 -- 7. Transaction Volume Trends
--- Daily transaction patterns
+-- Daily transaction patterns, summed from the daily rollup
 SELECT
-    DATE(transaction_date) AS txn_date,
-    COUNT(*) AS transaction_count,
-    SUM(amount) AS total_amount,
-    AVG(amount) AS avg_amount,
-    COUNT(DISTINCT CASE WHEN transaction_type = 'DEPOSIT' THEN transaction_id END) AS deposits,
-    COUNT(DISTINCT CASE WHEN transaction_type = 'WITHDRAWAL' THEN transaction_id END) AS withdrawals
-FROM DATA_LAKE.SILVER.SILVER_TRANSACTIONS
-WHERE transaction_date >= DATEADD(DAY, -30, CURRENT_DATE())
+    transaction_date_only AS txn_date,
+    SUM(transaction_count) AS transaction_count,
+    SUM(amount_sum) AS total_amount,
+    SUM(amount_sum) / SUM(transaction_count) AS avg_amount,
+    SUM(CASE WHEN transaction_type = 'DEPOSIT' THEN transaction_count ELSE 0 END) AS deposits,
+    SUM(CASE WHEN transaction_type = 'WITHDRAWAL' THEN transaction_count ELSE 0 END) AS withdrawals
+FROM DATA_LAKE.ROLLUP.ROLLUP_TRANSACTIONS_DAILY
+WHERE transaction_date_only >= DATEADD(DAY, -30, CURRENT_DATE())
   AND status_clean = 'COMPLETED'
 GROUP BY txn_date
 ORDER BY txn_date DESC;
@@ -151,40 +151,41 @@ WHERE order_year = 2024
 ORDER BY order_year DESC, order_month DESC;
 
 -- 10. Order Status Distribution
--- Current state of all orders
+-- Current state of all orders, summed from the daily rollup
 SELECT
     order_status_clean,
-    COUNT(*) AS order_count,
-    SUM(order_total) AS total_value,
-    AVG(order_total) AS avg_value,
-    MIN(order_date) AS oldest_order,
-    MAX(order_date) AS newest_order
-FROM DATA_LAKE.SILVER.SILVER_ORDERS
+    SUM(order_count) AS order_count,
+    SUM(order_total_sum) AS total_value,
+    SUM(order_total_sum) / NULLIF(SUM(order_total_count), 0) AS avg_value,
+    MIN(first_order_at) AS oldest_order,
+    MAX(last_order_at) AS newest_order
+FROM DATA_LAKE.ROLLUP.ROLLUP_ORDERS_DAILY
 GROUP BY order_status_clean
 ORDER BY order_count DESC;
 
 -- 11. Priority Order Analysis
--- High-priority order handling
+-- High-priority order handling; ages are weighted by each day's order count
 SELECT
     priority_clean,
     order_status_clean,
-    COUNT(*) AS order_count,
-    AVG(order_total) AS avg_order_value,
-    AVG(DATEDIFF(DAY, order_date, CURRENT_DATE())) AS avg_age_days
-FROM DATA_LAKE.SILVER.SILVER_ORDERS
+    SUM(order_count) AS order_count,
+    SUM(order_total_sum) / NULLIF(SUM(order_total_count), 0) AS avg_order_value,
+    SUM(order_count * DATEDIFF(DAY, order_date_only, CURRENT_DATE())) / SUM(order_count)
+        AS avg_age_days
+FROM DATA_LAKE.ROLLUP.ROLLUP_ORDERS_DAILY
 WHERE priority_clean IN ('HIGH', 'URGENT')
 GROUP BY priority_clean, order_status_clean
 ORDER BY priority_clean, order_status_clean;
 
 -- 12. Payment Method Preferences
--- Analysis of payment methods used
+-- Analysis of payment methods used, summed from the daily rollup
 SELECT
     payment_method,
-    COUNT(*) AS order_count,
-    SUM(order_total) AS total_value,
-    AVG(order_total) AS avg_order_value,
-    ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) AS percentage
-FROM DATA_LAKE.SILVER.SILVER_ORDERS
+    SUM(order_count) AS order_count,
+    SUM(order_total_sum) AS total_value,
+    SUM(order_total_sum) / NULLIF(SUM(order_total_count), 0) AS avg_order_value,
+    ROUND(SUM(order_count) * 100.0 / SUM(SUM(order_count)) OVER (), 2) AS percentage
+FROM DATA_LAKE.ROLLUP.ROLLUP_ORDERS_DAILY
 WHERE order_status_clean NOT IN ('CANCELLED', 'UNKNOWN')
 GROUP BY payment_method
 ORDER BY order_count DESC;
@@ -338,3 +339,21 @@ WHERE registration_date >= DATEADD(MONTH, -12, CURRENT_DATE())
 GROUP BY cohort_month
 ORDER BY cohort_month DESC;
 
+-- 21. Twelve-Month Category Dashboard
+-- Monthly volume and distinct merchants per category over the last year.
+-- Reads about 365 rollup rows per account and category instead of every
+-- transaction; merchant counts combine the daily HLL sketches
+SELECT
+    DATE_TRUNC('MONTH', transaction_date_only) AS month,
+    category,
+    SUM(transaction_count) AS transaction_count,
+    SUM(amount_sum) AS total_amount,
+    MAX(amount_max) AS largest_transaction,
+    COUNT(DISTINCT account_id) AS active_accounts,
+    HLL_ESTIMATE(HLL_COMBINE(HLL_IMPORT(merchant_sketch))) AS distinct_merchants
+FROM DATA_LAKE.ROLLUP.ROLLUP_TRANSACTIONS_DAILY
+WHERE transaction_date_only >= DATEADD(DAY, -365, CURRENT_DATE())
+  AND status_clean = 'COMPLETED'
+GROUP BY month, category
+ORDER BY month DESC, total_amount DESC;
+
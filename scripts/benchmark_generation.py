@@ -0,0 +1,284 @@
+"""
+Benchmark sample data generation throughput and peak memory.
+
+Runs each domain generator (finance, operations, crm) at several scale
+factors, each in a fresh process, and records wall time, rows per second,
+peak RSS and output bytes per format. Results are written as JSON and
+compared against a stored baseline; a case that is slower or uses more
+memory than the baseline by more than the threshold is a regression and
+makes the script exit non-zero.
+
+Run as a module from the repository root:
+``python -m scripts.benchmark_generation --scale-factors 1 10 --threshold 0.2``
+"""
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+
+# Configuration
+BENCHMARK_DIR = Path(__file__).parent.parent / "benchmarks"
+RESULTS_FILE = BENCHMARK_DIR / "generation_results.json"
+BASELINE_FILE = BENCHMARK_DIR / "generation_baseline.json"
+DOMAINS = ("finance", "operations", "crm")
+DEFAULT_SCALE_FACTORS = (1.0, 10.0)
+DEFAULT_THRESHOLD = 0.2
+
+# Metrics compared against the baseline, and whether a higher value is better
+REGRESSION_METRICS = {
+    "rows_per_second": True,
+    "peak_rss_mb": False,
+}
+
+
+def _output_format(path):
+    """Return the output format of a generated file, e.g. ``csv.gz``."""
+    return "csv.gz" if path.name.endswith(".csv.gz") else path.suffix.lstrip(".")
+
+
+def _run_case(domain, scale_factor, generator_args):
+    """Generate one domain into a scratch directory and return its measurements.
+
+    Runs in a fresh worker process, so ``ru_maxrss`` is this case's peak RSS.
+    Shard processes started with ``--workers`` are counted through
+    ``RUSAGE_CHILDREN``, the peak of the largest of them.
+    """
+    from scripts import generate_sample_data
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        generate_sample_data.SAMPLE_DATA_DIR = Path(scratch_dir)
+        options = generate_sample_data.parse_args(
+            ["--scale-factor", str(scale_factor), *generator_args]
+        )
+        generate = getattr(generate_sample_data, f"generate_{domain}_data")
+        started = time.perf_counter()
+        rows = sum(generate(options).values())
+        wall_seconds = time.perf_counter() - started
+
+        output_bytes = {}
+        for path in Path(scratch_dir).rglob("*"):
+            if path.is_file():
+                output_format = _output_format(path)
+                output_bytes[output_format] = (
+                    output_bytes.get(output_format, 0) + path.stat().st_size
+                )
+
+    peak_rss_kb = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return {
+        "domain": domain,
+        "scale_factor": scale_factor,
+        "rows": rows,
+        "wall_seconds": round(wall_seconds, 4),
+        "rows_per_second": round(rows / wall_seconds, 1),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+        "output_bytes": output_bytes,
+    }
+
+
+def case_id(result):
+    """Return the key identifying a benchmark case, e.g. ``finance@sf10``."""
+    return f"{result['domain']}@sf{result['scale_factor']:g}"
+
+
+def run_benchmarks(domains, scale_factors, generator_args=(), repeat=1):
+    """Run every domain at every scale factor and return one result per case.
+
+    Each run gets its own spawned process. With ``repeat`` above one, the
+    fastest run of each case is kept.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for scale_factor in scale_factors:
+        for domain in domains:
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    future = executor.submit(_run_case, domain, scale_factor, list(generator_args))
+                    runs.append(future.result())
+            best = min(runs, key=lambda run: run["wall_seconds"])
+            print(
+                f"  {case_id(best):<22} {best['rows']:>12,} rows "
+                f"{best['wall_seconds']:>9.2f}s {best['rows_per_second']:>14,.0f} rows/s "
+                f"{best['peak_rss_mb']:>9,.1f} MB"
+            )
+            results.append(best)
+    return results
+
+
+def environment():
+    """Describe the machine and library versions the benchmark ran with."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "numpy": np.__version__,
+        "pyarrow": pa.__version__,
+    }
+
+
+def environment_differences(baseline):
+    """Return ``{field: (baseline_value, current_value)}`` where the environments differ.
+
+    Throughput and memory are only comparable on the same machine and library
+    versions, so a non-empty result means regressions may be spurious.
+    """
+    current = environment()
+    recorded = baseline.get("environment", {})
+    return {
+        field: (recorded.get(field), value)
+        for field, value in current.items()
+        if recorded.get(field) != value
+    }
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """Return a list of regressions of ``results`` against ``baseline``.
+
+    Each regression is a dict with the case, metric, baseline and current
+    values and the relative change. Cases missing from the baseline are
+    skipped.
+    """
+    baseline_cases = {case_id(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline_cases.get(case_id(result))
+        if previous is None:
+            continue
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            change = (result[metric] - previous[metric]) / previous[metric]
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append(
+                    {
+                        "case": case_id(result),
+                        "metric": metric,
+                        "baseline": previous[metric],
+                        "current": result[metric],
+                        "change": round(change, 4),
+                    }
+                )
+    return regressions
+
+
+def save_results(results, path):
+    """Write benchmark results and their environment to ``path`` as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"environment": environment(), "results": results}
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the generation benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--domains",
+        nargs="+",
+        choices=DOMAINS,
+        default=list(DOMAINS),
+        help="Domains to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--scale-factors",
+        nargs="+",
+        type=float,
+        default=list(DEFAULT_SCALE_FACTORS),
+        help="Scale factors to run each domain at (default: 1 10)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Runs per case; the fastest is kept (default: 1)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown or memory growth counted as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=RESULTS_FILE,
+        help=f"Where to write results (default: {RESULTS_FILE.relative_to(BENCHMARK_DIR.parent)})",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=BASELINE_FILE,
+        help="Baseline results to compare against "
+        f"(default: {BASELINE_FILE.relative_to(BENCHMARK_DIR.parent)})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Also store these results as the new baseline",
+    )
+    parser.add_argument(
+        "generator_args",
+        nargs=argparse.REMAINDER,
+        help="Options after -- are passed to generate_sample_data.py, e.g. -- --formats parquet",
+    )
+    args = parser.parse_args(argv)
+    if args.generator_args[:1] == ["--"]:
+        args.generator_args = args.generator_args[1:]
+    return args
+
+
+def main(args=None):
+    """Run the benchmark, save results and report regressions against the baseline."""
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print("Benchmarking Sample Data Generation")
+    print("=" * 60)
+    results = run_benchmarks(args.domains, args.scale_factors, args.generator_args, args.repeat)
+    save_results(results, args.output)
+    print(f"Results saved to: {args.output}")
+
+    regressions = []
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        print("-" * 60)
+        differences = environment_differences(baseline)
+        if differences:
+            print("⚠ Baseline was recorded in a different environment; results may not compare:")
+            for field, (recorded, current) in differences.items():
+                print(f"  {field:<22} {recorded} -> {current}")
+        if regressions:
+            print(f"✗ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(
+                    f"  {regression['case']:<22} {regression['metric']:<16} "
+                    f"{regression['baseline']:>14,} -> {regression['current']:>14,} "
+                    f"({regression['change']:+.1%})"
+                )
+        else:
+            print(f"✓ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline saved to: {args.baseline}")
+    print("=" * 60)
+    return regressions
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main(parse_args()) else 0)
@@ -0,0 +1,263 @@
+"""
+Benchmark hash key formats: storage size and join speed on the local backend.
+
+Builds a synthetic hub of --rows business keys and a link of --fanout rows
+per hub key, hashes them in each load_data_vault.py --hash-format (hex,
+binary, integer), bulk loads both tables into the local backend (see
+bulk_load.py) and measures, per format:
+
+- hashing time for the hub and link keys
+- in-memory bytes of the hash key columns
+- Parquet bytes of the link's hub hash key column and of both tables on disk
+- time of the link-to-hub join on the hash key, in Arrow and, when duckdb
+  is installed, in DuckDB (the engine of the dbt ``duckdb`` target)
+
+Savings are reported relative to hex. Results are written as JSON.
+
+Run as a module from the repository root:
+``python -m scripts.benchmark_hash_keys --rows 1000000 --fanout 5``
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scripts import bulk_load, load_data_vault
+from scripts.benchmark_generation import BENCHMARK_DIR, environment
+from scripts.generate_sample_data import parquet_files
+
+# Configuration
+RESULTS_FILE = BENCHMARK_DIR / "hash_key_results.json"
+DEFAULT_ROWS = 1_000_000
+DEFAULT_FANOUT = 5
+DEFAULT_REPEAT = 3
+SEED = 42
+SCHEMA = "BENCH"
+
+
+def synthetic_keys(rows, fanout, seed=SEED):
+    """Return ``(hub_keys, link_keys)`` business key tables.
+
+    ``hub_keys`` has ``rows`` distinct ``parent_id`` values; ``link_keys``
+    has ``rows * fanout`` distinct ``child_id`` values, each paired with a
+    random parent, as a link between two hubs would be.
+    """
+    rng = np.random.default_rng(seed)
+    parent_ids = pa.array(np.char.add("P-", np.arange(rows).astype(str)))
+    child_ids = pa.array(np.char.add("C-", np.arange(rows * fanout).astype(str)))
+    parents = parent_ids.take(pa.array(rng.integers(0, rows, rows * fanout)))
+    hub_keys = pa.table({"parent_id": parent_ids})
+    link_keys = pa.table({"parent_id": parents, "child_id": child_ids})
+    return hub_keys, link_keys
+
+
+def build_tables(hub_keys, link_keys, hash_format, workers):
+    """Hash the keys in ``hash_format``; return ``(hub, link, hash_seconds)``."""
+    started = time.perf_counter()
+    hub = pa.table({
+        "parent_hk": load_data_vault.hash_columns(hub_keys, ["parent_id"], workers, hash_format),
+        "parent_id": hub_keys["parent_id"],
+    })
+    link = pa.table({
+        "parent_child_lk": load_data_vault.hash_columns(
+            link_keys, ["parent_id", "child_id"], workers, hash_format
+        ),
+        "parent_hk": load_data_vault.hash_columns(
+            link_keys, ["parent_id"], workers, hash_format
+        ),
+    })
+    return hub, link, time.perf_counter() - started
+
+
+def column_bytes(files, column):
+    """Return the compressed Parquet bytes of ``column`` across ``files``."""
+    total = 0
+    for path in files:
+        metadata = pq.ParquetFile(path).metadata
+        index = metadata.schema.names.index(column)
+        total += sum(
+            metadata.row_group(group).column(index).total_compressed_size
+            for group in range(metadata.num_row_groups)
+        )
+    return total
+
+
+def _best_seconds(run, repeat):
+    """Return the fastest of ``repeat`` timed calls of ``run``."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def duckdb_join_seconds(hub_files, link_files, repeat):
+    """Return the best DuckDB join time of the link to the hub, or None without duckdb."""
+    try:
+        import duckdb
+    except ImportError:
+        return None
+
+    conn = duckdb.connect()
+    try:
+        for table_name, files in (("hub", hub_files), ("link", link_files)):
+            conn.execute(
+                f"CREATE TABLE {table_name} AS SELECT * FROM read_parquet(?)",
+                [[str(path) for path in files]],
+            )
+        query = (
+            "SELECT COUNT(*), COUNT(DISTINCT h.parent_id) "
+            "FROM link l JOIN hub h ON l.parent_hk = h.parent_hk"
+        )
+        return _best_seconds(lambda: conn.execute(query).fetchall(), repeat)
+    finally:
+        conn.close()
+
+
+def run_case(hub_keys, link_keys, hash_format, workers, repeat, warehouse_dir):
+    """Build, load and join the tables in one format; return its measurements."""
+    hub, link, hash_seconds = build_tables(hub_keys, link_keys, hash_format, workers)
+    backend = bulk_load.LocalBackend(Path(warehouse_dir) / hash_format)
+    hub_name, link_name = "hub_parent", "link_parent_child"
+    for table_name, table in ((hub_name, hub), (link_name, link)):
+        bulk_load.bulk_load(backend, SCHEMA, table_name, table, workers=workers)
+    hub_files = parquet_files(backend.table_dir(SCHEMA, hub_name))
+    link_files = parquet_files(backend.table_dir(SCHEMA, link_name))
+
+    hub, link = backend.read(SCHEMA, hub_name), backend.read(SCHEMA, link_name)
+    arrow_join_seconds = _best_seconds(
+        lambda: link.join(hub, "parent_hk", join_type="inner"), repeat
+    )
+    duckdb_seconds = duckdb_join_seconds(hub_files, link_files, repeat)
+    return {
+        "hash_format": hash_format,
+        "hub_rows": hub.num_rows,
+        "link_rows": link.num_rows,
+        "hash_seconds": round(hash_seconds, 4),
+        "key_memory_bytes": (
+            hub["parent_hk"].nbytes + link["parent_child_lk"].nbytes + link["parent_hk"].nbytes
+        ),
+        "key_parquet_bytes": column_bytes(link_files, "parent_hk"),
+        "table_parquet_bytes": sum(path.stat().st_size for path in hub_files + link_files),
+        "arrow_join_seconds": round(arrow_join_seconds, 4),
+        "duckdb_join_seconds": None if duckdb_seconds is None else round(duckdb_seconds, 4),
+    }
+
+
+def savings(results):
+    """Return ``{format: {metric: change}}`` of each format relative to hex.
+
+    A change of -0.4 means 40% smaller or faster than hex.
+    """
+    baseline = next(result for result in results if result["hash_format"] == "hex")
+    metrics = [
+        "key_memory_bytes",
+        "key_parquet_bytes",
+        "table_parquet_bytes",
+        "arrow_join_seconds",
+        "duckdb_join_seconds",
+    ]
+    return {
+        result["hash_format"]: {
+            metric: round((result[metric] - baseline[metric]) / baseline[metric], 4)
+            for metric in metrics
+            if result[metric] is not None and baseline[metric]
+        }
+        for result in results
+        if result is not baseline
+    }
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the hash key benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=DEFAULT_ROWS,
+        help=f"Hub keys (default: {DEFAULT_ROWS:,})",
+    )
+    parser.add_argument(
+        "--fanout",
+        type=int,
+        default=DEFAULT_FANOUT,
+        help=f"Link rows per hub key (default: {DEFAULT_FANOUT})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Runs of each join; the fastest is kept (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Threads for hashing and staging (default: all cores)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=RESULTS_FILE,
+        help=f"Where to write results (default: {RESULTS_FILE.relative_to(BENCHMARK_DIR.parent)})",
+    )
+    args = parser.parse_args(argv)
+    for option in ("rows", "fanout", "repeat", "workers"):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option} must be at least 1")
+    return args
+
+
+def main(args=None):
+    """Benchmark every hash format, print the savings against hex and save the results."""
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print("Benchmarking Hash Key Formats")
+    print(f"Hub rows: {args.rows:,}  Link rows: {args.rows * args.fanout:,}")
+    print("=" * 60)
+    hub_keys, link_keys = synthetic_keys(args.rows, args.fanout)
+    results = []
+    with tempfile.TemporaryDirectory() as warehouse_dir:
+        for hash_format in load_data_vault.HASH_TYPES:
+            result = run_case(
+                hub_keys, link_keys, hash_format, args.workers, args.repeat, warehouse_dir
+            )
+            duckdb_seconds = result["duckdb_join_seconds"]
+            print(
+                f"  {hash_format:<8} hash {result['hash_seconds']:>7.2f}s "
+                f"key {result['key_parquet_bytes']:>12,} B "
+                f"tables {result['table_parquet_bytes']:>12,} B "
+                f"join {result['arrow_join_seconds']:>7.3f}s arrow "
+                + (f"{duckdb_seconds:>7.3f}s duckdb" if duckdb_seconds is not None else "")
+            )
+            results.append(result)
+
+    print("-" * 60)
+    print("Change against hex:")
+    changes = savings(results)
+    for hash_format, metrics in changes.items():
+        for metric, change in metrics.items():
+            print(f"  {hash_format:<8} {metric:<22} {change:+.1%}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(
+        {"environment": environment(), "results": results, "savings": changes}, indent=2
+    ) + "\n")
+    print("=" * 60)
+    print(f"Results saved to: {args.output}")
+    print("=" * 60)
+    return results
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,151 @@
+"""
+Bootstrap a local DuckDB database for running the dbt project offline.
+
+Creates ``DUCKDB_PATH`` with a ``stage`` schema holding every hub, link and
+satellite, so the dbt sources (``DATA_LAKE.STAGE.*``) resolve without a
+Snowflake account: DuckDB names the database after the file and matches
+identifiers case-insensitively. Tables are read from the delta files
+load_data_vault.py wrote to VAULT_DATA_DIR, with satellite rows end-dated
+where their key's next version begins; when those are missing the vault is
+built in memory from the sample data instead, with --hash-format encoding
+its hash keys. Hash keys keep their type in DuckDB: hex text is
+VARCHAR, binary BLOB and integer UBIGINT; the dbt models only compare and
+join them, so they run unchanged on every format.
+
+Then run dbt against the ``duckdb`` target of dbt_project/profiles:
+``cd dbt_project && dbt run --profiles-dir profiles --target duckdb``
+
+Run as a module from the repository root:
+``python -m scripts.bootstrap_duckdb``
+"""
+
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+from scripts import load_data_vault
+from scripts.generate_sample_data import SAMPLE_DATA_DIR
+
+# Configuration
+DUCKDB_PATH = SAMPLE_DATA_DIR / "data_lake.duckdb"
+STAGE_SCHEMA = "stage"
+
+
+def vault_tables(workers=None, hash_format="hex"):
+    """Return ``{table_name: rows}`` for every vault table.
+
+    Rows are the table's delta files in VAULT_DATA_DIR when it has any, or
+    built in memory from the sample data otherwise.
+    """
+    table_names = [*load_data_vault.HUBS, *load_data_vault.LINKS, *load_data_vault.SATELLITES]
+    files = {name: load_data_vault.delta_files(name) for name in table_names}
+    if all(files.values()):
+        return files
+
+    sources = load_data_vault.load_sources(load_data_vault.required_sources())
+    vault = load_data_vault.build_vault(
+        sources, datetime.now().replace(microsecond=0), workers, hash_format
+    )
+    return {name: files[name] or vault[name] for name in table_names}
+
+
+def bootstrap(database_path, tables):
+    """Create ``stage.<table>`` in ``database_path`` for each entry of ``tables``.
+
+    Entries are Arrow tables, or a Parquet path or list of paths, such as a
+    vault table's delta files; satellites read from files get each version's
+    ``end_date`` from the next version of its key. Existing tables are
+    replaced. Returns ``{table_name: row_count}``.
+    """
+    import duckdb
+
+    database_path = Path(database_path)
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+    counts = {}
+    conn = duckdb.connect(str(database_path))
+    try:
+        conn.execute(f"CREATE SCHEMA IF NOT EXISTS {STAGE_SCHEMA}")
+        for table_name, rows in tables.items():
+            if isinstance(rows, (Path, list)):
+                paths = [str(path) for path in (rows if isinstance(rows, list) else [rows])]
+                columns = "*"
+                if table_name in load_data_vault.SATELLITES:
+                    hash_key = load_data_vault.table_columns(table_name)[0]
+                    columns = (
+                        "* REPLACE (LEAD(load_date) OVER "
+                        f"(PARTITION BY {hash_key} ORDER BY load_date) AS end_date)"
+                    )
+                conn.execute(
+                    f"CREATE OR REPLACE TABLE {STAGE_SCHEMA}.{table_name} AS "
+                    f"SELECT {columns} FROM read_parquet(?)",
+                    [paths],
+                )
+            else:
+                conn.register("vault_rows", rows)
+                conn.execute(
+                    f"CREATE OR REPLACE TABLE {STAGE_SCHEMA}.{table_name} AS "
+                    "SELECT * FROM vault_rows"
+                )
+                conn.unregister("vault_rows")
+            (counts[table_name],) = conn.execute(
+                f"SELECT COUNT(*) FROM {STAGE_SCHEMA}.{table_name}"
+            ).fetchone()
+    finally:
+        conn.close()
+    return counts
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the DuckDB bootstrap."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--database",
+        type=Path,
+        default=None,
+        help=f"DuckDB file to create (default: {DUCKDB_PATH})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Threads hashing rows when the vault is built in memory (default: all cores)",
+    )
+    parser.add_argument(
+        "--hash-format",
+        choices=load_data_vault.HASH_TYPES,
+        default="hex",
+        help="Encoding of hash keys when the vault is built in memory (default: hex)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.database is None:
+        args.database = DUCKDB_PATH
+    return args
+
+
+def main(args=None):
+    """Load every vault table into the stage schema of the local DuckDB database."""
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print("Bootstrapping Local DuckDB Warehouse")
+    print(f"Database: {args.database}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    counts = bootstrap(args.database, vault_tables(args.workers, args.hash_format))
+    for table_name, rows in counts.items():
+        print(f"  ✓ {STAGE_SCHEMA}.{table_name:<30} {rows:>12,} rows")
+
+    print("=" * 60)
+    print(f"Created {len(counts)} tables in {time.perf_counter() - started:.2f}s")
+    print("Next: cd dbt_project && dbt run --profiles-dir profiles --target duckdb")
+    print("=" * 60)
+    return counts
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,440 @@
+"""
+Bulk load Arrow or pandas tables into the warehouse as staged Parquet.
+
+Row-wise ``INSERT`` statements do not scale past a few thousand rows, so
+tables are loaded column-wise: each table is cut into chunks of
+--chunk-rows, the chunks are written as Parquet files on --workers threads,
+and the files are loaded in one bulk operation by a backend:
+
+- ``snowflake``: ``PUT`` the files to the table's internal stage (uploading
+  --workers files in parallel) and ``COPY INTO`` the table, matching
+  columns by name. With ``--method write_pandas`` the connector's
+  ``write_pandas`` does the chunking, staging and copy instead.
+- ``local``: a stand-in for offline runs and tests that moves the staged
+  files into ``WAREHOUSE_DIR/<schema>/<table>/``, one directory of Parquet
+  files per table, the same way COPY appends files to a table.
+
+bulk_load appends, or with ``replace`` swaps in a table holding only the new
+rows, so readers see the old rows or the new ones and never an empty table:
+Snowflake copies into ``<table>_new`` and runs ``ALTER TABLE ... SWAP
+WITH``, and the local backend renames directories.
+
+bulk_merge applies one load_data_vault.py delta to a vault table instead of
+appending it: Snowflake copies the delta into a temporary table and runs the
+MERGE of load_data_vault.merge_sql, which inserts new keys and versions and
+end-dates the satellite rows they replace in one statement; the local
+backend does the same in Arrow.
+
+By default the hub, link and satellite tables written by load_data_vault.py
+are loaded into the STAGE schema; --raw also loads the producer tables from
+sample_data/ into RAW. Vault tables load incrementally: only the delta files
+newer than the table's latest ``load_date`` are merged, one at a time in
+load order, so a re-run loads nothing twice. --full-refresh replaces them
+with every delta file instead. RAW tables hold the producer tables' current
+contents and are always replaced.
+
+Run as a module from the repository root:
+``python -m scripts.bulk_load --backend snowflake --chunk-rows 500000 --workers 8``
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from scripts import load_data_vault
+from scripts.generate_sample_data import BASE_ROW_COUNTS, SAMPLE_DATA_DIR, parquet_files
+from scripts.load_data_vault import VAULT_DATA_DIR
+
+# Configuration
+WAREHOUSE_DIR = SAMPLE_DATA_DIR / "warehouse"
+CHUNK_ROWS = 500_000
+LOAD_WORKERS = 4
+BACKENDS = ("local", "snowflake")
+SNOWFLAKE_METHODS = ("copy", "write_pandas")
+VAULT_SCHEMA = "STAGE"
+RAW_SCHEMA = "RAW"
+
+
+def to_arrow(data):
+    """Return ``data`` (an Arrow or pandas table) as an Arrow table."""
+    if isinstance(data, pa.Table):
+        return data
+    return pa.Table.from_pandas(data, preserve_index=False)
+
+
+def stage_parquet(table, directory, chunk_rows=CHUNK_ROWS, workers=LOAD_WORKERS):
+    """Write ``table`` to ``directory`` as Parquet files of up to ``chunk_rows`` rows.
+
+    Chunks are written on ``workers`` threads. Returns the file paths in row
+    order.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    run_id = uuid.uuid4().hex[:8]
+    starts = range(0, table.num_rows, chunk_rows)
+    paths = [directory / f"chunk-{run_id}-{index:05d}.parquet" for index in range(len(starts))]
+
+    def write_chunk(start, path):
+        pq.write_table(table.slice(start, chunk_rows), path)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(write_chunk, starts, paths))
+    return paths
+
+
+class LocalBackend:
+    """Warehouse stand-in: each table is a directory of Parquet files."""
+
+    name = "local"
+
+    def __init__(self, root=None):
+        self.root = Path(root or WAREHOUSE_DIR)
+
+    def table_dir(self, schema, table_name):
+        return self.root / schema.lower() / table_name.lower()
+
+    def load(self, schema, table_name, table, chunk_rows, workers):
+        """Stage ``table`` as Parquet and move the files into the table; return rows loaded."""
+        table_dir = self.table_dir(schema, table_name)
+        staging_dir = self.root / ".stage"
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=staging_dir) as stage:
+            table_dir.mkdir(parents=True, exist_ok=True)
+            for path in stage_parquet(table, stage, chunk_rows, workers):
+                os.replace(path, table_dir / path.name)
+        return table.num_rows
+
+    def replace(self, schema, table_name, table, chunk_rows, workers):
+        """Load ``table`` into ``<table>_new`` and swap the directories; return rows loaded."""
+        table_dir = self.table_dir(schema, table_name)
+        new_dir = self.table_dir(schema, f"{table_name}_new")
+        old_dir = self.table_dir(schema, f"{table_name}_old")
+        for leftover in (new_dir, old_dir):
+            shutil.rmtree(leftover, ignore_errors=True)
+        rows = self.load(schema, f"{table_name}_new", table, chunk_rows, workers)
+        if table_dir.exists():
+            table_dir.rename(old_dir)
+        new_dir.rename(table_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+        return rows
+
+    def merge(self, schema, table_name, table, chunk_rows, workers):
+        """Apply a vault delta to ``schema.table_name`` as the Snowflake MERGE would.
+
+        Hub and link keys the table lacks are appended; satellites also
+        end-date the rows the delta replaces, which rewrites the table.
+        Returns the rows inserted.
+        """
+        if not parquet_files(self.table_dir(schema, table_name)):
+            return self.load(schema, table_name, table, chunk_rows, workers)
+        existing = self.read(schema, table_name)
+        hash_key = table.column_names[0]
+        if table_name not in load_data_vault.SATELLITES:
+            return self.load(
+                schema, table_name, load_data_vault.new_keys(existing, table, hash_key),
+                chunk_rows, workers,
+            )
+        inserts, _, _ = load_data_vault.satellite_delta(existing, table, hash_key)
+        self.replace(
+            schema, table_name, load_data_vault.apply_satellite_delta(existing, inserts, hash_key),
+            chunk_rows, workers,
+        )
+        return inserts.num_rows
+
+    def read(self, schema, table_name):
+        """Return everything loaded into a table so far."""
+        files = parquet_files(self.table_dir(schema, table_name))
+        return ds.dataset([str(f) for f in files], format="parquet").to_table()
+
+    def max_load_date(self, schema, table_name):
+        """Return the latest ``load_date`` in a table, or None when it is empty."""
+        files = parquet_files(self.table_dir(schema, table_name))
+        if not files:
+            return None
+        load_dates = ds.dataset([str(f) for f in files], format="parquet").to_table(
+            columns=["load_date"]
+        )
+        return pc.max(load_dates["load_date"]).as_py()
+
+    def close(self):
+        pass
+
+
+class SnowflakeBackend:
+    """Load through a table's internal stage with PUT and COPY INTO, or write_pandas."""
+
+    name = "snowflake"
+
+    def __init__(self, conn, method="copy"):
+        self.conn = conn
+        self.method = method
+
+    def load(self, schema, table_name, table, chunk_rows, workers):
+        """Bulk load ``table`` into ``schema.table_name`` and return the rows loaded."""
+        if self.method == "write_pandas":
+            from snowflake.connector.pandas_tools import write_pandas
+
+            _, _, rows, _ = write_pandas(
+                self.conn,
+                table.to_pandas(),
+                table_name.upper(),
+                schema=schema,
+                chunk_size=chunk_rows,
+                parallel=workers,
+                quote_identifiers=False,
+            )
+            return rows
+
+        table_stage = f"@{schema}.%{table_name}"
+        cursor = self.conn.cursor()
+        try:
+            with tempfile.TemporaryDirectory() as stage:
+                stage_parquet(table, stage, chunk_rows, workers)
+                cursor.execute(
+                    f"PUT 'file://{Path(stage).as_posix()}/*.parquet' {table_stage} "
+                    f"PARALLEL = {workers} AUTO_COMPRESS = FALSE OVERWRITE = TRUE"
+                )
+            cursor.execute(
+                f"COPY INTO {schema}.{table_name} FROM {table_stage} "
+                "FILE_FORMAT = (TYPE = PARQUET) "
+                "MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE PURGE = TRUE"
+            )
+            # One result row per file; rows_loaded is the fourth column
+            return sum(row[3] for row in cursor.fetchall())
+        finally:
+            cursor.close()
+
+    def replace(self, schema, table_name, table, chunk_rows, workers):
+        """Load ``table`` into a copy of the table and swap it in; return rows loaded.
+
+        ``ALTER TABLE ... SWAP WITH`` exchanges the two tables in one
+        metadata operation, so the table is never seen empty or half loaded.
+        """
+        new_table = f"{table_name}_new"
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                f"CREATE OR REPLACE TABLE {schema}.{new_table} LIKE {schema}.{table_name}"
+            )
+            rows = self.load(schema, new_table, table, chunk_rows, workers)
+            cursor.execute(f"ALTER TABLE {schema}.{table_name} SWAP WITH {schema}.{new_table}")
+            cursor.execute(f"DROP TABLE IF EXISTS {schema}.{new_table}")
+            return rows
+        finally:
+            cursor.close()
+
+    def max_load_date(self, schema, table_name):
+        """Return the latest ``load_date`` in a table, or None when it is empty."""
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(f"SELECT MAX(load_date) FROM {schema}.{table_name}")
+            return cursor.fetchall()[0][0]
+        finally:
+            cursor.close()
+
+    def merge(self, schema, table_name, table, chunk_rows, workers):
+        """Copy a vault delta into a temporary table and MERGE it; return the rows inserted."""
+        staging_table = f"{table_name}_delta"
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(
+                f"CREATE OR REPLACE TEMPORARY TABLE {schema}.{staging_table} "
+                f"LIKE {schema}.{table_name}"
+            )
+            self.load(schema, staging_table, table, chunk_rows, workers)
+            cursor.execute(load_data_vault.merge_sql(
+                table_name, f"{schema}.{staging_table}", f"{schema}.{table_name}"
+            ))
+            # One result row; rows inserted is the first column
+            inserted = cursor.fetchall()[0][0]
+            cursor.execute(f"DROP TABLE IF EXISTS {schema}.{staging_table}")
+            return inserted
+        finally:
+            cursor.close()
+
+    def close(self):
+        self.conn.close()
+
+
+def create_backend(options):
+    """Return the backend selected by --backend."""
+    if options.backend == "snowflake":
+        from scripts.setup_snowflake import create_connection
+
+        return SnowflakeBackend(create_connection(), options.method)
+    return LocalBackend()
+
+
+def bulk_load(backend, schema, table_name, data, chunk_rows=CHUNK_ROWS, workers=LOAD_WORKERS,
+              replace=False):
+    """Load an Arrow or pandas table into ``schema.table_name`` and return its timing.
+
+    With ``replace`` the table's rows are swapped for ``data`` atomically
+    instead of appended to. Returns ``{"rows", "seconds"}``.
+    """
+    started = time.perf_counter()
+    load = backend.replace if replace else backend.load
+    rows = load(schema, table_name, to_arrow(data), chunk_rows, workers)
+    return {"rows": rows, "seconds": time.perf_counter() - started}
+
+
+def bulk_merge(backend, schema, table_name, delta, chunk_rows=CHUNK_ROWS, workers=LOAD_WORKERS):
+    """Merge one load_data_vault.py delta into the vault table ``schema.table_name``.
+
+    Returns ``{"rows", "seconds"}`` with the rows inserted.
+    """
+    started = time.perf_counter()
+    rows = backend.merge(schema, table_name, to_arrow(delta), chunk_rows, workers)
+    return {"rows": rows, "seconds": time.perf_counter() - started}
+
+
+def merge_new_deltas(backend, table_name, files, chunk_rows=CHUNK_ROWS, workers=LOAD_WORKERS):
+    """Merge the delta ``files`` newer than the vault table's latest ``load_date``.
+
+    Deltas are merged one at a time in load order, since a MERGE must not
+    see two versions of a key at once. Returns ``{"rows", "seconds"}`` with
+    the rows inserted.
+    """
+    started = time.perf_counter()
+    loaded_until = backend.max_load_date(VAULT_SCHEMA, table_name)
+    rows = 0
+    for path in files:
+        if loaded_until is None or load_data_vault.delta_load_date(path) > loaded_until:
+            rows += bulk_merge(
+                backend, VAULT_SCHEMA, table_name, pq.read_table(path), chunk_rows, workers
+            )["rows"]
+    return {"rows": rows, "seconds": time.perf_counter() - started}
+
+
+def discover_sources(include_raw=False):
+    """Return ``(schema, table_name, files)`` for every table to load.
+
+    Vault tables are the delta file directories in VAULT_DATA_DIR; with
+    ``include_raw`` the producer tables in SAMPLE_DATA_DIR are added for the
+    RAW schema.
+    """
+    sources = [
+        (VAULT_SCHEMA, path.name, sorted(path.glob("load-*.parquet")))
+        for path in sorted(VAULT_DATA_DIR.iterdir() if VAULT_DATA_DIR.is_dir() else [])
+        if path.is_dir() and any(path.glob("load-*.parquet"))
+    ]
+    if include_raw:
+        for table_name in BASE_ROW_COUNTS:
+            files = parquet_files(SAMPLE_DATA_DIR / table_name)
+            if files:
+                sources.append((RAW_SCHEMA, table_name, files))
+    return sources
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the bulk loader."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="local",
+        help="Where to load: a local Parquet warehouse or Snowflake (default: local)",
+    )
+    parser.add_argument(
+        "--method",
+        choices=SNOWFLAKE_METHODS,
+        default="copy",
+        help="Snowflake load path: staged PUT + COPY INTO, or write_pandas (default: copy)",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=CHUNK_ROWS,
+        help=f"Rows per staged Parquet file (default: {CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=LOAD_WORKERS,
+        help=f"Files written and uploaded in parallel (default: {LOAD_WORKERS})",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        default=None,
+        help="Only load these tables (default: all)",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Also load the producer tables from sample_data/ into the RAW schema",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Replace each vault table with all of its delta files instead of merging new ones",
+    )
+    args = parser.parse_args(argv)
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+
+def main(args=None):
+    """Bulk load every discovered table and report rows and throughput."""
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print(f"Bulk Loading into {args.backend}")
+    print(f"Chunk rows: {args.chunk_rows:,}  Workers: {args.workers}")
+    print("=" * 60)
+
+    sources = [
+        source for source in discover_sources(args.raw)
+        if args.tables is None or source[1] in args.tables
+    ]
+    if not sources:
+        print("⚠ Nothing to load; run load_data_vault.py first")
+        return {}
+
+    backend = create_backend(args)
+    results = {}
+    try:
+        for schema, table_name, files in sources:
+            if schema == VAULT_SCHEMA and not args.full_refresh:
+                result = merge_new_deltas(
+                    backend, table_name, files, args.chunk_rows, args.workers
+                )
+            else:
+                if schema == VAULT_SCHEMA:
+                    table = load_data_vault.read_vault_table(table_name, files)
+                else:
+                    table = ds.dataset([str(f) for f in files], format="parquet").to_table()
+                result = bulk_load(
+                    backend, schema, table_name, table, args.chunk_rows, args.workers,
+                    replace=True,
+                )
+            results[f"{schema}.{table_name}"] = result
+            print(
+                f"  ✓ {schema}.{table_name:<30} {result['rows']:>12,} rows "
+                f"{result['rows'] / max(result['seconds'], 1e-9):>14,.0f} rows/s"
+            )
+    finally:
+        backend.close()
+
+    print("=" * 60)
+    print(f"Loaded {sum(r['rows'] for r in results.values()):,} rows into {len(results)} tables")
+    print("=" * 60)
+    return results
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,220 @@
+"""
+Report how well the dbt models with a ``cluster_by`` key are clustered locally.
+
+Reads the models and their cluster keys from the dbt manifest
+(dbt_project/target/manifest.json, written by ``dbt run`` or ``dbt
+compile``) and, for each built table in the local DuckDB database, splits
+the table into blocks of --block-rows rows in storage order (DuckDB row
+groups by default) and takes the min and max of the first cluster key in
+each block. From those ranges it reports the measures Snowflake's
+``SYSTEM$CLUSTERING_INFORMATION`` uses for micro-partitions:
+
+- average overlaps: how many other blocks each block's range overlaps
+- average depth: how many blocks cover a key value, averaged over the block
+  boundaries (1.0 is perfectly clustered)
+- scan fraction: the share of blocks a query over --window-days of the key
+  has to read, averaged over consecutive windows spanning the table
+
+Cluster keys must be dates or timestamps. A table deeper than --max-depth
+fails the check and makes the script exit non-zero.
+
+Run as a module from the repository root, after ``dbt run --target duckdb``:
+``python -m scripts.check_clustering --max-depth 2``
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from scripts.bootstrap_duckdb import DUCKDB_PATH
+
+# Configuration
+MANIFEST_PATH = Path(__file__).parent.parent / "dbt_project" / "target" / "manifest.json"
+BLOCK_ROWS = 122_880  # DuckDB row group size
+WINDOW_DAYS = 30
+MAX_DEPTH = 2.0
+
+
+def cluster_keys(manifest):
+    """Return ``{relation_name: cluster_key}`` for every model with ``cluster_by``.
+
+    ``manifest`` is the parsed dbt manifest; the key is the first
+    ``cluster_by`` column.
+    """
+    keys = {}
+    for node in manifest["nodes"].values():
+        cluster_by = node.get("config", {}).get("cluster_by")
+        if node.get("resource_type") != "model" or not cluster_by:
+            continue
+        if isinstance(cluster_by, str):
+            cluster_by = [cluster_by]
+        keys[node["relation_name"]] = cluster_by[0]
+    return keys
+
+
+def block_ranges(conn, relation, column, block_rows=BLOCK_ROWS):
+    """Return ``(mins, maxs)``: the day range of ``column`` in each block of ``relation``.
+
+    Blocks are consecutive runs of ``block_rows`` row ids, i.e. storage
+    order. Days count from 1970-01-01; blocks without a value are left out.
+    """
+    rows = conn.execute(
+        "SELECT rowid // ? AS block, "
+        f"MIN(CAST({column} AS DATE)) - DATE '1970-01-01', "
+        f"MAX(CAST({column} AS DATE)) - DATE '1970-01-01' "
+        f"FROM {relation} WHERE {column} IS NOT NULL "
+        "GROUP BY block ORDER BY block",
+        [block_rows],
+    ).fetchall()
+    ranges = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    return ranges[:, 1], ranges[:, 2]
+
+
+def _covering(sorted_mins, sorted_maxs, start, end):
+    """Return how many ranges overlap ``[start, end]``, element-wise."""
+    return (
+        np.searchsorted(sorted_mins, end, side="right")
+        - np.searchsorted(sorted_maxs, start, side="left")
+    )
+
+
+def clustering_metrics(mins, maxs, window_days=WINDOW_DAYS):
+    """Return the clustering measures of blocks with key ranges ``[mins, maxs]``.
+
+    The result has ``blocks``, ``average_overlaps``, ``average_depth`` and
+    ``scan_fraction`` (see the module docstring); an empty table reports
+    zero blocks and no measures.
+    """
+    mins, maxs = np.asarray(mins), np.asarray(maxs)
+    if not len(mins):
+        return {"blocks": 0, "average_overlaps": None, "average_depth": None,
+                "scan_fraction": None}
+    sorted_mins, sorted_maxs = np.sort(mins), np.sort(maxs)
+    overlaps = _covering(sorted_mins, sorted_maxs, mins, maxs) - 1
+    points = np.unique(np.concatenate([mins, maxs]))
+    depth = _covering(sorted_mins, sorted_maxs, points, points)
+    window_starts = np.arange(sorted_mins[0], sorted_maxs[-1] + 1, window_days)
+    scanned = _covering(sorted_mins, sorted_maxs, window_starts, window_starts + window_days - 1)
+    return {
+        "blocks": len(mins),
+        "average_overlaps": round(float(overlaps.mean()), 4),
+        "average_depth": round(float(depth.mean()), 4),
+        "scan_fraction": round(float(scanned.mean()) / len(mins), 4),
+    }
+
+
+def check_table(conn, relation, column, block_rows=BLOCK_ROWS, window_days=WINDOW_DAYS):
+    """Return the clustering measures of one built table, or None if it does not exist."""
+    import duckdb
+
+    try:
+        mins, maxs = block_ranges(conn, relation, column, block_rows)
+    except duckdb.CatalogException:
+        return None
+    return {"relation": relation, "cluster_key": column,
+            **clustering_metrics(mins, maxs, window_days)}
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the clustering check."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--database",
+        type=Path,
+        default=DUCKDB_PATH,
+        help=f"DuckDB file the dbt duckdb target built (default: {DUCKDB_PATH})",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=MANIFEST_PATH,
+        help="dbt manifest listing the models and their cluster_by keys "
+        "(default: dbt_project/target/manifest.json)",
+    )
+    parser.add_argument(
+        "--block-rows",
+        type=int,
+        default=BLOCK_ROWS,
+        help=f"Rows per block; DuckDB row groups hold {BLOCK_ROWS:,} (default: {BLOCK_ROWS:,})",
+    )
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=WINDOW_DAYS,
+        help="Days covered by the date-range query of the scan fraction "
+        f"(default: {WINDOW_DAYS})",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=float,
+        default=MAX_DEPTH,
+        help=f"Average depth above which a table fails the check (default: {MAX_DEPTH:g})",
+    )
+    args = parser.parse_args(argv)
+    if args.block_rows < 1:
+        parser.error("--block-rows must be at least 1")
+    if args.window_days < 1:
+        parser.error("--window-days must be at least 1")
+    if args.max_depth < 1:
+        parser.error("--max-depth must be at least 1")
+    return args
+
+
+def main(args=None):
+    """Check every clustered model and return the tables deeper than --max-depth.
+
+    Returns None when there is no manifest to read the models from.
+    """
+    import duckdb
+
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print("Clustering Depth Check")
+    print(f"Database: {args.database}")
+    print("=" * 60)
+    if not args.manifest.exists():
+        print(f"✗ No dbt manifest at {args.manifest}; run dbt first")
+        return None
+
+    keys = cluster_keys(json.loads(args.manifest.read_text()))
+    failing = []
+    conn = duckdb.connect(str(args.database), read_only=True)
+    try:
+        print(f"  {'table':<44} {'blocks':>7} {'overlaps':>9} {'depth':>7} {'scan':>7}")
+        for relation, column in keys.items():
+            result = check_table(conn, relation, column, args.block_rows, args.window_days)
+            name = relation.replace('"', "")
+            if result is None:
+                print(f"  ⚠ {name} not built yet")
+                continue
+            if not result["blocks"]:
+                print(f"  ⚠ {name} is empty")
+                continue
+            failed = result["average_depth"] > args.max_depth
+            if failed:
+                failing.append(result)
+            print(
+                f"{'✗' if failed else '✓'} {name:<44} {result['blocks']:>7,} "
+                f"{result['average_overlaps']:>9.2f} {result['average_depth']:>7.2f} "
+                f"{result['scan_fraction']:>7.1%}"
+            )
+    finally:
+        conn.close()
+
+    print("=" * 60)
+    if failing:
+        print(f"✗ {len(failing)} table(s) deeper than {args.max_depth:g}; "
+              "rebuild them with dbt run --full-refresh")
+    else:
+        print(f"✓ Every clustered table is within depth {args.max_depth:g}")
+    print("=" * 60)
+    return failing
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(parse_args()) == [] else 1)
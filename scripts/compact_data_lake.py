@@ -0,0 +1,394 @@
+"""
+Compact small Parquet files under a data lake prefix into files of a target size.
+
+Batches, shards and partitions leave many small files under each
+domain/entity prefix (e.g. ``finance/transactions/``), which slows Glue
+crawlers and Snowflake stage scans. Files in the same directory (so within
+one Hive partition) that are smaller than the target size are merged into
+as few files as possible of about --target-file-mb, optionally sorted by a
+key column. Files already at the target size are left alone.
+
+The location is a local directory (``sample_data/finance_transactions``) or
+an S3 prefix (``s3://bucket/finance/transactions/``). Compaction is atomic
+per directory: before merging, a marker file (MARKER_NAME) listing the input
+files is written to the directory; the merged files are then written
+completely, locally via a temporary name and rename, the marker is marked
+committed, and only then are the inputs and the marker removed. Each run
+first recovers from markers a crashed run left behind: a committed marker's
+remaining inputs are deleted, while an uncommitted marker's partial outputs
+are deleted and its inputs kept. A crash therefore never leaves rows
+duplicated or missing.
+
+Run as a module from the repository root:
+``python -m scripts.compact_data_lake s3://bucket/finance/transactions/ --sort-by transaction_id``
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+from pathlib import Path, PurePosixPath
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scripts.generate_sample_data import PARQUET_CODECS
+
+# Configuration
+TARGET_FILE_MB = 128
+ROW_GROUP_ROWS = 1_000_000
+COMPACTED_PREFIX = "compacted"
+MARKER_NAME = "_compaction.json"
+
+
+class LocalStore:
+    """Parquet files under a local directory, addressed by relative POSIX path."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def __str__(self):
+        return str(self.root)
+
+    def list_files(self, suffix=".parquet"):
+        """Return ``{relative_path: size}`` for every file under the root ending in ``suffix``."""
+        return {
+            path.relative_to(self.root).as_posix(): path.stat().st_size
+            for path in sorted(self.root.rglob(f"*{suffix}"))
+        }
+
+    def read_text(self, name):
+        return (self.root / name).read_text()
+
+    def write_text(self, name, text):
+        """Replace ``name`` with ``text`` atomically, via a temporary file and rename."""
+        path = self.root / name
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(text)
+        os.replace(temporary, path)
+
+    def open_input(self, name):
+        return pa.OSFile(str(self.root / name), "rb")
+
+    def open_output(self, name):
+        """Open a temporary file that ``finish_output`` renames to ``name``."""
+        path = self.root / name
+        return pa.OSFile(str(path.with_name(path.name + ".tmp")), "wb")
+
+    def finish_output(self, output, name):
+        output.close()
+        path = self.root / name
+        os.replace(path.with_name(path.name + ".tmp"), path)
+
+    def delete(self, names):
+        for name in names:
+            (self.root / name).unlink(missing_ok=True)
+
+
+class S3Store:
+    """Parquet objects under an S3 prefix, addressed by key relative to the prefix."""
+
+    def __init__(self, s3_client, bucket_name, prefix, options):
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.prefix = prefix.rstrip("/") + "/"
+        self._part_size = int(options.part_size_mb * 1024 * 1024)
+
+    def __str__(self):
+        return f"s3://{self.bucket_name}/{self.prefix}"
+
+    def list_files(self, suffix=".parquet"):
+        """Return ``{relative_key: size}`` for each object under the prefix ending in ``suffix``."""
+        from scripts.upload_to_s3 import list_remote_objects
+
+        remote = list_remote_objects(self.s3_client, self.bucket_name, [self.prefix])
+        return {
+            key[len(self.prefix):]: item["size"]
+            for key, item in sorted(remote.items())
+            if key.endswith(suffix)
+        }
+
+    def read_text(self, name):
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.prefix + name)
+        return response["Body"].read().decode()
+
+    def write_text(self, name, text):
+        """Replace ``name`` with ``text``; a PutObject is atomic."""
+        self.s3_client.put_object(
+            Bucket=self.bucket_name, Key=self.prefix + name, Body=text.encode()
+        )
+
+    def open_input(self, name):
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.prefix + name)
+        return io.BytesIO(response["Body"].read())
+
+    def open_output(self, name):
+        """Open a multipart upload; S3 publishes the object only once it completes."""
+        from scripts.upload_to_s3 import S3MultipartWriter
+
+        return S3MultipartWriter(
+            self.s3_client, self.bucket_name, self.prefix + name, self._part_size
+        )
+
+    def finish_output(self, output, name):
+        output.close()
+
+    def delete(self, names):
+        from scripts.upload_to_s3 import delete_keys
+
+        delete_keys(self.s3_client, self.bucket_name, [self.prefix + name for name in names])
+
+
+def open_store(location, options):
+    """Return the store for a local directory or an ``s3://bucket/prefix`` location."""
+    if location.startswith("s3://"):
+        from scripts.upload_to_s3 import create_s3_client
+
+        bucket_name, _, prefix = location[len("s3://"):].partition("/")
+        return S3Store(create_s3_client(), bucket_name, prefix, options)
+    return LocalStore(location)
+
+
+def plan_compaction(files, target_bytes):
+    """Group the files to merge by directory.
+
+    Returns ``{directory: [names]}`` for every directory holding at least two
+    files smaller than ``target_bytes``; larger files are not rewritten.
+    """
+    groups = {}
+    for name, size in files.items():
+        if size < target_bytes:
+            groups.setdefault(str(PurePosixPath(name).parent), []).append(name)
+    return {directory: names for directory, names in groups.items() if len(names) > 1}
+
+
+def _output_name(directory, run_id, index):
+    """Return the relative name of a compacted file, unique to this run."""
+    name = f"{COMPACTED_PREFIX}-{run_id}-{index:03d}.parquet"
+    return name if directory == "." else f"{directory}/{name}"
+
+
+def _marker_name(directory):
+    """Return the relative name of a directory's compaction marker."""
+    return MARKER_NAME if directory == "." else f"{directory}/{MARKER_NAME}"
+
+
+def recover(store):
+    """Finish or roll back the compactions a crashed run left markers for.
+
+    A committed marker's merged files are complete, so its remaining inputs
+    are deleted. An uncommitted marker's inputs are all still in place, so
+    the partial outputs of its run are deleted instead. Returns how many
+    markers were resolved.
+    """
+    markers = store.list_files(MARKER_NAME)
+    if not markers:
+        return 0
+    outputs = [*store.list_files(".parquet"), *store.list_files(".parquet.tmp")]
+    for marker in markers:
+        state = json.loads(store.read_text(marker))
+        directory = str(PurePosixPath(marker).parent)
+        if state["committed"]:
+            store.delete(state["inputs"])
+            print(f"  ✓ {directory}: finished interrupted compaction {state['run_id']}")
+        else:
+            run_prefix = _output_name(directory, state["run_id"], 0)[:-len("000.parquet")]
+            store.delete([name for name in outputs if name.startswith(run_prefix)])
+            print(f"  ✓ {directory}: rolled back interrupted compaction {state['run_id']}")
+        store.delete([marker])
+    return len(markers)
+
+
+def _read_tables(store, names):
+    """Yield each input file as an Arrow table, one file in memory at a time."""
+    for name in names:
+        with store.open_input(name) as source:
+            yield pq.read_table(source)
+
+
+class _RollingWriter:
+    """Write row groups to compacted files, starting a new file at the target size."""
+
+    def __init__(self, store, directory, run_id, schema, options):
+        self.written = []
+        self.schema = schema
+        self._store = store
+        self._directory = directory
+        self._run_id = run_id
+        self._options = options
+        self._target_bytes = int(options.target_file_mb * 1024 * 1024)
+        self._writer = self._output = None
+
+    def write(self, table):
+        if self._writer is None:
+            name = _output_name(self._directory, self._run_id, len(self.written))
+            self._output = self._store.open_output(name)
+            self._writer = pq.ParquetWriter(
+                self._output, self.schema, compression=self._options.parquet_codec
+            )
+            self.written.append((name, 0))
+        self._writer.write_table(table, row_group_size=self._options.row_group_rows)
+        if self._output.tell() >= self._target_bytes:
+            self._finish()
+
+    def close(self):
+        if self._writer is not None:
+            self._finish()
+        return self.written
+
+    def _finish(self):
+        self._writer.close()
+        name, _ = self.written[-1]
+        self.written[-1] = (name, self._output.tell())
+        self._store.finish_output(self._output, name)
+        self._writer = self._output = None
+
+
+def compact_directory(store, directory, names, options, run_id):
+    """Merge ``names`` into new files of about --target-file-mb.
+
+    Without --sort-by, inputs are streamed one file at a time in name order
+    and buffered only up to one row group; with it, the directory's rows are
+    sorted in memory before writing. Returns ``(name, size)`` of each new file.
+    """
+    tables = _read_tables(store, names)
+    if options.sort_by:
+        tables = [pa.concat_tables(tables).sort_by(options.sort_by)]
+
+    writer = None
+    pending = []
+    pending_rows = 0
+    row_group_rows = options.row_group_rows
+    for table in tables:
+        if writer is None:
+            writer = _RollingWriter(store, directory, run_id, table.schema, options)
+        pending.append(table.cast(writer.schema))
+        pending_rows += table.num_rows
+        if pending_rows >= row_group_rows:
+            rows = pa.concat_tables(pending)
+            full_rows = rows.num_rows - rows.num_rows % row_group_rows
+            writer.write(rows.slice(0, full_rows))
+            pending = [rows.slice(full_rows)]
+            pending_rows -= full_rows
+    if pending_rows:
+        writer.write(pa.concat_tables(pending))
+    return writer.close() if writer is not None else []
+
+
+def compact(store, options):
+    """Compact every directory of small files in ``store`` and return a summary.
+
+    The summary holds the file counts and bytes before and after, across the
+    directories that were compacted.
+    """
+    recover(store)
+    target_bytes = int(options.target_file_mb * 1024 * 1024)
+    files = store.list_files()
+    plan = plan_compaction(files, target_bytes)
+    run_id = time.strftime("%Y%m%d%H%M%S")
+    summary = dict.fromkeys(
+        ("directories", "files_before", "bytes_before", "files_after", "bytes_after"), 0
+    )
+    for directory, names in sorted(plan.items()):
+        marker = _marker_name(directory)
+        state = {"run_id": run_id, "inputs": names, "committed": False}
+        store.write_text(marker, json.dumps(state))
+        written = compact_directory(store, directory, names, options, run_id)
+        # Inputs are removed only once every new file is complete and recorded
+        state["committed"] = True
+        store.write_text(marker, json.dumps(state))
+        store.delete(names)
+        store.delete([marker])
+        bytes_before = sum(files[name] for name in names)
+        bytes_after = sum(size for _, size in written)
+        print(
+            f"  ✓ {directory}: {len(names)} files ({bytes_before / 1e6:,.2f} MB) -> "
+            f"{len(written)} files ({bytes_after / 1e6:,.2f} MB)"
+        )
+        summary["directories"] += 1
+        summary["files_before"] += len(names)
+        summary["bytes_before"] += bytes_before
+        summary["files_after"] += len(written)
+        summary["bytes_after"] += bytes_after
+    return summary
+
+
+def parse_args(argv=None):
+    """Parse command-line options for compaction."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "location",
+        help="Local directory or s3://bucket/prefix/ holding one table's Parquet files",
+    )
+    parser.add_argument(
+        "--target-file-mb",
+        type=float,
+        default=TARGET_FILE_MB,
+        help=f"Size of the compacted files (default: {TARGET_FILE_MB})",
+    )
+    parser.add_argument(
+        "--sort-by",
+        default=None,
+        help="Sort each directory's rows by this column before writing",
+    )
+    parser.add_argument(
+        "--row-group-rows",
+        type=int,
+        default=ROW_GROUP_ROWS,
+        help=f"Maximum rows per Parquet row group (default: {ROW_GROUP_ROWS})",
+    )
+    parser.add_argument(
+        "--parquet-codec",
+        choices=PARQUET_CODECS,
+        default="snappy",
+        help="Parquet compression codec (default: snappy)",
+    )
+    parser.add_argument(
+        "--part-size-mb",
+        type=float,
+        default=64,
+        help="Multipart part size when writing to S3 (default: 64)",
+    )
+    args = parser.parse_args(argv)
+    if args.target_file_mb <= 0:
+        parser.error("--target-file-mb must be positive")
+    if args.row_group_rows < 1:
+        parser.error("--row-group-rows must be at least 1")
+    if args.part_size_mb < 5:
+        parser.error("--part-size-mb must be at least 5 (the S3 minimum)")
+    return args
+
+
+def main(args=None):
+    """Compact one location and report the file-count and byte reductions."""
+    if args is None:
+        args = parse_args([])
+
+    store = open_store(args.location, args)
+    print("=" * 60)
+    print(f"Compacting {store}")
+    print(f"Target file size: {args.target_file_mb:g} MB")
+    print("=" * 60)
+
+    summary = compact(store, args)
+
+    print("-" * 60)
+    if summary["directories"]:
+        byte_change = (summary["bytes_after"] - summary["bytes_before"]) / summary["bytes_before"]
+        print(
+            f"Files: {summary['files_before']:,} -> {summary['files_after']:,} "
+            f"({summary['files_before'] - summary['files_after']:,} fewer)"
+        )
+        print(
+            f"Bytes: {summary['bytes_before'] / 1e6:,.2f} MB -> "
+            f"{summary['bytes_after'] / 1e6:,.2f} MB ({byte_change:+.1%})"
+        )
+    else:
+        print("Nothing to compact")
+    print("=" * 60)
+    return summary
+
+
+if __name__ == "__main__":
+    main(parse_args())
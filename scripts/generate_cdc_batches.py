@@ -0,0 +1,372 @@
+"""
+Generate change-data-capture (CDC) delta batches against a sample snapshot.
+
+Reads a table's snapshot as written by generate_sample_data.py, replays the
+batches already generated for it, and emits the next numbered batches of
+inserts, updates and deletes at per-table rates. Each batch row is a full row
+image plus three columns:
+
+- ``cdc_batch_id``: batch number, starting at 1
+- ``cdc_operation``: ``I`` (insert), ``U`` (update) or ``D`` (delete)
+- ``cdc_timestamp``: when the change happened, inside the batch's window
+
+Batches are written to ``CDC_DATA_DIR/<table>/batch_NNNNNN.<format>`` and are
+deterministic for a given snapshot and batch number. Replaying earlier
+batches needs their Parquet files, so --formats must include parquet.
+
+Run as a module from the repository root:
+``python -m scripts.generate_cdc_batches --batches 7``
+"""
+
+import argparse
+from datetime import timedelta
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from scripts.generate_sample_data import (
+    BASE_ROW_COUNTS,
+    END_DATE,
+    SAMPLE_DATA_DIR,
+    accounts_table,
+    add_format_arguments,
+    check_format_arguments,
+    customers_table,
+    inventory_table,
+    opportunities_table,
+    orders_table,
+    parquet_files,
+    random_timestamps,
+    table_rng,
+    write_table,
+)
+
+# Configuration
+CDC_DATA_DIR = SAMPLE_DATA_DIR / "cdc"
+CDC_START = END_DATE + timedelta(days=1)
+BATCH_INTERVAL_HOURS = 24
+
+# Entities that change between loads: key column, id prefix, the builder
+# used for inserted rows and replacement values, and the columns an update
+# may change
+CDC_TABLES = {
+    "finance_accounts": {
+        "key": "account_id",
+        "prefix": "ACC",
+        "builder": accounts_table,
+        "mutable": ("account_status", "balance"),
+    },
+    "operations_orders": {
+        "key": "order_id",
+        "prefix": "ORD",
+        "builder": orders_table,
+        "mutable": ("order_status", "priority", "shipping_address", "billing_address"),
+    },
+    "operations_inventory": {
+        "key": "inventory_id",
+        "prefix": "INV",
+        "builder": inventory_table,
+        "mutable": ("quantity_on_hand", "reorder_level", "unit_cost", "unit_price"),
+    },
+    "crm_customers": {
+        "key": "customer_id",
+        "prefix": "CUST",
+        "builder": customers_table,
+        "mutable": (
+            "customer_status",
+            "customer_segment",
+            "lifetime_value",
+            "email",
+            "phone",
+            "address",
+        ),
+    },
+    "crm_opportunities": {
+        "key": "opportunity_id",
+        "prefix": "OPP",
+        "builder": opportunities_table,
+        "mutable": ("stage", "probability", "amount", "actual_close_date"),
+    },
+}
+
+# Changes per batch as a fraction of the table's current row count
+CHANGE_KINDS = ("insert", "update", "delete")
+DEFAULT_CHANGE_RATES = {"insert": 0.005, "update": 0.02, "delete": 0.001}
+
+OPERATION_CODES = {"insert": "I", "update": "U", "delete": "D"}
+
+# Audit timestamp columns set to the change time, per change kind
+AUDIT_COLUMNS = {
+    "insert": ("created_at", "updated_at"),
+    "update": ("updated_at",),
+    "delete": (),
+}
+
+
+def load_snapshot(table_name):
+    """Read a table's snapshot from SAMPLE_DATA_DIR, ordered by its key."""
+    files = parquet_files(SAMPLE_DATA_DIR / table_name)
+    if not files:
+        raise FileNotFoundError(
+            f"No snapshot for {table_name} in {SAMPLE_DATA_DIR}; "
+            "run generate_sample_data.py with Parquet output first"
+        )
+    snapshot = ds.dataset([str(f) for f in files], format="parquet").to_table()
+    return snapshot.sort_by(CDC_TABLES[table_name]["key"])
+
+
+def snapshot_row_counts():
+    """Return the snapshot row count of every table, for foreign keys of new rows."""
+    row_counts = dict(BASE_ROW_COUNTS)
+    for table_name in row_counts:
+        files = parquet_files(SAMPLE_DATA_DIR / table_name)
+        if files:
+            row_counts[table_name] = sum(pq.read_metadata(f).num_rows for f in files)
+    return row_counts
+
+
+def existing_batches(table_name):
+    """Return the Parquet batch files already written for a table, in batch order."""
+    return sorted((CDC_DATA_DIR / table_name).glob("batch_*.parquet"))
+
+
+def apply_batch(state, batch, key):
+    """Apply a CDC batch to ``state`` and return the new state, ordered by key."""
+    changed_keys = pc.filter(batch[key], pc.not_equal(batch["cdc_operation"], "I"))
+    kept = state.filter(pc.invert(pc.is_in(state[key], value_set=changed_keys)))
+    upserts = batch.filter(pc.not_equal(batch["cdc_operation"], "D")).select(state.column_names)
+    return pa.concat_tables([kept, upserts.cast(state.schema)]).sort_by(key)
+
+
+def _max_id(ids, prefix):
+    """Return the largest numeric part of ids such as ``CUST000042``."""
+    if len(ids) == 0:
+        return 0
+    return pc.max(pc.cast(pc.utf8_slice_codeunits(ids, len(prefix)), pa.int64())).as_py()
+
+
+def _values_differ(new, old):
+    """Return a boolean mask of positions where ``new`` and ``old`` differ, nulls included."""
+    differs = pc.not_equal(new, old)
+    return pc.fill_null(differs, pc.xor(pc.is_null(new), pc.is_null(old)))
+
+
+def _set_change_times(table, timestamps, columns):
+    """Overwrite the audit ``columns`` that ``table`` has with the change times."""
+    for column in columns:
+        if column in table.column_names:
+            index = table.column_names.index(column)
+            values = pa.array(timestamps).cast(table.schema.field(column).type)
+            table = table.set_column(index, column, values)
+    return table
+
+
+def _updated_rows(rng, state, positions, config, row_counts):
+    """Change one mutable column of each row at ``positions``.
+
+    Replacement values come from freshly built rows, so they follow the same
+    distributions as the snapshot. Rows whose drawn value equals the old one
+    are dropped, so every update changes the row's hash_diff.
+    """
+    old = state.take(positions)
+    fresh = config["builder"](rng, 0, len(positions), row_counts).cast(state.schema)
+    changed_column = rng.integers(0, len(config["mutable"]), len(positions))
+    changed = np.zeros(len(positions), dtype=bool)
+    updated = old
+    for index, column in enumerate(config["mutable"]):
+        selected = changed_column == index
+        new_values = pc.if_else(selected, fresh[column], old[column])
+        changed |= selected & _values_differ(new_values, old[column]).to_numpy(zero_copy_only=False)
+        updated = updated.set_column(state.column_names.index(column), column, new_values)
+    return updated.filter(changed)
+
+
+def generate_batch(table_name, state, batch_id, rates, row_counts, next_id, interval):
+    """Build CDC batch ``batch_id`` for ``state`` and return it.
+
+    The batch changes ``rates[kind]`` of the current rows for each change
+    kind, at times spread across the batch's window of ``interval``.
+    """
+    config = CDC_TABLES[table_name]
+    rng = table_rng(f"cdc:{table_name}", batch_id)
+    counts = {kind: int(round(rates[kind] * state.num_rows)) for kind in CHANGE_KINDS}
+    counts["update"] = min(counts["update"], state.num_rows)
+    counts["delete"] = min(counts["delete"], state.num_rows - counts["update"])
+    positions = rng.choice(state.num_rows, counts["update"] + counts["delete"], replace=False)
+    update_positions, delete_positions = np.split(positions, [counts["update"]])
+
+    changes = {
+        "insert": config["builder"](rng, next_id, next_id + counts["insert"], row_counts).cast(
+            state.schema
+        ),
+        "update": _updated_rows(rng, state, update_positions, config, row_counts),
+        "delete": state.take(delete_positions),
+    }
+
+    window_start = CDC_START + (batch_id - 1) * interval
+    window_end = window_start + interval - timedelta(seconds=1)
+    parts = []
+    for kind in CHANGE_KINDS:
+        rows = changes[kind]
+        timestamps = random_timestamps(rng, rows.num_rows, window_start, window_end)
+        rows = _set_change_times(rows, timestamps, AUDIT_COLUMNS[kind])
+        parts.append(
+            rows.append_column("cdc_batch_id", pa.array(np.full(rows.num_rows, batch_id)))
+            .append_column("cdc_operation", pa.array(np.full(rows.num_rows, OPERATION_CODES[kind])))
+            .append_column("cdc_timestamp", pa.array(timestamps))
+        )
+    return pa.concat_tables(parts).sort_by(
+        [("cdc_timestamp", "ascending"), (config["key"], "ascending")]
+    )
+
+
+def generate_cdc_batches(table_name, num_batches, rates, options):
+    """Append ``num_batches`` CDC batches for a table and return their change counts."""
+    config = CDC_TABLES[table_name]
+    key = config["key"]
+    output_dir = CDC_DATA_DIR / table_name
+    if options.reset:
+        for batch_file in output_dir.glob("batch_*"):
+            batch_file.unlink()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    state = load_snapshot(table_name)
+    next_id = _max_id(state[key], config["prefix"])
+    previous = existing_batches(table_name)
+    for batch_file in previous:
+        batch = pq.read_table(batch_file)
+        next_id = max(next_id, _max_id(batch[key], config["prefix"]))
+        state = apply_batch(state, batch, key)
+
+    row_counts = snapshot_row_counts()
+    interval = timedelta(hours=options.interval_hours)
+    summary = []
+    for batch_id in range(len(previous) + 1, len(previous) + num_batches + 1):
+        batch = generate_batch(table_name, state, batch_id, rates, row_counts, next_id, interval)
+        write_table([batch], output_dir / f"batch_{batch_id:06d}", table_name, options)
+        operations = pc.value_counts(batch["cdc_operation"]).to_pylist()
+        counts = {item["values"]: item["counts"] for item in operations}
+        summary.append(
+            {
+                "batch_id": batch_id,
+                **{kind: counts.get(code, 0) for kind, code in OPERATION_CODES.items()},
+            }
+        )
+        next_id += counts.get("I", 0)
+        state = apply_batch(state, batch, key)
+    return summary
+
+
+def _parse_rate_override(value):
+    """Parse a ``TABLE:KIND=RATE`` override for --rate."""
+    target, _, rate = value.partition("=")
+    table_name, _, kind = target.partition(":")
+    try:
+        rate = float(rate)
+    except ValueError:
+        rate = -1.0
+    if table_name not in CDC_TABLES or kind not in CHANGE_KINDS or not 0 <= rate <= 1:
+        raise argparse.ArgumentTypeError(
+            f"expected TABLE:KIND=RATE with TABLE one of {', '.join(CDC_TABLES)}, "
+            f"KIND one of {', '.join(CHANGE_KINDS)} and RATE between 0 and 1"
+        )
+    return table_name, kind, rate
+
+
+def resolve_change_rates(args):
+    """Return ``{table: {kind: rate}}`` from the default and per-table rates."""
+    defaults = {kind: getattr(args, f"{kind}_rate") for kind in CHANGE_KINDS}
+    rates = {table_name: dict(defaults) for table_name in args.tables}
+    for table_name, kind, rate in args.rate:
+        if table_name in rates:
+            rates[table_name][kind] = rate
+    return rates
+
+
+def parse_args(argv=None):
+    """Parse command-line options for CDC batch generation."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=tuple(CDC_TABLES),
+        default=list(CDC_TABLES),
+        help="Tables to generate batches for (default: all)",
+    )
+    parser.add_argument(
+        "--batches", type=int, default=1, help="Number of batches to append (default: 1)"
+    )
+    parser.add_argument(
+        "--interval-hours",
+        type=float,
+        default=BATCH_INTERVAL_HOURS,
+        help=f"Time window covered by each batch (default: {BATCH_INTERVAL_HOURS})",
+    )
+    for kind in CHANGE_KINDS:
+        parser.add_argument(
+            f"--{kind}-rate",
+            type=float,
+            default=DEFAULT_CHANGE_RATES[kind],
+            help=f"Fraction of rows with a {kind} per batch "
+            f"(default: {DEFAULT_CHANGE_RATES[kind]})",
+        )
+    parser.add_argument(
+        "--rate",
+        type=_parse_rate_override,
+        action="append",
+        default=[],
+        metavar="TABLE:KIND=RATE",
+        help="Override one table's rate, e.g. crm_customers:update=0.02; may be repeated",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete existing batches and start again from batch 1",
+    )
+    add_format_arguments(parser)
+    parser.set_defaults(stream=False, partition_by="none", s3_bucket=None)
+    args = parser.parse_args(argv)
+    if args.batches < 1:
+        parser.error("--batches must be at least 1")
+    if args.interval_hours < 1:
+        parser.error("--interval-hours must be at least 1")
+    if "parquet" not in args.formats:
+        parser.error("--formats must include parquet; later runs replay batches from it")
+    check_format_arguments(parser, args)
+    args.change_rates = resolve_change_rates(args)
+    return args
+
+
+def main(args=None):
+    """Generate CDC batches for every selected table."""
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print("Generating CDC Batches")
+    print("=" * 60)
+
+    batches_per_table = {}
+    for table_name in args.tables:
+        summary = generate_cdc_batches(
+            table_name, args.batches, args.change_rates[table_name], args
+        )
+        for batch in summary:
+            print(
+                f"  {table_name:<22} batch {batch['batch_id']:>4}: "
+                f"{batch['insert']:>8,} inserts {batch['update']:>8,} updates "
+                f"{batch['delete']:>8,} deletes"
+            )
+        batches_per_table[table_name] = summary
+
+    print("=" * 60)
+    print(f"Batches saved to: {CDC_DATA_DIR}")
+    print("=" * 60)
+    return batches_per_table
+
+
+if __name__ == "__main__":
+    main(parse_args())
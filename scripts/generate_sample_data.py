@@ -1,12 +1,55 @@
 """
 Generate realistic sample datasets for Finance, Operations, and CRM domains.
 This script creates CSV and Parquet files with synthetic data using Faker.
+
+Columns are generated as whole NumPy arrays rather than row by row: enums,
+amounts, identifiers, foreign keys and timestamps are drawn in bulk from a
+per-table random generator, and only free-text columns fall back to Faker.
+
+Tables are produced in chunks of CHUNK_ROWS ids, each from its own seed, so
+the streaming mode (--stream) writes the same data as the in-memory mode
+while holding only one chunk at a time. With --workers the same chunks are
+generated as shards in a process pool, each written to its own part file.
+--partition-by writes Parquet as Hive-style date partitions instead
+(``<table>/year=YYYY/month=MM[/day=DD]/part-*.parquet``).
+
+Each table is written once per --formats entry (parquet, csv, csv.gz),
+concurrently from the same Arrow table; CSV is encoded by Arrow on several
+threads, and the Parquet codec, row-group size and dictionary encoding are
+configurable.
+
+With --s3-bucket, Parquet is streamed straight into S3 multipart uploads
+under the key layout of upload_to_s3.FILE_MAPPINGS instead of being written
+to SAMPLE_DATA_DIR, holding only a few upload parts in memory per open file.
+This needs boto3 and running as a module (``python -m
+scripts.generate_sample_data``).
+
+Foreign keys are uniform by default; --key-distribution makes a relationship
+Zipf-distributed or concentrates it on a hot set of parent keys, to reproduce
+skewed joins.
+
+Other scripts build on the public helpers: the ``<table>_table(rng, start,
+stop, row_counts, key_distributions=None)`` builders return the rows with
+ids ``start + 1 .. stop`` as an Arrow table, ``table_rng`` gives the seeded
+generator for a table chunk, ``random_timestamps`` draws timestamps in a
+window, and ``write_table`` writes chunks to the selected formats.
 """
 
+import argparse
+import os
+import shutil
+import string
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from pathlib import Path
 
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from faker import Faker
 
 # Initialize Faker for data generation
@@ -15,354 +58,1171 @@ Faker.seed(42)  # For reproducibility
 
 # Configuration
 SAMPLE_DATA_DIR = Path(__file__).parent.parent / "sample_data"
+DEFAULT_SEED = 42
+SEED = DEFAULT_SEED  # Base seed of the current run, set from --seed by use_seed
 NUM_CUSTOMERS = 1000
 NUM_ACCOUNTS = 1500
 NUM_TRANSACTIONS = 5000
 NUM_ORDERS = 2000
 NUM_SHIPMENTS = 1800
 NUM_INTERACTIONS = 3000
+NUM_INVENTORY_ITEMS = 500
+NUM_OPPORTUNITIES = 800
 START_DATE = datetime(2023, 1, 1)
 END_DATE = datetime(2024, 12, 31)
 
+# Row counts per table at scale factor 1. Ledger entries are derived from
+# transactions (one debit and one credit each), so they have no entry here.
+BASE_ROW_COUNTS = {
+    "finance_accounts": NUM_ACCOUNTS,
+    "finance_transactions": NUM_TRANSACTIONS,
+    "operations_orders": NUM_ORDERS,
+    "operations_shipments": NUM_SHIPMENTS,
+    "operations_inventory": NUM_INVENTORY_ITEMS,
+    "crm_customers": NUM_CUSTOMERS,
+    "crm_interactions": NUM_INTERACTIONS,
+    "crm_opportunities": NUM_OPPORTUNITIES,
+}
 
-def generate_finance_data():
-    """Generate finance domain datasets: accounts, transactions, ledger entries."""
-    print("Generating Finance data...")
+# Rows per generated chunk; each chunk is seeded independently and becomes one
+# Parquet row group in streaming mode. Changing it changes the generated values.
+CHUNK_ROWS = 100_000
+
+# Date column each table is partitioned on with --partition-by
+PARTITION_COLUMNS = {
+    "finance_accounts": "open_date",
+    "finance_transactions": "transaction_date",
+    "finance_ledger": "entry_date",
+    "operations_orders": "order_date",
+    "operations_shipments": "ship_date",
+    "operations_inventory": "last_restock_date",
+    "crm_customers": "registration_date",
+    "crm_interactions": "interaction_date",
+    "crm_opportunities": "created_at",
+}
+
+# Hive partition directory layout per --partition-by grain
+PARTITION_LAYOUTS = {
+    "month": "year=%Y/month=%m",
+    "day": "year=%Y/month=%m/day=%d",
+}
+
+TARGET_FILE_MB = 128
+
+# Partitioned writes buffer each partition's rows into full row groups, but
+# flush every partition once this many chunks of rows are buffered in total
+PARTITION_BUFFER_CHUNKS = 10
+
+# Streaming to S3 with --s3-bucket: multipart part size and parts uploading
+# at once per open file, so each file buffers at most S3_UPLOAD_THREADS + 1 parts
+S3_PART_SIZE_MB = 64
+S3_MIN_PART_SIZE_MB = 5
+S3_UPLOAD_THREADS = 2
+
+# Output formats for --formats; each table is written once per selected format
+OUTPUT_FORMATS = ("parquet", "csv", "csv.gz")
+DEFAULT_FORMATS = ("parquet", "csv")
+PARQUET_CODECS = ("snappy", "zstd", "gzip", "none")
+
+# Threads encoding slices of each CSV write in parallel
+CSV_ENCODE_THREADS = os.cpu_count() or 1
+
+# Foreign-key relationships (``child_table.column``) and their parent tables.
+# Each can draw its keys from its own distribution with --key-distribution.
+FK_RELATIONSHIPS = {
+    "finance_accounts.customer_id": "crm_customers",
+    "finance_transactions.account_id": "finance_accounts",
+    "finance_ledger.account_id": "finance_accounts",
+    "operations_orders.customer_id": "crm_customers",
+    "operations_shipments.order_id": "operations_orders",
+    "crm_interactions.customer_id": "crm_customers",
+    "crm_opportunities.customer_id": "crm_customers",
+}
+
+# Foreign-key distributions: uniform, zipf:S (rank k drawn with weight k^-S)
+# or hot:PCT:SHARE (PCT% of parent keys receive SHARE% of the rows)
+KEY_DISTRIBUTIONS = ("uniform", "zipf", "hot")
+UNIFORM = ("uniform",)
+
+# Free-text columns larger than this sample from a shared Faker-generated pool
+FAKER_POOL_SIZE = 10_000
+
+# Faker providers for free-text columns, keyed by pool name
+FREE_TEXT = {
+    "address": lambda: fake.address().replace("\n", ", "),
+    "bs": lambda: fake.bs().title(),
+    "catch_phrase": lambda: fake.catch_phrase(),
+    "city": lambda: fake.city(),
+    "company": lambda: fake.company(),
+    "email": lambda: fake.email(),
+    "first_name": lambda: fake.first_name(),
+    "last_name": lambda: fake.last_name(),
+    "name": lambda: fake.name(),
+    "notes": lambda: fake.text(max_nb_chars=200),
+    "phone_number": lambda: fake.phone_number(),
+    "sentence_4": lambda: fake.sentence(nb_words=4),
+    "sentence_5": lambda: fake.sentence(nb_words=5),
+    "sentence_6": lambda: fake.sentence(nb_words=6),
+    "state_abbr": lambda: fake.state_abbr(),
+    "zipcode": lambda: fake.zipcode(),
+}
+
+
+def resolve_row_counts(scale_factor=1.0, overrides=None):
+    """Return rows per table for a scale factor, applying per-table overrides.
+
+    Every table in BASE_ROW_COUNTS is scaled together, so foreign keys drawn
+    from a parent table's count always reference rows that exist.
+    """
+    row_counts = {
+        table_name: max(1, round(base_rows * scale_factor))
+        for table_name, base_rows in BASE_ROW_COUNTS.items()
+    }
+    for table_name, rows in (overrides or {}).items():
+        if table_name not in row_counts:
+            raise ValueError(f"Unknown table for row override: {table_name}")
+        row_counts[table_name] = rows
+    return row_counts
+
+
+def use_seed(seed):
+    """Make ``seed`` the base seed of every table and Faker pool.
+
+    Cached values derived from the previous seed are dropped. Process-pool
+    workers call it on start-up, so shards use the parent's seed.
+    """
+    global SEED
+    if seed != SEED:
+        SEED = seed
+        _key_ranking.cache_clear()
+        _faker_pool.cache_clear()
+
+
+def table_rng(table_name, chunk_index=0):
+    """Return a random generator seeded from SEED, the table name and chunk index."""
+    return np.random.default_rng([SEED, zlib.crc32(table_name.encode()), chunk_index])
+
+
+def _format_ids(prefix, numbers, width):
+    """Format integer ids as zero-padded strings, e.g. ``TXN00000042``."""
+    digits = pc.utf8_lpad(pc.cast(pa.array(numbers), pa.string()), width=width, padding="0")
+    return pc.binary_join_element_wise(prefix, digits, "")
+
+
+def _choice(rng, elements, size):
+    """Draw ``size`` values uniformly from ``elements``."""
+    return np.asarray(elements, dtype=object)[rng.integers(0, len(elements), size)]
+
+
+def _amounts(rng, low, high, size):
+    """Draw uniform monetary amounts rounded to cents."""
+    return np.round(rng.uniform(low, high, size), 2)
+
+
+@lru_cache(maxsize=None)
+def _key_ranking(parent_rows):
+    """Return parent key numbers ordered by popularity, a fixed shuffle of ``1 .. parent_rows``.
+
+    Hot keys are spread across the id range rather than being the lowest ids.
+    """
+    return np.random.default_rng([SEED, parent_rows]).permutation(parent_rows) + 1
+
+
+@lru_cache(maxsize=None)
+def _zipf_cdf(parent_rows, exponent):
+    """Return the cumulative distribution of a Zipf law over ``parent_rows`` ranks."""
+    cdf = np.cumsum(np.arange(1, parent_rows + 1, dtype=np.float64) ** -exponent)
+    return cdf / cdf[-1]
+
+
+def _foreign_keys(rng, size, relationship, row_counts, key_distributions=None):
+    """Draw foreign-key numbers in ``1 .. parent_rows`` for a FK_RELATIONSHIPS entry.
+
+    Keys are uniform unless ``key_distributions`` maps the relationship to a
+    Zipf or hot-set distribution, in which case popularity ranks are drawn and
+    mapped to keys through ``_key_ranking``.
+    """
+    parent_rows = row_counts[FK_RELATIONSHIPS[relationship]]
+    kind, *params = (key_distributions or {}).get(relationship, UNIFORM)
+    if kind == "uniform":
+        return rng.integers(1, parent_rows + 1, size)
+    if kind == "zipf":
+        (exponent,) = params
+        ranks = np.searchsorted(_zipf_cdf(parent_rows, exponent), rng.random(size), side="right")
+        ranks = np.minimum(ranks, parent_rows - 1)
+    else:
+        key_fraction, row_fraction = params
+        hot_keys = min(parent_rows, max(1, round(key_fraction * parent_rows)))
+        hot_ranks = rng.integers(0, hot_keys, size)
+        cold_ranks = (
+            rng.integers(hot_keys, parent_rows, size) if hot_keys < parent_rows else hot_ranks
+        )
+        ranks = np.where(rng.random(size) < row_fraction, hot_ranks, cold_ranks)
+    return _key_ranking(parent_rows)[ranks]
+
+
+def random_timestamps(rng, size, start=START_DATE, end=END_DATE):
+    """Draw uniform second-resolution timestamps in ``[start, end]``.
+
+    ``start`` may be a scalar or an array of per-row lower bounds.
+    """
+    low = np.asarray(start, dtype="datetime64[s]").astype(np.int64)
+    high = np.datetime64(end, "s").astype(np.int64)
+    offsets = np.floor(rng.random(size) * (high - low + 1)).astype(np.int64)
+    return (low + offsets).astype("datetime64[s]").astype("datetime64[us]")
 
-    # Generate Accounts
-    accounts = []
-    for i in range(NUM_ACCOUNTS):
-        account = {
-            "account_id": f"ACC{i+1:06d}",
-            "account_number": fake.bban(),
-            "account_type": fake.random_element(
-                elements=("CHECKING", "SAVINGS", "INVESTMENT", "CREDIT")
+
+def _random_dates(rng, size, start=START_DATE, end=END_DATE):
+    """Draw uniform calendar dates in ``[start, end]``."""
+    low = np.datetime64(start, "D").astype(np.int64)
+    high = np.datetime64(end, "D").astype(np.int64)
+    return rng.integers(low, high + 1, size).astype("datetime64[D]")
+
+
+def _random_codes(rng, size, pattern, letters=string.ascii_letters):
+    """Vectorized ``Faker.bothify``: ``#`` becomes a digit and ``?`` a letter."""
+    alphabet = np.frombuffer(letters.encode(), dtype=np.uint8)
+    columns = []
+    for char in pattern:
+        if char == "#":
+            columns.append(rng.integers(ord("0"), ord("9") + 1, size, dtype=np.uint8))
+        elif char == "?":
+            columns.append(alphabet[rng.integers(0, len(alphabet), size)])
+        else:
+            columns.append(np.full(size, ord(char), dtype=np.uint8))
+    codes = np.column_stack(columns).view(f"S{len(pattern)}").ravel()
+    return pa.array(codes).cast(pa.string())
+
+
+@lru_cache(maxsize=None)
+def _faker_pool(kind):
+    """Build the shared pool of FAKER_POOL_SIZE values for a FREE_TEXT provider."""
+    fake.seed_instance(zlib.crc32(f"{SEED}:{kind}".encode()))
+    return np.array([FREE_TEXT[kind]() for _ in range(FAKER_POOL_SIZE)], dtype=object)
+
+
+def _faker_values(rng, size, kind):
+    """Generate a free-text column from the FREE_TEXT provider ``kind``.
+
+    Small columns call Faker directly, reseeded from ``rng`` so the column is
+    reproducible. Larger columns sample from a shared pool instead of calling
+    Faker once per row.
+    """
+    if size > FAKER_POOL_SIZE:
+        return _faker_pool(kind)[rng.integers(0, FAKER_POOL_SIZE, size)]
+    fake.seed_instance(int(rng.integers(2**32)))
+    return np.array([FREE_TEXT[kind]() for _ in range(size)], dtype=object)
+
+
+def _nullable(values, rng, chance_of_value):
+    """Null out values so roughly ``chance_of_value`` of them remain set."""
+    return pa.array(values, mask=rng.random(len(values)) >= chance_of_value)
+
+
+def accounts_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build finance accounts for account numbers ``start + 1 .. stop``."""
+    size = stop - start
+    return pa.table(
+        {
+            "account_id": _format_ids("ACC", np.arange(start + 1, stop + 1), 6),
+            "account_number": _random_codes(
+                rng, size, "????##############", letters=string.ascii_uppercase
             ),
-            "account_status": fake.random_element(elements=("ACTIVE", "CLOSED", "SUSPENDED")),
-            "balance": round(fake.random.uniform(100, 100000), 2),
-            "currency": "USD",
-            "open_date": fake.date_between(start_date=START_DATE, end_date=END_DATE),
-            "customer_id": f"CUST{fake.random_int(min=1, max=NUM_CUSTOMERS):06d}",
-            "created_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "updated_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
+            "account_type": _choice(rng, ("CHECKING", "SAVINGS", "INVESTMENT", "CREDIT"), size),
+            "account_status": _choice(rng, ("ACTIVE", "CLOSED", "SUSPENDED"), size),
+            "balance": _amounts(rng, 100, 100000, size),
+            "currency": np.full(size, "USD", dtype=object),
+            "open_date": _random_dates(rng, size),
+            "customer_id": _format_ids(
+                "CUST",
+                _foreign_keys(
+                    rng, size, "finance_accounts.customer_id", row_counts, key_distributions
+                ),
+                6,
+            ),
+            "created_at": random_timestamps(rng, size),
+            "updated_at": random_timestamps(rng, size),
         }
-        accounts.append(account)
-
-    accounts_df = pd.DataFrame(accounts)
-    accounts_df.to_csv(SAMPLE_DATA_DIR / "finance_accounts.csv", index=False)
-    accounts_df.to_parquet(SAMPLE_DATA_DIR / "finance_accounts.parquet", index=False)
-    print(f"  ✓ Generated {len(accounts_df)} accounts")
-
-    # Generate Transactions
-    transactions = []
-    for i in range(NUM_TRANSACTIONS):
-        transaction = {
-            "transaction_id": f"TXN{i+1:08d}",
-            "account_id": f"ACC{fake.random_int(min=1, max=NUM_ACCOUNTS):06d}",
-            "transaction_type": fake.random_element(
-                elements=("DEPOSIT", "WITHDRAWAL", "TRANSFER", "PAYMENT", "FEE")
+    )
+
+
+def transactions_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build finance transactions for transaction numbers ``start + 1 .. stop``."""
+    size = stop - start
+    merchants = _faker_values(rng, size, "company")
+    return pa.table(
+        {
+            "transaction_id": _format_ids("TXN", np.arange(start + 1, stop + 1), 8),
+            "account_id": _format_ids(
+                "ACC",
+                _foreign_keys(
+                    rng, size, "finance_transactions.account_id", row_counts, key_distributions
+                ),
+                6,
             ),
-            "amount": round(fake.random.uniform(10, 5000), 2),
-            "currency": "USD",
-            "transaction_date": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "description": fake.sentence(nb_words=6),
-            "merchant": fake.company() if fake.boolean(chance_of_getting_true=70) else None,
-            "category": fake.random_element(
-                elements=(
-                    "RETAIL",
-                    "FOOD",
-                    "TRAVEL",
-                    "UTILITIES",
-                    "HEALTHCARE",
-                    "OTHER",
-                )
+            "transaction_type": _choice(
+                rng, ("DEPOSIT", "WITHDRAWAL", "TRANSFER", "PAYMENT", "FEE"), size
             ),
-            "status": fake.random_element(elements=("COMPLETED", "PENDING", "FAILED")),
-            "created_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
+            "amount": _amounts(rng, 10, 5000, size),
+            "currency": np.full(size, "USD", dtype=object),
+            "transaction_date": random_timestamps(rng, size),
+            "description": _faker_values(rng, size, "sentence_6"),
+            "merchant": _nullable(merchants, rng, 0.7),
+            "category": _choice(
+                rng, ("RETAIL", "FOOD", "TRAVEL", "UTILITIES", "HEALTHCARE", "OTHER"), size
+            ),
+            "status": _choice(rng, ("COMPLETED", "PENDING", "FAILED"), size),
+            "created_at": random_timestamps(rng, size),
         }
-        transactions.append(transaction)
-
-    transactions_df = pd.DataFrame(transactions)
-    transactions_df.to_csv(SAMPLE_DATA_DIR / "finance_transactions.csv", index=False)
-    transactions_df.to_parquet(SAMPLE_DATA_DIR / "finance_transactions.parquet", index=False)
-    print(f"  ✓ Generated {len(transactions_df)} transactions")
-
-    # Generate Ledger Entries
-    ledger_entries = []
-    for i in range(NUM_TRANSACTIONS):
-        # Create debit and credit entries for each transaction
-        transaction_id = f"TXN{i+1:08d}"
-        amount = round(fake.random.uniform(10, 5000), 2)
-        entry_date = fake.date_time_between(start_date=START_DATE, end_date=END_DATE)
-
-        # Debit entry
-        ledger_entries.append(
-            {
-                "ledger_entry_id": f"LED{i*2+1:08d}",
-                "transaction_id": transaction_id,
-                "account_id": f"ACC{fake.random_int(min=1, max=NUM_ACCOUNTS):06d}",
-                "entry_type": "DEBIT",
-                "amount": amount,
-                "entry_date": entry_date,
-                "description": fake.sentence(nb_words=4),
-                "created_at": entry_date,
-            }
-        )
+    )
 
-        # Credit entry
-        ledger_entries.append(
-            {
-                "ledger_entry_id": f"LED{i*2+2:08d}",
-                "transaction_id": transaction_id,
-                "account_id": f"ACC{fake.random_int(min=1, max=NUM_ACCOUNTS):06d}",
-                "entry_type": "CREDIT",
-                "amount": amount,
-                "entry_date": entry_date,
-                "description": fake.sentence(nb_words=4),
-                "created_at": entry_date,
-            }
-        )
-
-    ledger_df = pd.DataFrame(ledger_entries)
-    ledger_df.to_csv(SAMPLE_DATA_DIR / "finance_ledger.csv", index=False)
-    ledger_df.to_parquet(SAMPLE_DATA_DIR / "finance_ledger.parquet", index=False)
-    print(f"  ✓ Generated {len(ledger_df)} ledger entries")
 
+def ledger_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build a debit and a credit ledger entry for each transaction in ``start .. stop``."""
+    size = stop - start
+    transaction_numbers = np.repeat(np.arange(start + 1, stop + 1), 2)
+    entry_dates = np.repeat(random_timestamps(rng, size), 2)
+    return pa.table(
+        {
+            "ledger_entry_id": _format_ids("LED", np.arange(2 * start + 1, 2 * stop + 1), 8),
+            "transaction_id": _format_ids("TXN", transaction_numbers, 8),
+            "account_id": _format_ids(
+                "ACC",
+                _foreign_keys(
+                    rng, 2 * size, "finance_ledger.account_id", row_counts, key_distributions
+                ),
+                6,
+            ),
+            "entry_type": np.tile(np.array(["DEBIT", "CREDIT"], dtype=object), size),
+            "amount": np.repeat(_amounts(rng, 10, 5000, size), 2),
+            "entry_date": entry_dates,
+            "description": _faker_values(rng, 2 * size, "sentence_4"),
+            "created_at": entry_dates,
+        }
+    )
 
-def generate_operations_data():
-    """Generate operations domain datasets: orders, shipments, inventory."""
-    print("Generating Operations data...")
 
-    # Generate Orders
-    orders = []
-    for i in range(NUM_ORDERS):
-        order = {
-            "order_id": f"ORD{i+1:08d}",
-            "customer_id": f"CUST{fake.random_int(min=1, max=NUM_CUSTOMERS):06d}",
-            "order_date": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "order_status": fake.random_element(
-                elements=(
-                    "PENDING",
-                    "PROCESSING",
-                    "SHIPPED",
-                    "DELIVERED",
-                    "CANCELLED",
-                )
+def orders_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build operations orders for order numbers ``start + 1 .. stop``."""
+    size = stop - start
+    return pa.table(
+        {
+            "order_id": _format_ids("ORD", np.arange(start + 1, stop + 1), 8),
+            "customer_id": _format_ids(
+                "CUST",
+                _foreign_keys(
+                    rng, size, "operations_orders.customer_id", row_counts, key_distributions
+                ),
+                6,
             ),
-            "order_total": round(fake.random.uniform(50, 5000), 2),
-            "currency": "USD",
-            "payment_method": fake.random_element(
-                elements=("CREDIT_CARD", "DEBIT_CARD", "BANK_TRANSFER", "PAYPAL")
+            "order_date": random_timestamps(rng, size),
+            "order_status": _choice(
+                rng, ("PENDING", "PROCESSING", "SHIPPED", "DELIVERED", "CANCELLED"), size
             ),
-            "shipping_address": fake.address().replace("\n", ", "),
-            "billing_address": fake.address().replace("\n", ", "),
-            "priority": fake.random_element(elements=("LOW", "MEDIUM", "HIGH", "URGENT")),
-            "created_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "updated_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-        }
-        orders.append(order)
-
-    orders_df = pd.DataFrame(orders)
-    orders_df.to_csv(SAMPLE_DATA_DIR / "operations_orders.csv", index=False)
-    orders_df.to_parquet(SAMPLE_DATA_DIR / "operations_orders.parquet", index=False)
-    print(f"  ✓ Generated {len(orders_df)} orders")
-
-    # Generate Shipments
-    shipments = []
-    for i in range(NUM_SHIPMENTS):
-        ship_date = fake.date_time_between(start_date=START_DATE, end_date=END_DATE)
-        delivery_date = ship_date + timedelta(days=fake.random_int(min=1, max=10))
-
-        shipment = {
-            "shipment_id": f"SHIP{i+1:08d}",
-            "order_id": f"ORD{fake.random_int(min=1, max=NUM_ORDERS):08d}",
-            "carrier": fake.random_element(elements=("UPS", "FedEx", "USPS", "DHL")),
-            "tracking_number": fake.bothify(text="??########??"),
-            "ship_date": ship_date,
-            "estimated_delivery": delivery_date,
-            "actual_delivery": delivery_date if fake.boolean(chance_of_getting_true=80) else None,
-            "shipment_status": fake.random_element(
-                elements=("IN_TRANSIT", "DELIVERED", "DELAYED", "RETURNED")
+            "order_total": _amounts(rng, 50, 5000, size),
+            "currency": np.full(size, "USD", dtype=object),
+            "payment_method": _choice(
+                rng, ("CREDIT_CARD", "DEBIT_CARD", "BANK_TRANSFER", "PAYPAL"), size
             ),
-            "weight_kg": round(fake.random.uniform(0.5, 50), 2),
-            "shipping_cost": round(fake.random.uniform(5, 100), 2),
-            "created_at": ship_date,
-            "updated_at": fake.date_time_between(start_date=ship_date, end_date=END_DATE),
+            "shipping_address": _faker_values(rng, size, "address"),
+            "billing_address": _faker_values(rng, size, "address"),
+            "priority": _choice(rng, ("LOW", "MEDIUM", "HIGH", "URGENT"), size),
+            "created_at": random_timestamps(rng, size),
+            "updated_at": random_timestamps(rng, size),
         }
-        shipments.append(shipment)
-
-    shipments_df = pd.DataFrame(shipments)
-    shipments_df.to_csv(SAMPLE_DATA_DIR / "operations_shipments.csv", index=False)
-    shipments_df.to_parquet(SAMPLE_DATA_DIR / "operations_shipments.parquet", index=False)
-    print(f"  ✓ Generated {len(shipments_df)} shipments")
-
-    # Generate Inventory
-    inventory = []
-    for i in range(500):
-        inventory_item = {
-            "inventory_id": f"INV{i+1:06d}",
-            "sku": fake.bothify(text="SKU-????-####"),
-            "product_name": fake.catch_phrase(),
-            "category": fake.random_element(
-                elements=(
-                    "ELECTRONICS",
-                    "CLOTHING",
-                    "FOOD",
-                    "FURNITURE",
-                    "BOOKS",
-                    "TOYS",
-                )
+    )
+
+
+def shipments_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build operations shipments for shipment numbers ``start + 1 .. stop``."""
+    size = stop - start
+    ship_dates = random_timestamps(rng, size)
+    delivery_dates = ship_dates + rng.integers(1, 11, size).astype("timedelta64[D]")
+    return pa.table(
+        {
+            "shipment_id": _format_ids("SHIP", np.arange(start + 1, stop + 1), 8),
+            "order_id": _format_ids(
+                "ORD",
+                _foreign_keys(
+                    rng, size, "operations_shipments.order_id", row_counts, key_distributions
+                ),
+                8,
             ),
-            "quantity_on_hand": fake.random_int(min=0, max=1000),
-            "reorder_level": fake.random_int(min=10, max=100),
-            "unit_cost": round(fake.random.uniform(5, 500), 2),
-            "unit_price": round(fake.random.uniform(10, 1000), 2),
-            "warehouse_location": (
-                f"WH-{fake.random_element(elements=('A', 'B', 'C'))}"
-                f"-{fake.random_int(min=1, max=99):02d}"
+            "carrier": _choice(rng, ("UPS", "FedEx", "USPS", "DHL"), size),
+            "tracking_number": _random_codes(rng, size, "??########??"),
+            "ship_date": ship_dates,
+            "estimated_delivery": delivery_dates,
+            "actual_delivery": _nullable(delivery_dates, rng, 0.8),
+            "shipment_status": _choice(
+                rng, ("IN_TRANSIT", "DELIVERED", "DELAYED", "RETURNED"), size
             ),
-            "last_restock_date": fake.date_between(start_date=START_DATE, end_date=END_DATE),
-            "created_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "updated_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
+            "weight_kg": _amounts(rng, 0.5, 50, size),
+            "shipping_cost": _amounts(rng, 5, 100, size),
+            "created_at": ship_dates,
+            "updated_at": random_timestamps(rng, size, start=ship_dates),
         }
-        inventory.append(inventory_item)
+    )
 
-    inventory_df = pd.DataFrame(inventory)
-    inventory_df.to_csv(SAMPLE_DATA_DIR / "operations_inventory.csv", index=False)
-    inventory_df.to_parquet(SAMPLE_DATA_DIR / "operations_inventory.parquet", index=False)
-    print(f"  ✓ Generated {len(inventory_df)} inventory items")
 
+def inventory_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build operations inventory items for item numbers ``start + 1 .. stop``."""
+    size = stop - start
+    warehouse_location = pc.binary_join_element_wise(
+        "WH-",
+        _choice(rng, ("A", "B", "C"), size).astype(str),
+        "-",
+        pc.utf8_lpad(pc.cast(pa.array(rng.integers(1, 100, size)), pa.string()), 2, "0"),
+        "",
+    )
+    return pa.table(
+        {
+            "inventory_id": _format_ids("INV", np.arange(start + 1, stop + 1), 6),
+            "sku": _random_codes(rng, size, "SKU-????-####"),
+            "product_name": _faker_values(rng, size, "catch_phrase"),
+            "category": _choice(
+                rng, ("ELECTRONICS", "CLOTHING", "FOOD", "FURNITURE", "BOOKS", "TOYS"), size
+            ),
+            "quantity_on_hand": rng.integers(0, 1001, size),
+            "reorder_level": rng.integers(10, 101, size),
+            "unit_cost": _amounts(rng, 5, 500, size),
+            "unit_price": _amounts(rng, 10, 1000, size),
+            "warehouse_location": warehouse_location,
+            "last_restock_date": _random_dates(rng, size),
+            "created_at": random_timestamps(rng, size),
+            "updated_at": random_timestamps(rng, size),
+        }
+    )
 
-def generate_crm_data():
-    """Generate CRM domain datasets: customers, interactions, opportunities."""
-    print("Generating CRM data...")
 
-    # Generate Customers
-    customers = []
-    for i in range(NUM_CUSTOMERS):
-        customer = {
-            "customer_id": f"CUST{i+1:06d}",
-            "first_name": fake.first_name(),
-            "last_name": fake.last_name(),
-            "email": fake.email(),
-            "phone": fake.phone_number(),
-            "date_of_birth": fake.date_of_birth(minimum_age=18, maximum_age=80),
-            "customer_type": fake.random_element(
-                elements=("INDIVIDUAL", "BUSINESS", "INSTITUTIONAL")
-            ),
-            "customer_segment": fake.random_element(
-                elements=("RETAIL", "PREMIUM", "ENTERPRISE", "VIP")
-            ),
-            "address": fake.address().replace("\n", ", "),
-            "city": fake.city(),
-            "state": fake.state_abbr(),
-            "zip_code": fake.zipcode(),
-            "country": "USA",
-            "registration_date": fake.date_between(start_date=START_DATE, end_date=END_DATE),
-            "customer_status": fake.random_element(elements=("ACTIVE", "INACTIVE", "CHURNED")),
-            "lifetime_value": round(fake.random.uniform(1000, 100000), 2),
-            "created_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "updated_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
+def customers_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build CRM customers for customer numbers ``start + 1 .. stop``."""
+    size = stop - start
+    # Anchor ages to END_DATE rather than today so output is reproducible
+    birth_start = END_DATE - timedelta(days=81 * 365)
+    birth_end = END_DATE - timedelta(days=18 * 365)
+    return pa.table(
+        {
+            "customer_id": _format_ids("CUST", np.arange(start + 1, stop + 1), 6),
+            "first_name": _faker_values(rng, size, "first_name"),
+            "last_name": _faker_values(rng, size, "last_name"),
+            "email": _faker_values(rng, size, "email"),
+            "phone": _faker_values(rng, size, "phone_number"),
+            "date_of_birth": _random_dates(rng, size, birth_start, birth_end),
+            "customer_type": _choice(rng, ("INDIVIDUAL", "BUSINESS", "INSTITUTIONAL"), size),
+            "customer_segment": _choice(rng, ("RETAIL", "PREMIUM", "ENTERPRISE", "VIP"), size),
+            "address": _faker_values(rng, size, "address"),
+            "city": _faker_values(rng, size, "city"),
+            "state": _faker_values(rng, size, "state_abbr"),
+            "zip_code": _faker_values(rng, size, "zipcode"),
+            "country": np.full(size, "USA", dtype=object),
+            "registration_date": _random_dates(rng, size),
+            "customer_status": _choice(rng, ("ACTIVE", "INACTIVE", "CHURNED"), size),
+            "lifetime_value": _amounts(rng, 1000, 100000, size),
+            "created_at": random_timestamps(rng, size),
+            "updated_at": random_timestamps(rng, size),
         }
-        customers.append(customer)
-
-    customers_df = pd.DataFrame(customers)
-    customers_df.to_csv(SAMPLE_DATA_DIR / "crm_customers.csv", index=False)
-    customers_df.to_parquet(SAMPLE_DATA_DIR / "crm_customers.parquet", index=False)
-    print(f"  ✓ Generated {len(customers_df)} customers")
-
-    # Generate Interactions
-    interactions = []
-    for i in range(NUM_INTERACTIONS):
-        interaction = {
-            "interaction_id": f"INT{i+1:08d}",
-            "customer_id": f"CUST{fake.random_int(min=1, max=NUM_CUSTOMERS):06d}",
-            "interaction_type": fake.random_element(
-                elements=("CALL", "EMAIL", "CHAT", "MEETING", "SOCIAL_MEDIA")
+    )
+
+
+def interactions_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build CRM interactions for interaction numbers ``start + 1 .. stop``."""
+    size = stop - start
+    return pa.table(
+        {
+            "interaction_id": _format_ids("INT", np.arange(start + 1, stop + 1), 8),
+            "customer_id": _format_ids(
+                "CUST",
+                _foreign_keys(
+                    rng, size, "crm_interactions.customer_id", row_counts, key_distributions
+                ),
+                6,
             ),
-            "interaction_date": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "duration_minutes": fake.random_int(min=1, max=120),
-            "subject": fake.sentence(nb_words=5),
-            "notes": fake.text(max_nb_chars=200),
-            "sentiment": fake.random_element(elements=("POSITIVE", "NEUTRAL", "NEGATIVE")),
-            "outcome": fake.random_element(
-                elements=("RESOLVED", "FOLLOW_UP_NEEDED", "ESCALATED", "CLOSED")
+            "interaction_type": _choice(
+                rng, ("CALL", "EMAIL", "CHAT", "MEETING", "SOCIAL_MEDIA"), size
             ),
-            "assigned_to": fake.name(),
-            "created_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
+            "interaction_date": random_timestamps(rng, size),
+            "duration_minutes": rng.integers(1, 121, size),
+            "subject": _faker_values(rng, size, "sentence_5"),
+            "notes": _faker_values(rng, size, "notes"),
+            "sentiment": _choice(rng, ("POSITIVE", "NEUTRAL", "NEGATIVE"), size),
+            "outcome": _choice(rng, ("RESOLVED", "FOLLOW_UP_NEEDED", "ESCALATED", "CLOSED"), size),
+            "assigned_to": _faker_values(rng, size, "name"),
+            "created_at": random_timestamps(rng, size),
         }
-        interactions.append(interaction)
-
-    interactions_df = pd.DataFrame(interactions)
-    interactions_df.to_csv(SAMPLE_DATA_DIR / "crm_interactions.csv", index=False)
-    interactions_df.to_parquet(SAMPLE_DATA_DIR / "crm_interactions.parquet", index=False)
-    print(f"  ✓ Generated {len(interactions_df)} interactions")
-
-    # Generate Opportunities
-    opportunities = []
-    for i in range(800):
-        opportunity = {
-            "opportunity_id": f"OPP{i+1:06d}",
-            "customer_id": f"CUST{fake.random_int(min=1, max=NUM_CUSTOMERS):06d}",
-            "opportunity_name": fake.bs().title(),
-            "opportunity_type": fake.random_element(
-                elements=("NEW_BUSINESS", "UPSELL", "RENEWAL", "CROSS_SELL")
+    )
+
+
+def opportunities_table(rng, start, stop, row_counts, key_distributions=None):
+    """Build CRM opportunities for opportunity numbers ``start + 1 .. stop``."""
+    size = stop - start
+    return pa.table(
+        {
+            "opportunity_id": _format_ids("OPP", np.arange(start + 1, stop + 1), 6),
+            "customer_id": _format_ids(
+                "CUST",
+                _foreign_keys(
+                    rng, size, "crm_opportunities.customer_id", row_counts, key_distributions
+                ),
+                6,
+            ),
+            "opportunity_name": _faker_values(rng, size, "bs"),
+            "opportunity_type": _choice(
+                rng, ("NEW_BUSINESS", "UPSELL", "RENEWAL", "CROSS_SELL"), size
             ),
-            "stage": fake.random_element(
-                elements=(
+            "stage": _choice(
+                rng,
+                (
                     "PROSPECTING",
                     "QUALIFICATION",
                     "PROPOSAL",
                     "NEGOTIATION",
                     "CLOSED_WON",
                     "CLOSED_LOST",
-                )
+                ),
+                size,
             ),
-            "probability": fake.random_int(min=0, max=100),
-            "amount": round(fake.random.uniform(5000, 500000), 2),
-            "expected_close_date": fake.date_between(start_date=START_DATE, end_date=END_DATE),
-            "actual_close_date": (
-                fake.date_between(start_date=START_DATE, end_date=END_DATE)
-                if fake.boolean(chance_of_getting_true=50)
-                else None
+            "probability": rng.integers(0, 101, size),
+            "amount": _amounts(rng, 5000, 500000, size),
+            "expected_close_date": _random_dates(rng, size),
+            "actual_close_date": _nullable(_random_dates(rng, size), rng, 0.5),
+            "lead_source": _choice(
+                rng, ("WEBSITE", "REFERRAL", "COLD_CALL", "TRADE_SHOW", "PARTNER"), size
             ),
-            "lead_source": fake.random_element(
-                elements=("WEBSITE", "REFERRAL", "COLD_CALL", "TRADE_SHOW", "PARTNER")
-            ),
-            "assigned_to": fake.name(),
-            "created_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
-            "updated_at": fake.date_time_between(start_date=START_DATE, end_date=END_DATE),
+            "assigned_to": _faker_values(rng, size, "name"),
+            "created_at": random_timestamps(rng, size),
+            "updated_at": random_timestamps(rng, size),
         }
-        opportunities.append(opportunity)
+    )
+
+
+def _iter_chunks(table_name, builder, num_rows, chunk_rows, row_counts, key_distributions=None):
+    """Yield a table as consecutive chunks of ``chunk_rows`` ids."""
+    for index, start in enumerate(range(0, num_rows, chunk_rows)):
+        stop = min(start + chunk_rows, num_rows)
+        yield builder(table_rng(table_name, index), start, stop, row_counts, key_distributions)
+
+
+def _split_partitions(table, table_name, partition_by):
+    """Yield ``(partition_path, rows)`` pairs, keeping row order within a partition."""
+    column = table.column(PARTITION_COLUMNS[table_name]).combine_chunks()
+    if pa.types.is_date(column.type):
+        column = column.cast(pa.timestamp("s"))
+    keys = pc.dictionary_encode(pc.strftime(column, format=PARTITION_LAYOUTS[partition_by]))
+    codes = keys.indices.to_numpy()
+    sorted_rows = table.take(np.argsort(codes, kind="stable"))
+    counts = np.bincount(codes, minlength=len(keys.dictionary))
+    offset = 0
+    for partition_path, count in zip(keys.dictionary.to_pylist(), counts):
+        yield partition_path, sorted_rows.slice(offset, count)
+        offset += count
+
+
+@lru_cache(maxsize=None)
+def _s3_client():
+    """Return this process's S3 client for --s3-bucket, created on first use."""
+    from scripts.upload_to_s3 import create_s3_client
+
+    return create_s3_client(max_pool_connections=max(10, S3_UPLOAD_THREADS))
 
-    opportunities_df = pd.DataFrame(opportunities)
-    opportunities_df.to_csv(SAMPLE_DATA_DIR / "crm_opportunities.csv", index=False)
-    opportunities_df.to_parquet(SAMPLE_DATA_DIR / "crm_opportunities.parquet", index=False)
-    print(f"  ✓ Generated {len(opportunities_df)} opportunities")
 
+def _open_parquet_output(path, data_root, options):
+    """Open the output stream a Parquet file at ``path`` is written to.
 
-def main():
+    Locally that is the file itself. With --s3-bucket it is a multipart
+    upload to the S3 key of ``path`` relative to ``data_root``, and nothing
+    is written to disk.
+    """
+    if options.s3_bucket:
+        from scripts.upload_to_s3 import S3MultipartWriter, s3_key_for
+
+        return S3MultipartWriter(
+            _s3_client(),
+            options.s3_bucket,
+            s3_key_for(path.relative_to(data_root)),
+            int(options.s3_part_size_mb * 1024 * 1024),
+            S3_UPLOAD_THREADS,
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return pa.OSFile(str(path), "wb")
+
+
+def _parquet_writer_options(options):
+    """Return ParquetWriter keyword arguments for the selected codec and encoding."""
+    return {"compression": options.parquet_codec, "use_dictionary": not options.no_dictionary}
+
+
+class _ParquetSink:
+    """Append tables to one Parquet file, as row groups of ``--row-group-rows``."""
+
+    def __init__(self, path, schema, options, data_root):
+        self._output = _open_parquet_output(path, data_root, options)
+        self._writer = pq.ParquetWriter(self._output, schema, **_parquet_writer_options(options))
+        self._row_group_rows = options.row_group_rows
+
+    def write(self, table):
+        self._writer.write_table(
+            table.cast(self._writer.schema), row_group_size=self._row_group_rows
+        )
+
+    def close(self):
+        self._writer.close()
+        self._output.close()
+
+
+class _PartitionedParquetSink:
+    """Route rows into Hive-style partition directories, rolling files at a target size.
+
+    Each chunk's rows are buffered per partition and written once a partition
+    holds ``--row-group-rows`` rows (default: ``--chunk-rows``), so row groups
+    are not split by chunk boundaries. When PARTITION_BUFFER_CHUNKS chunks of
+    rows are buffered in total, every partition is flushed to bound memory.
+    One Parquet writer stays open per partition; once its file reaches
+    ``--target-file-mb`` it is closed and the next rows start a new file.
+    """
+
+    def __init__(self, table_dir, table_name, options, file_prefix):
+        self.table_dir = table_dir
+        self.table_name = table_name
+        self.file_prefix = file_prefix
+        self._options = options
+        self._data_root = table_dir.parent
+        self._target_bytes = int(options.target_file_mb * 1024 * 1024)
+        self._row_group_rows = options.row_group_rows or options.chunk_rows
+        self._max_buffered_rows = PARTITION_BUFFER_CHUNKS * options.chunk_rows
+        self._schema = None
+        self._buffers = {}
+        self._buffered_rows = 0
+        self._writers = {}
+        self._next_file_index = {}
+
+    def write(self, table):
+        self._schema = self._schema or table.schema
+        partitions = _split_partitions(table, self.table_name, self._options.partition_by)
+        for partition_path, rows in partitions:
+            buffer = self._buffers.setdefault(partition_path, [])
+            buffer.append(rows.cast(self._schema))
+            self._buffered_rows += rows.num_rows
+            if sum(part.num_rows for part in buffer) >= self._row_group_rows:
+                self._flush(partition_path, whole_row_groups=True)
+        if self._buffered_rows >= self._max_buffered_rows:
+            for partition_path in list(self._buffers):
+                self._flush(partition_path)
+
+    def close(self):
+        for partition_path in list(self._buffers):
+            self._flush(partition_path)
+        for writer, output in self._writers.values():
+            writer.close()
+            output.close()
+        self._writers.clear()
+
+    def _flush(self, partition_path, whole_row_groups=False):
+        """Write a partition's buffered rows, keeping a partial row group if asked."""
+        rows = pa.concat_tables(self._buffers.pop(partition_path))
+        kept = rows.num_rows % self._row_group_rows if whole_row_groups else 0
+        if kept:
+            self._buffers[partition_path] = [rows.slice(rows.num_rows - kept)]
+            rows = rows.slice(0, rows.num_rows - kept)
+        self._buffered_rows -= rows.num_rows
+        if partition_path not in self._writers:
+            self._open(partition_path, self._schema)
+        writer, output = self._writers[partition_path]
+        writer.write_table(rows, row_group_size=self._row_group_rows)
+        if output.tell() >= self._target_bytes:
+            writer.close()
+            output.close()
+            del self._writers[partition_path]
+
+    def _open(self, partition_path, schema):
+        file_index = self._next_file_index.get(partition_path, 0)
+        self._next_file_index[partition_path] = file_index + 1
+        file_path = self.table_dir / partition_path / f"{self.file_prefix}-{file_index:03d}.parquet"
+        output = _open_parquet_output(file_path, self._data_root, self._options)
+        writer = pq.ParquetWriter(output, schema, **_parquet_writer_options(self._options))
+        self._writers[partition_path] = (writer, output)
+
+
+class _CsvSink:
+    """Append tables to a CSV file, optionally gzip-compressed.
+
+    Each write is split into slices that Arrow's CSV writer encodes on
+    CSV_ENCODE_THREADS threads; the encoded slices are then written in order.
+    """
+
+    def __init__(self, path, schema, compression=None):
+        self._schema = schema
+        if compression:
+            self._stream = pa.CompressedOutputStream(str(path), compression)
+        else:
+            self._stream = pa.OSFile(str(path), "wb")
+        self._include_header = True
+
+    def write(self, table):
+        table = table.cast(self._schema)
+        slice_rows = max(1, -(-table.num_rows // CSV_ENCODE_THREADS))
+        slices = [
+            table.slice(offset, slice_rows) for offset in range(0, table.num_rows, slice_rows)
+        ]
+        headers = [self._include_header] + [False] * (len(slices) - 1)
+        with ThreadPoolExecutor(max_workers=CSV_ENCODE_THREADS) as executor:
+            for buffer in executor.map(self._encode, slices or [table], headers):
+                self._stream.write(buffer)
+        self._include_header = False
+
+    def close(self):
+        self._stream.close()
+
+    @staticmethod
+    def _encode(table, include_header):
+        buffer = pa.BufferOutputStream()
+        pacsv.write_csv(table, buffer, pacsv.WriteOptions(include_header=include_header))
+        return buffer.getvalue()
+
+
+def _open_sinks(base_path, schema, table_name, options, table_dir, partition_prefix):
+    """Open one sink per selected output format at ``base_path.<format>``.
+
+    With --partition-by, Parquet goes to a partition tree under ``table_dir``
+    instead, file names starting with ``partition_prefix``.
+    """
+    sinks = []
+    for output_format in options.formats:
+        path = base_path.with_name(f"{base_path.name}.{output_format}")
+        if output_format == "parquet" and options.partition_by != "none":
+            sinks.append(_PartitionedParquetSink(table_dir, table_name, options, partition_prefix))
+        elif output_format == "parquet":
+            sinks.append(_ParquetSink(path, schema, options, table_dir.parent))
+        elif output_format == "csv.gz":
+            sinks.append(_CsvSink(path, schema, compression="gzip"))
+        else:
+            sinks.append(_CsvSink(path, schema))
+    return sinks
+
+
+def write_table(chunks, base_path, table_name, options, table_dir=None, partition_prefix="part"):
+    """Write a table's chunks to every selected format and return its row count.
+
+    All formats are written concurrently from the same Arrow chunk. Without
+    --stream (or --partition-by) the chunks are concatenated first; with it,
+    each chunk is written as soon as it is generated so only one is held in
+    memory.
+    """
+    if not options.stream and options.partition_by == "none":
+        chunks = [pa.concat_tables(chunks)]
+    sinks = None
+    rows = 0
+    with ThreadPoolExecutor(max_workers=max(1, len(options.formats))) as executor:
+        try:
+            for chunk in chunks:
+                if sinks is None:
+                    sinks = _open_sinks(
+                        base_path,
+                        chunk.schema,
+                        table_name,
+                        options,
+                        table_dir or base_path,
+                        partition_prefix,
+                    )
+                list(executor.map(lambda sink: sink.write(chunk), sinks))
+                rows += chunk.num_rows
+        finally:
+            for sink in sinks or []:
+                sink.close()
+    return rows
+
+
+def parquet_files(path):
+    """Return the Parquet files of a table written as one file or a directory."""
+    if path.with_suffix(".parquet").exists():
+        return [path.with_suffix(".parquet")]
+    if path.is_dir():
+        return sorted(path.rglob("*.parquet"))
+    return []
+
+
+def _reset_table_output(table_name, directory, options):
+    """Remove a table's previous output before it is written again.
+
+    A table is written either as single files ``<table_name>.<format>`` or as
+    a directory ``<table_name>/``. Both layouts are cleared, and the directory
+    is recreated when ``directory`` is set, so readers that prefer one layout
+    never pick up a stale copy in the other. With --s3-bucket the table's S3
+    prefix is cleared instead.
+    """
+    if options.s3_bucket:
+        from scripts.upload_to_s3 import delete_prefix, table_prefix
+
+        delete_prefix(_s3_client(), options.s3_bucket, table_prefix(table_name))
+        return
+    table_dir = SAMPLE_DATA_DIR / table_name
+    if table_dir.exists():
+        shutil.rmtree(table_dir)
+    for output_format in OUTPUT_FORMATS:
+        (SAMPLE_DATA_DIR / f"{table_name}.{output_format}").unlink(missing_ok=True)
+    if directory:
+        table_dir.mkdir(parents=True)
+
+
+def _write_shard(output_dir, table_name, builder, num_rows, options, shard_index):
+    """Generate one id-range shard of a table and write it as its own part file(s)."""
+    start = shard_index * options.chunk_rows
+    stop = min(start + options.chunk_rows, num_rows)
+    shard = builder(
+        table_rng(table_name, shard_index),
+        start,
+        stop,
+        options.row_counts,
+        options.key_distributions,
+    )
+    part_name = f"part-{shard_index:05d}"
+    table_dir = output_dir / table_name
+    return write_table([shard], table_dir / part_name, table_name, options, table_dir, part_name)
+
+
+def _generate_sharded(table_name, builder, num_rows, options):
+    """Generate a table as part files under ``<table_name>/`` using a process pool.
+
+    Shards are fixed id ranges of ``chunk_rows`` seeded by table name and shard
+    index, so the files are identical whatever the worker count.
+    """
+    write_shard = partial(_write_shard, SAMPLE_DATA_DIR, table_name, builder, num_rows, options)
+    num_shards = -(-num_rows // options.chunk_rows)
+    with ProcessPoolExecutor(
+        max_workers=options.workers, initializer=use_seed, initargs=(options.seed,)
+    ) as executor:
+        return sum(executor.map(write_shard, range(num_shards)))
+
+
+def _generate_table(table_name, builder, num_rows, options):
+    """Generate a table and write it to SAMPLE_DATA_DIR, returning its row count."""
+    use_seed(options.seed)
+    directory = bool(options.workers) or options.partition_by != "none"
+    _reset_table_output(table_name, directory, options)
+    if options.workers:
+        return _generate_sharded(table_name, builder, num_rows, options)
+    chunks = _iter_chunks(
+        table_name,
+        builder,
+        num_rows,
+        options.chunk_rows,
+        options.row_counts,
+        options.key_distributions,
+    )
+    return write_table(chunks, SAMPLE_DATA_DIR / table_name, table_name, options)
+
+
+def generate_finance_data(options=None):
+    """Generate finance domain datasets: accounts, transactions, ledger entries."""
+    options = options or parse_args([])
+    row_counts = options.row_counts
+    print("Generating Finance data...")
+
+    rows = {}
+    rows["finance_accounts"] = _generate_table(
+        "finance_accounts", accounts_table, row_counts["finance_accounts"], options
+    )
+    print(f"  ✓ Generated {rows['finance_accounts']} accounts")
+
+    rows["finance_transactions"] = _generate_table(
+        "finance_transactions", transactions_table, row_counts["finance_transactions"], options
+    )
+    print(f"  ✓ Generated {rows['finance_transactions']} transactions")
+
+    # Each transaction produces a debit and a credit entry
+    rows["finance_ledger"] = _generate_table(
+        "finance_ledger", ledger_table, row_counts["finance_transactions"], options
+    )
+    print(f"  ✓ Generated {rows['finance_ledger']} ledger entries")
+    return rows
+
+
+def generate_operations_data(options=None):
+    """Generate operations domain datasets: orders, shipments, inventory."""
+    options = options or parse_args([])
+    row_counts = options.row_counts
+    print("Generating Operations data...")
+
+    rows = {}
+    rows["operations_orders"] = _generate_table(
+        "operations_orders", orders_table, row_counts["operations_orders"], options
+    )
+    print(f"  ✓ Generated {rows['operations_orders']} orders")
+
+    rows["operations_shipments"] = _generate_table(
+        "operations_shipments", shipments_table, row_counts["operations_shipments"], options
+    )
+    print(f"  ✓ Generated {rows['operations_shipments']} shipments")
+
+    rows["operations_inventory"] = _generate_table(
+        "operations_inventory", inventory_table, row_counts["operations_inventory"], options
+    )
+    print(f"  ✓ Generated {rows['operations_inventory']} inventory items")
+    return rows
+
+
+def generate_crm_data(options=None):
+    """Generate CRM domain datasets: customers, interactions, opportunities."""
+    options = options or parse_args([])
+    row_counts = options.row_counts
+    print("Generating CRM data...")
+
+    rows = {}
+    rows["crm_customers"] = _generate_table(
+        "crm_customers", customers_table, row_counts["crm_customers"], options
+    )
+    print(f"  ✓ Generated {rows['crm_customers']} customers")
+
+    rows["crm_interactions"] = _generate_table(
+        "crm_interactions", interactions_table, row_counts["crm_interactions"], options
+    )
+    print(f"  ✓ Generated {rows['crm_interactions']} interactions")
+
+    rows["crm_opportunities"] = _generate_table(
+        "crm_opportunities", opportunities_table, row_counts["crm_opportunities"], options
+    )
+    print(f"  ✓ Generated {rows['crm_opportunities']} opportunities")
+    return rows
+
+
+def _parse_row_override(value):
+    """Parse a ``TABLE=ROWS`` override for --rows."""
+    table_name, _, rows = value.partition("=")
+    if table_name not in BASE_ROW_COUNTS or not rows.isdigit() or int(rows) < 1:
+        raise argparse.ArgumentTypeError(
+            f"expected TABLE=ROWS with TABLE one of {', '.join(BASE_ROW_COUNTS)}"
+        )
+    return table_name, int(rows)
+
+
+def _parse_formats(value):
+    """Parse a comma-separated --formats list; ``none`` selects no output."""
+    formats = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    if formats == ("none",):
+        return ()
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"expected a comma-separated list of {', '.join(OUTPUT_FORMATS)}, or none"
+        )
+    return formats
+
+
+def _parse_key_distribution(value):
+    """Parse a ``RELATIONSHIP=SPEC`` override for --key-distribution.
+
+    RELATIONSHIP is a FK_RELATIONSHIPS entry or ``all``; SPEC is ``uniform``,
+    ``zipf:S`` or ``hot:PCT:SHARE``. Returns the relationship and a tuple such
+    as ``("zipf", 1.1)`` or ``("hot", 0.01, 0.8)``.
+    """
+    relationship, _, spec = value.partition("=")
+    kind, *params = spec.split(":")
+    try:
+        params = [float(param) for param in params]
+    except ValueError:
+        params = None
+    valid = relationship in ("all", *FK_RELATIONSHIPS) and params is not None
+    if kind == "uniform":
+        valid = valid and not params
+    elif kind == "zipf":
+        valid = valid and len(params) == 1 and params[0] > 0
+    elif kind == "hot":
+        valid = valid and len(params) == 2 and all(0 < p <= 100 for p in params)
+        params = [p / 100 for p in params or ()]
+    else:
+        valid = False
+    if not valid:
+        raise argparse.ArgumentTypeError(
+            "expected RELATIONSHIP=uniform|zipf:S|hot:PCT:SHARE with RELATIONSHIP one of "
+            f"all, {', '.join(FK_RELATIONSHIPS)}"
+        )
+    return relationship, (kind, *params)
+
+
+def resolve_key_distributions(overrides=()):
+    """Return the key distribution of every FK relationship.
+
+    ``overrides`` are ``(relationship, distribution)`` pairs applied in
+    order, where ``all`` sets every relationship.
+    """
+    distributions = dict.fromkeys(FK_RELATIONSHIPS, UNIFORM)
+    for relationship, distribution in overrides:
+        targets = FK_RELATIONSHIPS if relationship == "all" else (relationship,)
+        distributions.update(dict.fromkeys(targets, distribution))
+    return distributions
+
+
+def _format_key_distribution(distribution):
+    """Format a key distribution tuple back into its --key-distribution spec."""
+    kind, *params = distribution
+    if kind == "hot":
+        params = [p * 100 for p in params]
+    return ":".join([kind, *(f"{p:g}" for p in params)])
+
+
+def add_format_arguments(parser):
+    """Add the output format and Parquet encoding options to ``parser``."""
+    parser.add_argument(
+        "--formats",
+        type=_parse_formats,
+        default=DEFAULT_FORMATS,
+        help="Comma-separated output formats: parquet, csv, csv.gz, or none (default: parquet,csv)",
+    )
+    parser.add_argument(
+        "--parquet-codec",
+        choices=PARQUET_CODECS,
+        default="snappy",
+        help="Parquet compression codec (default: snappy)",
+    )
+    parser.add_argument(
+        "--row-group-rows",
+        type=int,
+        default=None,
+        help="Maximum rows per Parquet row group (default: one per written chunk)",
+    )
+    parser.add_argument(
+        "--no-dictionary",
+        action="store_true",
+        help="Disable Parquet dictionary encoding",
+    )
+
+
+def check_format_arguments(parser, args):
+    """Reject invalid values of the options added by add_format_arguments."""
+    if args.row_group_rows is not None and args.row_group_rows < 1:
+        parser.error("--row-group-rows must be at least 1")
+
+
+def parse_args(argv=None):
+    """Parse command-line options for data generation."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scale-factor",
+        type=float,
+        default=1.0,
+        help="Multiply every table's base row count, e.g. 100 for SF100 (default: 1)",
+    )
+    parser.add_argument(
+        "--rows",
+        type=_parse_row_override,
+        action="append",
+        default=[],
+        metavar="TABLE=ROWS",
+        help="Override the row count of one table; may be repeated",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write each table chunk by chunk so peak memory stays flat",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=CHUNK_ROWS,
+        help=f"Rows per generated chunk / Parquet row group (default: {CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Generate id-range shards in N processes, one part file per shard",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SEED,
+        help=f"Base random seed; output is identical for a given seed (default: {DEFAULT_SEED})",
+    )
+    parser.add_argument(
+        "--partition-by",
+        choices=("none", *PARTITION_LAYOUTS),
+        default="none",
+        help="Write Parquet as Hive-style year=/month=[/day=] partitions; CSV stays unpartitioned",
+    )
+    parser.add_argument(
+        "--target-file-mb",
+        type=float,
+        default=TARGET_FILE_MB,
+        help=f"Roll partitioned Parquet files at this size (default: {TARGET_FILE_MB})",
+    )
+    parser.add_argument(
+        "--key-distribution",
+        type=_parse_key_distribution,
+        action="append",
+        default=[],
+        metavar="RELATIONSHIP=SPEC",
+        help="Foreign-key distribution for one relationship (or all): uniform, zipf:S or "
+        "hot:PCT:SHARE, e.g. operations_orders.customer_id=zipf:1.1; may be repeated",
+    )
+    parser.add_argument(
+        "--s3-bucket",
+        default=None,
+        help="Stream Parquet straight to this S3 bucket instead of writing SAMPLE_DATA_DIR "
+        "(requires --formats parquet)",
+    )
+    parser.add_argument(
+        "--s3-part-size-mb",
+        type=float,
+        default=S3_PART_SIZE_MB,
+        help=f"Multipart part size when streaming to S3 (default: {S3_PART_SIZE_MB})",
+    )
+    add_format_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.scale_factor <= 0:
+        parser.error("--scale-factor must be positive")
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+    if args.workers < 0:
+        parser.error("--workers must not be negative")
+    if args.seed < 0:
+        parser.error("--seed must not be negative")
+    check_format_arguments(parser, args)
+    if args.s3_bucket and args.formats != ("parquet",):
+        parser.error("--s3-bucket streams Parquet only; pass --formats parquet")
+    if args.s3_part_size_mb < S3_MIN_PART_SIZE_MB:
+        parser.error(f"--s3-part-size-mb must be at least {S3_MIN_PART_SIZE_MB} (the S3 minimum)")
+    args.row_counts = resolve_row_counts(args.scale_factor, dict(args.rows))
+    args.key_distributions = resolve_key_distributions(args.key_distribution)
+    return args
+
+
+def main(args=None):
     """Main function to generate all sample datasets."""
-    # Create sample_data directory if it doesn't exist
-    SAMPLE_DATA_DIR.mkdir(exist_ok=True)
+    if args is None:
+        args = parse_args([])
+
+    # Create sample_data directory if it doesn't exist, unless streaming to S3
+    destination = f"s3://{args.s3_bucket}" if args.s3_bucket else SAMPLE_DATA_DIR
+    if not args.s3_bucket:
+        SAMPLE_DATA_DIR.mkdir(exist_ok=True)
 
     print("=" * 60)
     print("Starting Sample Data Generation")
+    print(f"Scale factor: {args.scale_factor:g}")
+    print(f"Seed: {args.seed}")
+    print(f"Formats: {', '.join(args.formats) or 'none'}")
+    for relationship, distribution in args.key_distributions.items():
+        if distribution != UNIFORM:
+            print(f"Key distribution: {relationship}={_format_key_distribution(distribution)}")
     print("=" * 60)
 
     # Generate data for each domain
-    generate_finance_data()
+    rows_per_table = {}
+    rows_per_table.update(generate_finance_data(args))
     print()
-    generate_operations_data()
+    rows_per_table.update(generate_operations_data(args))
     print()
-    generate_crm_data()
+    rows_per_table.update(generate_crm_data(args))
 
     print()
     print("=" * 60)
     print("Sample Data Generation Complete!")
-    print(f"Data saved to: {SAMPLE_DATA_DIR}")
+    print(f"Data saved to: {destination}")
+    print("-" * 60)
+    for table_name, rows in rows_per_table.items():
+        print(f"  {table_name:<24} {rows:>14,} rows")
     print("=" * 60)
+    return rows_per_table
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_args())
@@ -0,0 +1,910 @@
+"""
+Build Data Vault 2.0 hub, link and satellite rows from the sample data.
+
+Reads the producer Parquet written by generate_sample_data.py and computes
+the MD5 hash keys of every hub and link and the ``hash_diff`` of every
+satellite row, producing row sets with the columns of the tables in
+snowflake/ddl/02_hubs.sql, 03_links.sql and 04_satellites.sql.
+
+Hash inputs follow the usual Data Vault normalization: each value is cast
+to text, trimmed and upper-cased, NULLs become ``^^`` and the values of a
+composite key or of a satellite's attributes are joined with ``||``. Hashes
+are the lowercase hex MD5 of that text, as Snowflake's ``MD5()`` returns.
+Values are cast to the text ``TO_VARCHAR`` gives for the column types in
+the DDL: floats, stored as ``DECIMAL(18,2)``, keep exactly two decimals
+(``3.0`` is ``3.00``) and timestamps, stored as ``TIMESTAMP_NTZ``, have
+millisecond precision (``2024-01-01 10:00:00.000``), so keys and
+``hash_diff`` match ``MD5(UPPER(TRIM(TO_VARCHAR(...))))`` computed in the
+warehouse over the loaded tables.
+
+--hash-format stores hash keys and ``hash_diff`` more compactly: ``binary``
+keeps the 16-byte digest (Snowflake ``MD5_BINARY()``, a ``BINARY(16)``
+column) and ``integer`` its lower 64 bits as an unsigned integer (Snowflake
+``MD5_NUMBER_LOWER64()``, a ``NUMBER(20,0)`` column). Both compare and join
+faster than 32-character text; ``integer`` trades collision resistance for
+half the size of ``binary``. setup_snowflake.py --hash-format creates the
+matching columns. A vault is loaded in one format: switching formats needs
+--full-refresh.
+
+Hashing is vectorized: normalization runs as Arrow compute kernels and MD5
+runs in NumPy over all rows of a slice at once, with no per-row Python.
+Slices are hashed on a thread pool across all cores (both Arrow and NumPy
+release the GIL).
+
+Each table is a directory ``VAULT_DATA_DIR/<table>/`` of append-only delta
+files, one per load date, ready for bulk load. The first load writes every
+row; later loads write only what changed: hubs and links their unseen keys,
+and satellites the rows whose ``hash_diff`` differs from the current row of
+their hash key (or that have none). Existing files are never rewritten, so
+a load costs the changed rows, not the table. A replaced satellite row ends
+where its key's next version begins: read_vault_table derives ``end_date``
+from the versions' load dates, and merge_sql applies one delta to a
+warehouse table as a single Snowflake MERGE that end-dates the replaced rows
+and inserts the new ones. ``link_order_product`` is not built: no producer
+table records which products an order contains.
+
+Run as a module from the repository root:
+``python -m scripts.load_data_vault --workers 8``
+"""
+
+import argparse
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from scripts.generate_sample_data import SAMPLE_DATA_DIR, parquet_files
+
+# Configuration
+VAULT_DATA_DIR = SAMPLE_DATA_DIR / "vault"
+DELTA_DATE_FORMAT = "%Y%m%dT%H%M%S%f"  # load date in delta file names; sorts by time
+HASH_CHUNK_ROWS = 16_384
+DELIMITER = "||"
+NULL_PLACEHOLDER = "^^"
+DECIMAL_SCALE = 2  # scale of the DECIMAL(18,2) columns floats are stored in
+
+# Arrow type of hash key and hash_diff columns for each --hash-format
+HASH_TYPES = {
+    "hex": pa.string(),
+    "binary": pa.binary(16),
+    "integer": pa.uint64(),
+}
+
+# Hubs: hash key column, business key column, extra columns copied from the
+# first source, and the producer tables the business key is collected from
+HUBS = {
+    "hub_customer": {
+        "hash_key": "customer_hk",
+        "business_key": "customer_id",
+        "sources": (
+            "crm_customers",
+            "finance_accounts",
+            "operations_orders",
+            "crm_interactions",
+            "crm_opportunities",
+        ),
+    },
+    "hub_account": {
+        "hash_key": "account_hk",
+        "business_key": "account_id",
+        "sources": ("finance_accounts", "finance_transactions"),
+    },
+    "hub_order": {
+        "hash_key": "order_hk",
+        "business_key": "order_id",
+        "sources": ("operations_orders",),
+    },
+    "hub_transaction": {
+        "hash_key": "transaction_hk",
+        "business_key": "transaction_id",
+        "sources": ("finance_transactions",),
+    },
+    "hub_product": {
+        "hash_key": "product_hk",
+        "business_key": "inventory_id",
+        "extra_columns": ("sku",),
+        "sources": ("operations_inventory",),
+    },
+    "hub_interaction": {
+        "hash_key": "interaction_hk",
+        "business_key": "interaction_id",
+        "sources": ("crm_interactions",),
+    },
+    "hub_opportunity": {
+        "hash_key": "opportunity_hk",
+        "business_key": "opportunity_id",
+        "sources": ("crm_opportunities",),
+    },
+}
+
+# Links: link hash key column, the hubs it joins (in hash order) and the
+# producer table holding both business keys
+LINKS = {
+    "link_customer_account": {
+        "hash_key": "customer_account_lk",
+        "hubs": ("hub_customer", "hub_account"),
+        "source": "finance_accounts",
+    },
+    "link_account_transaction": {
+        "hash_key": "account_transaction_lk",
+        "hubs": ("hub_account", "hub_transaction"),
+        "source": "finance_transactions",
+    },
+    "link_customer_order": {
+        "hash_key": "customer_order_lk",
+        "hubs": ("hub_customer", "hub_order"),
+        "source": "operations_orders",
+    },
+    "link_customer_interaction": {
+        "hash_key": "customer_interaction_lk",
+        "hubs": ("hub_customer", "hub_interaction"),
+        "source": "crm_interactions",
+    },
+    "link_customer_opportunity": {
+        "hash_key": "customer_opportunity_lk",
+        "hubs": ("hub_customer", "hub_opportunity"),
+        "source": "crm_opportunities",
+    },
+}
+
+# Satellites: parent hub, producer table and descriptive attributes, in
+# column order
+SATELLITES = {
+    "sat_customer": {
+        "hub": "hub_customer",
+        "source": "crm_customers",
+        "attributes": (
+            "first_name",
+            "last_name",
+            "email",
+            "phone",
+            "date_of_birth",
+            "customer_type",
+            "customer_segment",
+            "address",
+            "city",
+            "state",
+            "zip_code",
+            "country",
+            "registration_date",
+            "customer_status",
+            "lifetime_value",
+        ),
+    },
+    "sat_account": {
+        "hub": "hub_account",
+        "source": "finance_accounts",
+        "attributes": (
+            "account_number",
+            "account_type",
+            "account_status",
+            "balance",
+            "currency",
+            "open_date",
+        ),
+    },
+    "sat_transaction": {
+        "hub": "hub_transaction",
+        "source": "finance_transactions",
+        "attributes": (
+            "transaction_type",
+            "amount",
+            "currency",
+            "transaction_date",
+            "description",
+            "merchant",
+            "category",
+            "status",
+        ),
+    },
+    "sat_order": {
+        "hub": "hub_order",
+        "source": "operations_orders",
+        "attributes": (
+            "order_date",
+            "order_status",
+            "order_total",
+            "currency",
+            "payment_method",
+            "shipping_address",
+            "billing_address",
+            "priority",
+        ),
+    },
+    "sat_product": {
+        "hub": "hub_product",
+        "source": "operations_inventory",
+        "attributes": (
+            "product_name",
+            "category",
+            "quantity_on_hand",
+            "reorder_level",
+            "unit_cost",
+            "unit_price",
+            "warehouse_location",
+            "last_restock_date",
+        ),
+    },
+    "sat_interaction": {
+        "hub": "hub_interaction",
+        "source": "crm_interactions",
+        "attributes": (
+            "interaction_type",
+            "interaction_date",
+            "duration_minutes",
+            "subject",
+            "notes",
+            "sentiment",
+            "outcome",
+            "assigned_to",
+        ),
+    },
+    "sat_opportunity": {
+        "hub": "hub_opportunity",
+        "source": "crm_opportunities",
+        "attributes": (
+            "opportunity_name",
+            "opportunity_type",
+            "stage",
+            "probability",
+            "amount",
+            "expected_close_date",
+            "actual_close_date",
+            "lead_source",
+            "assigned_to",
+        ),
+    },
+}
+
+# MD5 (RFC 1321): per-round shift amounts and sine-derived constants
+_MD5_SHIFTS = np.array(
+    (7, 12, 17, 22) * 4 + (5, 9, 14, 20) * 4 + (4, 11, 16, 23) * 4 + (6, 10, 15, 21) * 4,
+    dtype=np.uint32,
+)
+_MD5_CONSTANTS = np.floor(np.abs(np.sin(np.arange(1, 65))) * 2**32).astype(np.uint32)
+_MD5_INITIAL_STATE = np.array([0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476], dtype=np.uint32)
+_MD5_MESSAGE_INDEX = (
+    list(range(16))
+    + [(5 * i + 1) % 16 for i in range(16)]
+    + [(3 * i + 5) % 16 for i in range(16)]
+    + [(7 * i) % 16 for i in range(16)]
+)
+_HEX_PAIRS = np.array([f"{byte:02x}".encode() for byte in range(256)], dtype="S2")
+
+
+def _md5_compress(blocks):
+    """Run MD5 over ``blocks``, shaped ``(rows, blocks_per_row, 16)`` little-endian words.
+
+    Every row has the same number of 64-byte blocks. Returns the final state
+    of each row as ``(rows, 4)`` uint32. Rounds work in place on preallocated
+    arrays, so each of the 64 steps allocates nothing.
+    """
+    rows = blocks.shape[0]
+    state = np.tile(_MD5_INITIAL_STATE, (rows, 1)).T.copy()
+    f = np.empty(rows, dtype=np.uint32)
+    scratch = np.empty(rows, dtype=np.uint32)
+    for block_index in range(blocks.shape[1]):
+        words = np.ascontiguousarray(blocks[:, block_index, :].T)
+        a, b, c, d = (word.copy() for word in state)
+        for i in range(64):
+            if i < 16:
+                np.bitwise_and(b, c, out=f)
+                np.invert(b, out=scratch)
+                scratch &= d
+                f |= scratch
+            elif i < 32:
+                np.bitwise_and(d, b, out=f)
+                np.invert(d, out=scratch)
+                scratch &= c
+                f |= scratch
+            elif i < 48:
+                np.bitwise_xor(b, c, out=f)
+                f ^= d
+            else:
+                np.invert(d, out=f)
+                f |= b
+                f ^= c
+            f += a
+            f += _MD5_CONSTANTS[i]
+            f += words[_MD5_MESSAGE_INDEX[i]]
+            np.left_shift(f, _MD5_SHIFTS[i], out=scratch)
+            f >>= 32 - _MD5_SHIFTS[i]
+            f |= scratch
+            # The new b overwrites a, which is the next step's d
+            np.add(b, f, out=a)
+            a, b, c, d = d, a, b, c
+        state += np.stack([a, b, c, d])
+    return state.T
+
+
+def md5_digests(values):
+    """Return the MD5 digest of each string in ``values`` as ``(rows, 16)`` uint8.
+
+    ``values`` is an Arrow string array without nulls. Messages are padded
+    in bulk and grouped by their number of 64-byte blocks, so the only Python
+    loop is over the distinct block counts.
+    """
+    values = values.cast(pa.large_string())
+    rows = len(values)
+    offsets = np.frombuffer(values.buffers()[1], dtype=np.int64)[
+        values.offset:values.offset + rows + 1
+    ]
+    data_buffer = values.buffers()[2]
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer else np.zeros(0, np.uint8)
+    lengths = np.diff(offsets)
+    block_counts = (lengths + 8) // 64 + 1
+
+    digests = np.empty((rows, 16), dtype=np.uint8)
+    for block_count in np.unique(block_counts):
+        selected = np.flatnonzero(block_counts == block_count)
+        selected_lengths = lengths[selected]
+        width = block_count * 64
+        padded = np.zeros(len(selected) * width, dtype=np.uint8)
+        # Copy each message's bytes to the start of its row, as one flat copy
+        copied = np.cumsum(selected_lengths) - selected_lengths
+        positions = np.arange(selected_lengths.sum())
+        source_shift = np.repeat(offsets[selected] - copied, selected_lengths)
+        target_shift = np.repeat(np.arange(len(selected)) * width - copied, selected_lengths)
+        padded[positions + target_shift] = data[positions + source_shift]
+        padded = padded.reshape(len(selected), width)
+        # Padding: a 0x80 byte, zeros, then the message length in bits
+        padded[np.arange(len(selected)), selected_lengths] = 0x80
+        padded[:, -8:] = (selected_lengths.astype("<u8") * 8).reshape(-1, 1).view(np.uint8)
+        blocks = padded.view("<u4").reshape(len(selected), block_count, 16)
+        digests[selected] = np.ascontiguousarray(_md5_compress(blocks), "<u4").view(np.uint8)
+    return digests
+
+
+def _hex_strings(digests):
+    """Return 16-byte digests as an Arrow array of 32-character lowercase hex."""
+    text = np.ascontiguousarray(_HEX_PAIRS[digests]).view(np.uint8)
+    offsets = np.arange(0, 32 * (len(digests) + 1), 32, dtype=np.int32)
+    return pa.Array.from_buffers(
+        pa.string(), len(digests), [None, pa.py_buffer(offsets), pa.py_buffer(text)]
+    )
+
+
+def _binary_digests(digests):
+    """Return 16-byte digests as an Arrow ``binary(16)`` array, as ``MD5_BINARY()`` returns."""
+    return pa.FixedSizeBinaryArray.from_buffers(
+        pa.binary(16), len(digests), [None, pa.py_buffer(np.ascontiguousarray(digests))]
+    )
+
+
+def _integer_digests(digests):
+    """Return the lower 64 bits of 16-byte digests as uint64, as ``MD5_NUMBER_LOWER64()`` does.
+
+    Snowflake reads the digest as a big-endian 128-bit number, so its lower
+    64 bits are the last eight bytes.
+    """
+    return pa.array(
+        np.ascontiguousarray(digests[:, 8:]).view(">u8").ravel().astype(np.uint64),
+        type=pa.uint64(),
+    )
+
+
+_DIGEST_ENCODERS = {
+    "hex": _hex_strings,
+    "binary": _binary_digests,
+    "integer": _integer_digests,
+}
+
+
+def _warehouse_text(values):
+    """Return ``values`` as the text Snowflake's ``TO_VARCHAR`` gives once they are loaded.
+
+    Floats are rounded to DECIMAL_SCALE places and keep trailing zeros, and
+    timestamps are truncated to milliseconds (the default ``TIMESTAMP_NTZ``
+    output format); other types cast to the same text in Arrow and Snowflake.
+    """
+    if pa.types.is_floating(values.type):
+        values = pc.round(values, DECIMAL_SCALE).cast(pa.decimal128(38, DECIMAL_SCALE))
+    elif pa.types.is_timestamp(values.type):
+        values = values.cast(pa.timestamp("ms"), safe=False)
+    return pc.cast(values, pa.string())
+
+
+def hash_input(table, columns):
+    """Return the normalized text hashed for ``columns`` of each row of ``table``."""
+    parts = [
+        pc.fill_null(
+            pc.utf8_upper(pc.utf8_trim_whitespace(_warehouse_text(table[column]))),
+            NULL_PLACEHOLDER,
+        )
+        for column in columns
+    ]
+    return pc.binary_join_element_wise(*parts, DELIMITER)
+
+
+def _hash_slice(table, columns, hash_format):
+    return _DIGEST_ENCODERS[hash_format](md5_digests(hash_input(table, columns).combine_chunks()))
+
+
+def hash_columns(table, columns, workers=None, hash_format="hex"):
+    """Return the MD5 hash of ``columns`` for every row of ``table``.
+
+    The hash is encoded as ``hash_format`` (a key of HASH_TYPES). Rows are
+    hashed in slices of HASH_CHUNK_ROWS on ``workers`` threads (default:
+    all cores).
+    """
+    slices = [
+        table.slice(start, HASH_CHUNK_ROWS) for start in range(0, table.num_rows, HASH_CHUNK_ROWS)
+    ]
+    if not slices:
+        return pa.chunked_array([], type=HASH_TYPES[hash_format])
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        return pa.chunked_array(
+            executor.map(
+                _hash_slice, slices, [columns] * len(slices), [hash_format] * len(slices)
+            ),
+            type=HASH_TYPES[hash_format],
+        )
+
+
+def _first_per_key(table, key):
+    """Return the first row of ``table`` for each distinct value of ``key``."""
+    return table.take(pc.index_in(pc.unique(table[key]), value_set=table[key]))
+
+
+def _constant_column(value, rows):
+    return pa.array(np.full(rows, np.datetime64(value, "us")), type=pa.timestamp("us"))
+
+
+def load_sources(table_names):
+    """Read the producer tables ``table_names`` from SAMPLE_DATA_DIR."""
+    sources = {}
+    for table_name in table_names:
+        files = parquet_files(SAMPLE_DATA_DIR / table_name)
+        if not files:
+            raise FileNotFoundError(
+                f"No Parquet for {table_name} in {SAMPLE_DATA_DIR}; "
+                "run generate_sample_data.py with Parquet output first"
+            )
+        sources[table_name] = ds.dataset([str(f) for f in files], format="parquet").to_table()
+    return sources
+
+
+def required_sources():
+    """Return the producer tables the hubs, links and satellites are built from."""
+    names = [source for hub in HUBS.values() for source in hub["sources"]]
+    names += [entity["source"] for entity in (*LINKS.values(), *SATELLITES.values())]
+    return list(dict.fromkeys(names))
+
+
+def build_hub(hub_name, sources, load_date, workers=None, hash_format="hex"):
+    """Return the distinct business keys of a hub with their hash keys.
+
+    Keys are collected from every source table in order; a key seen in
+    several tables keeps the record source of the first.
+    """
+    config = HUBS[hub_name]
+    business_key = config["business_key"]
+    extra_columns = config.get("extra_columns", ())
+    parts = []
+    for source in config["sources"]:
+        # Sources may store keys as string or large_string; hubs use string
+        keys = sources[source].select([business_key, *extra_columns])
+        keys = keys.filter(pc.is_valid(keys[business_key]))
+        keys = keys.cast(pa.schema([(column, pa.string()) for column in keys.column_names]))
+        parts.append(
+            keys.append_column("record_source", pa.array([source] * keys.num_rows, pa.string()))
+        )
+    keys = _first_per_key(pa.concat_tables(parts), business_key)
+    return pa.table(
+        {
+            config["hash_key"]: hash_columns(keys, [business_key], workers, hash_format),
+            business_key: keys[business_key],
+            **{column: keys[column] for column in extra_columns},
+            "load_date": _constant_column(load_date, keys.num_rows),
+            "record_source": keys["record_source"],
+        }
+    )
+
+
+def build_link(link_name, sources, load_date, workers=None, hash_format="hex"):
+    """Return the distinct relationships of a link with link and hub hash keys."""
+    config = LINKS[link_name]
+    business_keys = [HUBS[hub]["business_key"] for hub in config["hubs"]]
+    pairs = sources[config["source"]].select(business_keys)
+    pairs = pairs.filter(pc.and_(*(pc.is_valid(pairs[key]) for key in business_keys)))
+    pairs = pairs.append_column(
+        config["hash_key"], hash_columns(pairs, business_keys, workers, hash_format)
+    )
+    pairs = _first_per_key(pairs, config["hash_key"])
+    return pa.table(
+        {
+            config["hash_key"]: pairs[config["hash_key"]],
+            **{
+                HUBS[hub]["hash_key"]: hash_columns(pairs, [key], workers, hash_format)
+                for hub, key in zip(config["hubs"], business_keys)
+            },
+            "load_date": _constant_column(load_date, pairs.num_rows),
+            "record_source": pa.array([config["source"]] * pairs.num_rows, pa.string()),
+        }
+    )
+
+
+def build_satellite(satellite_name, sources, load_date, workers=None, hash_format="hex"):
+    """Return one satellite row per source row with its hub hash key and hash_diff."""
+    config = SATELLITES[satellite_name]
+    hub = HUBS[config["hub"]]
+    rows = sources[config["source"]]
+    attributes = list(config["attributes"])
+    return pa.table(
+        {
+            hub["hash_key"]: hash_columns(rows, [hub["business_key"]], workers, hash_format),
+            "load_date": _constant_column(load_date, rows.num_rows),
+            "end_date": pa.nulls(rows.num_rows, pa.timestamp("us")),
+            "hash_diff": hash_columns(rows, attributes, workers, hash_format),
+            **{column: rows[column] for column in attributes},
+            "record_source": pa.array([config["source"]] * rows.num_rows, pa.string()),
+        }
+    )
+
+
+def build_vault(sources, load_date, workers=None, hash_format="hex"):
+    """Return ``{table_name: rows}`` for every hub, link and satellite."""
+    vault = {}
+    for hub_name in HUBS:
+        vault[hub_name] = build_hub(hub_name, sources, load_date, workers, hash_format)
+    for link_name in LINKS:
+        vault[link_name] = build_link(link_name, sources, load_date, workers, hash_format)
+    for satellite_name in SATELLITES:
+        vault[satellite_name] = build_satellite(
+            satellite_name, sources, load_date, workers, hash_format
+        )
+    return vault
+
+
+def table_columns(table_name):
+    """Return the columns of a hub, link or satellite in table order."""
+    if table_name in SATELLITES:
+        config = SATELLITES[table_name]
+        return [
+            HUBS[config["hub"]]["hash_key"],
+            "load_date",
+            "end_date",
+            "hash_diff",
+            *config["attributes"],
+            "record_source",
+        ]
+    if table_name in LINKS:
+        config = LINKS[table_name]
+        return [
+            config["hash_key"],
+            *(HUBS[hub]["hash_key"] for hub in config["hubs"]),
+            "load_date",
+            "record_source",
+        ]
+    config = HUBS[table_name]
+    return [
+        config["hash_key"],
+        config["business_key"],
+        *config.get("extra_columns", ()),
+        "load_date",
+        "record_source",
+    ]
+
+
+def delta_path(table_name, load_date):
+    """Return the delta file the load of ``load_date`` writes for ``table_name``."""
+    return VAULT_DATA_DIR / table_name / f"load-{load_date.strftime(DELTA_DATE_FORMAT)}.parquet"
+
+
+def delta_load_date(path):
+    """Return the load date of a delta file from its name."""
+    return datetime.strptime(path.stem[len("load-"):], DELTA_DATE_FORMAT)
+
+
+def delta_files(table_name):
+    """Return the delta files of ``table_name`` in load order."""
+    return sorted((VAULT_DATA_DIR / table_name).glob("load-*.parquet"))
+
+
+def current_rows(existing, hash_key):
+    """Return the current version of each hash key: its row with the latest load_date."""
+    return _first_per_key(existing.sort_by([("load_date", "descending")]), hash_key)
+
+
+def end_date_versions(rows, hash_key):
+    """Return satellite ``rows`` with each version end-dated at its key's next load_date.
+
+    Rows come back ordered by hash key and load date; the latest version of
+    each key keeps a NULL ``end_date``.
+    """
+    rows = rows.sort_by([(hash_key, "ascending"), ("load_date", "ascending")])
+    if rows.num_rows < 2:
+        return rows
+    keys = rows[hash_key].combine_chunks()
+    load_dates = rows["load_date"].combine_chunks()
+    end_type = rows.schema.field("end_date").type
+    next_dates = pa.concat_arrays([load_dates.slice(1).cast(end_type), pa.nulls(1, end_type)])
+    same_key = pa.concat_arrays(
+        [pc.equal(keys.slice(1), keys.slice(0, len(keys) - 1)), pa.array([False])]
+    )
+    end_dates = pc.if_else(same_key, next_dates, pa.nulls(len(keys), end_type))
+    return rows.set_column(rows.schema.get_field_index("end_date"), "end_date", end_dates)
+
+
+def read_vault_table(table_name, files=None):
+    """Return every row loaded into a vault table, with satellites end-dated.
+
+    ``files`` defaults to all of the table's delta files.
+    """
+    files = delta_files(table_name) if files is None else files
+    rows = ds.dataset([str(f) for f in files], format="parquet").to_table()
+    if table_name in SATELLITES:
+        rows = end_date_versions(rows, rows.column_names[0])
+    return rows
+
+
+def new_keys(existing, incoming, key):
+    """Return the rows of ``incoming`` whose ``key`` is not in ``existing`` yet.
+
+    Hubs and links are insert-only, so this is their whole incremental load.
+    """
+    return incoming.filter(pc.invert(pc.is_in(incoming[key], value_set=existing[key])))
+
+
+def satellite_delta(existing, incoming, hash_key):
+    """Compare incoming satellite rows with the current row of each hash key.
+
+    The current row of a key is its version with the latest ``load_date``.
+    Incoming rows are new (no current row), changed (different
+    ``hash_diff``) or unchanged. Returns ``(inserts, ended_keys, counts)``:
+    the new and changed rows to insert, the hash keys whose current row
+    they replace, and the count of each kind.
+    """
+    current = current_rows(existing.select([hash_key, "load_date", "hash_diff"]), hash_key)
+    compared = incoming.join(
+        current.select([hash_key, "hash_diff"]).rename_columns([hash_key, "current_hash_diff"]),
+        hash_key,
+        join_type="left outer",
+    )
+    is_new = pc.is_null(compared["current_hash_diff"])
+    is_changed = pc.fill_null(
+        pc.not_equal(compared["hash_diff"], compared["current_hash_diff"]), False
+    )
+    inserts = compared.filter(pc.or_(is_new, is_changed)).select(incoming.column_names)
+    ended_keys = compared.filter(is_changed)[hash_key]
+    counts = {
+        "new": pc.sum(is_new).as_py() or 0,
+        "changed": pc.sum(is_changed).as_py() or 0,
+    }
+    counts["unchanged"] = incoming.num_rows - counts["new"] - counts["changed"]
+    return inserts, ended_keys, counts
+
+
+def apply_satellite_delta(existing, inserts, hash_key):
+    """Return ``existing`` with the rows ``inserts`` replace end-dated and ``inserts`` appended.
+
+    The current row of each inserted key gets the inserted row's
+    ``load_date`` as its ``end_date``, in one whole-column step, as the
+    MERGE of merge_sql does in the warehouse.
+    """
+    replacing = pc.index_in(existing[hash_key], value_set=inserts[hash_key])
+    end_type = existing.schema.field("end_date").type
+    next_dates = inserts["load_date"].combine_chunks().cast(end_type).take(replacing)
+    end_dates = pc.if_else(
+        pc.and_(pc.is_null(existing["end_date"]), pc.is_valid(replacing)),
+        next_dates,
+        existing["end_date"],
+    )
+    existing = existing.set_column(
+        existing.schema.get_field_index("end_date"), "end_date", end_dates
+    )
+    return pa.concat_tables([existing, inserts.cast(existing.schema)])
+
+
+def satellite_merge_sql(satellite_name, staging_table, target_table=None):
+    """Return the Snowflake MERGE that loads a satellite from ``staging_table``.
+
+    ``staging_table`` holds one load's delta (or all rows built by
+    build_satellite) and ``target_table`` defaults to ``satellite_name``. In
+    one set-based statement the MERGE end-dates the current row of every
+    changed hash key and inserts the new and changed rows; unchanged rows are
+    not touched, so merging the same delta twice changes nothing. Changed
+    rows appear twice in the source: once keyed to match (and end-date) their
+    current row, and once with a NULL key so they are inserted as the new
+    version.
+    """
+    target = target_table or satellite_name
+    hash_key = HUBS[SATELLITES[satellite_name]["hub"]]["hash_key"]
+    columns = table_columns(satellite_name)
+    return f"""MERGE INTO {target} AS target
+USING (
+    SELECT staged.{hash_key} AS merge_key, staged.*
+    FROM {staging_table} AS staged
+    UNION ALL
+    SELECT NULL AS merge_key, staged.*
+    FROM {staging_table} AS staged
+    JOIN {target} AS current_row
+      ON current_row.{hash_key} = staged.{hash_key}
+     AND current_row.end_date IS NULL
+     AND current_row.hash_diff <> staged.hash_diff
+) AS source
+ON target.{hash_key} = source.merge_key AND target.end_date IS NULL
+WHEN MATCHED AND target.hash_diff <> source.hash_diff THEN
+    UPDATE SET end_date = source.load_date
+WHEN NOT MATCHED THEN
+    INSERT ({", ".join(columns)})
+    VALUES ({", ".join(f"source.{column}" for column in columns)})"""
+
+
+def merge_sql(table_name, staging_table, target_table=None):
+    """Return the Snowflake MERGE applying a staged delta to a hub, link or satellite.
+
+    Hubs and links insert the staged keys they do not hold yet; satellites
+    use satellite_merge_sql. ``target_table`` defaults to ``table_name``.
+    """
+    if table_name in SATELLITES:
+        return satellite_merge_sql(table_name, staging_table, target_table)
+    target = target_table or table_name
+    columns = table_columns(table_name)
+    return f"""MERGE INTO {target} AS target
+USING {staging_table} AS source
+ON target.{columns[0]} = source.{columns[0]}
+WHEN NOT MATCHED THEN
+    INSERT ({", ".join(columns)})
+    VALUES ({", ".join(f"source.{column}" for column in columns)})"""
+
+
+def _read_existing(table_name, rows, load_date):
+    """Read the columns of ``table_name`` an incremental load compares against.
+
+    Every delta file except this load's own is read (so a retried load date
+    recomputes the same delta): the hash key, plus ``load_date`` and
+    ``hash_diff`` for satellites. Returns None when the table has no rows
+    yet. Raises ValueError when the files encode hash keys differently
+    from ``rows`` (another --hash-format), since such keys never match.
+    """
+    own_file = delta_path(table_name, load_date)
+    files = [path for path in delta_files(table_name) if path != own_file]
+    if not files:
+        return None
+    dataset = ds.dataset([str(f) for f in files], format="parquet")
+    hash_key = rows.column_names[0]
+    existing_type = dataset.schema.field(hash_key).type
+    incoming_type = rows.schema.field(hash_key).type
+    if existing_type != incoming_type:
+        raise ValueError(
+            f"{VAULT_DATA_DIR / table_name} stores {hash_key} as {existing_type}, not "
+            f"{incoming_type}; reload with --full-refresh to change --hash-format"
+        )
+    columns = [hash_key, "load_date", "hash_diff"] if table_name in SATELLITES else [hash_key]
+    return dataset.to_table(columns=columns)
+
+
+def _write_parquet(rows, path):
+    """Write ``rows`` to ``path`` via a temporary file, so readers never see a partial file."""
+    temporary_path = path.with_name(path.name + ".tmp")
+    pq.write_table(rows, temporary_path)
+    os.replace(temporary_path, path)
+
+
+def _replace_table_dir(table_name, rows, load_date):
+    """Replace every delta file of ``table_name`` with one file of ``rows``."""
+    table_dir = VAULT_DATA_DIR / table_name
+    new_dir = table_dir.with_name(table_name + ".new")
+    old_dir = table_dir.with_name(table_name + ".old")
+    for leftover in (new_dir, old_dir):
+        shutil.rmtree(leftover, ignore_errors=True)
+    new_dir.mkdir(parents=True)
+    _write_parquet(rows, new_dir / delta_path(table_name, load_date).name)
+    if table_dir.exists():
+        table_dir.rename(old_dir)
+    new_dir.rename(table_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def load_table(table_name, rows, load_date, full_refresh=False):
+    """Write one load of a hub, link or satellite to VAULT_DATA_DIR and return its counts.
+
+    The first load, and any load with ``full_refresh``, replaces the table's
+    directory with one delta file of all ``rows``. Later loads compare
+    ``rows`` with the earlier delta files and append a delta file holding
+    only hubs' and links' new keys and satellites' new and changed rows; no
+    delta file is written when nothing changed. The counts are ``{"new",
+    "changed", "unchanged"}`` incoming rows.
+
+    Raises ValueError when the existing table stores its hash keys in a
+    different --hash-format than ``rows``.
+    """
+    existing = None if full_refresh else _read_existing(table_name, rows, load_date)
+    if existing is None:
+        _replace_table_dir(table_name, rows, load_date)
+        return {"new": rows.num_rows, "changed": 0, "unchanged": 0}
+
+    hash_key = rows.column_names[0]
+    if table_name in SATELLITES:
+        delta, _, counts = satellite_delta(existing, rows, hash_key)
+    else:
+        delta = new_keys(existing, rows, hash_key)
+        counts = {
+            "new": delta.num_rows,
+            "changed": 0,
+            "unchanged": rows.num_rows - delta.num_rows,
+        }
+
+    path = delta_path(table_name, load_date)
+    if delta.num_rows:
+        _write_parquet(delta, path)
+    else:
+        path.unlink(missing_ok=True)
+    return counts
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the Data Vault loader."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Threads hashing row slices in parallel (default: all cores)",
+    )
+    parser.add_argument(
+        "--load-date",
+        type=datetime.fromisoformat,
+        default=None,
+        help="load_date stamped on every row, ISO format (default: now)",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Rebuild every table instead of loading incrementally into the existing ones",
+    )
+    parser.add_argument(
+        "--hash-format",
+        choices=HASH_TYPES,
+        default="hex",
+        help="Encoding of hash keys and hash_diff: 32-character hex text, 16-byte binary "
+        "or 64-bit integer (default: hex)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.load_date is None:
+        args.load_date = datetime.now().replace(microsecond=0)
+    return args
+
+
+def main(args=None):
+    """Build every hub, link and satellite and load them into VAULT_DATA_DIR."""
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print("Building Data Vault Rows")
+    print(f"Load date: {args.load_date}  Hash format: {args.hash_format}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    sources = load_sources(required_sources())
+    vault = build_vault(sources, args.load_date, args.workers, args.hash_format)
+
+    load_counts = {}
+    for table_name, rows in vault.items():
+        counts = load_table(table_name, rows, args.load_date, args.full_refresh)
+        load_counts[table_name] = counts
+        print(
+            f"  ✓ {table_name:<28} {counts['new']:>10,} new {counts['changed']:>10,} changed "
+            f"{counts['unchanged']:>10,} unchanged"
+        )
+
+    print("=" * 60)
+    print(f"Loaded {len(vault)} tables in {time.perf_counter() - started:.2f}s")
+    print(f"Rows saved to: {VAULT_DATA_DIR}")
+    print("=" * 60)
+    return load_counts
+
+
+if __name__ == "__main__":
+    main(parse_args())
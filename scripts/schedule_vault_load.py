@@ -0,0 +1,323 @@
+"""
+Load the Data Vault as a dependency graph on a bounded pool of connections.
+
+The hub, link and satellite definitions in load_data_vault.py form a DAG:
+every hub loads first, then each link (after the hubs it joins) and each
+satellite (after its hub). Links and satellites do not depend on each other,
+so once the hubs are in, they all load concurrently, up to --connections at
+a time, each on its own warehouse connection.
+
+Each node builds its rows, loads them incrementally into VAULT_DATA_DIR
+(see load_data_vault.load_table) and merges the resulting delta into the
+warehouse table (see bulk_load.merge_new_deltas), so a load moves only the
+changed rows; with --full-refresh the table is swapped for the rebuilt one
+instead. A failed node is retried up to --retries
+times; nodes that depend on a node that still fails are skipped. Completed
+nodes are recorded in ``VAULT_DATA_DIR/.load_state.json`` for the load
+date, so re-running the same load date after a failure resumes with the
+nodes that did not complete. The state is removed once every node
+succeeds.
+
+The run ends with a per-node timing report: start offset, duration,
+attempts, rows and status.
+
+Run as a module from the repository root:
+``python -m scripts.schedule_vault_load --connections 8 --backend snowflake``
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from scripts import bulk_load, load_data_vault
+
+# Configuration
+CONNECTIONS = 4
+RETRIES = 2
+RETRY_DELAY_SECONDS = 1.0
+STATE_FILENAME = ".load_state.json"
+
+
+def vault_dag():
+    """Return ``{node: set(dependencies)}`` for every hub, link and satellite."""
+    dag = {hub_name: set() for hub_name in load_data_vault.HUBS}
+    for link_name, config in load_data_vault.LINKS.items():
+        dag[link_name] = set(config["hubs"])
+    for satellite_name, config in load_data_vault.SATELLITES.items():
+        dag[satellite_name] = {config["hub"]}
+    return dag
+
+
+def run_dag(dag, task, connections, retries=RETRIES, completed=(), on_complete=None):
+    """Run ``task(node, connection)`` for every node of ``dag`` in dependency order.
+
+    ``connections`` is a list of connections (or backends); at most one task
+    uses each at a time, so their number bounds concurrency. A node starts
+    once all its dependencies succeeded, and a failing node is retried up to
+    ``retries`` more times. Nodes in ``completed`` are not run again, and
+    ``on_complete(node)`` is called as each node succeeds.
+
+    Returns ``{node: report}`` where each report holds ``status`` (``done``,
+    ``failed``, ``skipped`` or ``completed`` for nodes done earlier),
+    ``attempts``, ``start`` (seconds from the run's start), ``seconds``,
+    ``result`` (the task's return value) and ``error``.
+    """
+    pool = queue.Queue()
+    for connection in connections:
+        pool.put(connection)
+    report = {
+        node: {"status": "pending", "attempts": 0, "start": None, "seconds": 0.0,
+               "result": None, "error": None}
+        for node in dag
+    }
+    for node in completed:
+        if node in report:
+            report[node]["status"] = "completed"
+    started = time.perf_counter()
+
+    def run_node(node):
+        attempt = report[node]["attempts"]
+        if attempt:
+            time.sleep(RETRY_DELAY_SECONDS * attempt)
+        connection = pool.get()
+        if report[node]["start"] is None:
+            report[node]["start"] = time.perf_counter() - started
+        try:
+            return task(node, connection)
+        finally:
+            pool.put(connection)
+
+    def finished(node):
+        return report[node]["status"] in ("done", "completed")
+
+    running = {}
+    with ThreadPoolExecutor(max_workers=len(connections)) as executor:
+        while True:
+            for node, dependencies in dag.items():
+                if report[node]["status"] != "pending" or node in running.values():
+                    continue
+                if any(report[d]["status"] in ("failed", "skipped") for d in dependencies):
+                    report[node]["status"] = "skipped"
+                elif all(finished(d) for d in dependencies):
+                    running[executor.submit(run_node, node)] = node
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                entry = report[node]
+                entry["attempts"] += 1
+                entry["seconds"] = time.perf_counter() - started - entry["start"]
+                try:
+                    entry["result"] = future.result()
+                except Exception as e:
+                    entry["error"] = str(e)
+                    if entry["attempts"] > retries:
+                        entry["status"] = "failed"
+                    continue
+                entry["status"] = "done"
+                entry["error"] = None
+                if on_complete is not None:
+                    on_complete(node)
+    return report
+
+
+def _state_path():
+    return load_data_vault.VAULT_DATA_DIR / STATE_FILENAME
+
+
+def load_state(load_date):
+    """Return the nodes already completed for ``load_date`` by an earlier run."""
+    path = _state_path()
+    if not path.exists():
+        return set()
+    state = json.loads(path.read_text())
+    if state.get("load_date") != load_date.isoformat():
+        return set()
+    return set(state["completed"])
+
+
+def save_state(load_date, completed):
+    """Record the completed nodes for ``load_date``, replacing the file atomically."""
+    path = _state_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(path.name + ".tmp")
+    temporary_path.write_text(
+        json.dumps({"load_date": load_date.isoformat(), "completed": sorted(completed)}, indent=2)
+    )
+    os.replace(temporary_path, path)
+
+
+def _builder(node):
+    if node in load_data_vault.HUBS:
+        return load_data_vault.build_hub
+    if node in load_data_vault.LINKS:
+        return load_data_vault.build_link
+    return load_data_vault.build_satellite
+
+
+def load_node(node, backend, sources, options):
+    """Build one table, load it into VAULT_DATA_DIR and merge its delta into ``backend``.
+
+    Any delta files newer than the warehouse table are merged, which
+    includes this load's (when anything changed) and none twice on a
+    retry. With ``full_refresh`` the warehouse table is replaced instead.
+    Returns the incremental load counts of the table.
+    """
+    rows = _builder(node)(
+        node, sources, options.load_date, options.workers, options.hash_format
+    )
+    counts = load_data_vault.load_table(node, rows, options.load_date, options.full_refresh)
+    if options.full_refresh:
+        bulk_load.bulk_load(
+            backend, bulk_load.VAULT_SCHEMA, node, load_data_vault.read_vault_table(node),
+            options.chunk_rows, options.workers, replace=True,
+        )
+    else:
+        bulk_load.merge_new_deltas(
+            backend, node, load_data_vault.delta_files(node), options.chunk_rows, options.workers
+        )
+    return counts
+
+
+def print_report(report):
+    """Print one line per node: start offset, duration, attempts, rows and status."""
+    print(f"  {'node':<28} {'start':>8} {'seconds':>8} {'tries':>5} {'rows':>10}  status")
+    for node, entry in sorted(report.items(), key=lambda item: item[1]["start"] or 0):
+        rows = sum(entry["result"].values()) if entry["result"] else 0
+        start = f"{entry['start']:.2f}" if entry["start"] is not None else "-"
+        marker = {"done": "✓", "completed": "✓", "failed": "✗"}.get(entry["status"], "⚠")
+        print(
+            f"  {node:<28} {start:>8} {entry['seconds']:>8.2f} {entry['attempts']:>5} "
+            f"{rows:>10,}  {marker} {entry['status']}"
+        )
+        if entry["error"]:
+            print(f"      {entry['error']}")
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the scheduled Data Vault load."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=CONNECTIONS,
+        help=f"Warehouse connections, so nodes loading at once (default: {CONNECTIONS})",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=RETRIES,
+        help=f"Retries of a failed node before giving up (default: {RETRIES})",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=bulk_load.BACKENDS,
+        default="local",
+        help="Warehouse to load into (default: local)",
+    )
+    parser.add_argument(
+        "--method",
+        choices=bulk_load.SNOWFLAKE_METHODS,
+        default="copy",
+        help="Snowflake load path (default: copy)",
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=bulk_load.CHUNK_ROWS,
+        help=f"Rows per staged Parquet file (default: {bulk_load.CHUNK_ROWS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Threads per node for hashing and staging (default: all cores)",
+    )
+    parser.add_argument(
+        "--load-date",
+        type=datetime.fromisoformat,
+        default=None,
+        help="load_date of this load, ISO format; reuse it to resume a failed load "
+        "(default: now)",
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Rebuild every table instead of loading incrementally",
+    )
+    parser.add_argument(
+        "--hash-format",
+        choices=load_data_vault.HASH_TYPES,
+        default="hex",
+        help="Encoding of hash keys and hash_diff; see load_data_vault.py (default: hex)",
+    )
+    args = parser.parse_args(argv)
+    if args.connections < 1:
+        parser.error("--connections must be at least 1")
+    if args.retries < 0:
+        parser.error("--retries must not be negative")
+    if args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.load_date is None:
+        args.load_date = datetime.now().replace(microsecond=0)
+    return args
+
+
+def main(args=None):
+    """Load every hub, link and satellite as a DAG and print the timing report."""
+    if args is None:
+        args = parse_args([])
+
+    print("=" * 60)
+    print("Scheduled Data Vault Load")
+    print(f"Load date: {args.load_date}  Connections: {args.connections}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    sources = load_data_vault.load_sources(load_data_vault.required_sources())
+    completed = load_state(args.load_date)
+    if completed:
+        print(f"Resuming: {len(completed)} nodes already loaded for this load date")
+
+    def record(node):
+        completed.add(node)
+        save_state(args.load_date, completed)
+
+    backends = [bulk_load.create_backend(args) for _ in range(args.connections)]
+    try:
+        report = run_dag(
+            vault_dag(),
+            lambda node, backend: load_node(node, backend, sources, args),
+            backends,
+            args.retries,
+            completed=set(completed),
+            on_complete=record,
+        )
+    finally:
+        for backend in backends:
+            backend.close()
+
+    print_report(report)
+    failed = [node for node, entry in report.items() if entry["status"] in ("failed", "skipped")]
+    print("=" * 60)
+    if failed:
+        print(f"✗ {len(failed)} nodes not loaded; re-run with --load-date "
+              f"{args.load_date.isoformat()} to resume")
+    else:
+        _state_path().unlink(missing_ok=True)
+        print(f"✓ Loaded {len(report)} nodes in {time.perf_counter() - started:.2f}s")
+    print("=" * 60)
+    return report
+
+
+if __name__ == "__main__":
+    report = main(parse_args())
+    sys.exit(1 if any(entry["status"] in ("failed", "skipped") for entry in report.values()) else 0)
@@ -1,12 +1,44 @@
 """
 Setup Snowflake database with Data Vault 2.0 schema.
 Executes DDL scripts to create external stages, hubs, links, and satellites.
+
+Applied statements are recorded in a ledger table (LEDGER_TABLE) with a
+checksum of their text and the database and schema they ran in, so re-runs
+only execute statements that are new or changed; unchanged DDL is skipped.
+Pending statements from every script are sent in one multi-statement batch,
+together with the ledger inserts recording them.
+--dry-run prints that batch instead; it only reads the ledger, and reads a
+missing one as empty rather than creating it.
+
+Scripts are split into statements by a tokenizer that ignores semicolons in
+quoted strings, quoted identifiers, ``$$`` bodies and comments. Comments
+and surplus whitespace do not count towards a statement's checksum, so
+editing them re-runs nothing.
+
+``CREATE OR REPLACE TABLE`` would empty a populated table, so pending table
+statements run as ``CREATE TABLE IF NOT EXISTS``: a new table is created and
+an existing one (e.g. on the first run against a database set up before the
+ledger existed) is kept with its rows. A changed definition of a table the
+ledger already knows is not applied; --replace-tables rebuilds those tables
+as written, dropping their rows.
+
+The DDL declares hash keys and ``hash_diff`` as ``VARCHAR(32)`` hex MD5.
+--hash-format binary or integer declares them ``BINARY(16)`` or
+``NUMBER(20,0)`` instead, to match a vault loaded with the same
+load_data_vault.py --hash-format. Switching an existing schema changes
+every table definition, so it also needs --replace-tables.
+
+Run as a module from the repository root:
+``python -m scripts.setup_snowflake --dry-run``
 """
 
+import argparse
+import hashlib
 import os
+import re
+import time
 from pathlib import Path
 
-import snowflake.connector
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -21,6 +53,15 @@ SNOWFLAKE_CONFIG = {
     "role": os.getenv("SNOWFLAKE_ROLE", "ACCOUNTADMIN"),
     "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE", "COMPUTE_WH"),
 }
+LEDGER_TABLE = "DATA_LAKE.PUBLIC.SCHEMA_MIGRATIONS"
+
+# Column type of hash keys and hash_diff for each --hash-format; the DDL
+# scripts are written for hex
+HASH_KEY_TYPES = {
+    "hex": "VARCHAR(32)",
+    "binary": "BINARY(16)",
+    "integer": "NUMBER(20,0)",
+}
 
 # DDL script execution order
 DDL_SCRIPTS = [
@@ -30,9 +71,20 @@ DDL_SCRIPTS = [
     "04_satellites.sql",
 ]
 
+USE_PATTERN = re.compile(r"USE\s+(DATABASE|SCHEMA)\s+([\w.$\"]+)$", re.IGNORECASE)
+REPLACE_TABLE_PATTERN = re.compile(
+    r"CREATE\s+OR\s+REPLACE\s+((?:TRANSIENT\s+|TEMPORARY\s+)?)TABLE\s+([\w.$\"]+)",
+    re.IGNORECASE,
+)
+HASH_COLUMN_PATTERN = re.compile(
+    r"\b(\w+_(?:hk|lk)|hash_diff)(\s+)VARCHAR\(32\)", re.IGNORECASE
+)
+
 
 def create_connection():
     """Create Snowflake connection."""
+    import snowflake.connector
+
     try:
         conn = snowflake.connector.connect(**SNOWFLAKE_CONFIG)
         print("✓ Connected to Snowflake")
@@ -42,45 +94,274 @@ def create_connection():
         raise
 
 
-def execute_sql_file(conn, sql_file_path):
-    """Execute SQL statements from a file."""
-    try:
-        with open(sql_file_path, "r") as f:
-            sql_content = f.read()
+def split_statements(sql):
+    """Split a SQL script into statements on top-level semicolons.
+
+    Semicolons inside single-quoted strings (with ``''`` or backslash
+    escapes), double-quoted identifiers, ``$$`` bodies and ``--``, ``//`` or
+    ``/* */`` comments do not end a statement. Comments are dropped and runs
+    of whitespace outside quoted text collapse to one space, so the text
+    returned is the statement's normal form. Empty statements are dropped.
+    """
+    statements = []
+    current = []
+    i = 0
+    length = len(sql)
+
+    def space():
+        if current and current[-1] != " ":
+            current.append(" ")
+
+    def end_statement():
+        statement = "".join(current).strip()
+        if statement:
+            statements.append(statement)
+        current.clear()
+
+    while i < length:
+        char = sql[i]
+        pair = sql[i:i + 2]
+        if pair in ("--", "//"):
+            end = sql.find("\n", i)
+            i = length if end == -1 else end
+            space()
+        elif pair == "/*":
+            end = sql.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+            space()
+        elif pair == "$$":
+            end = sql.find("$$", i + 2)
+            end = length if end == -1 else end + 2
+            current.append(sql[i:end])
+            i = end
+        elif char in ("'", '"'):
+            end = i + 1
+            while end < length:
+                if char == "'" and sql[end] == "\\":
+                    end += 2
+                elif sql[end] == char and sql[end + 1:end + 2] == char:
+                    end += 2
+                elif sql[end] == char:
+                    break
+                else:
+                    end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+        elif char == ";":
+            end_statement()
+            i += 1
+        elif char.isspace():
+            space()
+            i += 1
+        else:
+            current.append(char)
+            i += 1
+    end_statement()
+    return statements
+
 
-        # Split by semicolon and execute each statement
-        statements = [stmt.strip() for stmt in sql_content.split(";") if stmt.strip()]
+def apply_hash_format(sql, hash_format):
+    """Return ``sql`` with hash key and ``hash_diff`` columns typed for ``hash_format``.
 
-        cursor = conn.cursor()
-        for i, statement in enumerate(statements, 1):
-            # Skip comments and empty statements
-            if statement.startswith("--") or not statement:
+    Columns are recognised by name: ``*_hk``, ``*_lk`` and ``hash_diff``
+    declared ``VARCHAR(32)``.
+    """
+    return HASH_COLUMN_PATTERN.sub(
+        lambda match: match.group(1) + match.group(2) + HASH_KEY_TYPES[hash_format], sql
+    )
+
+
+def checksum(context, statement):
+    """Return the SHA-256 of ``statement`` run in ``context`` (database, schema)."""
+    text = "\n".join([*(part or "" for part in context), statement])
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _qualify(name, context):
+    """Return ``name`` qualified with the context database and schema, upper-cased."""
+    parts = name.upper().split(".")
+    database, schema = (part.upper() if part else None for part in context)
+    if len(parts) == 1 and schema:
+        parts = [schema, *parts]
+    if len(parts) == 2 and database:
+        parts = [database, *parts]
+    return ".".join(parts)
+
+
+def plan_script(script_name, sql, applied, replace_tables=False):
+    """Decide what to run for one script given the ledger's ``applied`` entries.
+
+    ``applied`` maps each recorded checksum to its object name (or None).
+    Returns a dict with ``statements`` (the SQL to execute, starting with
+    the ``USE`` statements that set its context), ``records`` (the
+    ``(script, object, checksum)`` rows to add to the ledger) and the
+    counts ``pending``, ``skipped`` and ``held`` (changed table definitions
+    not applied without ``replace_tables``).
+    """
+    database = schema = None
+    context_statements = {}
+    known_objects = {obj for obj in applied.values() if obj}
+    plan = {"statements": [], "records": [], "pending": 0, "skipped": 0, "held": []}
+    for statement in split_statements(sql):
+        use = USE_PATTERN.match(statement)
+        if use:
+            kind, name = use.group(1).upper(), use.group(2)
+            if kind == "DATABASE":
+                database, schema = name, None
+                context_statements.pop("SCHEMA", None)
+            elif "." in name:
+                database, schema = name.split(".", 1)
+            else:
+                schema = name
+            context_statements[kind] = statement
+            continue
+
+        context = (database, schema)
+        statement_checksum = checksum(context, statement)
+        if statement_checksum in applied:
+            plan["skipped"] += 1
+            continue
+
+        replace_table = REPLACE_TABLE_PATTERN.match(statement)
+        obj = _qualify(replace_table.group(2), context) if replace_table else None
+        if replace_table and not replace_tables:
+            if obj in known_objects:
+                plan["held"].append(obj)
                 continue
+            modifier, name = replace_table.groups()
+            statement = (
+                f"CREATE {modifier}TABLE IF NOT EXISTS {name}"
+                + statement[replace_table.end():]
+            )
+
+        if not plan["statements"] or plan["context"] != context:
+            plan["statements"].extend(
+                context_statements[kind] for kind in ("DATABASE", "SCHEMA")
+                if kind in context_statements
+            )
+            plan["context"] = context
+        plan["statements"].append(statement)
+        plan["records"].append((script_name, obj, statement_checksum))
+        plan["pending"] += 1
+    plan.pop("context", None)
+    return plan
+
+
+def _literal(value):
+    if value is None:
+        return "NULL"
+    return "'" + str(value).replace("'", "''") + "'"
+
 
-            try:
-                cursor.execute(statement)
-                print(f"  ✓ Executed statement {i}/{len(statements)}")
-            except Exception as e:
-                print(f"  ✗ Error executing statement {i}: {e}")
-                print(f"  Statement: {statement[:100]}...")
-                # Continue with next statement
+def ledger_insert(records):
+    """Return the INSERT adding ``records`` to the ledger in one statement."""
+    values = ",\n".join(
+        f"({_literal(script)}, {_literal(obj)}, {_literal(statement_checksum)}, "
+        "CURRENT_TIMESTAMP())"
+        for script, obj, statement_checksum in records
+    )
+    return (
+        f"INSERT INTO {LEDGER_TABLE} (script_name, object_name, checksum, applied_at) "
+        f"VALUES\n{values}"
+    )
 
+
+def ledger_exists(conn):
+    """Return whether the ledger table exists, without creating anything."""
+    database, schema, table = LEDGER_TABLE.split(".")
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SHOW DATABASES LIKE {_literal(database)}")
+        if not cursor.fetchall():
+            return False
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {database}.INFORMATION_SCHEMA.TABLES "
+            f"WHERE TABLE_SCHEMA = {_literal(schema)} AND TABLE_NAME = {_literal(table)}"
+        )
+        return cursor.fetchall()[0][0] > 0
+    finally:
         cursor.close()
-        return True
 
-    except Exception as e:
-        print(f"✗ Error reading/executing SQL file {sql_file_path}: {e}")
-        return False
+
+def read_ledger(conn, create=True):
+    """Return the ledger as ``{checksum: object_name}``.
+
+    The ledger table is created if it does not exist; with ``create=False``
+    (dry runs) a missing ledger is read as empty and nothing is created.
+    """
+    if not create and not ledger_exists(conn):
+        return {}
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {LEDGER_TABLE} ("
+            "script_name VARCHAR(200) NOT NULL, object_name VARCHAR(500), "
+            "checksum VARCHAR(64) NOT NULL, applied_at TIMESTAMP_LTZ NOT NULL)"
+        )
+        cursor.execute(f"SELECT checksum, object_name FROM {LEDGER_TABLE}")
+        return {row[0]: row[1] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+
+
+def build_batch(plans):
+    """Return every pending statement of ``plans`` as one list.
+
+    Each script's statements are followed by the ledger insert recording
+    them, so a failure part-way through keeps the scripts before it recorded.
+    """
+    batch = []
+    for plan in plans:
+        if plan["records"]:
+            batch.extend(plan["statements"])
+            batch.append(ledger_insert(plan["records"]))
+    return batch
+
+
+def execute_batch(conn, statements):
+    """Execute ``statements`` in a single multi-statement round trip."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(";\n".join(statements), num_statements=len(statements))
+    finally:
+        cursor.close()
+
+
+def parse_args(argv=None):
+    """Parse command-line options for the Snowflake setup."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--replace-tables",
+        action="store_true",
+        help="Rebuild tables whose definition changed (drops their rows)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the pending statements without executing them or creating the ledger",
+    )
+    parser.add_argument(
+        "--hash-format",
+        choices=HASH_KEY_TYPES,
+        default="hex",
+        help="Type of hash key and hash_diff columns, matching load_data_vault.py "
+        "--hash-format (default: hex)",
+    )
+    return parser.parse_args(argv)
 
 
-def main():
+def main(args=None):
     """Main function to setup Snowflake schema."""
+    if args is None:
+        args = parse_args([])
+
     print("=" * 60)
     print("Snowflake Data Vault 2.0 Setup")
     print("=" * 60)
     print(f"Account: {SNOWFLAKE_CONFIG['account']}")
     print(f"User: {SNOWFLAKE_CONFIG['user']}")
     print(f"Role: {SNOWFLAKE_CONFIG['role']}")
+    print(f"Hash keys: {HASH_KEY_TYPES[args.hash_format]}")
     print()
 
     # Create connection
@@ -88,48 +369,60 @@ def main():
         conn = create_connection()
     except Exception:
         print("Failed to connect to Snowflake. Exiting.")
-        return
-
-    print()
-    print("Executing DDL scripts...")
-    print("-" * 60)
+        return None
 
-    # Execute DDL scripts in order
-    success_count = 0
-    for script_name in DDL_SCRIPTS:
-        script_path = DDL_DIR / script_name
-        print(f"\nExecuting: {script_name}")
+    started = time.perf_counter()
+    try:
+        applied = read_ledger(conn, create=not args.dry_run)
+        print(f"Ledger: {len(applied)} statements applied earlier")
+        print("-" * 60)
 
-        if not script_path.exists():
-            print(f"  ⚠ Warning: Script not found: {script_path}")
-            continue
+        plans = []
+        for script_name in DDL_SCRIPTS:
+            script_path = DDL_DIR / script_name
+            if not script_path.exists():
+                print(f"  ⚠ Warning: Script not found: {script_path}")
+                continue
+            sql = apply_hash_format(script_path.read_text(), args.hash_format)
+            plan = plan_script(script_name, sql, applied, args.replace_tables)
+            plans.append(plan)
+            print(
+                f"  {script_name:<28} {plan['pending']:>3} pending "
+                f"{plan['skipped']:>3} unchanged"
+            )
+            for obj in plan["held"]:
+                print(f"    ⚠ {obj} definition changed; not applied (use --replace-tables)")
 
-        if execute_sql_file(conn, script_path):
-            success_count += 1
-            print(f"  ✓ Completed: {script_name}")
-        else:
-            print(f"  ✗ Failed: {script_name}")
+        batch = build_batch(plans)
+        if args.dry_run:
+            print(";\n".join(batch) + (";" if batch else ""))
+        elif batch:
+            execute_batch(conn, batch)
+    except Exception as e:
+        print(f"✗ Setup failed: {e}")
+        raise
+    finally:
+        conn.close()
 
+    pending = sum(plan["pending"] for plan in plans)
     print("-" * 60)
-    print()
-
-    # Close connection
-    conn.close()
-    print("✓ Connection closed")
-
-    print()
     print("=" * 60)
     print("Setup Summary")
     print("=" * 60)
-    print(f"Successfully executed: {success_count}/{len(DDL_SCRIPTS)} scripts")
-    print()
-    print("Data Vault 2.0 Schema Created:")
-    print("  - External Stages (RAW schema)")
-    print("  - Hubs (STAGE schema)")
-    print("  - Links (STAGE schema)")
-    print("  - Satellites (STAGE schema)")
+    if args.dry_run:
+        print(f"Dry run: {pending} statements pending")
+    elif pending:
+        print(f"✓ Applied {pending} statements in one batch "
+              f"({time.perf_counter() - started:.2f}s)")
+    else:
+        print("✓ Schema up to date; nothing to apply")
+    print(f"Unchanged statements skipped: {sum(plan['skipped'] for plan in plans)}")
+    held = [obj for plan in plans for obj in plan["held"]]
+    if held:
+        print(f"⚠ {len(held)} changed table definitions held back")
     print("=" * 60)
+    return plans
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_args())
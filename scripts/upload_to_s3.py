@@ -1,12 +1,44 @@
 """
 Upload sample datasets to AWS S3 following the data lake folder structure.
 Organizes data by producer: finance/, operations/, crm/
+
+Tables generated as directories (sharded part files or Hive-style
+year=/month=/day= partitions) are mirrored below the table's S3 prefix so
+Glue and Snowflake can prune partitions.
+
+Files are uploaded concurrently by a thread pool (--concurrency), and each
+large file as a multipart upload of --chunk-size-mb parts sent on
+--threads-per-file threads.
+
+A manifest in the data directory records each uploaded file's size, SHA-256
+and S3 ETag. Files whose content and remote object still match it are
+skipped, and manifest entries whose local file has gone are reported as
+deletions.
+
+Multipart uploads are resumable: each one's upload ID and the ETags of its
+completed parts are checkpointed in the data directory, so a re-run after a
+failure sends only the missing parts. --abort-orphaned-uploads aborts
+multipart uploads under the table prefixes that no checkpoint refers to and
+that were started more than --orphan-min-age-hours ago, so uploads still
+running on other hosts or processes (such as generate_sample_data.py
+streams) are left alone.
 """
 
+import argparse
+import hashlib
+import io
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
@@ -18,6 +50,20 @@ SAMPLE_DATA_DIR = Path(__file__).parent.parent / "sample_data"
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "institutional-data-lake")
 AWS_REGION = os.getenv("AWS_DEFAULT_REGION", "us-east-1")
 
+# Transfer defaults: files uploaded at once, and per-file multipart settings
+UPLOAD_CONCURRENCY = 4
+THREADS_PER_FILE = 4
+MULTIPART_CHUNK_MB = 64
+MULTIPART_THRESHOLD_MB = 64
+MIN_PART_SIZE_MB = 5
+
+# Upload manifest and multipart checkpoints, kept in the data directory
+MANIFEST_FILENAME = ".upload_manifest.json"
+CHECKPOINT_DIRNAME = ".upload_checkpoints"
+
+# Multipart uploads younger than this are never treated as orphaned
+ORPHAN_MIN_AGE_HOURS = 24
+
 # Define file mappings: local file -> S3 path
 FILE_MAPPINGS = {
     # Finance files
@@ -35,10 +81,138 @@ FILE_MAPPINGS = {
 }
 
 
-def create_s3_client():
-    """Create and return an S3 client."""
+def table_prefix(table_name):
+    """Return the S3 prefix of a table, e.g. ``finance/transactions/``."""
+    return FILE_MAPPINGS[f"{table_name}.parquet"].rsplit("/", 1)[0] + "/"
+
+
+def table_prefixes():
+    """Return the S3 prefixes of every table in FILE_MAPPINGS, sorted."""
+    return sorted({s3_key.rsplit("/", 1)[0] + "/" for s3_key in FILE_MAPPINGS.values()})
+
+
+def s3_key_for(relative_path):
+    """Return the S3 key of a file at ``relative_path`` in the data directory.
+
+    ``<table>.parquet`` maps to its FILE_MAPPINGS key, and a file under a
+    table directory ``<table>/...`` to the same relative path below the
+    table's prefix.
+    """
+    table_part, *rest = Path(relative_path).parts
+    if not rest:
+        return FILE_MAPPINGS[table_part]
+    return table_prefix(table_part) + "/".join(rest)
+
+
+def discover_upload_files(data_dir=None):
+    """Return ``(local_file, s3_key)`` pairs for every dataset to upload.
+
+    A table written as a directory has each Parquet file under it uploaded
+    to the table's S3 prefix with the same relative path; otherwise the
+    single file from FILE_MAPPINGS is used.
+    """
+    data_dir = data_dir or SAMPLE_DATA_DIR
+    uploads = []
+    for local_filename in FILE_MAPPINGS:
+        table_dir = data_dir / Path(local_filename).stem
+        if table_dir.is_dir():
+            local_files = sorted(table_dir.rglob("*.parquet"))
+        else:
+            local_files = [data_dir / local_filename]
+        for local_file in local_files:
+            uploads.append((local_file, s3_key_for(local_file.relative_to(data_dir))))
+    return uploads
+
+
+def load_manifest(data_dir=None):
+    """Load the upload manifest, keyed by ``s3://bucket/key``."""
+    manifest_path = (data_dir or SAMPLE_DATA_DIR) / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+
+def _write_json(path, payload):
+    """Write ``payload`` as JSON to ``path``, replacing any previous file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+    temp_path.replace(path)
+
+
+def save_manifest(manifest, data_dir=None):
+    """Write the upload manifest, replacing the previous one atomically."""
+    _write_json((data_dir or SAMPLE_DATA_DIR) / MANIFEST_FILENAME, manifest)
+
+
+def checkpoint_path(bucket_name, s3_key, data_dir=None):
+    """Return the checkpoint file of a multipart upload to ``bucket_name/s3_key``."""
+    return (data_dir or SAMPLE_DATA_DIR) / CHECKPOINT_DIRNAME / bucket_name / f"{s3_key}.json"
+
+
+def load_checkpoint(path):
+    """Load a multipart upload checkpoint, or return None if there is none."""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def file_sha256(local_file):
+    """Return the SHA-256 hex digest of a file's content."""
+    with open(local_file, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def local_file_state(local_file, previous=None, rehash=False):
+    """Return a file's size, mtime and SHA-256.
+
+    The hash recorded in ``previous`` is reused while the size and mtime are
+    unchanged, so unchanged files are not re-read on every run.
+    """
+    stat = local_file.stat()
+    state = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if (
+        previous
+        and not rehash
+        and previous["size"] == state["size"]
+        and previous["mtime_ns"] == state["mtime_ns"]
+    ):
+        state["sha256"] = previous["sha256"]
+    else:
+        state["sha256"] = file_sha256(local_file)
+    return state
+
+
+def list_remote_objects(s3_client, bucket_name, prefixes):
+    """Return ``{s3_key: {"size", "etag"}}`` for objects under ``prefixes``.
+
+    One paginated listing per prefix replaces a HEAD request per file.
+    """
+    remote = {}
+    for prefix in prefixes:
+        kwargs = {"Bucket": bucket_name, "Prefix": prefix}
+        while True:
+            response = s3_client.list_objects_v2(**kwargs)
+            for item in response.get("Contents", []):
+                remote[item["Key"]] = {"size": item["Size"], "etag": item["ETag"]}
+            if not response.get("IsTruncated"):
+                break
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+    return remote
+
+
+def create_s3_client(max_pool_connections=10):
+    """Create and return an S3 client.
+
+    The client is shared by every upload thread, so its connection pool is
+    sized to the total number of concurrent requests.
+    """
     try:
-        s3_client = boto3.client("s3", region_name=AWS_REGION)
+        s3_client = boto3.client(
+            "s3",
+            region_name=AWS_REGION,
+            config=Config(max_pool_connections=max_pool_connections),
+        )
         return s3_client
     except Exception as e:
         print(f"Error creating S3 client: {e}")
@@ -75,50 +249,498 @@ def create_bucket(s3_client, bucket_name, region):
         return False
 
 
-def upload_file(s3_client, local_file, bucket_name, s3_key):
-    """Upload a file to S3."""
+def transfer_config(options):
+    """Build the boto3 multipart settings for one file from the upload options."""
+    return TransferConfig(
+        multipart_threshold=int(options.multipart_threshold_mb * 1024 * 1024),
+        multipart_chunksize=int(options.chunk_size_mb * 1024 * 1024),
+        max_concurrency=options.threads_per_file,
+    )
+
+
+def list_uploaded_parts(s3_client, bucket_name, s3_key, upload_id):
+    """Return ``{part_number: etag}`` of a multipart upload, or None if it no longer exists."""
+    parts = {}
+    kwargs = {"Bucket": bucket_name, "Key": s3_key, "UploadId": upload_id}
+    while True:
+        try:
+            response = s3_client.list_parts(**kwargs)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchUpload":
+                return None
+            raise
+        for part in response.get("Parts", []):
+            parts[part["PartNumber"]] = part["ETag"]
+        if not response.get("IsTruncated"):
+            return parts
+        kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+
+
+def _resume_checkpoint(s3_client, local_file, bucket_name, s3_key, part_size, path):
+    """Return the checkpoint of an upload to resume, or start a new multipart upload.
+
+    A checkpoint is resumed only if the file's size and mtime and the part
+    size are unchanged and S3 still holds the upload; its parts are kept
+    where S3 lists the same ETag. Otherwise any old upload is aborted.
+    """
+    stat = local_file.stat()
+    state = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "part_size": part_size}
+    checkpoint = load_checkpoint(path)
+    if checkpoint is not None:
+        upload_id = checkpoint["upload_id"]
+        if all(checkpoint[field] == value for field, value in state.items()):
+            remote_parts = list_uploaded_parts(s3_client, bucket_name, s3_key, upload_id)
+            if remote_parts is not None:
+                checkpoint["parts"] = {
+                    number: etag
+                    for number, etag in checkpoint["parts"].items()
+                    if remote_parts.get(int(number)) == etag
+                }
+                return checkpoint
+        else:
+            try:
+                s3_client.abort_multipart_upload(
+                    Bucket=bucket_name, Key=s3_key, UploadId=upload_id
+                )
+            except ClientError:
+                pass
+    response = s3_client.create_multipart_upload(Bucket=bucket_name, Key=s3_key)
+    checkpoint = {"upload_id": response["UploadId"], **state, "parts": {}}
+    _write_json(path, checkpoint)
+    return checkpoint
+
+
+def upload_multipart_resumable(s3_client, local_file, bucket_name, s3_key, config):
+    """Upload a file as a multipart upload that a later run can resume.
+
+    Parts of ``config.multipart_chunksize`` are sent on
+    ``config.max_concurrency`` threads. The upload ID and each completed
+    part's ETag are checkpointed as they finish, so after a failure only
+    the missing parts are sent again. The checkpoint is removed once the
+    upload completes.
+    """
+    path = checkpoint_path(bucket_name, s3_key)
+    part_size = config.multipart_chunksize
+    checkpoint = _resume_checkpoint(s3_client, local_file, bucket_name, s3_key, part_size, path)
+    num_parts = max(1, -(-checkpoint["size"] // part_size))
+    missing = [n for n in range(1, num_parts + 1) if str(n) not in checkpoint["parts"]]
+    if len(missing) < num_parts:
+        print(f"  ↻ Resuming {local_file.name}: {num_parts - len(missing)}/{num_parts} parts done")
+    checkpoint_lock = threading.Lock()
+
+    def send_part(part_number):
+        with open(local_file, "rb") as f:
+            f.seek((part_number - 1) * part_size)
+            body = f.read(part_size)
+        response = s3_client.upload_part(
+            Bucket=bucket_name,
+            Key=s3_key,
+            UploadId=checkpoint["upload_id"],
+            PartNumber=part_number,
+            Body=body,
+        )
+        with checkpoint_lock:
+            checkpoint["parts"][str(part_number)] = response["ETag"]
+            _write_json(path, checkpoint)
+
+    with ThreadPoolExecutor(max_workers=config.max_concurrency) as executor:
+        list(executor.map(send_part, missing))
+
+    parts = sorted((int(number), etag) for number, etag in checkpoint["parts"].items())
+    s3_client.complete_multipart_upload(
+        Bucket=bucket_name,
+        Key=s3_key,
+        UploadId=checkpoint["upload_id"],
+        MultipartUpload={"Parts": [{"PartNumber": n, "ETag": etag} for n, etag in parts]},
+    )
+    path.unlink()
+
+
+class S3MultipartWriter(io.RawIOBase):
+    """Writable file object that streams its bytes to one S3 object.
+
+    Bytes are buffered into parts of ``part_size`` and each full part is
+    sent with UploadPart on a background thread while writing continues. At
+    most ``max_in_flight`` parts are uploading at once and ``write`` blocks
+    for a free slot, so memory stays under ``max_in_flight + 1`` parts.
+    Closing sends the last part and completes the upload, or aborts it if a
+    part failed; an object smaller than one part is sent as a single PUT.
+    """
+
+    def __init__(self, s3_client, bucket_name, s3_key, part_size, max_in_flight=2):
+        super().__init__()
+        self.bucket_name = bucket_name
+        self.s3_key = s3_key
+        self._s3_client = s3_client
+        self._part_size = part_size
+        self._buffer = bytearray()
+        self._position = 0
+        self._upload_id = None
+        self._futures = []
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight)
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        while len(self._buffer) >= self._part_size:
+            self._send_part(bytes(self._buffer[:self._part_size]))
+            del self._buffer[:self._part_size]
+        return len(data)
+
+    def close(self):
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self._s3_client.put_object(
+                    Bucket=self.bucket_name, Key=self.s3_key, Body=bytes(self._buffer)
+                )
+            else:
+                if self._buffer:
+                    self._send_part(bytes(self._buffer))
+                parts = [future.result() for future in self._futures]
+                self._s3_client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=self.s3_key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            self._abort()
+            raise
+        finally:
+            self._buffer.clear()
+            self._executor.shutdown()
+            super().close()
+
+    def _send_part(self, body):
+        for future in self._futures:
+            if future.done() and future.exception():
+                raise future.exception()
+        if self._upload_id is None:
+            response = self._s3_client.create_multipart_upload(
+                Bucket=self.bucket_name, Key=self.s3_key
+            )
+            self._upload_id = response["UploadId"]
+        self._slots.acquire()
+        part_number = len(self._futures) + 1
+        self._futures.append(self._executor.submit(self._upload_part, part_number, body))
+
+    def _upload_part(self, part_number, body):
+        try:
+            response = self._s3_client.upload_part(
+                Bucket=self.bucket_name,
+                Key=self.s3_key,
+                UploadId=self._upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._slots.release()
+
+    def _abort(self):
+        if self._upload_id is None:
+            return
+        self._executor.shutdown()
+        try:
+            self._s3_client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.s3_key, UploadId=self._upload_id
+            )
+        except ClientError:
+            pass
+
+
+def delete_keys(s3_client, bucket_name, keys):
+    """Delete objects by key, up to 1,000 per DeleteObjects request."""
+    keys = sorted(keys)
+    for offset in range(0, len(keys), 1000):
+        batch = keys[offset:offset + 1000]
+        s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+        )
+
+
+def delete_prefix(s3_client, bucket_name, prefix):
+    """Delete every object under ``prefix`` and return how many were deleted."""
+    keys = list(list_remote_objects(s3_client, bucket_name, [prefix]))
+    delete_keys(s3_client, bucket_name, keys)
+    return len(keys)
+
+
+def list_multipart_uploads(s3_client, bucket_name, prefix=""):
+    """Return the in-progress multipart uploads under ``prefix``.
+
+    Each upload is ``(s3_key, upload_id, initiated)``, with ``initiated`` the
+    timezone-aware time the upload was started.
+    """
+    uploads = []
+    kwargs = {"Bucket": bucket_name, "Prefix": prefix}
+    while True:
+        response = s3_client.list_multipart_uploads(**kwargs)
+        uploads.extend(
+            (item["Key"], item["UploadId"], item["Initiated"])
+            for item in response.get("Uploads", [])
+        )
+        if not response.get("IsTruncated"):
+            return uploads
+        kwargs["KeyMarker"] = response["NextKeyMarker"]
+        kwargs["UploadIdMarker"] = response["NextUploadIdMarker"]
+
+
+def abort_orphaned_uploads(s3_client, bucket_name, data_dir=None,
+                           min_age_hours=ORPHAN_MIN_AGE_HOURS):
+    """Abort multipart uploads that no checkpoint refers to and return them.
+
+    Only uploads under the table prefixes and started at least
+    ``min_age_hours`` ago are aborted; uploads elsewhere in the bucket, and
+    recent ones that another host or process may still be writing, are
+    left alone. Checkpoints whose upload no longer exists in S3 are removed
+    as well, so the next run starts those files afresh.
+    """
+    checkpoint_dir = (data_dir or SAMPLE_DATA_DIR) / CHECKPOINT_DIRNAME / bucket_name
+    checkpoints = {
+        load_checkpoint(path)["upload_id"]: path for path in checkpoint_dir.rglob("*.json")
+    }
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=min_age_hours)
+    uploads = [
+        upload
+        for prefix in table_prefixes()
+        for upload in list_multipart_uploads(s3_client, bucket_name, prefix)
+    ]
+    orphaned = [
+        (key, upload_id)
+        for key, upload_id, initiated in uploads
+        if upload_id not in checkpoints and initiated <= cutoff
+    ]
+    for s3_key, upload_id in orphaned:
+        s3_client.abort_multipart_upload(Bucket=bucket_name, Key=s3_key, UploadId=upload_id)
+        print(f"  ✓ Aborted: s3://{bucket_name}/{s3_key} (upload {upload_id})")
+    live_upload_ids = {upload_id for _, upload_id, _ in uploads}
+    for upload_id, path in checkpoints.items():
+        if upload_id not in live_upload_ids:
+            path.unlink()
+            print(f"  ✓ Removed stale checkpoint: {path.name}")
+    return orphaned
+
+
+def upload_file(s3_client, local_file, bucket_name, s3_key, config=None):
+    """Upload a file to S3, as a resumable multipart upload when it is above the threshold."""
     try:
-        s3_client.upload_file(str(local_file), bucket_name, s3_key)
+        if config is not None and local_file.stat().st_size >= config.multipart_threshold:
+            upload_multipart_resumable(s3_client, local_file, bucket_name, s3_key, config)
+        else:
+            s3_client.upload_file(str(local_file), bucket_name, s3_key, Config=config)
         print(f"  ✓ Uploaded: {local_file.name} -> s3://{bucket_name}/{s3_key}")
         return True
-    except ClientError as e:
+    except (ClientError, S3UploadFailedError) as e:
         print(f"  ✗ Error uploading {local_file.name}: {e}")
         return False
 
 
-def upload_all_files(s3_client, bucket_name):
-    """Upload all sample data files to S3."""
+def _sync_file(s3_client, local_file, bucket_name, s3_key, config, previous, remote, options):
+    """Upload one file unless it matches its manifest entry and remote object.
+
+    Returns ``(status, entry)`` where status is ``uploaded``, ``skipped`` or
+    ``failed`` and entry is the file's new manifest entry.
+    """
+    state = local_file_state(local_file, previous, options.rehash)
+    unchanged = (
+        not options.force
+        and previous is not None
+        and remote is not None
+        and previous["sha256"] == state["sha256"]
+        and previous["etag"] == remote["etag"]
+        and previous["size"] == remote["size"]
+    )
+    if unchanged:
+        return "skipped", {**previous, **state}
+    if not upload_file(s3_client, local_file, bucket_name, s3_key, config):
+        return "failed", None
+    etag = s3_client.head_object(Bucket=bucket_name, Key=s3_key)["ETag"]
+    return "uploaded", {"file": local_file.name, **state, "etag": etag}
+
+
+def report_removed_files(s3_client, bucket_name, manifest, current_uris, delete):
+    """Report manifest entries whose local file is gone, deleting them remotely if asked."""
+    prefix = f"s3://{bucket_name}/"
+    removed = sorted(uri for uri in manifest if uri.startswith(prefix) and uri not in current_uris)
+    for uri in removed:
+        if delete:
+            s3_client.delete_object(Bucket=bucket_name, Key=uri.removeprefix(prefix))
+            del manifest[uri]
+            print(f"  ✓ Deleted: {uri} (removed locally)")
+        else:
+            print(f"  ⚠ Removed locally, still in S3: {uri}")
+    return removed
+
+
+def upload_all_files(s3_client, bucket_name, options=None):
+    """Upload all changed sample data files to S3, ``options.concurrency`` at a time.
+
+    Unchanged files are skipped using the upload manifest and a listing of
+    each table's S3 prefix.
+    """
+    options = options or parse_args([])
+    config = transfer_config(options)
     success_count = 0
     fail_count = 0
+    skip_count = 0
 
-    for local_filename, s3_key in FILE_MAPPINGS.items():
-        local_file = SAMPLE_DATA_DIR / local_filename
-
-        if not local_file.exists():
+    uploads = []
+    for local_file, s3_key in discover_upload_files():
+        if local_file.exists():
+            uploads.append((local_file, s3_key))
+        else:
             print(f"  ⚠ Warning: File not found: {local_file}")
             fail_count += 1
-            continue
 
-        if upload_file(s3_client, local_file, bucket_name, s3_key):
-            success_count += 1
-        else:
-            fail_count += 1
+    manifest = load_manifest()
+    remote = {}
+    if not options.force:
+        remote = list_remote_objects(s3_client, bucket_name, table_prefixes())
+    manifest_lock = threading.Lock()
+
+    def sync(local_file, s3_key):
+        uri = f"s3://{bucket_name}/{s3_key}"
+        status, entry = _sync_file(
+            s3_client,
+            local_file,
+            bucket_name,
+            s3_key,
+            config,
+            manifest.get(uri),
+            remote.get(s3_key),
+            options,
+        )
+        if status == "uploaded":
+            # Save after every upload so a failed run keeps its progress
+            with manifest_lock:
+                manifest[uri] = entry
+                save_manifest(manifest)
+        return status
+
+    started = time.perf_counter()
+    uploaded_bytes = 0
+    with ThreadPoolExecutor(max_workers=options.concurrency) as executor:
+        futures = [executor.submit(sync, local_file, s3_key) for local_file, s3_key in uploads]
+        for (local_file, _), future in zip(uploads, futures):
+            status = future.result()
+            if status == "uploaded":
+                success_count += 1
+                uploaded_bytes += local_file.stat().st_size
+            elif status == "skipped":
+                skip_count += 1
+            else:
+                fail_count += 1
+    elapsed = time.perf_counter() - started
+
+    current_uris = {f"s3://{bucket_name}/{s3_key}" for _, s3_key in uploads}
+    report_removed_files(s3_client, bucket_name, manifest, current_uris, options.delete_removed)
+    save_manifest(manifest)
 
+    if skip_count:
+        print(f"  Skipped {skip_count} unchanged files")
+
+    if uploaded_bytes:
+        megabytes = uploaded_bytes / (1024 * 1024)
+        print(
+            f"  Transferred {megabytes:,.1f} MB in {elapsed:,.1f}s "
+            f"({megabytes / max(elapsed, 1e-9):,.1f} MB/s)"
+        )
     return success_count, fail_count
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options for the upload."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=UPLOAD_CONCURRENCY,
+        help=f"Files uploaded at the same time (default: {UPLOAD_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--threads-per-file",
+        type=int,
+        default=THREADS_PER_FILE,
+        help=f"Threads sending the parts of one file (default: {THREADS_PER_FILE})",
+    )
+    parser.add_argument(
+        "--chunk-size-mb",
+        type=float,
+        default=MULTIPART_CHUNK_MB,
+        help=f"Multipart part size (default: {MULTIPART_CHUNK_MB}; "
+        f"S3 minimum is {MIN_PART_SIZE_MB})",
+    )
+    parser.add_argument(
+        "--multipart-threshold-mb",
+        type=float,
+        default=MULTIPART_THRESHOLD_MB,
+        help=f"Files at least this large use multipart uploads "
+        f"(default: {MULTIPART_THRESHOLD_MB})",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Upload every file, ignoring the manifest",
+    )
+    parser.add_argument(
+        "--rehash",
+        action="store_true",
+        help="Re-hash every file even if its size and mtime are unchanged",
+    )
+    parser.add_argument(
+        "--delete-removed",
+        action="store_true",
+        help="Delete S3 objects whose local file was removed since the last upload",
+    )
+    parser.add_argument(
+        "--abort-orphaned-uploads",
+        action="store_true",
+        help="Abort multipart uploads no local checkpoint refers to, then exit",
+    )
+    parser.add_argument(
+        "--orphan-min-age-hours",
+        type=float,
+        default=ORPHAN_MIN_AGE_HOURS,
+        help="Only abort uploads started at least this long ago "
+        f"(default: {ORPHAN_MIN_AGE_HOURS})",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.threads_per_file < 1:
+        parser.error("--concurrency and --threads-per-file must be at least 1")
+    if args.chunk_size_mb < MIN_PART_SIZE_MB:
+        parser.error(f"--chunk-size-mb must be at least {MIN_PART_SIZE_MB} (the S3 minimum)")
+    if args.orphan_min_age_hours < 0:
+        parser.error("--orphan-min-age-hours must not be negative")
+    return args
+
+
+def main(args=None):
     """Main function to upload data to S3."""
+    if args is None:
+        args = parse_args([])
+
     print("=" * 60)
     print("S3 Data Upload")
     print("=" * 60)
     print(f"Bucket: {S3_BUCKET_NAME}")
     print(f"Region: {AWS_REGION}")
+    print(f"Concurrency: {args.concurrency} files x {args.threads_per_file} threads")
     print()
 
     # Create S3 client
     try:
-        s3_client = create_s3_client()
+        s3_client = create_s3_client(args.concurrency * args.threads_per_file)
     except Exception as e:
         print(f"Failed to create S3 client: {e}")
         return
@@ -132,12 +754,20 @@ def main():
     else:
         print(f"✓ Bucket '{S3_BUCKET_NAME}' exists")
 
+    if args.abort_orphaned_uploads:
+        print()
+        aborted = abort_orphaned_uploads(
+            s3_client, S3_BUCKET_NAME, min_age_hours=args.orphan_min_age_hours
+        )
+        print(f"Aborted {len(aborted)} orphaned multipart uploads")
+        return
+
     print()
     print("Uploading files...")
     print("-" * 60)
 
     # Upload all files
-    success_count, fail_count = upload_all_files(s3_client, S3_BUCKET_NAME)
+    success_count, fail_count = upload_all_files(s3_client, S3_BUCKET_NAME, args)
 
     print("-" * 60)
     print()
@@ -155,4 +785,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_args())
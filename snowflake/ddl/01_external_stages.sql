@@ -42,6 +42,30 @@ CREATE OR REPLACE STAGE crm_stage
   )
   COMMENT = 'External stage for CRM domain data';
 
+-- Partitioned external tables
+-- The generator and uploader can lay files out as Hive-style partitions
+-- (<entity>/year=YYYY/month=MM[/day=DD]/part-*.parquet). Deriving partition
+-- columns from the file path lets date-range queries prune whole directories.
+CREATE OR REPLACE EXTERNAL TABLE ext_finance_transactions (
+    year INTEGER AS (TRY_TO_NUMBER(SPLIT_PART(SPLIT_PART(METADATA$FILENAME, 'year=', 2), '/', 1))),
+    month INTEGER AS (TRY_TO_NUMBER(SPLIT_PART(SPLIT_PART(METADATA$FILENAME, 'month=', 2), '/', 1)))
+)
+PARTITION BY (year, month)
+LOCATION = @finance_stage/transactions/
+FILE_FORMAT = (TYPE = PARQUET)
+AUTO_REFRESH = FALSE
+COMMENT = 'Finance transactions partitioned by year/month from the S3 path';
+
+CREATE OR REPLACE EXTERNAL TABLE ext_operations_orders (
+    year INTEGER AS (TRY_TO_NUMBER(SPLIT_PART(SPLIT_PART(METADATA$FILENAME, 'year=', 2), '/', 1))),
+    month INTEGER AS (TRY_TO_NUMBER(SPLIT_PART(SPLIT_PART(METADATA$FILENAME, 'month=', 2), '/', 1)))
+)
+PARTITION BY (year, month)
+LOCATION = @operations_stage/orders/
+FILE_FORMAT = (TYPE = PARQUET)
+AUTO_REFRESH = FALSE
+COMMENT = 'Operations orders partitioned by year/month from the S3 path';
+
 -- List files in stages to verify connectivity
 LIST @finance_stage;
 LIST @operations_stage;
@@ -7,5 +7,3 @@ This package contains unit and integration tests for:
 - Data quality checks
 - Snowflake setup scripts
 """
-
-
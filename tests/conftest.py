@@ -5,11 +5,21 @@ This module contains shared fixtures and configuration used across
 all test modules in the dbtDataLake project.
 """
 
-import os
+import hashlib
+import io
 import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+from boto3.s3.inject import upload_file as boto3_upload_file
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from botocore.hooks import HierarchicalEmitter
 
 
 # Add the project root to the Python path for imports
@@ -53,10 +63,10 @@ def mock_env_vars(monkeypatch):
         "AWS_SECRET_ACCESS_KEY": "test_aws_secret",
         "S3_BUCKET_NAME": "test-bucket",
     }
-    
+
     for key, value in test_env_vars.items():
         monkeypatch.setenv(key, value)
-    
+
     return test_env_vars
 
 
@@ -68,3 +78,202 @@ def temp_output_dir(tmp_path):
     return output_dir
 
 
+class FakeS3Client:
+    """Filesystem-backed stand-in for a boto3 S3 client.
+
+    Objects are stored as files under ``root/<bucket>/<key>``. It implements
+    the low-level calls boto3's managed transfer makes (PutObject and the
+    multipart CreateMultipartUpload/UploadPart/CompleteMultipartUpload), and
+    ``upload_file`` is boto3's own, so multipart splitting and per-file
+    threads come from the real transfer manager. ETags follow S3's rules: the
+    MD5 of the body, or for multipart uploads the MD5 of the part MD5s
+    suffixed with the part count. ``delay`` slows each request so tests can
+    observe concurrency through ``max_in_flight`` (files) and
+    ``max_parts_in_flight`` (parts); keys in ``fail_keys`` fail every write,
+    and part numbers in ``fail_parts`` fail their UploadPart. ``parts_sent``
+    records ``(key, part_number)`` of every part received. Multipart uploads
+    are reported as initiated ``upload_age`` before they were created.
+    """
+
+    def __init__(self, root, delay=0.0):
+        self.root = Path(root)
+        self.delay = delay
+        self.fail_keys = set()
+        self.fail_parts = set()
+        self.parts_sent = []
+        self.upload_age = timedelta(0)
+        self.uploads = []
+        self.max_in_flight = 0
+        self.max_parts_in_flight = 0
+        self._in_flight = 0
+        self._parts_in_flight = 0
+        self._etags = {}
+        self._multipart = {}
+        self._lock = threading.Lock()
+        self.meta = SimpleNamespace(
+            events=HierarchicalEmitter(),
+            config=Config(request_checksum_calculation="when_required"),
+        )
+
+    @staticmethod
+    def _error(code, operation):
+        return ClientError({"Error": {"Code": code, "Message": code}}, operation)
+
+    def _object_path(self, bucket, key):
+        bucket_dir = self.root / bucket
+        if not bucket_dir.is_dir():
+            raise self._error("NoSuchBucket", "PutObject")
+        return bucket_dir / key
+
+    def _check_writable(self, key, operation):
+        time.sleep(self.delay)
+        if key in self.fail_keys:
+            raise self._error("InternalError", operation)
+
+    def _store(self, bucket, key, body, etag):
+        path = self._object_path(bucket, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        with self._lock:
+            self._etags[(bucket, key)] = etag
+            self.uploads.append(key)
+
+    def head_bucket(self, Bucket):
+        if not (self.root / Bucket).is_dir():
+            raise self._error("404", "HeadBucket")
+        return {}
+
+    def create_bucket(self, Bucket, **kwargs):
+        (self.root / Bucket).mkdir(parents=True, exist_ok=True)
+        return {}
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None, Callback=None, Config=None):
+        with self._lock:
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            boto3_upload_file(self, Filename, Bucket, Key, ExtraArgs, Callback, Config)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self._check_writable(Key, "PutObject")
+        body = Body if isinstance(Body, bytes) else Body.read()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        self._store(Bucket, Key, body, etag)
+        return {"ETag": etag}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self._object_path(Bucket, Key)
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self._multipart[upload_id] = {
+                "Bucket": Bucket, "Key": Key, "Parts": {},
+                "Initiated": datetime.now(timezone.utc) - self.upload_age,
+            }
+        return {"Bucket": Bucket, "Key": Key, "UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **kwargs):
+        with self._lock:
+            self._parts_in_flight += 1
+            self.max_parts_in_flight = max(self.max_parts_in_flight, self._parts_in_flight)
+        try:
+            self._check_writable(Key, "UploadPart")
+            if PartNumber in self.fail_parts:
+                raise self._error("InternalError", "UploadPart")
+            body = Body if isinstance(Body, bytes) else Body.read()
+            with self._lock:
+                if UploadId not in self._multipart:
+                    raise self._error("NoSuchUpload", "UploadPart")
+                self._multipart[UploadId]["Parts"][PartNumber] = body
+                self.parts_sent.append((Key, PartNumber))
+            return {"ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+        finally:
+            with self._lock:
+                self._parts_in_flight -= 1
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload, **kwargs):
+        with self._lock:
+            upload = self._multipart.pop(UploadId, None)
+        if upload is None:
+            raise self._error("NoSuchUpload", "CompleteMultipartUpload")
+        bodies = [upload["Parts"][part["PartNumber"]] for part in MultipartUpload["Parts"]]
+        digests = b"".join(hashlib.md5(body).digest() for body in bodies)
+        etag = f'"{hashlib.md5(digests).hexdigest()}-{len(bodies)}"'
+        self._store(Bucket, Key, b"".join(bodies), etag)
+        return {"Bucket": Bucket, "Key": Key, "ETag": etag}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId, **kwargs):
+        with self._lock:
+            if self._multipart.pop(UploadId, None) is None:
+                raise self._error("NoSuchUpload", "AbortMultipartUpload")
+        return {}
+
+    def list_parts(self, Bucket, Key, UploadId, **kwargs):
+        with self._lock:
+            upload = self._multipart.get(UploadId)
+            if upload is None:
+                raise self._error("NoSuchUpload", "ListParts")
+            parts = [
+                {"PartNumber": number, "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+                 "Size": len(body)}
+                for number, body in sorted(upload["Parts"].items())
+            ]
+        return {"UploadId": UploadId, "Parts": parts, "IsTruncated": False}
+
+    def list_multipart_uploads(self, Bucket, Prefix="", **kwargs):
+        with self._lock:
+            uploads = [
+                {"Key": upload["Key"], "UploadId": upload_id, "Initiated": upload["Initiated"]}
+                for upload_id, upload in self._multipart.items()
+                if upload["Bucket"] == Bucket and upload["Key"].startswith(Prefix)
+            ]
+        return {"Uploads": uploads, "IsTruncated": False}
+
+    def get_object(self, Bucket, Key):
+        path = self._object_path(Bucket, Key)
+        if not path.is_file():
+            raise self._error("NoSuchKey", "GetObject")
+        return {"Body": io.BytesIO(path.read_bytes()), "ETag": self._etags[(Bucket, Key)]}
+
+    def head_object(self, Bucket, Key):
+        path = self._object_path(Bucket, Key)
+        if not path.is_file():
+            raise self._error("404", "HeadObject")
+        return {
+            "ContentLength": path.stat().st_size,
+            "ETag": self._etags[(Bucket, Key)],
+        }
+
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken=None):
+        if not (self.root / Bucket).is_dir():
+            raise self._error("NoSuchBucket", "ListObjectsV2")
+        contents = [
+            {"Key": key, "Size": self._object_path(Bucket, key).stat().st_size, "ETag": etag}
+            for (bucket, key), etag in sorted(self._etags.items())
+            if bucket == Bucket and key.startswith(Prefix)
+        ]
+        return {"Contents": contents, "KeyCount": len(contents), "IsTruncated": False}
+
+    def delete_object(self, Bucket, Key):
+        self._object_path(Bucket, Key).unlink(missing_ok=True)
+        self._etags.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket, Delete):
+        for item in Delete["Objects"]:
+            self.delete_object(Bucket=Bucket, Key=item["Key"])
+        return {}
+
+    def read(self, bucket, key):
+        """Return the stored body of an object (test helper, not an S3 API)."""
+        return self._object_path(bucket, key).read_bytes()
+
+
+@pytest.fixture
+def fake_s3(tmp_path):
+    """Provide a filesystem-backed S3 client with an existing ``test-bucket``."""
+    client = FakeS3Client(tmp_path / "fake_s3")
+    client.create_bucket(Bucket="test-bucket")
+    return client
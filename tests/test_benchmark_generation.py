@@ -0,0 +1,122 @@
+"""
+Unit tests for benchmark_generation.py script.
+
+Tests benchmark measurement of a single case and regression detection
+against a stored baseline.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _result(domain='finance', scale_factor=1.0, rows_per_second=1000.0, peak_rss_mb=200.0):
+    """Build a benchmark result with the fields compare_to_baseline reads."""
+    return {
+        'domain': domain,
+        'scale_factor': scale_factor,
+        'rows_per_second': rows_per_second,
+        'peak_rss_mb': peak_rss_mb,
+    }
+
+
+class TestCompareToBaseline:
+    """Test suite for baseline regression detection."""
+
+    def test_changes_within_threshold_pass(self):
+        """Test that small slowdowns and memory growth are not regressions."""
+        from scripts.benchmark_generation import compare_to_baseline
+
+        baseline = {'results': [_result()]}
+        results = [_result(rows_per_second=850.0, peak_rss_mb=230.0)]
+
+        assert compare_to_baseline(results, baseline, threshold=0.2) == []
+
+    def test_slowdown_and_memory_growth_are_regressions(self):
+        """Test that throughput drops and RSS growth past the threshold are reported."""
+        from scripts.benchmark_generation import compare_to_baseline
+
+        baseline = {'results': [_result()]}
+        results = [_result(rows_per_second=500.0, peak_rss_mb=300.0)]
+
+        regressions = compare_to_baseline(results, baseline, threshold=0.2)
+
+        assert [r['metric'] for r in regressions] == ['rows_per_second', 'peak_rss_mb']
+        assert regressions[0]['case'] == 'finance@sf1'
+        assert regressions[0]['change'] == -0.5
+        assert regressions[1]['change'] == 0.5
+
+    def test_improvements_and_new_cases_are_not_regressions(self):
+        """Test that faster runs and cases missing from the baseline pass."""
+        from scripts.benchmark_generation import compare_to_baseline
+
+        baseline = {'results': [_result()]}
+        results = [_result(rows_per_second=5000.0, peak_rss_mb=50.0), _result(domain='crm')]
+
+        assert compare_to_baseline(results, baseline, threshold=0.2) == []
+
+    def test_environment_differences_are_reported(self):
+        """Test that a baseline from another machine or library version is flagged."""
+        from scripts.benchmark_generation import environment, environment_differences
+
+        recorded = {**environment(), 'cpu_count': -1}
+
+        assert environment_differences({'environment': environment()}) == {}
+        assert environment_differences({'environment': recorded}) == {
+            'cpu_count': (-1, environment()['cpu_count'])
+        }
+
+
+class TestBenchmarkRun:
+    """Test suite for benchmark measurement and options."""
+
+    def test_run_case_measures_rows_time_memory_and_bytes(self):
+        """Test that a case reports rows, throughput, peak RSS and bytes per format."""
+        from scripts import benchmark_generation, generate_sample_data
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR'):
+            result = benchmark_generation._run_case(
+                'crm', 0.01, ['--formats', 'parquet,csv.gz']
+            )
+
+        assert result['rows'] == 10 + 30 + 8
+        assert result['wall_seconds'] > 0
+        assert result['rows_per_second'] > 0
+        assert result['peak_rss_mb'] > 0
+        assert set(result['output_bytes']) == {'parquet', 'csv.gz'}
+
+    def test_run_case_counts_shard_process_memory(self):
+        """Test that peak RSS includes the shard processes of a --workers run."""
+        import resource
+
+        from scripts import benchmark_generation, generate_sample_data
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR'):
+            result = benchmark_generation._run_case('crm', 0.01, ['--workers', '2'])
+
+        children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        assert result['peak_rss_mb'] >= round(children_kb / 1024, 1)
+
+    def test_generator_options_pass_through(self):
+        """Test that options after -- are kept for generate_sample_data.py."""
+        from scripts.benchmark_generation import parse_args
+
+        args = parse_args(['--scale-factors', '1', '100', '--', '--formats', 'parquet'])
+
+        assert args.scale_factors == [1.0, 100.0]
+        assert args.generator_args == ['--formats', 'parquet']
+
+    def test_save_results_records_environment(self, tmp_path):
+        """Test that saved results include the environment they ran in."""
+        import json
+
+        from scripts.benchmark_generation import save_results
+
+        save_results([_result()], tmp_path / 'results.json')
+
+        payload = json.loads((tmp_path / 'results.json').read_text())
+        assert payload['results'] == [_result()]
+        assert {'python', 'cpu_count', 'numpy', 'pyarrow'} <= set(payload['environment'])
@@ -0,0 +1,48 @@
+"""
+Unit tests for benchmark_hash_keys.py script.
+
+Tests that every hash format is loaded, measured and compared against hex.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class TestBenchmarkHashKeys:
+    """Test suite for the hash key format benchmark."""
+
+    def test_synthetic_link_references_hub_keys(self):
+        """Test that every link row points at a hub key and child keys are distinct."""
+        import pyarrow.compute as pc
+
+        from scripts.benchmark_hash_keys import synthetic_keys
+
+        hub_keys, link_keys = synthetic_keys(rows=50, fanout=3)
+
+        assert hub_keys.num_rows == 50 and link_keys.num_rows == 150
+        assert pc.all(pc.is_in(link_keys['parent_id'], value_set=hub_keys['parent_id'])).as_py()
+        assert len(pc.unique(link_keys['child_id'])) == 150
+
+    def test_compact_formats_store_smaller_keys(self, temp_output_dir):
+        """Test that binary and integer keys take less Parquet space than hex and join fully."""
+        from scripts import benchmark_hash_keys
+
+        output = temp_output_dir / 'results.json'
+        results = benchmark_hash_keys.main(benchmark_hash_keys.parse_args(
+            ['--rows', '500', '--fanout', '2', '--repeat', '1', '--workers', '1',
+             '--output', str(output)]
+        ))
+
+        by_format = {result['hash_format']: result for result in results}
+        assert list(by_format) == ['hex', 'binary', 'integer']
+        assert all(result['link_rows'] == 1000 for result in results)
+        assert (by_format['integer']['key_parquet_bytes']
+                < by_format['binary']['key_parquet_bytes']
+                < by_format['hex']['key_parquet_bytes'])
+        saved = json.loads(output.read_text())
+        assert saved['savings']['binary']['key_memory_bytes'] < 0
+        assert set(saved['savings']) == {'binary', 'integer'}
@@ -0,0 +1,97 @@
+"""
+Unit tests for bootstrap_duckdb.py script.
+
+Tests that the vault tables land in the stage schema of a local DuckDB
+database under the names the dbt sources use.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+duckdb = pytest.importorskip('duckdb')
+
+
+class TestBootstrap:
+    """Test suite for creating the stage schema."""
+
+    def test_tables_resolve_under_the_dbt_source_names(self, tmp_path):
+        """Test that Parquet and Arrow tables load and resolve as DATA_LAKE.STAGE.<table>."""
+        from scripts.bootstrap_duckdb import bootstrap
+
+        pq.write_table(pa.table({'customer_hk': ['a', 'b']}), tmp_path / 'hub_customer.parquet')
+        database = tmp_path / 'data_lake.duckdb'
+
+        counts = bootstrap(database, {
+            'hub_customer': tmp_path / 'hub_customer.parquet',
+            'sat_customer': pa.table({'customer_hk': ['a'], 'hash_diff': ['x']}),
+        })
+
+        assert counts == {'hub_customer': 2, 'sat_customer': 1}
+        conn = duckdb.connect(str(database), read_only=True)
+        try:
+            (rows,) = conn.execute('SELECT COUNT(*) FROM DATA_LAKE.STAGE.HUB_CUSTOMER').fetchone()
+        finally:
+            conn.close()
+        assert rows == 2
+
+    def test_satellite_deltas_are_end_dated_by_the_next_version(self, tmp_path):
+        """Test that satellite delta files load with end dates from their key's next version."""
+        from datetime import datetime
+
+        from scripts.bootstrap_duckdb import bootstrap
+
+        first_load, second_load = datetime(2025, 1, 1), datetime(2025, 1, 2)
+        deltas = []
+        for name, keys, load_date in [('first', ['a', 'b'], first_load),
+                                      ('second', ['a'], second_load)]:
+            deltas.append(tmp_path / f'{name}.parquet')
+            pq.write_table(pa.table({
+                'customer_hk': keys,
+                'load_date': pa.array([load_date] * len(keys), pa.timestamp('us')),
+                'end_date': pa.nulls(len(keys), pa.timestamp('us')),
+                'hash_diff': [name] * len(keys),
+            }), deltas[-1])
+        database = tmp_path / 'data_lake.duckdb'
+
+        counts = bootstrap(database, {'sat_customer': deltas})
+
+        assert counts == {'sat_customer': 3}
+        conn = duckdb.connect(str(database), read_only=True)
+        try:
+            rows = conn.execute(
+                'SELECT customer_hk, hash_diff, end_date FROM stage.sat_customer '
+                'ORDER BY customer_hk, load_date'
+            ).fetchall()
+        finally:
+            conn.close()
+        assert rows == [('a', 'first', second_load), ('a', 'second', None), ('b', 'first', None)]
+
+    def test_main_builds_the_vault_when_no_files_exist(self, temp_output_dir):
+        """Test that every hub, link and satellite is created from the sample data."""
+        from scripts import bootstrap_duckdb, generate_sample_data, load_data_vault
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(load_data_vault, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(load_data_vault, 'VAULT_DATA_DIR', temp_output_dir / 'vault'):
+            options = generate_sample_data.parse_args(
+                ['--scale-factor', '0.01', '--formats', 'parquet']
+            )
+            generate_sample_data.generate_finance_data(options)
+            generate_sample_data.generate_operations_data(options)
+            generate_sample_data.generate_crm_data(options)
+
+            counts = bootstrap_duckdb.main(bootstrap_duckdb.parse_args(
+                ['--database', str(temp_output_dir / 'data_lake.duckdb'), '--workers', '1']
+            ))
+
+        expected = {*load_data_vault.HUBS, *load_data_vault.LINKS, *load_data_vault.SATELLITES}
+        assert set(counts) == expected
+        assert counts['sat_order'] == 20
@@ -0,0 +1,262 @@
+"""
+Unit tests for bulk_load.py script.
+
+Tests chunked Parquet staging, the local stand-in backend, and the
+statements the Snowflake backend issues for PUT, COPY INTO, SWAP and MERGE.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _hub(keys, load_date):
+    """Build hub_customer rows for ``keys`` loaded at ``load_date``."""
+    return pa.table({
+        'customer_hk': keys,
+        'customer_id': keys,
+        'load_date': pa.array([load_date] * len(keys), pa.timestamp('us')),
+        'record_source': ['CRM'] * len(keys),
+    })
+
+
+def _satellite(keys, hash_diffs, load_date):
+    """Build sat_customer delta rows for ``keys`` loaded at ``load_date``."""
+    return pa.table({
+        'customer_hk': keys,
+        'load_date': pa.array([load_date] * len(keys), pa.timestamp('us')),
+        'end_date': pa.nulls(len(keys), pa.timestamp('us')),
+        'hash_diff': hash_diffs,
+    })
+
+
+def _table(rows, start=0):
+    """Build a small two-column table with ids ``start .. start + rows - 1``."""
+    ids = list(range(start, start + rows))
+    return pa.table({'id': ids, 'name': [f'n{i}' for i in ids]})
+
+
+class FakeCursor:
+    """Cursor recording statements; COPY returns one result row per staged file."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._result = []
+
+    def execute(self, statement):
+        self.conn.statements.append(statement)
+        if statement.startswith('PUT'):
+            pattern = statement.split("'")[1][len('file://'):]
+            self.conn.staged = [pq.read_metadata(p).num_rows
+                                for p in sorted(Path(pattern).parent.glob('*.parquet'))]
+        elif statement.startswith('COPY'):
+            self._result = [(f'chunk-{i}', 'LOADED', rows, rows)
+                            for i, rows in enumerate(self.conn.staged)]
+        elif statement.startswith('MERGE'):
+            self._result = [(sum(self.conn.staged), 0)]
+        elif statement.startswith('SELECT MAX(load_date)'):
+            self._result = [(self.conn.max_load_date,)]
+
+    def fetchall(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Snowflake connection stand-in handing out FakeCursors."""
+
+    def __init__(self, max_load_date=None):
+        self.statements = []
+        self.staged = []
+        self.max_load_date = max_load_date
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class TestStaging:
+    """Test suite for chunked Parquet staging."""
+
+    def test_table_is_split_into_chunk_files(self, tmp_path):
+        """Test that a table is staged as files of at most chunk_rows rows, in order."""
+        from scripts.bulk_load import stage_parquet
+
+        paths = stage_parquet(_table(2500), tmp_path, chunk_rows=1000, workers=3)
+
+        assert [pq.read_metadata(p).num_rows for p in paths] == [1000, 1000, 500]
+        assert pq.read_table(paths[2])['id'][0].as_py() == 2000
+
+
+class TestLocalBackend:
+    """Test suite for the offline stand-in warehouse."""
+
+    def test_loads_append_and_replace_swaps_the_rows(self, tmp_path):
+        """Test that loads append to a table and replace leaves only the new rows."""
+        from scripts.bulk_load import LocalBackend, bulk_load
+
+        backend = LocalBackend(tmp_path)
+
+        bulk_load(backend, 'STAGE', 'hub_order', _table(300), chunk_rows=100)
+        result = bulk_load(backend, 'STAGE', 'hub_order', _table(50, start=300).to_pandas())
+
+        assert result['rows'] == 50
+        assert sorted(backend.read('STAGE', 'hub_order')['id'].to_pylist()) == list(range(350))
+        bulk_load(backend, 'STAGE', 'hub_order', _table(10), replace=True)
+        assert backend.read('STAGE', 'hub_order').num_rows == 10
+        assert [p.name for p in (tmp_path / 'stage').iterdir()] == ['hub_order']
+
+    def test_main_loads_vault_and_raw_tables(self, temp_output_dir):
+        """Test that main loads vault files into STAGE and producer files into RAW."""
+        from scripts import bulk_load
+
+        vault_dir = temp_output_dir / 'vault'
+        (vault_dir / 'hub_customer').mkdir(parents=True)
+        pq.write_table(_hub([f'c{i}' for i in range(40)], datetime(2025, 1, 1)),
+                       vault_dir / 'hub_customer' / 'load-20250101T000000000000.parquet')
+        pq.write_table(_table(25), temp_output_dir / 'crm_customers.parquet')
+
+        with patch.object(bulk_load, 'VAULT_DATA_DIR', vault_dir), \
+                patch.object(bulk_load, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(bulk_load, 'WAREHOUSE_DIR', temp_output_dir / 'warehouse'):
+            results = bulk_load.main(bulk_load.parse_args(['--raw', '--chunk-rows', '10']))
+            backend = bulk_load.LocalBackend()
+
+            assert {name: r['rows'] for name, r in results.items()} == {
+                'STAGE.hub_customer': 40, 'RAW.crm_customers': 25
+            }
+            assert len(list(backend.table_dir('STAGE', 'hub_customer').iterdir())) == 4
+            assert backend.read('RAW', 'crm_customers').num_rows == 25
+
+    def test_rerunning_main_loads_only_newer_deltas(self, temp_output_dir):
+        """Test that a re-run merges only deltas newer than the table and replaces RAW."""
+        from scripts import bulk_load
+
+        hub_dir = temp_output_dir / 'vault' / 'hub_customer'
+        hub_dir.mkdir(parents=True)
+        pq.write_table(_hub(['a', 'b'], datetime(2025, 1, 1)),
+                       hub_dir / 'load-20250101T000000000000.parquet')
+        pq.write_table(_table(25), temp_output_dir / 'crm_customers.parquet')
+
+        with patch.object(bulk_load, 'VAULT_DATA_DIR', temp_output_dir / 'vault'), \
+                patch.object(bulk_load, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(bulk_load, 'WAREHOUSE_DIR', temp_output_dir / 'warehouse'):
+            bulk_load.main(bulk_load.parse_args(['--raw']))
+            pq.write_table(_hub(['b', 'c'], datetime(2025, 1, 2)),
+                           hub_dir / 'load-20250102T000000000000.parquet')
+            results = bulk_load.main(bulk_load.parse_args(['--raw']))
+            rerun = bulk_load.main(bulk_load.parse_args(['--raw']))
+            backend = bulk_load.LocalBackend()
+
+            assert results['STAGE.hub_customer']['rows'] == 1
+            assert rerun['STAGE.hub_customer']['rows'] == 0
+            assert backend.read('STAGE', 'hub_customer').num_rows == 3
+            assert backend.read('RAW', 'crm_customers').num_rows == 25
+
+            bulk_load.main(bulk_load.parse_args(['--full-refresh']))
+            assert backend.read('STAGE', 'hub_customer').num_rows == 4
+
+    def test_merging_a_delta_twice_changes_nothing(self, tmp_path):
+        """Test that merges add new keys and versions once and end-date replaced rows."""
+        from scripts.bulk_load import LocalBackend, bulk_merge
+
+        backend = LocalBackend(tmp_path)
+        first, second = datetime(2025, 1, 1), datetime(2025, 1, 2)
+
+        bulk_merge(backend, 'STAGE', 'hub_customer', _hub(['a', 'b'], first))
+        bulk_merge(backend, 'STAGE', 'sat_customer', _satellite(['a', 'b'], ['1', '1'], first))
+        delta = _satellite(['b', 'c'], ['2', '1'], second)
+        results = [bulk_merge(backend, 'STAGE', 'sat_customer', delta) for _ in range(2)]
+        hub = bulk_merge(backend, 'STAGE', 'hub_customer', _hub(['b', 'c'], second))
+
+        assert [r['rows'] for r in results] == [2, 0]
+        assert hub['rows'] == 1
+        assert backend.read('STAGE', 'hub_customer').num_rows == 3
+        satellite = backend.read('STAGE', 'sat_customer').sort_by(
+            [('customer_hk', 'ascending'), ('load_date', 'ascending')]
+        )
+        assert satellite['hash_diff'].to_pylist() == ['1', '1', '2', '1']
+        assert satellite['end_date'].to_pylist() == [None, second, None, None]
+
+
+class TestSnowflakeBackend:
+    """Test suite for the Snowflake PUT and COPY INTO path."""
+
+    def test_copy_stages_chunks_and_sums_loaded_rows(self):
+        """Test that all chunks are PUT in one parallel statement and copied by name."""
+        from scripts.bulk_load import SnowflakeBackend, bulk_load
+
+        conn = FakeConnection()
+
+        result = bulk_load(SnowflakeBackend(conn), 'STAGE', 'sat_order', _table(2500),
+                           chunk_rows=1000, workers=4)
+
+        put, copy = conn.statements
+        assert put.endswith("/*.parquet' @STAGE.%sat_order "
+                            "PARALLEL = 4 AUTO_COMPRESS = FALSE OVERWRITE = TRUE")
+        assert copy.startswith('COPY INTO STAGE.sat_order FROM @STAGE.%sat_order')
+        assert 'MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE' in copy
+        assert conn.staged == [1000, 1000, 500]
+        assert result['rows'] == 2500
+
+    def test_replace_loads_a_copy_and_swaps_it_in(self):
+        """Test that a replace copies into <table>_new and swaps it with the table."""
+        from scripts.bulk_load import SnowflakeBackend, bulk_load
+
+        conn = FakeConnection()
+
+        result = bulk_load(SnowflakeBackend(conn), 'RAW', 'crm_customers', _table(30),
+                           replace=True)
+
+        create, put, copy, swap, drop = conn.statements
+        assert create == 'CREATE OR REPLACE TABLE RAW.crm_customers_new LIKE RAW.crm_customers'
+        assert '@RAW.%crm_customers_new' in put
+        assert copy.startswith('COPY INTO RAW.crm_customers_new')
+        assert swap == 'ALTER TABLE RAW.crm_customers SWAP WITH RAW.crm_customers_new'
+        assert drop == 'DROP TABLE IF EXISTS RAW.crm_customers_new'
+        assert result['rows'] == 30
+
+    def test_only_deltas_after_the_latest_load_date_are_merged(self, tmp_path):
+        """Test that deltas up to the table's MAX(load_date) are skipped."""
+        from scripts.bulk_load import SnowflakeBackend, merge_new_deltas
+
+        conn = FakeConnection(max_load_date=datetime(2025, 1, 1))
+        files = []
+        for day in (1, 2):
+            files.append(tmp_path / f'load-202501{day:02d}T000000000000.parquet')
+            pq.write_table(_hub(['a'], datetime(2025, 1, day)), files[-1])
+
+        result = merge_new_deltas(SnowflakeBackend(conn), 'hub_customer', files)
+
+        assert conn.statements[0] == 'SELECT MAX(load_date) FROM STAGE.hub_customer'
+        assert [s.split()[0] for s in conn.statements[1:]] == [
+            'CREATE', 'PUT', 'COPY', 'MERGE', 'DROP'
+        ]
+        assert result['rows'] == 1
+
+    def test_merge_copies_the_delta_into_a_temporary_table(self):
+        """Test that a delta is copied into a temporary table and merged into the target."""
+        from scripts.bulk_load import SnowflakeBackend, bulk_merge
+
+        conn = FakeConnection()
+        delta = _satellite(['a', 'b'], ['1', '1'], datetime(2025, 1, 1))
+
+        result = bulk_merge(SnowflakeBackend(conn), 'STAGE', 'sat_customer', delta, workers=2)
+
+        create, put, copy, merge, drop = conn.statements
+        assert create == ('CREATE OR REPLACE TEMPORARY TABLE STAGE.sat_customer_delta '
+                          'LIKE STAGE.sat_customer')
+        assert '@STAGE.%sat_customer_delta' in put
+        assert copy.startswith('COPY INTO STAGE.sat_customer_delta')
+        assert merge.startswith('MERGE INTO STAGE.sat_customer AS target')
+        assert 'FROM STAGE.sat_customer_delta AS staged' in merge
+        assert drop == 'DROP TABLE IF EXISTS STAGE.sat_customer_delta'
+        assert result['rows'] == 2
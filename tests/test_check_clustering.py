@@ -0,0 +1,99 @@
+"""
+Unit tests for check_clustering.py script.
+
+Tests the clustering measures of block key ranges, reading cluster keys
+from the dbt manifest, and the depth check against a local DuckDB table.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class TestClusteringMetrics:
+    """Test suite for overlap, depth and scan fraction."""
+
+    def test_disjoint_blocks_are_perfectly_clustered(self):
+        """Test that blocks covering consecutive date ranges have depth 1 and no overlaps."""
+        from scripts.check_clustering import clustering_metrics
+
+        mins = np.arange(0, 100, 10)
+        metrics = clustering_metrics(mins, mins + 9, window_days=10)
+
+        assert metrics == {
+            'blocks': 10, 'average_overlaps': 0.0, 'average_depth': 1.0, 'scan_fraction': 0.1,
+        }
+
+    def test_blocks_spanning_the_whole_range_are_all_scanned(self):
+        """Test that blocks each holding every date overlap all others and are always read."""
+        from scripts.check_clustering import clustering_metrics
+
+        metrics = clustering_metrics(np.zeros(8), np.full(8, 99), window_days=10)
+
+        assert metrics['average_overlaps'] == 7.0
+        assert metrics['average_depth'] == 8.0
+        assert metrics['scan_fraction'] == 1.0
+
+    def test_empty_table_has_no_measures(self):
+        """Test that a table without rows reports zero blocks."""
+        from scripts.check_clustering import clustering_metrics
+
+        assert clustering_metrics([], [])['blocks'] == 0
+
+
+class TestClusterKeys:
+    """Test suite for reading cluster keys from the dbt manifest."""
+
+    def test_only_models_with_cluster_by_are_checked(self):
+        """Test that the first cluster_by column of each model is its key."""
+        from scripts.check_clustering import cluster_keys
+
+        manifest = {'nodes': {
+            'model.a': {'resource_type': 'model', 'relation_name': 'a',
+                        'config': {'cluster_by': ['order_date_only', 'order_id']}},
+            'model.b': {'resource_type': 'model', 'relation_name': 'b',
+                        'config': {'cluster_by': 'transaction_date_only'}},
+            'model.c': {'resource_type': 'model', 'relation_name': 'c', 'config': {}},
+            'test.d': {'resource_type': 'test', 'config': {'cluster_by': ['x']}},
+        }}
+
+        assert cluster_keys(manifest) == {'a': 'order_date_only', 'b': 'transaction_date_only'}
+
+
+class TestCheckTable:
+    """Test suite for measuring tables in DuckDB."""
+
+    def test_sorted_table_passes_and_shuffled_table_fails(self, tmp_path):
+        """Test that the check reads storage order and fails tables deeper than --max-depth."""
+        duckdb = pytest.importorskip('duckdb')
+        from scripts import check_clustering
+
+        database = tmp_path / 'data_lake.duckdb'
+        conn = duckdb.connect(str(database))
+        conn.execute(
+            "CREATE TABLE sorted_orders AS SELECT DATE '2024-01-01' + CAST(i // 10 AS INTEGER) "
+            "AS order_date_only FROM range(1000) t(i) ORDER BY order_date_only"
+        )
+        conn.execute(
+            "CREATE TABLE shuffled_orders AS SELECT * FROM sorted_orders ORDER BY hash(rowid)"
+        )
+        conn.close()
+        manifest = tmp_path / 'manifest.json'
+        manifest.write_text(json.dumps({'nodes': {
+            f'model.{name}': {'resource_type': 'model', 'relation_name': name,
+                              'config': {'cluster_by': ['order_date_only']}}
+            for name in ('sorted_orders', 'shuffled_orders', 'missing_orders')
+        }}))
+
+        failing = check_clustering.main(check_clustering.parse_args([
+            '--database', str(database), '--manifest', str(manifest), '--block-rows', '100',
+        ]))
+
+        assert [result['relation'] for result in failing] == ['shuffled_orders']
+        assert failing[0]['scan_fraction'] > 0.9
@@ -0,0 +1,180 @@
+"""
+Unit tests for compact_data_lake.py script.
+
+Tests how small Parquet files are grouped per directory, merged into
+target-size files, optionally sorted, and swapped in locally and in S3.
+"""
+
+import sys
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _write_small_files(directory, count, rows=50, start=0):
+    """Write ``count`` small Parquet files of ``rows`` descending ids each."""
+    directory.mkdir(parents=True, exist_ok=True)
+    for index in range(count):
+        first = start + (count - index) * rows
+        ids = list(range(first, first - rows, -1))
+        pq.write_table(
+            pa.table({'id': ids, 'value': [f'v{i}' for i in ids]}),
+            directory / f'part-{index:05d}.parquet',
+        )
+
+
+class TestPlanCompaction:
+    """Test suite for choosing which files to merge."""
+
+    def test_small_files_are_grouped_per_directory(self):
+        """Test that only directories with several small files are compacted."""
+        from scripts.compact_data_lake import plan_compaction
+
+        files = {
+            'year=2023/month=01/a.parquet': 10,
+            'year=2023/month=01/b.parquet': 10,
+            'year=2023/month=02/a.parquet': 10,
+            'year=2023/month=03/a.parquet': 10,
+            'year=2023/month=03/big.parquet': 1000,
+        }
+
+        assert plan_compaction(files, target_bytes=100) == {
+            'year=2023/month=01': ['year=2023/month=01/a.parquet', 'year=2023/month=01/b.parquet'],
+        }
+
+
+class TestLocalCompaction:
+    """Test suite for compacting a local table directory."""
+
+    def test_partitions_are_merged_without_losing_rows(self, temp_output_dir, capsys):
+        """Test that each partition's files become one file with the same rows."""
+        from scripts import compact_data_lake
+
+        _write_small_files(temp_output_dir / 'year=2023' / 'month=01', 4)
+        _write_small_files(temp_output_dir / 'year=2023' / 'month=02', 3, start=1000)
+        before = pq.read_table(temp_output_dir / 'year=2023' / 'month=01').sort_by('id')
+
+        summary = compact_data_lake.main(
+            compact_data_lake.parse_args([str(temp_output_dir), '--target-file-mb', '1'])
+        )
+
+        month_01 = list((temp_output_dir / 'year=2023' / 'month=01').iterdir())
+        assert len(month_01) == 1 and month_01[0].name.startswith('compacted-')
+        assert pq.read_table(month_01[0]).sort_by('id').equals(before)
+        assert len(list((temp_output_dir / 'year=2023' / 'month=02').iterdir())) == 1
+        assert (summary['files_before'], summary['files_after']) == (7, 2)
+        assert 'Files: 7 -> 2 (5 fewer)' in capsys.readouterr().out
+
+    def test_sort_by_orders_rows_and_row_groups_are_full(self, temp_output_dir):
+        """Test that --sort-by sorts the merged rows into full row groups."""
+        from scripts import compact_data_lake
+
+        _write_small_files(temp_output_dir, 5)
+        options = compact_data_lake.parse_args(
+            [str(temp_output_dir), '--sort-by', 'id', '--row-group-rows', '100']
+        )
+
+        compact_data_lake.main(options)
+
+        (compacted,) = temp_output_dir.iterdir()
+        ids = pq.read_table(compacted).column('id').to_pylist()
+        metadata = pq.read_metadata(compacted)
+        assert ids == sorted(ids) and len(ids) == 250
+        assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [
+            100, 100, 50
+        ]
+
+    def test_output_rolls_at_target_size(self, temp_output_dir):
+        """Test that merged rows are split across files at the target size."""
+        from scripts import compact_data_lake
+
+        _write_small_files(temp_output_dir, 10, rows=2000)
+        options = compact_data_lake.parse_args(
+            [str(temp_output_dir), '--target-file-mb', '0.05', '--row-group-rows', '2000']
+        )
+
+        summary = compact_data_lake.main(options)
+
+        files = sorted(temp_output_dir.iterdir())
+        assert 1 < len(files) < 10
+        assert sum(pq.read_metadata(f).num_rows for f in files) == 20000
+        assert summary['files_after'] == len(files)
+
+
+class TestCrashRecovery:
+    """Test suite for resuming compactions a crashed run left behind."""
+
+    def _crash(self, store, operation):
+        """Make ``store.<operation>`` fail on its first call, as if the process died."""
+        original = getattr(store, operation)
+
+        def fail_once(*args):
+            setattr(store, operation, original)
+            raise RuntimeError('crashed')
+
+        setattr(store, operation, fail_once)
+
+    def test_crash_before_deleting_inputs_does_not_duplicate_rows(self, temp_output_dir):
+        """Test that the next run deletes inputs whose merged file was already committed."""
+        from scripts import compact_data_lake
+
+        _write_small_files(temp_output_dir, 4)
+        options = compact_data_lake.parse_args([str(temp_output_dir)])
+        store = compact_data_lake.LocalStore(temp_output_dir)
+        self._crash(store, 'delete')
+        with pytest.raises(RuntimeError):
+            compact_data_lake.compact(store, options)
+        assert len(store.list_files()) == 5
+
+        compact_data_lake.compact(store, options)
+
+        (compacted,) = temp_output_dir.iterdir()
+        assert compacted.name.startswith('compacted-')
+        assert pq.read_table(compacted).num_rows == 200
+
+    def test_crash_while_writing_rolls_back_partial_output(self, temp_output_dir):
+        """Test that partial merged files of an uncommitted run are removed, inputs kept."""
+        from scripts import compact_data_lake
+
+        _write_small_files(temp_output_dir, 4)
+        options = compact_data_lake.parse_args([str(temp_output_dir)])
+        store = compact_data_lake.LocalStore(temp_output_dir)
+        self._crash(store, 'finish_output')
+        with pytest.raises(RuntimeError):
+            compact_data_lake.compact(store, options)
+
+        assert compact_data_lake.recover(store) == 1
+
+        assert sorted(path.name for path in temp_output_dir.iterdir()) == [
+            f'part-{index:05d}.parquet' for index in range(4)
+        ]
+
+
+class TestS3Compaction:
+    """Test suite for compacting an S3 prefix."""
+
+    def test_prefix_is_compacted_in_place(self, temp_output_dir, fake_s3):
+        """Test that small objects are replaced by one compacted object."""
+        from scripts import compact_data_lake
+
+        _write_small_files(temp_output_dir, 4)
+        for part in sorted(temp_output_dir.iterdir()):
+            fake_s3.put_object(
+                Bucket='test-bucket', Key=f'crm/interactions/{part.name}', Body=part.read_bytes()
+            )
+        options = compact_data_lake.parse_args(['s3://test-bucket/crm/interactions/'])
+        store = compact_data_lake.S3Store(fake_s3, 'test-bucket', 'crm/interactions', options)
+
+        summary = compact_data_lake.compact(store, options)
+
+        listing = fake_s3.list_objects_v2(Bucket='test-bucket', Prefix='crm/interactions/')
+        (key,) = [item['Key'] for item in listing['Contents']]
+        assert key.startswith('crm/interactions/compacted-')
+        table = pq.read_table(pa.BufferReader(fake_s3.read('test-bucket', key)))
+        assert table.num_rows == 200
+        assert (summary['files_before'], summary['files_after']) == (4, 1)
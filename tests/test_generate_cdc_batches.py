@@ -0,0 +1,164 @@
+"""
+Unit tests for generate_cdc_batches.py script.
+
+Tests CDC delta batch generation against a small generated snapshot:
+change rates, batch numbering and timestamps, and replay of earlier batches.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture
+def snapshot_dir(temp_output_dir):
+    """Generate a small customers snapshot and point both scripts at it."""
+    from scripts import generate_cdc_batches, generate_sample_data
+
+    with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir), \
+            patch.object(generate_cdc_batches, 'SAMPLE_DATA_DIR', temp_output_dir), \
+            patch.object(generate_cdc_batches, 'CDC_DATA_DIR', temp_output_dir / 'cdc'):
+        generate_sample_data._generate_table(
+            'crm_customers', generate_sample_data.customers_table, 1000,
+            generate_sample_data.parse_args(['--formats', 'parquet']),
+        )
+        yield temp_output_dir
+
+
+class TestChangeRates:
+    """Test suite for CDC rate options."""
+
+    def test_default_rates_apply_to_every_table(self):
+        """Test that every CDC table gets the default rates."""
+        from scripts.generate_cdc_batches import CDC_TABLES, DEFAULT_CHANGE_RATES, parse_args
+
+        args = parse_args([])
+
+        assert set(args.change_rates) == set(CDC_TABLES)
+        assert args.change_rates['crm_customers'] == DEFAULT_CHANGE_RATES
+
+    def test_rate_override_applies_to_one_table(self):
+        """Test that --rate overrides one kind for a single table."""
+        from scripts.generate_cdc_batches import parse_args
+
+        args = parse_args(['--update-rate', '0.01', '--rate', 'crm_customers:update=0.05'])
+
+        assert args.change_rates['crm_customers']['update'] == 0.05
+        assert args.change_rates['finance_accounts']['update'] == 0.01
+
+    def test_invalid_rate_override_is_rejected(self):
+        """Test that unknown tables, kinds and out-of-range rates are rejected."""
+        from scripts.generate_cdc_batches import parse_args
+
+        for override in ('finance_ledger:update=0.1', 'crm_customers:merge=0.1',
+                         'crm_customers:update=2'):
+            with pytest.raises(SystemExit):
+                parse_args(['--rate', override])
+
+    def test_formats_without_parquet_are_rejected(self):
+        """Test that batches must be written as Parquet so later runs can replay them."""
+        from scripts.generate_cdc_batches import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(['--formats', 'csv'])
+        assert parse_args(['--formats', 'csv,parquet']).formats == ('csv', 'parquet')
+
+    def test_interval_below_one_hour_is_rejected(self):
+        """Test that batch windows must advance so batch timestamps keep increasing."""
+        from scripts.generate_cdc_batches import parse_args
+
+        for interval in ('0', '-6'):
+            with pytest.raises(SystemExit):
+                parse_args(['--interval-hours', interval])
+
+
+class TestBatchGeneration:
+    """Test suite for CDC batch contents."""
+
+    def _run(self, argv):
+        """Generate customer batches with the given CLI options."""
+        from scripts import generate_cdc_batches
+
+        args = generate_cdc_batches.parse_args(['--tables', 'crm_customers', *argv])
+        return generate_cdc_batches.main(args)['crm_customers']
+
+    def test_batch_changes_match_rates(self, snapshot_dir):
+        """Test that a batch holds the configured inserts, updates and deletes."""
+        summary = self._run(
+            ['--insert-rate', '0.01', '--update-rate', '0.05', '--delete-rate', '0.02']
+        )
+
+        batch = pq.read_table(snapshot_dir / 'cdc' / 'crm_customers' / 'batch_000001.parquet')
+        assert summary[0]['insert'] == 10
+        assert summary[0]['delete'] == 20
+        assert 0 < summary[0]['update'] <= 50
+        assert batch.num_rows == sum(summary[0][kind] for kind in ('insert', 'update', 'delete'))
+        assert set(batch.column('cdc_batch_id').to_pylist()) == {1}
+
+    def test_updates_change_only_mutable_columns(self, snapshot_dir):
+        """Test that updated rows differ from the snapshot in one mutable column."""
+        from scripts.generate_cdc_batches import CDC_TABLES
+
+        self._run(['--update-rate', '0.1'])
+
+        snapshot = pq.read_table(snapshot_dir / 'crm_customers.parquet').to_pandas()
+        batch = pq.read_table(
+            snapshot_dir / 'cdc' / 'crm_customers' / 'batch_000001.parquet'
+        ).to_pandas()
+        updates = batch[batch['cdc_operation'] == 'U'].set_index('customer_id')
+        before = snapshot.set_index('customer_id').loc[updates.index]
+        mutable = list(CDC_TABLES['crm_customers']['mutable'])
+        changed = (updates[mutable] != before[mutable]).sum(axis=1)
+        assert (changed == 1).all()
+        assert (updates['first_name'] == before['first_name']).all()
+        assert (updates['created_at'] == before['created_at']).all()
+
+    def test_inserts_continue_the_id_sequence(self, snapshot_dir):
+        """Test that inserted rows take new ids after the snapshot's highest id."""
+        self._run(['--insert-rate', '0.01', '--batches', '2'])
+
+        ids = []
+        for batch_id in (1, 2):
+            batch = pq.read_table(
+                snapshot_dir / 'cdc' / 'crm_customers' / f'batch_{batch_id:06d}.parquet'
+            ).to_pandas()
+            ids.extend(batch.loc[batch['cdc_operation'] == 'I', 'customer_id'])
+        assert sorted(ids) == [f'CUST{number:06d}' for number in range(1001, 1021)]
+
+    def test_batches_are_numbered_and_timestamped(self, snapshot_dir):
+        """Test that each batch's changes fall inside its own time window."""
+        from datetime import datetime
+
+        from scripts.generate_cdc_batches import CDC_START
+
+        self._run(['--batches', '2', '--interval-hours', '12'])
+
+        for batch_id in (1, 2):
+            batch = pq.read_table(
+                snapshot_dir / 'cdc' / 'crm_customers' / f'batch_{batch_id:06d}.parquet'
+            ).to_pandas()
+            window_start = (CDC_START - datetime(1970, 1, 1)).total_seconds()
+            window_start += (batch_id - 1) * 12 * 3600
+            times = batch['cdc_timestamp'].astype('int64') / 1e6
+            assert times.min() >= window_start
+            assert times.max() < window_start + 12 * 3600
+            assert batch['cdc_timestamp'].is_monotonic_increasing
+
+    def test_runs_continue_numbering_and_are_deterministic(self, snapshot_dir):
+        """Test that later runs append batches identical to a single longer run."""
+        batch_dir = snapshot_dir / 'cdc' / 'crm_customers'
+        self._run(['--batches', '2'])
+        self._run([])
+        appended = [pq.read_table(batch_dir / f'batch_{i:06d}.parquet') for i in (1, 2, 3)]
+
+        summary = self._run(['--batches', '3', '--reset'])
+        regenerated = [pq.read_table(batch_dir / f'batch_{i:06d}.parquet') for i in (1, 2, 3)]
+
+        assert [batch['batch_id'] for batch in summary] == [1, 2, 3]
+        assert all(a.equals(b) for a, b in zip(appended, regenerated))
@@ -5,10 +5,9 @@ Tests the data generation functionality for creating sample datasets
 for the data lake including customers, orders, transactions, and accounts.
 """
 
-import os
 import sys
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
@@ -23,14 +22,14 @@ class TestDataGenerationStructure:
     def test_sample_data_directory_constant_exists(self):
         """Test that SAMPLE_DATA_DIR constant is properly defined."""
         from scripts import generate_sample_data
-        
+
         assert hasattr(generate_sample_data, 'SAMPLE_DATA_DIR')
         assert isinstance(generate_sample_data.SAMPLE_DATA_DIR, Path)
 
     def test_configuration_constants_exist(self):
         """Test that all required configuration constants are defined."""
         from scripts import generate_sample_data
-        
+
         required_constants = [
             'NUM_CUSTOMERS',
             'NUM_ACCOUNTS',
@@ -39,14 +38,14 @@ class TestDataGenerationStructure:
             'START_DATE',
             'END_DATE'
         ]
-        
+
         for constant in required_constants:
             assert hasattr(generate_sample_data, constant), f"Missing constant: {constant}"
 
     def test_main_functions_exist(self):
         """Test that all main generation functions exist."""
         from scripts import generate_sample_data
-        
+
         assert hasattr(generate_sample_data, 'generate_finance_data')
         assert hasattr(generate_sample_data, 'generate_operations_data')
         assert hasattr(generate_sample_data, 'generate_crm_data')
@@ -56,39 +55,39 @@ class TestDataGenerationStructure:
 class TestFinanceDataGeneration:
     """Test suite for finance data generation."""
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_finance_data_creates_accounts(self, mock_parquet, mock_csv):
         """Test that finance data generation creates accounts DataFrame."""
         from scripts.generate_sample_data import generate_finance_data
-        
+
         # Mock the file operations
         generate_finance_data()
-        
+
         # Verify CSV and Parquet methods were called
         assert mock_csv.called
         assert mock_parquet.called
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_finance_data_creates_transactions(self, mock_parquet, mock_csv):
         """Test that finance data generation creates transactions DataFrame."""
         from scripts.generate_sample_data import generate_finance_data
-        
+
         generate_finance_data()
-        
+
         # Should be called multiple times (accounts, transactions, ledger)
         assert mock_csv.call_count >= 3
         assert mock_parquet.call_count >= 3
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_finance_data_creates_ledger(self, mock_parquet, mock_csv):
         """Test that finance data generation creates ledger entries."""
         from scripts.generate_sample_data import generate_finance_data
-        
+
         generate_finance_data()
-        
+
         # Verify all three datasets were created
         assert mock_csv.call_count == 3
         assert mock_parquet.call_count == 3
@@ -97,37 +96,37 @@ class TestFinanceDataGeneration:
 class TestOperationsDataGeneration:
     """Test suite for operations data generation."""
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_operations_data_creates_orders(self, mock_parquet, mock_csv):
         """Test that operations data generation creates orders DataFrame."""
         from scripts.generate_sample_data import generate_operations_data
-        
+
         generate_operations_data()
-        
+
         assert mock_csv.called
         assert mock_parquet.called
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_operations_data_creates_shipments(self, mock_parquet, mock_csv):
         """Test that operations data generation creates shipments DataFrame."""
         from scripts.generate_sample_data import generate_operations_data
-        
+
         generate_operations_data()
-        
+
         # Should create orders, shipments, and inventory
         assert mock_csv.call_count >= 3
         assert mock_parquet.call_count >= 3
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_operations_data_creates_inventory(self, mock_parquet, mock_csv):
         """Test that operations data generation creates inventory DataFrame."""
         from scripts.generate_sample_data import generate_operations_data
-        
+
         generate_operations_data()
-        
+
         # Verify all three datasets were created
         assert mock_csv.call_count == 3
         assert mock_parquet.call_count == 3
@@ -136,37 +135,37 @@ class TestOperationsDataGeneration:
 class TestCRMDataGeneration:
     """Test suite for CRM data generation."""
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_crm_data_creates_customers(self, mock_parquet, mock_csv):
         """Test that CRM data generation creates customers DataFrame."""
         from scripts.generate_sample_data import generate_crm_data
-        
+
         generate_crm_data()
-        
+
         assert mock_csv.called
         assert mock_parquet.called
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_crm_data_creates_interactions(self, mock_parquet, mock_csv):
         """Test that CRM data generation creates interactions DataFrame."""
         from scripts.generate_sample_data import generate_crm_data
-        
+
         generate_crm_data()
-        
+
         # Should create customers, interactions, and opportunities
         assert mock_csv.call_count >= 3
         assert mock_parquet.call_count >= 3
 
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_csv')
-    @patch('scripts.generate_sample_data.pd.DataFrame.to_parquet')
+    @patch('scripts.generate_sample_data._CsvSink')
+    @patch('scripts.generate_sample_data._ParquetSink')
     def test_generate_crm_data_creates_opportunities(self, mock_parquet, mock_csv):
         """Test that CRM data generation creates opportunities DataFrame."""
         from scripts.generate_sample_data import generate_crm_data
-        
+
         generate_crm_data()
-        
+
         # Verify all three datasets were created
         assert mock_csv.call_count == 3
         assert mock_parquet.call_count == 3
@@ -185,12 +184,12 @@ class TestMainFunction:
     ):
         """Test that main function calls all data generation functions."""
         from scripts.generate_sample_data import main
-        
+
         # Mock the directory creation
         mock_dir.mkdir = MagicMock()
-        
+
         main()
-        
+
         # Verify all generation functions were called
         mock_finance.assert_called_once()
         mock_ops.assert_called_once()
@@ -205,12 +204,12 @@ class TestMainFunction:
     ):
         """Test that main function creates the sample_data directory."""
         from scripts.generate_sample_data import main
-        
+
         # Mock the directory
         mock_dir.mkdir = MagicMock()
-        
+
         main()
-        
+
         # Verify directory creation was called
         mock_dir.mkdir.assert_called_once_with(exist_ok=True)
 
@@ -221,26 +220,582 @@ class TestDataQuality:
     def test_faker_seed_is_set(self):
         """Test that Faker seed is set for reproducibility."""
         from scripts import generate_sample_data
-        
+
         # The module should have Faker imported and seeded
         assert hasattr(generate_sample_data, 'fake')
 
     def test_date_range_is_valid(self):
         """Test that START_DATE is before END_DATE."""
-        from scripts.generate_sample_data import START_DATE, END_DATE
-        
+        from scripts.generate_sample_data import END_DATE, START_DATE
+
         assert START_DATE < END_DATE
 
     def test_record_counts_are_positive(self):
         """Test that all record count constants are positive integers."""
         from scripts.generate_sample_data import (
-            NUM_CUSTOMERS,
             NUM_ACCOUNTS,
+            NUM_CUSTOMERS,
+            NUM_ORDERS,
             NUM_TRANSACTIONS,
-            NUM_ORDERS
         )
-        
+
         assert NUM_CUSTOMERS > 0
         assert NUM_ACCOUNTS > 0
         assert NUM_TRANSACTIONS > 0
         assert NUM_ORDERS > 0
+
+
+class TestVectorizedGeneration:
+    """Test suite for the vectorized column generators."""
+
+    def test_tables_are_seed_reproducible(self):
+        """Test that the same table seed produces identical data."""
+        from scripts.generate_sample_data import (
+            BASE_ROW_COUNTS,
+            table_rng,
+            transactions_table,
+        )
+
+        first = transactions_table(table_rng('finance_transactions'), 0, 200, BASE_ROW_COUNTS)
+        second = transactions_table(table_rng('finance_transactions'), 0, 200, BASE_ROW_COUNTS)
+
+        assert first.equals(second)
+
+    def test_transaction_ids_and_foreign_keys(self):
+        """Test that ids are sequential and foreign keys stay in range."""
+        from scripts.generate_sample_data import (
+            BASE_ROW_COUNTS,
+            NUM_ACCOUNTS,
+            table_rng,
+            transactions_table,
+        )
+
+        df = transactions_table(
+            table_rng('finance_transactions'), 10, 20, BASE_ROW_COUNTS
+        ).to_pandas()
+
+        assert df['transaction_id'].tolist()[0] == 'TXN00000011'
+        assert df['transaction_id'].tolist()[-1] == 'TXN00000020'
+        account_numbers = df['account_id'].str[3:].astype(int)
+        assert account_numbers.between(1, NUM_ACCOUNTS).all()
+
+    def test_timestamps_within_date_range(self):
+        """Test that generated timestamps fall inside START_DATE..END_DATE."""
+        from scripts.generate_sample_data import (
+            BASE_ROW_COUNTS,
+            END_DATE,
+            START_DATE,
+            orders_table,
+            table_rng,
+        )
+
+        df = orders_table(table_rng('operations_orders'), 0, 500, BASE_ROW_COUNTS).to_pandas()
+
+        assert df['order_date'].min() >= START_DATE
+        assert df['order_date'].max() <= END_DATE
+
+    def test_ledger_has_debit_and_credit_per_transaction(self):
+        """Test that each transaction yields a balanced debit/credit pair."""
+        from scripts.generate_sample_data import BASE_ROW_COUNTS, ledger_table, table_rng
+
+        df = ledger_table(table_rng('finance_ledger'), 0, 50, BASE_ROW_COUNTS).to_pandas()
+
+        assert len(df) == 100
+        assert (df.groupby('transaction_id')['entry_type'].nunique() == 2).all()
+        assert (df.groupby('transaction_id')['amount'].nunique() == 1).all()
+
+    def test_schema_matches_expected_columns(self):
+        """Test that the customer table keeps the published column layout."""
+        from scripts.generate_sample_data import BASE_ROW_COUNTS, customers_table, table_rng
+
+        table = customers_table(table_rng('crm_customers'), 0, 10, BASE_ROW_COUNTS)
+
+        assert table.column_names[:3] == ['customer_id', 'first_name', 'last_name']
+        assert str(table.schema.field('date_of_birth').type) == 'date32[day]'
+
+
+class TestStreamingGeneration:
+    """Test suite for chunked, bounded-memory generation."""
+
+    def test_streaming_matches_in_memory_output(self, temp_output_dir):
+        """Test that streamed output holds the same rows as the in-memory path."""
+        import pyarrow.parquet as pq
+
+        from scripts import generate_sample_data
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            generate_sample_data._generate_table(
+                'crm_interactions', generate_sample_data.interactions_table, 250,
+                generate_sample_data.parse_args(['--chunk-rows', '100']),
+            )
+            expected = pq.read_table(temp_output_dir / 'crm_interactions.parquet')
+            generate_sample_data._generate_table(
+                'crm_interactions', generate_sample_data.interactions_table, 250,
+                generate_sample_data.parse_args(['--stream', '--chunk-rows', '100']),
+            )
+            streamed = pq.read_table(temp_output_dir / 'crm_interactions.parquet')
+
+        assert streamed.equals(expected)
+
+    def test_streaming_writes_one_row_group_per_chunk(self, temp_output_dir):
+        """Test that each chunk becomes a Parquet row group and CSV has one header."""
+        import pyarrow.parquet as pq
+
+        from scripts import generate_sample_data
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            rows = generate_sample_data._generate_table(
+                'finance_accounts', generate_sample_data.accounts_table, 250,
+                generate_sample_data.parse_args(['--stream', '--chunk-rows', '100']),
+            )
+
+        parquet_file = pq.ParquetFile(temp_output_dir / 'finance_accounts.parquet')
+        csv_df = pd.read_csv(temp_output_dir / 'finance_accounts.csv')
+        assert rows == 250
+        assert parquet_file.metadata.num_row_groups == 3
+        assert len(csv_df) == 250
+        assert csv_df['account_id'].iloc[-1] == 'ACC000250'
+
+    def test_parse_args_defaults(self):
+        """Test that streaming is off by default."""
+        from scripts.generate_sample_data import CHUNK_ROWS, parse_args
+
+        args = parse_args([])
+
+        assert args.stream is False
+        assert args.chunk_rows == CHUNK_ROWS
+
+
+class TestShardedGeneration:
+    """Test suite for multi-process sharded generation."""
+
+    def _generate_parts(self, output_dir, workers, seed=None):
+        """Generate sharded transactions and return each part file's bytes."""
+        from scripts import generate_sample_data
+
+        seed_args = [] if seed is None else ['--seed', str(seed)]
+        options = generate_sample_data.parse_args(
+            ['--workers', str(workers), '--chunk-rows', '100', *seed_args]
+        )
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', output_dir):
+            rows = generate_sample_data._generate_table(
+                'finance_transactions', generate_sample_data.transactions_table, 250, options
+            )
+        parts = sorted((output_dir / 'finance_transactions').iterdir())
+        return rows, {part.name: part.read_bytes() for part in parts}
+
+    def test_shards_write_one_part_file_per_id_range(self, temp_output_dir):
+        """Test that each shard is written as its own part file."""
+        rows, parts = self._generate_parts(temp_output_dir, workers=2)
+
+        assert rows == 250
+        assert sorted(parts) == [
+            'part-00000.csv', 'part-00000.parquet',
+            'part-00001.csv', 'part-00001.parquet',
+            'part-00002.csv', 'part-00002.parquet',
+        ]
+
+    def test_output_is_identical_for_any_worker_count(self, tmp_path):
+        """Test that part files are byte-identical whatever the worker count."""
+        _, single = self._generate_parts(tmp_path / 'one', workers=1)
+        _, multi = self._generate_parts(tmp_path / 'three', workers=3)
+
+        assert single == multi
+
+    def test_seed_changes_output_and_reaches_workers(self, tmp_path):
+        """Test that --seed changes the data and is used by every shard."""
+        from scripts.generate_sample_data import DEFAULT_SEED, use_seed
+
+        _, default = self._generate_parts(tmp_path / 'default', workers=2)
+        _, seeded = self._generate_parts(tmp_path / 'seeded', workers=2, seed=7)
+        _, seeded_again = self._generate_parts(tmp_path / 'again', workers=1, seed=7)
+        use_seed(DEFAULT_SEED)
+
+        assert seeded == seeded_again
+        assert seeded['part-00000.parquet'] != default['part-00000.parquet']
+
+    @pytest.mark.parametrize('argv', [
+        ['--workers', '-1'],
+        ['--chunk-rows', '0'],
+        ['--row-group-rows', '0'],
+        ['--seed', '-1'],
+    ])
+    def test_invalid_values_are_rejected(self, argv):
+        """Test that values that cannot shard or chunk the output are rejected."""
+        from scripts.generate_sample_data import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(argv)
+
+
+class TestScaleFactor:
+    """Test suite for scale-factor row counts."""
+
+    def test_scale_factor_one_matches_base_counts(self):
+        """Test that SF1 reproduces the module-level base counts."""
+        from scripts.generate_sample_data import NUM_TRANSACTIONS, resolve_row_counts
+
+        row_counts = resolve_row_counts(1)
+
+        assert row_counts['finance_transactions'] == NUM_TRANSACTIONS
+        assert row_counts['operations_inventory'] == 500
+        assert row_counts['crm_opportunities'] == 800
+
+    def test_scale_factor_scales_every_table(self):
+        """Test that every table scales by the same factor."""
+        from scripts.generate_sample_data import BASE_ROW_COUNTS, resolve_row_counts
+
+        row_counts = resolve_row_counts(10)
+
+        for table_name, base_rows in BASE_ROW_COUNTS.items():
+            assert row_counts[table_name] == base_rows * 10
+
+    def test_row_override_applies_to_one_table(self):
+        """Test that --rows overrides a single table after scaling."""
+        from scripts.generate_sample_data import parse_args
+
+        args = parse_args(['--scale-factor', '2', '--rows', 'crm_customers=7'])
+
+        assert args.row_counts['crm_customers'] == 7
+        assert args.row_counts['finance_accounts'] == 3000
+
+    def test_unknown_override_is_rejected(self):
+        """Test that overrides for unknown tables are rejected."""
+        from scripts.generate_sample_data import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(['--rows', 'finance_ledger=10'])
+
+    def test_foreign_keys_follow_scaled_parent_counts(self):
+        """Test that child foreign keys stay inside the scaled parent range."""
+        from scripts.generate_sample_data import (
+            orders_table,
+            resolve_row_counts,
+            table_rng,
+        )
+
+        row_counts = resolve_row_counts(0.01)
+        df = orders_table(table_rng('operations_orders'), 0, 200, row_counts).to_pandas()
+
+        customer_numbers = df['customer_id'].str[4:].astype(int)
+        assert customer_numbers.max() <= row_counts['crm_customers'] == 10
+
+    def test_main_reports_rows_per_table(self, temp_output_dir):
+        """Test that main returns and reports rows produced per table."""
+        from scripts import generate_sample_data
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            rows = generate_sample_data.main(
+                generate_sample_data.parse_args(['--scale-factor', '0.01'])
+            )
+
+        assert rows['finance_transactions'] == 50
+        assert rows['finance_ledger'] == 100
+        assert rows['crm_customers'] == 10
+
+
+class TestPartitionedGeneration:
+    """Test suite for Hive-partitioned output."""
+
+    def test_rows_land_in_their_date_partition(self, temp_output_dir):
+        """Test that each row is written under its year=/month= directory."""
+        import pyarrow.parquet as pq
+
+        from scripts import generate_sample_data
+
+        options = generate_sample_data.parse_args(['--partition-by', 'month'])
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            rows = generate_sample_data._generate_table(
+                'operations_orders', generate_sample_data.orders_table, 300, options
+            )
+
+        files = sorted((temp_output_dir / 'operations_orders').rglob('*.parquet'))
+        assert rows == 300
+        assert sum(pq.read_metadata(f).num_rows for f in files) == 300
+        for part_file in files:
+            year = part_file.parent.parent.name.split('=')[1]
+            month = part_file.parent.name.split('=')[1]
+            dates = pq.read_table(part_file).column('order_date').to_pandas()
+            assert (dates.dt.strftime('%Y%m') == year + month).all()
+
+    def test_files_roll_at_target_size(self, temp_output_dir):
+        """Test that a partition is split into several files past the target size."""
+        from scripts import generate_sample_data
+
+        options = generate_sample_data.parse_args(
+            ['--partition-by', 'month', '--chunk-rows', '50', '--target-file-mb', '0.001']
+        )
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            generate_sample_data._generate_table(
+                'finance_ledger', generate_sample_data.ledger_table, 500, options
+            )
+
+        month_dirs = {f.parent for f in (temp_output_dir / 'finance_ledger').rglob('*.parquet')}
+        assert any(len(list(month_dir.iterdir())) > 1 for month_dir in month_dirs)
+
+    def test_partition_row_groups_are_not_split_by_chunks(self, temp_output_dir):
+        """Test that chunks are buffered per partition into full row groups."""
+        import pyarrow.parquet as pq
+
+        from scripts import generate_sample_data
+
+        options = generate_sample_data.parse_args(
+            ['--partition-by', 'month', '--chunk-rows', '100', '--row-group-rows', '20']
+        )
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            generate_sample_data._generate_table(
+                'operations_orders', generate_sample_data.orders_table, 1000, options
+            )
+
+        for part_file in (temp_output_dir / 'operations_orders').rglob('*.parquet'):
+            metadata = pq.read_metadata(part_file)
+            sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+            assert all(size == 20 for size in sizes[:-1])
+            assert 0 < sizes[-1] <= 20
+
+    def test_switching_layout_removes_the_other_layout(self, temp_output_dir):
+        """Test that a single-file run removes an earlier partition tree and vice versa."""
+        from scripts import generate_sample_data
+
+        table_dir = temp_output_dir / 'finance_accounts'
+        single_file = temp_output_dir / 'finance_accounts.parquet'
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            generate_sample_data._generate_table(
+                'finance_accounts', generate_sample_data.accounts_table, 100,
+                generate_sample_data.parse_args(['--partition-by', 'month']),
+            )
+            assert table_dir.is_dir() and not single_file.exists()
+
+            generate_sample_data._generate_table(
+                'finance_accounts', generate_sample_data.accounts_table, 100,
+                generate_sample_data.parse_args([]),
+            )
+            assert single_file.exists() and not table_dir.exists()
+
+            generate_sample_data._generate_table(
+                'finance_accounts', generate_sample_data.accounts_table, 100,
+                generate_sample_data.parse_args(['--workers', '1']),
+            )
+            assert table_dir.is_dir() and not single_file.exists()
+
+
+class TestOutputFormats:
+    """Test suite for the multi-format writer."""
+
+    def _generate(self, output_dir, argv, rows=250):
+        """Generate finance accounts with the given CLI options."""
+        from scripts import generate_sample_data
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', output_dir):
+            return generate_sample_data._generate_table(
+                'finance_accounts', generate_sample_data.accounts_table, rows,
+                generate_sample_data.parse_args(argv),
+            )
+
+    def test_parse_formats(self):
+        """Test --formats parsing, including none and unknown formats."""
+        from scripts.generate_sample_data import DEFAULT_FORMATS, parse_args
+
+        assert parse_args([]).formats == DEFAULT_FORMATS
+        assert parse_args(['--formats', 'parquet,csv.gz']).formats == ('parquet', 'csv.gz')
+        assert parse_args(['--formats', 'none']).formats == ()
+        with pytest.raises(SystemExit):
+            parse_args(['--formats', 'json'])
+
+    def test_only_selected_formats_are_written(self, temp_output_dir):
+        """Test that unselected formats are skipped and none writes nothing."""
+        rows = self._generate(temp_output_dir, ['--formats', 'parquet'])
+        assert rows == 250
+        assert [f.name for f in temp_output_dir.iterdir()] == ['finance_accounts.parquet']
+
+        (temp_output_dir / 'finance_accounts.parquet').unlink()
+        assert self._generate(temp_output_dir, ['--formats', 'none']) == 250
+        assert list(temp_output_dir.iterdir()) == []
+
+    def test_all_formats_hold_the_same_rows(self, temp_output_dir):
+        """Test that parquet, csv and csv.gz are written from the same table."""
+        import pyarrow.parquet as pq
+
+        from scripts import generate_sample_data
+
+        with patch.object(generate_sample_data, 'CSV_ENCODE_THREADS', 4):
+            self._generate(
+                temp_output_dir,
+                ['--formats', 'parquet,csv,csv.gz', '--stream', '--chunk-rows', '100'],
+            )
+
+        parquet_df = pq.read_table(temp_output_dir / 'finance_accounts.parquet').to_pandas()
+        csv_df = pd.read_csv(temp_output_dir / 'finance_accounts.csv')
+        gz_df = pd.read_csv(temp_output_dir / 'finance_accounts.csv.gz')
+        assert len(csv_df) == len(gz_df) == 250
+        assert csv_df['account_id'].tolist() == parquet_df['account_id'].tolist()
+        assert gz_df.equals(csv_df)
+
+    def test_parquet_codec_and_row_groups(self, temp_output_dir):
+        """Test that codec, row-group size and dictionary options reach the file."""
+        import pyarrow.parquet as pq
+
+        self._generate(
+            temp_output_dir,
+            [
+                '--formats', 'parquet', '--parquet-codec', 'zstd',
+                '--row-group-rows', '100', '--no-dictionary',
+            ],
+        )
+
+        metadata = pq.read_metadata(temp_output_dir / 'finance_accounts.parquet')
+        column = metadata.row_group(0).column(0)
+        assert metadata.num_row_groups == 3
+        assert column.compression == 'ZSTD'
+        assert not column.has_dictionary_page
+
+
+class TestKeyDistributions:
+    """Test suite for skewed foreign-key distributions."""
+
+    def test_uniform_is_the_default(self):
+        """Test that every relationship is uniform unless overridden."""
+        from scripts.generate_sample_data import FK_RELATIONSHIPS, UNIFORM, parse_args
+
+        args = parse_args([])
+
+        assert args.key_distributions == dict.fromkeys(FK_RELATIONSHIPS, UNIFORM)
+
+    def test_overrides_apply_in_order(self):
+        """Test that a specific relationship overrides an earlier all= setting."""
+        from scripts.generate_sample_data import parse_args
+
+        args = parse_args([
+            '--key-distribution', 'all=zipf:1.2',
+            '--key-distribution', 'operations_orders.customer_id=hot:1:80',
+        ])
+
+        assert args.key_distributions['crm_interactions.customer_id'] == ('zipf', 1.2)
+        assert args.key_distributions['operations_orders.customer_id'] == ('hot', 0.01, 0.8)
+
+    def test_invalid_distributions_are_rejected(self):
+        """Test that unknown relationships and malformed specs are rejected."""
+        from scripts.generate_sample_data import parse_args
+
+        for spec in ('crm_customers.customer_id=zipf:1.1', 'all=zipf', 'all=zipf:x',
+                     'all=hot:1', 'all=hot:0:50', 'all=pareto:2'):
+            with pytest.raises(SystemExit):
+                parse_args(['--key-distribution', spec])
+
+    def test_hot_set_receives_its_share_of_rows(self):
+        """Test that PCT% of parent keys receive about SHARE% of the rows."""
+        import numpy as np
+
+        from scripts.generate_sample_data import _foreign_keys
+
+        distributions = {'crm_interactions.customer_id': ('hot', 0.01, 0.8)}
+        keys = _foreign_keys(
+            np.random.default_rng(0), 100_000, 'crm_interactions.customer_id',
+            {'crm_customers': 1000}, distributions,
+        )
+
+        counts = np.sort(np.bincount(keys, minlength=1001)[1:])[::-1]
+        assert keys.min() >= 1 and keys.max() <= 1000
+        assert counts[:10].sum() / len(keys) == pytest.approx(0.8, abs=0.01)
+
+    def test_zipf_skew_grows_with_exponent(self):
+        """Test that larger Zipf exponents concentrate rows on fewer keys."""
+        import numpy as np
+
+        from scripts.generate_sample_data import _foreign_keys
+
+        def top_key_share(exponent):
+            keys = _foreign_keys(
+                np.random.default_rng(0), 50_000, 'finance_transactions.account_id',
+                {'finance_accounts': 1500},
+                {'finance_transactions.account_id': ('zipf', exponent)},
+            )
+            return np.bincount(keys).max() / len(keys)
+
+        assert 1 / 1500 * 10 < top_key_share(0.8) < top_key_share(1.5)
+
+    def test_skewed_tables_are_reproducible_across_chunks(self, temp_output_dir):
+        """Test that skewed keys are identical whether streamed or sharded."""
+        import pyarrow.parquet as pq
+
+        from scripts import generate_sample_data
+
+        skew = ['--key-distribution', 'operations_orders.customer_id=zipf:1.1']
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            generate_sample_data._generate_table(
+                'operations_orders', generate_sample_data.orders_table, 250,
+                generate_sample_data.parse_args([*skew, '--stream', '--chunk-rows', '100']),
+            )
+            streamed = pq.read_table(temp_output_dir / 'operations_orders.parquet')
+            generate_sample_data._generate_table(
+                'operations_orders', generate_sample_data.orders_table, 250,
+                generate_sample_data.parse_args([*skew, '--workers', '1', '--chunk-rows', '100']),
+            )
+        parts = sorted((temp_output_dir / 'operations_orders').glob('*.parquet'))
+        sharded = pq.read_table(parts[0])
+
+        assert sharded.column('customer_id').equals(streamed.column('customer_id').slice(0, 100))
+
+
+class TestS3Streaming:
+    """Test suite for streaming generated Parquet straight to S3."""
+
+    def _generate(self, data_dir, fake_s3, argv, table='finance_transactions', rows=250):
+        """Generate one table with --s3-bucket against the fake S3 client."""
+        from scripts import generate_sample_data
+
+        options = generate_sample_data.parse_args(
+            ['--s3-bucket', 'test-bucket', '--formats', 'parquet', *argv]
+        )
+        builder = getattr(generate_sample_data, f"{table.split('_', 1)[1]}_table")
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', data_dir), \
+                patch.object(generate_sample_data, '_s3_client', lambda: fake_s3):
+            return generate_sample_data._generate_table(table, builder, rows, options)
+
+    def test_table_is_streamed_to_its_mapped_key(self, temp_output_dir, fake_s3):
+        """Test that the table lands at its FILE_MAPPINGS key and nothing is written locally."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from scripts import generate_sample_data
+
+        rows = self._generate(temp_output_dir, fake_s3, ['--chunk-rows', '100'])
+
+        body = fake_s3.read('test-bucket', 'finance/transactions/finance_transactions.parquet')
+        expected = generate_sample_data.transactions_table(
+            generate_sample_data.table_rng('finance_transactions'), 0, 100,
+            generate_sample_data.resolve_row_counts(),
+        )
+        streamed = pq.read_table(pa.BufferReader(body))
+        assert rows == streamed.num_rows == 250
+        assert streamed.slice(0, 100).equals(expected)
+        assert list(temp_output_dir.iterdir()) == []
+
+    def test_partitions_are_streamed_under_the_table_prefix(self, temp_output_dir, fake_s3):
+        """Test that partition files mirror the local Hive layout in S3."""
+        self._generate(temp_output_dir, fake_s3, ['--partition-by', 'month'])
+
+        keys = [key for key in fake_s3.uploads if key.startswith('finance/transactions/')]
+        assert keys
+        assert all(key.endswith('/part-000.parquet') for key in keys)
+        assert all('/year=' in key and '/month=' in key for key in keys)
+
+    def test_rerun_clears_the_previous_layout(self, temp_output_dir, fake_s3):
+        """Test that a single-file run removes partition objects from an earlier run."""
+        self._generate(temp_output_dir, fake_s3, ['--partition-by', 'month'])
+        self._generate(temp_output_dir, fake_s3, [])
+
+        listing = fake_s3.list_objects_v2(Bucket='test-bucket', Prefix='finance/transactions/')
+        assert [item['Key'] for item in listing['Contents']] == [
+            'finance/transactions/finance_transactions.parquet'
+        ]
+
+    def test_streaming_requires_parquet_only(self):
+        """Test that CSV output cannot be combined with --s3-bucket."""
+        from scripts.generate_sample_data import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(['--s3-bucket', 'test-bucket'])
+        with pytest.raises(SystemExit):
+            parse_args(['--s3-bucket', 'test-bucket', '--formats', 'parquet',
+                        '--s3-part-size-mb', '1'])
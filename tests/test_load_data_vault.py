@@ -0,0 +1,336 @@
+"""
+Unit tests for load_data_vault.py script.
+
+Tests the vectorized MD5 against hashlib, hash-input normalization, and the
+hub, link and satellite row sets built from a small generated dataset.
+"""
+
+import hashlib
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+LOAD_DATE = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def vault_sources(temp_output_dir):
+    """Generate every domain at a small scale and point the loader at it."""
+    from scripts import generate_sample_data, load_data_vault
+
+    with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir), \
+            patch.object(load_data_vault, 'SAMPLE_DATA_DIR', temp_output_dir), \
+            patch.object(load_data_vault, 'VAULT_DATA_DIR', temp_output_dir / 'vault'):
+        options = generate_sample_data.parse_args(
+            ['--scale-factor', '0.01', '--formats', 'parquet']
+        )
+        generate_sample_data.generate_finance_data(options)
+        generate_sample_data.generate_operations_data(options)
+        generate_sample_data.generate_crm_data(options)
+        yield load_data_vault.load_sources(load_data_vault.required_sources())
+
+
+class TestHashing:
+    """Test suite for vectorized hash computation."""
+
+    def test_md5_matches_hashlib_across_block_boundaries(self):
+        """Test that digests match hashlib for lengths around the 64-byte blocks."""
+        from scripts.load_data_vault import md5_digests
+
+        values = ['', 'a', 'x' * 55, 'x' * 56, 'x' * 64, 'x' * 119, 'x' * 120, 'héllo wörld']
+
+        digests = md5_digests(pa.array(values))
+
+        assert [bytes(d) for d in digests] == [hashlib.md5(v.encode()).digest() for v in values]
+
+    def test_keys_are_trimmed_upper_cased_and_joined(self):
+        """Test that hash inputs are normalized and NULLs take the placeholder."""
+        from scripts.load_data_vault import hash_columns
+
+        table = pa.table({'a': [' cust01 ', 'CUST01', None], 'b': ['x', 'X ', 'y']})
+
+        hashes = hash_columns(table, ['a', 'b']).to_pylist()
+
+        assert hashes[0] == hashes[1] == hashlib.md5(b'CUST01||X').hexdigest()
+        assert hashes[2] == hashlib.md5(b'^^||Y').hexdigest()
+
+    def test_floats_and_timestamps_are_formatted_as_snowflake_text(self):
+        """Test that floats keep two decimals and timestamps have millisecond precision."""
+        from scripts.load_data_vault import hash_input
+
+        table = pa.table({
+            'amount': [3.0, 1234.5, 0.1 + 0.2],
+            'at': pa.array(
+                [datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 10, 0, 0, 123456), None],
+                pa.timestamp('us'),
+            ),
+        })
+
+        assert hash_input(table, ['amount', 'at']).to_pylist() == [
+            '3.00||2024-01-01 10:00:00.000',
+            '1234.50||2024-01-01 10:00:00.123',
+            '0.30||^^',
+        ]
+
+    def test_parallel_slices_match_single_thread(self):
+        """Test that hashing in many slices on several threads gives the same result."""
+        from scripts import load_data_vault
+
+        table = pa.table({'id': [f'ID{i:05d}' for i in range(1000)]})
+
+        with patch.object(load_data_vault, 'HASH_CHUNK_ROWS', 64):
+            parallel = load_data_vault.hash_columns(table, ['id'], workers=4)
+        single = load_data_vault.hash_columns(table, ['id'], workers=1)
+
+        assert parallel.to_pylist() == single.to_pylist()
+        assert parallel[7].as_py() == hashlib.md5(b'ID00007').hexdigest()
+
+    def test_binary_and_integer_formats_encode_the_same_digest(self):
+        """Test that binary keys are the raw digest and integer keys its lower 64 bits."""
+        from scripts.load_data_vault import HASH_TYPES, hash_columns
+
+        table = pa.table({'id': ['CUST01', 'cust02 ']})
+        digests = [hashlib.md5(b'CUST01').digest(), hashlib.md5(b'CUST02').digest()]
+
+        binary = hash_columns(table, ['id'], hash_format='binary')
+        integer = hash_columns(table, ['id'], hash_format='integer')
+
+        assert binary.type == HASH_TYPES['binary'] and integer.type == HASH_TYPES['integer']
+        assert binary.to_pylist() == digests
+        # Snowflake MD5_NUMBER_LOWER64: the last 8 digest bytes, big-endian
+        assert integer.to_pylist() == [int.from_bytes(d[8:], 'big') for d in digests]
+
+
+class TestBuildVault:
+    """Test suite for hub, link and satellite row sets."""
+
+    def test_hubs_hold_each_business_key_once(self, vault_sources):
+        """Test that hubs collect keys from every source without duplicates."""
+        from scripts.load_data_vault import build_hub
+
+        hub = build_hub('hub_customer', vault_sources, LOAD_DATE)
+
+        customer_ids = set(vault_sources['crm_customers']['customer_id'].to_pylist())
+        order_customers = set(vault_sources['operations_orders']['customer_id'].to_pylist())
+        assert hub.column_names == ['customer_hk', 'customer_id', 'load_date', 'record_source']
+        assert len(set(hub['customer_hk'].to_pylist())) == hub.num_rows
+        assert set(hub['customer_id'].to_pylist()) == customer_ids | order_customers
+
+    def test_links_reference_hub_hash_keys(self, vault_sources):
+        """Test that every link row points at rows of both of its hubs."""
+        from scripts.load_data_vault import build_hub, build_link
+
+        link = build_link('link_customer_order', vault_sources, LOAD_DATE)
+        customers = build_hub('hub_customer', vault_sources, LOAD_DATE)
+        orders = build_hub('hub_order', vault_sources, LOAD_DATE)
+
+        assert link.num_rows == vault_sources['operations_orders'].num_rows
+        assert set(link['customer_hk'].to_pylist()) <= set(customers['customer_hk'].to_pylist())
+        assert set(link['order_hk'].to_pylist()) == set(orders['order_hk'].to_pylist())
+
+    def test_satellite_hash_diff_tracks_attributes(self, vault_sources):
+        """Test that hash_diff changes only when a descriptive attribute changes."""
+        import pyarrow.compute as pc
+
+        from scripts.load_data_vault import build_satellite
+
+        before = build_satellite('sat_account', vault_sources, LOAD_DATE)
+        accounts = vault_sources['finance_accounts']
+        status = pc.if_else(
+            pc.equal(pa.array(range(accounts.num_rows)), 0), 'CLOSED_X', accounts['account_status']
+        )
+        changed = dict(
+            vault_sources,
+            finance_accounts=accounts.set_column(
+                accounts.schema.get_field_index('account_status'), 'account_status', status
+            ).set_column(
+                accounts.schema.get_field_index('updated_at'), 'updated_at',
+                pa.nulls(accounts.num_rows, accounts.schema.field('updated_at').type),
+            ),
+        )
+        after = build_satellite('sat_account', changed, LOAD_DATE)
+
+        differs = [a != b for a, b in zip(before['hash_diff'].to_pylist(),
+                                          after['hash_diff'].to_pylist())]
+        assert differs[0] and not any(differs[1:])
+        assert before.column_names[:4] == ['account_hk', 'load_date', 'end_date', 'hash_diff']
+
+    def test_main_writes_every_table(self, vault_sources, temp_output_dir):
+        """Test that main writes one delta file per hub, link and satellite."""
+        from scripts import load_data_vault
+
+        load_counts = load_data_vault.main(
+            load_data_vault.parse_args(['--workers', '2', '--load-date', '2025-01-01'])
+        )
+
+        expected = {*load_data_vault.HUBS, *load_data_vault.LINKS, *load_data_vault.SATELLITES}
+        assert set(load_counts) == expected
+        (path,) = load_data_vault.delta_files('hub_order')
+        assert path.parent == temp_output_dir / 'vault' / 'hub_order'
+        assert path.name == 'load-20250101T000000000000.parquet'
+        assert load_data_vault.delta_load_date(path) == LOAD_DATE
+        hub = pq.read_table(path)
+        assert hub.num_rows == load_counts['hub_order']['new']
+        assert hub['load_date'][0].as_py() == LOAD_DATE
+
+
+def _satellite(keys, hash_diffs, load_date=LOAD_DATE):
+    """Build minimal satellite rows with current (NULL end_date) versions."""
+    return pa.table({
+        'customer_hk': keys,
+        'load_date': pa.array([load_date] * len(keys), pa.timestamp('us')),
+        'end_date': pa.nulls(len(keys), pa.timestamp('us')),
+        'hash_diff': hash_diffs,
+    })
+
+
+class TestIncrementalLoad:
+    """Test suite for hash_diff-based incremental loads."""
+
+    def test_satellite_delta_classifies_rows(self):
+        """Test that incoming rows are split into new, changed and unchanged."""
+        from scripts.load_data_vault import satellite_delta
+
+        existing = _satellite(['a', 'b', 'c'], ['1', '2', '3'])
+        incoming = _satellite(['a', 'b', 'd'], ['1', '9', '4'], datetime(2025, 1, 2))
+
+        inserts, ended_keys, counts = satellite_delta(existing, incoming, 'customer_hk')
+
+        assert counts == {'new': 1, 'changed': 1, 'unchanged': 1}
+        assert sorted(inserts['customer_hk'].to_pylist()) == ['b', 'd']
+        assert ended_keys.to_pylist() == ['b']
+
+    def test_delta_compares_only_current_rows(self):
+        """Test that an end-dated version does not count as the current row."""
+        from scripts.load_data_vault import apply_satellite_delta, satellite_delta
+
+        second_load = datetime(2025, 1, 2)
+        existing = _satellite(['a'], ['1'])
+        inserts, ended_keys, _ = satellite_delta(
+            existing, _satellite(['a'], ['2'], second_load), 'customer_hk'
+        )
+        history = apply_satellite_delta(existing, inserts, 'customer_hk')
+
+        _, _, counts = satellite_delta(history, _satellite(['a'], ['2']), 'customer_hk')
+
+        assert history['end_date'].to_pylist() == [second_load, None]
+        assert history['hash_diff'].to_pylist() == ['1', '2']
+        assert counts == {'new': 0, 'changed': 0, 'unchanged': 1}
+
+    def test_versions_end_where_the_next_version_of_their_key_begins(self):
+        """Test that end dates are derived from load dates across delta files."""
+        from scripts.load_data_vault import end_date_versions
+
+        second_load, third_load = datetime(2025, 1, 2), datetime(2025, 1, 3)
+        versions = pa.concat_tables([
+            _satellite(['a', 'b'], ['1', '1']),
+            _satellite(['b', 'c'], ['2', '1'], third_load),
+            _satellite(['b'], ['3'], second_load),
+        ])
+
+        history = end_date_versions(versions, 'customer_hk')
+
+        assert history['customer_hk'].to_pylist() == ['a', 'b', 'b', 'b', 'c']
+        assert history['hash_diff'].to_pylist() == ['1', '1', '3', '2', '1']
+        assert history['end_date'].to_pylist() == [None, second_load, third_load, None, None]
+
+    def test_second_run_loads_only_changes(self, vault_sources, temp_output_dir):
+        """Test that a re-run after one change appends a delta of one satellite row."""
+        from scripts import generate_sample_data, load_data_vault
+
+        load_data_vault.main(load_data_vault.parse_args(['--load-date', '2025-01-01']))
+        accounts_file = temp_output_dir / 'finance_accounts.parquet'
+        accounts = pq.read_table(accounts_file).to_pandas()
+        accounts.loc[0, 'balance'] += 1
+        pq.write_table(pa.Table.from_pandas(accounts, preserve_index=False), accounts_file)
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            load_counts = load_data_vault.main(
+                load_data_vault.parse_args(['--load-date', '2025-01-02'])
+            )
+
+        first_delta, second_delta = load_data_vault.delta_files('sat_account')
+        satellite = load_data_vault.read_vault_table('sat_account')
+        assert load_counts['sat_account'] == {
+            'new': 0, 'changed': 1, 'unchanged': len(accounts) - 1
+        }
+        assert load_counts['hub_account']['new'] == 0
+        assert load_counts['sat_customer']['changed'] == 0
+        assert pq.read_metadata(first_delta).num_rows == len(accounts)
+        assert pq.read_metadata(second_delta).num_rows == 1
+        assert len(load_data_vault.delta_files('hub_account')) == 1
+        assert satellite.num_rows == len(accounts) + 1
+        assert satellite['end_date'].null_count == len(accounts)
+        assert datetime(2025, 1, 2) in satellite['end_date'].to_pylist()
+
+    def test_rerunning_a_load_date_rewrites_the_same_delta(self, vault_sources, temp_output_dir):
+        """Test that a retried load date does not compare against its own delta."""
+        from scripts import generate_sample_data, load_data_vault
+
+        load_data_vault.main(load_data_vault.parse_args(['--load-date', '2025-01-01']))
+        accounts_file = temp_output_dir / 'finance_accounts.parquet'
+        accounts = pq.read_table(accounts_file).to_pandas()
+        accounts.loc[0, 'balance'] += 1
+        pq.write_table(pa.Table.from_pandas(accounts, preserve_index=False), accounts_file)
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir):
+            for _ in range(2):
+                load_counts = load_data_vault.main(
+                    load_data_vault.parse_args(['--load-date', '2025-01-02'])
+                )
+
+        assert load_counts['sat_account']['changed'] == 1
+        assert len(load_data_vault.delta_files('sat_account')) == 2
+
+    def test_hash_format_is_kept_across_incremental_loads(self, vault_sources, temp_output_dir):
+        """Test that binary keys reload incrementally and a format switch needs a full refresh."""
+        from scripts import load_data_vault
+
+        load_data_vault.main(load_data_vault.parse_args(
+            ['--load-date', '2025-01-01', '--hash-format', 'binary']
+        ))
+        load_counts = load_data_vault.main(load_data_vault.parse_args(
+            ['--load-date', '2025-01-02', '--hash-format', 'binary']
+        ))
+
+        assert load_counts['hub_customer']['new'] == 0
+        assert load_counts['sat_account']['changed'] == 0
+        link = load_data_vault.read_vault_table('link_customer_account')
+        assert link.schema.field('customer_hk').type == pa.binary(16)
+        with pytest.raises(ValueError, match='--full-refresh'):
+            load_data_vault.main(load_data_vault.parse_args(['--hash-format', 'integer']))
+        load_data_vault.main(load_data_vault.parse_args(
+            ['--hash-format', 'integer', '--full-refresh']
+        ))
+        (path,) = load_data_vault.delta_files('hub_customer')
+        assert pq.read_schema(path).field('customer_hk').type == pa.uint64()
+
+    def test_merge_sql_end_dates_and_inserts_in_one_statement(self):
+        """Test that the Snowflake load is a single MERGE over the staged rows."""
+        from scripts.load_data_vault import satellite_merge_sql
+
+        sql = satellite_merge_sql('sat_account', 'sat_account_stage')
+
+        assert sql.count('MERGE INTO') == 1 and ';' not in sql
+        assert 'UPDATE SET end_date = source.load_date' in sql
+        assert 'current_row.hash_diff <> staged.hash_diff' in sql
+        assert 'source.account_number' in sql
+
+    def test_hub_merge_sql_inserts_only_missing_keys(self):
+        """Test that hubs and links merge by inserting keys the target does not hold."""
+        from scripts.load_data_vault import merge_sql
+
+        sql = merge_sql('link_customer_order', 'STAGE.link_delta', 'STAGE.link_customer_order')
+
+        assert sql.startswith('MERGE INTO STAGE.link_customer_order AS target')
+        assert 'ON target.customer_order_lk = source.customer_order_lk' in sql
+        assert 'WHEN MATCHED' not in sql
+        assert 'source.customer_hk, source.order_hk, source.load_date' in sql
@@ -0,0 +1,217 @@
+"""
+Unit tests for schedule_vault_load.py script.
+
+Tests the hub/link/satellite DAG, concurrent execution on a bounded pool of
+connections, retries, and resuming a failed load without re-running
+completed nodes.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay():
+    """Retry failed nodes immediately."""
+    from scripts import schedule_vault_load
+
+    with patch.object(schedule_vault_load, 'RETRY_DELAY_SECONDS', 0):
+        yield
+
+
+class TestVaultDag:
+    """Test suite for the dependency graph."""
+
+    def test_links_and_satellites_follow_their_hubs(self):
+        """Test that links wait for both hubs and satellites for their hub only."""
+        from scripts.schedule_vault_load import vault_dag
+
+        dag = vault_dag()
+
+        assert dag['hub_customer'] == set()
+        assert dag['link_customer_order'] == {'hub_customer', 'hub_order'}
+        assert dag['sat_order'] == {'hub_order'}
+
+
+class TestRunDag:
+    """Test suite for scheduling, concurrency and retries."""
+
+    def test_dependencies_finish_before_dependents_start(self):
+        """Test that a node only starts after every dependency has finished."""
+        from scripts.schedule_vault_load import run_dag
+
+        events = []
+        lock = threading.Lock()
+
+        def task(node, connection):
+            with lock:
+                events.append(('start', node))
+            time.sleep(0.01)
+            with lock:
+                events.append(('end', node))
+
+        dag = {'hub_a': set(), 'hub_b': set(), 'link_ab': {'hub_a', 'hub_b'}, 'sat_a': {'hub_a'}}
+        report = run_dag(dag, task, connections=['c1', 'c2', 'c3'])
+
+        assert all(entry['status'] == 'done' for entry in report.values())
+        for node, dependencies in dag.items():
+            for dependency in dependencies:
+                assert events.index(('end', dependency)) < events.index(('start', node))
+
+    def test_independent_nodes_share_a_bounded_connection_pool(self):
+        """Test that independent nodes run concurrently, one task per connection."""
+        from scripts.schedule_vault_load import run_dag
+
+        in_use = set()
+        peak = []
+        lock = threading.Lock()
+
+        def task(node, connection):
+            with lock:
+                assert connection not in in_use
+                in_use.add(connection)
+                peak.append(len(in_use))
+            time.sleep(0.2)
+            with lock:
+                in_use.remove(connection)
+
+        dag = {f'sat_{i}': set() for i in range(6)}
+        started = time.perf_counter()
+        run_dag(dag, task, connections=['c1', 'c2', 'c3'])
+        elapsed = time.perf_counter() - started
+
+        assert max(peak) == 3
+        assert elapsed < 6 * 0.2
+
+    def test_failed_nodes_are_retried_and_dependents_skipped(self):
+        """Test that flaky nodes succeed on retry and persistent failures skip dependents."""
+        from scripts.schedule_vault_load import run_dag
+
+        calls = []
+
+        def task(node, connection):
+            calls.append(node)
+            if node == 'hub_flaky' and calls.count(node) == 1:
+                raise RuntimeError('connection reset')
+            if node == 'hub_broken':
+                raise RuntimeError('permission denied')
+            return {'new': 1}
+
+        dag = {
+            'hub_flaky': set(),
+            'hub_broken': set(),
+            'sat_flaky': {'hub_flaky'},
+            'sat_broken': {'hub_broken'},
+        }
+        report = run_dag(dag, task, connections=['c1'], retries=2)
+
+        assert report['hub_flaky']['status'] == 'done' and report['hub_flaky']['attempts'] == 2
+        assert report['hub_broken']['status'] == 'failed' and report['hub_broken']['attempts'] == 3
+        assert report['hub_broken']['error'] == 'permission denied'
+        assert report['sat_flaky']['status'] == 'done'
+        assert report['sat_broken']['status'] == 'skipped'
+        assert 'sat_broken' not in calls
+
+    def test_completed_nodes_are_not_run_again(self):
+        """Test that nodes completed by an earlier run are skipped but unblock dependents."""
+        from scripts.schedule_vault_load import run_dag
+
+        calls = []
+        dag = {'hub_a': set(), 'sat_a': {'hub_a'}}
+
+        report = run_dag(dag, lambda node, c: calls.append(node), ['c1'], completed={'hub_a'})
+
+        assert calls == ['sat_a']
+        assert report['hub_a']['status'] == 'completed'
+
+
+class TestScheduledLoad:
+    """Test suite for the end-to-end scheduled vault load."""
+
+    def test_failed_load_resumes_with_remaining_nodes(self, temp_output_dir):
+        """Test that re-running a failed load date loads only the nodes left over."""
+        from scripts import (
+            bulk_load,
+            generate_sample_data,
+            load_data_vault,
+            schedule_vault_load,
+        )
+
+        argv = ['--load-date', '2025-01-01', '--retries', '0', '--workers', '1']
+        original_load = bulk_load.LocalBackend.load
+
+        def failing_load(self, schema, table_name, *args):
+            if table_name == 'sat_order':
+                raise RuntimeError('warehouse unavailable')
+            return original_load(self, schema, table_name, *args)
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(load_data_vault, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(load_data_vault, 'VAULT_DATA_DIR', temp_output_dir / 'vault'), \
+                patch.object(bulk_load, 'WAREHOUSE_DIR', temp_output_dir / 'warehouse'):
+            options = generate_sample_data.parse_args(
+                ['--scale-factor', '0.01', '--formats', 'parquet']
+            )
+            generate_sample_data.generate_finance_data(options)
+            generate_sample_data.generate_operations_data(options)
+            generate_sample_data.generate_crm_data(options)
+
+            with patch.object(bulk_load.LocalBackend, 'load', failing_load):
+                first = schedule_vault_load.main(schedule_vault_load.parse_args(argv))
+            second = schedule_vault_load.main(schedule_vault_load.parse_args(argv))
+
+            warehouse = bulk_load.LocalBackend()
+            assert first['sat_order']['status'] == 'failed'
+            assert first['sat_customer']['status'] == 'done'
+            assert {node for node, e in second.items() if e['status'] == 'done'} == {'sat_order'}
+            assert second['sat_customer']['status'] == 'completed'
+            assert warehouse.read('STAGE', 'sat_order').num_rows == 20
+            assert not (temp_output_dir / 'vault' / '.load_state.json').exists()
+
+    def test_next_load_date_merges_only_the_changed_rows(self, temp_output_dir):
+        """Test that a later load date merges its delta without duplicating warehouse rows."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        from scripts import (
+            bulk_load,
+            generate_sample_data,
+            load_data_vault,
+            schedule_vault_load,
+        )
+
+        with patch.object(generate_sample_data, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(load_data_vault, 'SAMPLE_DATA_DIR', temp_output_dir), \
+                patch.object(load_data_vault, 'VAULT_DATA_DIR', temp_output_dir / 'vault'), \
+                patch.object(bulk_load, 'WAREHOUSE_DIR', temp_output_dir / 'warehouse'):
+            options = generate_sample_data.parse_args(
+                ['--scale-factor', '0.01', '--formats', 'parquet']
+            )
+            generate_sample_data.generate_finance_data(options)
+            generate_sample_data.generate_operations_data(options)
+            generate_sample_data.generate_crm_data(options)
+
+            schedule_vault_load.main(schedule_vault_load.parse_args(
+                ['--load-date', '2025-01-01', '--workers', '1']
+            ))
+            accounts_file = temp_output_dir / 'finance_accounts.parquet'
+            accounts = pq.read_table(accounts_file).to_pandas()
+            accounts.loc[0, 'balance'] += 1
+            pq.write_table(pa.Table.from_pandas(accounts, preserve_index=False), accounts_file)
+            schedule_vault_load.main(schedule_vault_load.parse_args(
+                ['--load-date', '2025-01-02', '--workers', '1']
+            ))
+
+            warehouse = bulk_load.LocalBackend()
+            satellite = warehouse.read('STAGE', 'sat_account')
+            assert satellite.num_rows == len(accounts) + 1
+            assert satellite['end_date'].null_count == len(accounts)
+            assert warehouse.read('STAGE', 'hub_account').num_rows == len(accounts)
@@ -0,0 +1,215 @@
+"""
+Unit tests for setup_snowflake.py script.
+
+Tests the statement splitter, the checksum ledger that skips unchanged DDL,
+the protection of populated tables, hash key column types, and batching
+pending statements into a single round trip.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+SCRIPT = """
+-- Hubs; created in STAGE
+USE DATABASE DATA_LAKE;
+USE SCHEMA STAGE;
+
+CREATE OR REPLACE TABLE hub_customer (
+    customer_hk VARCHAR(32) NOT NULL  -- hash key; MD5
+)
+COMMENT = 'Customers; one row per key';
+
+CREATE OR REPLACE STAGE crm_stage URL = 's3://bucket/crm/';
+"""
+
+
+class FakeCursor:
+    """Cursor recording statements and answering the ledger queries."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.statement = None
+
+    def execute(self, statement, num_statements=None):
+        self.conn.calls.append((statement, num_statements))
+        self.statement = statement
+
+    def fetchall(self):
+        if self.statement.startswith('SHOW DATABASES'):
+            return [('DATA_LAKE',)] if self.conn.ledger_created else []
+        if 'INFORMATION_SCHEMA.TABLES' in self.statement:
+            return [(int(self.conn.ledger_created),)]
+        return list(self.conn.ledger.items())
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Snowflake connection stand-in with a pre-filled ledger."""
+
+    def __init__(self, ledger=None, ledger_created=True):
+        self.ledger = dict(ledger or {})
+        self.ledger_created = ledger_created
+        self.calls = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def close(self):
+        pass
+
+
+class TestSplitStatements:
+    """Test suite for splitting scripts into statements."""
+
+    def test_semicolons_in_strings_comments_and_bodies_do_not_split(self):
+        """Test that only top-level semicolons end a statement."""
+        from scripts.setup_snowflake import split_statements
+
+        sql = (
+            "SELECT 'a;b''c' AS \"x;y\" -- trailing; comment\n"
+            "FROM t /* block; comment */;\n"
+            "CREATE FUNCTION f() RETURNS INT AS $$ 1; $$;;\n"
+            "// only a comment;\n"
+        )
+
+        assert split_statements(sql) == [
+            "SELECT 'a;b''c' AS \"x;y\" FROM t",
+            "CREATE FUNCTION f() RETURNS INT AS $$ 1; $$",
+        ]
+
+    def test_comments_and_whitespace_do_not_change_the_statement(self):
+        """Test that reformatting or re-commenting yields the same normal form."""
+        from scripts.setup_snowflake import split_statements
+
+        first = split_statements("CREATE TABLE t (\n    a INT -- key\n);")
+        second = split_statements("CREATE TABLE t ( a INT /* the key */ );")
+
+        assert first == ['CREATE TABLE t ( a INT )'] == second
+
+
+class TestPlanScript:
+    """Test suite for deciding which statements to run."""
+
+    def test_first_run_creates_tables_without_replacing_them(self):
+        """Test that pending tables run as CREATE TABLE IF NOT EXISTS after their USE context."""
+        from scripts.setup_snowflake import plan_script
+
+        plan = plan_script('02_hubs.sql', SCRIPT, applied={})
+
+        assert plan['statements'][:2] == ['USE DATABASE DATA_LAKE', 'USE SCHEMA STAGE']
+        assert plan['statements'][2].startswith('CREATE TABLE IF NOT EXISTS hub_customer (')
+        assert plan['statements'][3].startswith('CREATE OR REPLACE STAGE crm_stage')
+        assert [record[1] for record in plan['records']] == ['DATA_LAKE.STAGE.HUB_CUSTOMER', None]
+        assert plan['pending'] == 2
+
+    def test_unchanged_statements_are_skipped(self):
+        """Test that a re-run with every checksum in the ledger executes nothing."""
+        from scripts.setup_snowflake import plan_script
+
+        first = plan_script('02_hubs.sql', SCRIPT, applied={})
+        applied = {checksum: obj for _, obj, checksum in first['records']}
+
+        plan = plan_script('02_hubs.sql', SCRIPT.replace('-- hash key', '-- edited'), applied)
+
+        assert plan['statements'] == [] and plan['skipped'] == 2
+
+    def test_changed_table_is_held_unless_replacing(self):
+        """Test that a changed table definition is only applied with replace_tables."""
+        from scripts.setup_snowflake import plan_script
+
+        first = plan_script('02_hubs.sql', SCRIPT, applied={})
+        applied = {checksum: obj for _, obj, checksum in first['records']}
+        changed = SCRIPT.replace('VARCHAR(32)', 'BINARY(16)')
+
+        held = plan_script('02_hubs.sql', changed, applied)
+        replaced = plan_script('02_hubs.sql', changed, applied, replace_tables=True)
+
+        assert held['held'] == ['DATA_LAKE.STAGE.HUB_CUSTOMER'] and held['pending'] == 0
+        assert replaced['statements'][2].startswith('CREATE OR REPLACE TABLE hub_customer')
+
+
+class TestHashFormat:
+    """Test suite for typing hash key columns."""
+
+    def test_hash_columns_take_the_format_type(self):
+        """Test that only *_hk, *_lk and hash_diff VARCHAR(32) columns change type."""
+        from scripts.setup_snowflake import apply_hash_format
+
+        sql = (
+            'CREATE TABLE t (customer_account_lk VARCHAR(32), customer_hk  VARCHAR(32), '
+            'hash_diff VARCHAR(32), zip_code VARCHAR(32))'
+        )
+
+        assert apply_hash_format(sql, 'hex') == sql
+        assert apply_hash_format(sql, 'binary') == (
+            'CREATE TABLE t (customer_account_lk BINARY(16), customer_hk  BINARY(16), '
+            'hash_diff BINARY(16), zip_code VARCHAR(32))'
+        )
+
+    def test_switching_format_holds_existing_tables(self):
+        """Test that a schema set up as hex is not rebuilt as integer without --replace-tables."""
+        from scripts import setup_snowflake
+
+        plans = [
+            setup_snowflake.plan_script(name, (setup_snowflake.DDL_DIR / name).read_text(), {})
+            for name in setup_snowflake.DDL_SCRIPTS
+        ]
+        conn = FakeConnection({c: obj for plan in plans for _, obj, c in plan['records']})
+        with patch.object(setup_snowflake, 'create_connection', return_value=conn):
+            plans = setup_snowflake.main(setup_snowflake.parse_args(['--hash-format', 'integer']))
+
+        held = [obj for plan in plans for obj in plan['held']]
+        assert 'DATA_LAKE.STAGE.HUB_CUSTOMER' in held
+        assert 'DATA_LAKE.STAGE.SAT_ORDER' in held
+        assert len(conn.calls) == 2
+
+
+class TestMain:
+    """Test suite for the end-to-end setup run."""
+
+    def test_pending_statements_are_sent_in_one_batch(self):
+        """Test that every script's pending DDL and ledger inserts go in one round trip."""
+        from scripts import setup_snowflake
+
+        conn = FakeConnection()
+        with patch.object(setup_snowflake, 'create_connection', return_value=conn):
+            plans = setup_snowflake.main(setup_snowflake.parse_args([]))
+
+        create_ledger, select_ledger, (batch, num_statements) = conn.calls
+        assert create_ledger[0].startswith('CREATE TABLE IF NOT EXISTS DATA_LAKE.PUBLIC.')
+        assert num_statements == batch.count(';\n') + 1
+        assert batch.count('INSERT INTO DATA_LAKE.PUBLIC.SCHEMA_MIGRATIONS') == len(plans)
+        assert 'CREATE OR REPLACE TABLE' not in batch
+
+    def test_rerun_with_a_complete_ledger_sends_nothing(self):
+        """Test that re-running setup against an up-to-date ledger executes no DDL."""
+        from scripts import setup_snowflake
+
+        plans = [
+            setup_snowflake.plan_script(name, (setup_snowflake.DDL_DIR / name).read_text(), {})
+            for name in setup_snowflake.DDL_SCRIPTS
+        ]
+        conn = FakeConnection({c: obj for plan in plans for _, obj, c in plan['records']})
+        with patch.object(setup_snowflake, 'create_connection', return_value=conn):
+            setup_snowflake.main(setup_snowflake.parse_args([]))
+
+        assert len(conn.calls) == 2
+
+    def test_dry_run_does_not_create_the_ledger(self):
+        """Test that a dry run against an account without a ledger only reads."""
+        from scripts import setup_snowflake
+
+        conn = FakeConnection(ledger_created=False)
+        with patch.object(setup_snowflake, 'create_connection', return_value=conn):
+            plans = setup_snowflake.main(setup_snowflake.parse_args(['--dry-run']))
+
+        assert [statement for statement, _ in conn.calls] == ["SHOW DATABASES LIKE 'DATA_LAKE'"]
+        assert all(plan['pending'] == len(plan['records']) for plan in plans)
+        assert sum(plan['pending'] for plan in plans) > 0
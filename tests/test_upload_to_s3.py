@@ -0,0 +1,474 @@
+"""
+Unit tests for upload_to_s3.py script.
+
+Tests how local datasets are discovered and mapped to the S3 data lake
+layout, and how uploads are reported.
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class TestDiscoverUploadFiles:
+    """Test suite for mapping local files to S3 keys."""
+
+    def test_monolithic_files_use_file_mappings(self, temp_output_dir):
+        """Test that single-file tables map to their FILE_MAPPINGS key."""
+        from scripts.upload_to_s3 import FILE_MAPPINGS, discover_upload_files
+
+        uploads = dict(discover_upload_files(temp_output_dir))
+
+        assert uploads[temp_output_dir / 'finance_transactions.parquet'] == (
+            FILE_MAPPINGS['finance_transactions.parquet']
+        )
+        assert len(uploads) == len(FILE_MAPPINGS)
+
+    def test_partitioned_tree_is_mirrored(self, temp_output_dir):
+        """Test that Hive partition directories are mirrored under the table prefix."""
+        from scripts.upload_to_s3 import discover_upload_files
+
+        partition_dir = temp_output_dir / 'finance_transactions' / 'year=2023' / 'month=01'
+        partition_dir.mkdir(parents=True)
+        (partition_dir / 'part-000.parquet').write_bytes(b'data')
+        (partition_dir / 'part-001.parquet').write_bytes(b'data')
+
+        uploads = dict(discover_upload_files(temp_output_dir))
+
+        assert uploads[partition_dir / 'part-000.parquet'] == (
+            'finance/transactions/year=2023/month=01/part-000.parquet'
+        )
+        assert uploads[partition_dir / 'part-001.parquet'] == (
+            'finance/transactions/year=2023/month=01/part-001.parquet'
+        )
+        assert temp_output_dir / 'finance_transactions.parquet' not in uploads
+
+
+class TestUploadAllFiles:
+    """Test suite for uploading every discovered file."""
+
+    def test_missing_files_are_counted_as_failures(self, temp_output_dir, fake_s3):
+        """Test that files that do not exist are reported, not uploaded."""
+        from scripts import upload_to_s3
+
+        with patch.object(upload_to_s3, 'SAMPLE_DATA_DIR', temp_output_dir):
+            success_count, fail_count = upload_to_s3.upload_all_files(fake_s3, 'test-bucket')
+
+        assert success_count == 0
+        assert fail_count == len(upload_to_s3.FILE_MAPPINGS)
+        assert fake_s3.uploads == []
+
+    def test_partition_files_are_uploaded(self, temp_output_dir, fake_s3):
+        """Test that each partition file is uploaded to its mirrored key."""
+        from scripts import upload_to_s3
+
+        partition_dir = temp_output_dir / 'crm_interactions' / 'year=2024' / 'month=06'
+        partition_dir.mkdir(parents=True)
+        (partition_dir / 'part-000.parquet').write_bytes(b'data')
+
+        with patch.object(upload_to_s3, 'SAMPLE_DATA_DIR', temp_output_dir):
+            success_count, _ = upload_to_s3.upload_all_files(fake_s3, 'test-bucket')
+
+        assert success_count == 1
+        assert fake_s3.uploads == ['crm/interactions/year=2024/month=06/part-000.parquet']
+        assert fake_s3.read(
+            'test-bucket', 'crm/interactions/year=2024/month=06/part-000.parquet'
+        ) == b'data'
+
+
+class TestConcurrentUploads:
+    """Test suite for thread-pool and multipart uploads against a fake S3."""
+
+    def _write_tables(self, data_dir, size=1024):
+        """Write a monolithic Parquet file for every mapped table."""
+        from scripts.upload_to_s3 import FILE_MAPPINGS
+
+        for index, local_filename in enumerate(FILE_MAPPINGS):
+            (data_dir / local_filename).write_bytes(bytes([index]) * size)
+
+    def test_all_files_are_uploaded_concurrently(self, temp_output_dir, fake_s3):
+        """Test that up to --concurrency files are in flight at once."""
+        from scripts import upload_to_s3
+
+        self._write_tables(temp_output_dir)
+        fake_s3.delay = 0.05
+        options = upload_to_s3.parse_args(['--concurrency', '3'])
+        with patch.object(upload_to_s3, 'SAMPLE_DATA_DIR', temp_output_dir):
+            success_count, fail_count = upload_to_s3.upload_all_files(
+                fake_s3, 'test-bucket', options
+            )
+
+        assert (success_count, fail_count) == (len(upload_to_s3.FILE_MAPPINGS), 0)
+        assert fake_s3.max_in_flight == 3
+        assert fake_s3.read('test-bucket', 'crm/customers/crm_customers.parquet') == (
+            (temp_output_dir / 'crm_customers.parquet').read_bytes()
+        )
+
+    def test_large_files_use_configured_part_size(self, temp_output_dir, fake_s3):
+        """Test that files above the threshold are sent as parts of --chunk-size-mb."""
+        from scripts import upload_to_s3
+
+        local_file = temp_output_dir / 'finance_ledger.parquet'
+        local_file.write_bytes(os.urandom(11 * 1024 * 1024))
+        options = upload_to_s3.parse_args(
+            ['--chunk-size-mb', '5', '--multipart-threshold-mb', '8', '--threads-per-file', '2']
+        )
+        fake_s3.delay = 0.05
+
+        upload_to_s3.upload_file(
+            fake_s3, local_file, 'test-bucket', 'finance/ledger/finance_ledger.parquet',
+            upload_to_s3.transfer_config(options),
+        )
+
+        head = fake_s3.head_object(
+            Bucket='test-bucket', Key='finance/ledger/finance_ledger.parquet'
+        )
+        assert head['ETag'].endswith('-3"')
+        assert fake_s3.max_parts_in_flight == 2
+        assert fake_s3.read('test-bucket', 'finance/ledger/finance_ledger.parquet') == (
+            local_file.read_bytes()
+        )
+
+    def test_small_files_use_a_single_put(self, temp_output_dir, fake_s3):
+        """Test that files below the threshold are not split into parts."""
+        from scripts import upload_to_s3
+
+        local_file = temp_output_dir / 'finance_ledger.parquet'
+        local_file.write_bytes(b'x' * 1024)
+
+        upload_to_s3.upload_file(
+            fake_s3, local_file, 'test-bucket', 'finance/ledger/finance_ledger.parquet',
+            upload_to_s3.transfer_config(upload_to_s3.parse_args([])),
+        )
+
+        head = fake_s3.head_object(
+            Bucket='test-bucket', Key='finance/ledger/finance_ledger.parquet'
+        )
+        assert '-' not in head['ETag']
+        assert fake_s3.max_parts_in_flight == 0
+
+    def test_failed_upload_is_counted_and_others_finish(self, temp_output_dir, fake_s3):
+        """Test that one failing file is reported without aborting the others."""
+        from scripts import upload_to_s3
+
+        self._write_tables(temp_output_dir)
+        fake_s3.fail_keys.add('finance/ledger/finance_ledger.parquet')
+        with patch.object(upload_to_s3, 'SAMPLE_DATA_DIR', temp_output_dir):
+            success_count, fail_count = upload_to_s3.upload_all_files(fake_s3, 'test-bucket')
+
+        assert (success_count, fail_count) == (len(upload_to_s3.FILE_MAPPINGS) - 1, 1)
+
+    def test_throughput_is_reported(self, temp_output_dir, fake_s3, capsys):
+        """Test that the aggregate transfer rate is printed."""
+        from scripts import upload_to_s3
+
+        self._write_tables(temp_output_dir)
+        with patch.object(upload_to_s3, 'SAMPLE_DATA_DIR', temp_output_dir):
+            upload_to_s3.upload_all_files(fake_s3, 'test-bucket')
+
+        assert 'MB/s' in capsys.readouterr().out
+
+    def test_invalid_concurrency_is_rejected(self):
+        """Test that zero upload threads are rejected."""
+        from scripts.upload_to_s3 import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(['--concurrency', '0'])
+
+    def test_part_size_below_s3_minimum_is_rejected(self):
+        """Test that parts smaller than S3's 5 MB minimum are rejected."""
+        from scripts.upload_to_s3 import parse_args
+
+        with pytest.raises(SystemExit):
+            parse_args(['--chunk-size-mb', '1'])
+
+
+class TestIncrementalUploads:
+    """Test suite for skipping unchanged files using the upload manifest."""
+
+    def _write_tables(self, data_dir):
+        """Write a monolithic Parquet file for every mapped table."""
+        from scripts.upload_to_s3 import FILE_MAPPINGS
+
+        for index, local_filename in enumerate(FILE_MAPPINGS):
+            (data_dir / local_filename).write_bytes(bytes([index]) * 1024)
+
+    def _upload(self, data_dir, fake_s3, argv=()):
+        """Run one upload of ``data_dir`` to the fake bucket."""
+        from scripts import upload_to_s3
+
+        options = upload_to_s3.parse_args(list(argv))
+        with patch.object(upload_to_s3, 'SAMPLE_DATA_DIR', data_dir):
+            return upload_to_s3.upload_all_files(fake_s3, 'test-bucket', options)
+
+    def test_manifest_records_hash_size_and_etag(self, temp_output_dir, fake_s3):
+        """Test that each uploaded file gets a manifest entry matching S3."""
+        from scripts import upload_to_s3
+
+        self._write_tables(temp_output_dir)
+        self._upload(temp_output_dir, fake_s3)
+
+        manifest = upload_to_s3.load_manifest(temp_output_dir)
+        entry = manifest['s3://test-bucket/crm/customers/crm_customers.parquet']
+        head = fake_s3.head_object(
+            Bucket='test-bucket', Key='crm/customers/crm_customers.parquet'
+        )
+        assert entry['size'] == 1024
+        assert entry['etag'] == head['ETag']
+        assert entry['sha256'] == upload_to_s3.file_sha256(
+            temp_output_dir / 'crm_customers.parquet'
+        )
+
+    def test_unchanged_files_are_skipped(self, temp_output_dir, fake_s3, capsys):
+        """Test that a second run with no local changes uploads nothing."""
+        from scripts.upload_to_s3 import FILE_MAPPINGS
+
+        self._write_tables(temp_output_dir)
+        self._upload(temp_output_dir, fake_s3)
+        fake_s3.uploads.clear()
+
+        success_count, fail_count = self._upload(temp_output_dir, fake_s3)
+
+        assert (success_count, fail_count) == (0, 0)
+        assert fake_s3.uploads == []
+        assert f'Skipped {len(FILE_MAPPINGS)} unchanged files' in capsys.readouterr().out
+
+    def test_changed_file_is_reuploaded(self, temp_output_dir, fake_s3):
+        """Test that only a file whose content changed is sent again."""
+        self._write_tables(temp_output_dir)
+        self._upload(temp_output_dir, fake_s3)
+        fake_s3.uploads.clear()
+
+        (temp_output_dir / 'finance_ledger.parquet').write_bytes(b'changed')
+        success_count, _ = self._upload(temp_output_dir, fake_s3)
+
+        assert success_count == 1
+        assert fake_s3.uploads == ['finance/ledger/finance_ledger.parquet']
+        assert fake_s3.read('test-bucket', 'finance/ledger/finance_ledger.parquet') == (
+            b'changed'
+        )
+
+    def test_missing_remote_object_is_reuploaded(self, temp_output_dir, fake_s3):
+        """Test that a file is sent again when its S3 object has gone."""
+        self._write_tables(temp_output_dir)
+        self._upload(temp_output_dir, fake_s3)
+        fake_s3.uploads.clear()
+
+        fake_s3.delete_object(Bucket='test-bucket', Key='crm/customers/crm_customers.parquet')
+        success_count, _ = self._upload(temp_output_dir, fake_s3)
+
+        assert success_count == 1
+        assert fake_s3.uploads == ['crm/customers/crm_customers.parquet']
+
+    def test_force_uploads_every_file(self, temp_output_dir, fake_s3):
+        """Test that --force ignores the manifest."""
+        from scripts.upload_to_s3 import FILE_MAPPINGS
+
+        self._write_tables(temp_output_dir)
+        self._upload(temp_output_dir, fake_s3)
+        fake_s3.uploads.clear()
+
+        success_count, _ = self._upload(temp_output_dir, fake_s3, ['--force'])
+
+        assert success_count == len(FILE_MAPPINGS)
+        assert len(fake_s3.uploads) == len(FILE_MAPPINGS)
+
+    def test_removed_files_are_reported(self, temp_output_dir, fake_s3, capsys):
+        """Test that files removed locally are reported but kept in S3."""
+        self._write_tables(temp_output_dir)
+        self._upload(temp_output_dir, fake_s3)
+
+        (temp_output_dir / 'crm_interactions.parquet').unlink()
+        self._upload(temp_output_dir, fake_s3)
+
+        uri = 's3://test-bucket/crm/interactions/crm_interactions.parquet'
+        assert f'Removed locally, still in S3: {uri}' in capsys.readouterr().out
+        assert fake_s3.read('test-bucket', 'crm/interactions/crm_interactions.parquet')
+
+    def test_delete_removed_deletes_remote_objects(self, temp_output_dir, fake_s3):
+        """Test that --delete-removed deletes the object and its manifest entry."""
+        from scripts import upload_to_s3
+
+        partition_dir = temp_output_dir / 'crm_interactions' / 'year=2024'
+        partition_dir.mkdir(parents=True)
+        (partition_dir / 'part-000.parquet').write_bytes(b'old')
+        self._upload(temp_output_dir, fake_s3)
+
+        (partition_dir / 'part-000.parquet').unlink()
+        self._upload(temp_output_dir, fake_s3, ['--delete-removed'])
+
+        key = 'crm/interactions/year=2024/part-000.parquet'
+        manifest = upload_to_s3.load_manifest(temp_output_dir)
+        assert f's3://test-bucket/{key}' not in manifest
+        with pytest.raises(ClientError):
+            fake_s3.head_object(Bucket='test-bucket', Key=key)
+
+
+class TestResumableUploads:
+    """Test suite for checkpointed multipart uploads and orphan cleanup."""
+
+    KEY = 'finance/ledger/finance_ledger.parquet'
+
+    def _options(self):
+        """Return upload options that split an 11 MB file into three 5 MB parts."""
+        from scripts.upload_to_s3 import parse_args
+
+        return parse_args(
+            ['--chunk-size-mb', '5', '--multipart-threshold-mb', '8', '--threads-per-file', '1']
+        )
+
+    def _upload(self, data_dir, fake_s3, local_file):
+        """Upload ``local_file`` with the checkpoints kept in ``data_dir``."""
+        from scripts import upload_to_s3
+
+        config = upload_to_s3.transfer_config(self._options())
+        with patch.object(upload_to_s3, 'SAMPLE_DATA_DIR', data_dir):
+            return upload_to_s3.upload_file(fake_s3, local_file, 'test-bucket', self.KEY, config)
+
+    def test_failed_upload_resumes_missing_parts(self, temp_output_dir, fake_s3):
+        """Test that a re-run sends only the parts the failed run did not finish."""
+        from scripts import upload_to_s3
+
+        local_file = temp_output_dir / 'finance_ledger.parquet'
+        local_file.write_bytes(os.urandom(11 * 1024 * 1024))
+        fake_s3.fail_parts.add(3)
+
+        assert self._upload(temp_output_dir, fake_s3, local_file) is False
+        path = upload_to_s3.checkpoint_path('test-bucket', self.KEY, temp_output_dir)
+        assert sorted(upload_to_s3.load_checkpoint(path)['parts']) == ['1', '2']
+
+        fake_s3.fail_parts.clear()
+        fake_s3.parts_sent.clear()
+        assert self._upload(temp_output_dir, fake_s3, local_file) is True
+
+        assert fake_s3.parts_sent == [(self.KEY, 3)]
+        assert fake_s3.read('test-bucket', self.KEY) == local_file.read_bytes()
+        assert fake_s3.head_object(Bucket='test-bucket', Key=self.KEY)['ETag'].endswith('-3"')
+        assert not path.exists()
+
+    def test_changed_file_restarts_the_upload(self, temp_output_dir, fake_s3):
+        """Test that a checkpoint for different file content is discarded."""
+        local_file = temp_output_dir / 'finance_ledger.parquet'
+        local_file.write_bytes(os.urandom(11 * 1024 * 1024))
+        fake_s3.fail_parts.add(3)
+        self._upload(temp_output_dir, fake_s3, local_file)
+
+        local_file.write_bytes(os.urandom(12 * 1024 * 1024))
+        fake_s3.fail_parts.clear()
+        fake_s3.parts_sent.clear()
+        assert self._upload(temp_output_dir, fake_s3, local_file) is True
+
+        assert fake_s3.parts_sent == [(self.KEY, 1), (self.KEY, 2), (self.KEY, 3)]
+        assert fake_s3.read('test-bucket', self.KEY) == local_file.read_bytes()
+        assert fake_s3.list_multipart_uploads(Bucket='test-bucket')['Uploads'] == []
+
+    def test_orphaned_uploads_are_aborted(self, temp_output_dir, fake_s3):
+        """Test that old uploads without a checkpoint are aborted and checkpointed ones kept."""
+        from datetime import timedelta
+
+        from scripts import upload_to_s3
+
+        local_file = temp_output_dir / 'finance_ledger.parquet'
+        local_file.write_bytes(os.urandom(11 * 1024 * 1024))
+        fake_s3.fail_parts.add(3)
+        fake_s3.upload_age = timedelta(days=2)
+        self._upload(temp_output_dir, fake_s3, local_file)
+        orphan = fake_s3.create_multipart_upload(
+            Bucket='test-bucket', Key='crm/customers/orphan.parquet'
+        )
+
+        aborted = upload_to_s3.abort_orphaned_uploads(fake_s3, 'test-bucket', temp_output_dir)
+
+        assert aborted == [('crm/customers/orphan.parquet', orphan['UploadId'])]
+        remaining = fake_s3.list_multipart_uploads(Bucket='test-bucket')['Uploads']
+        assert [upload['Key'] for upload in remaining] == [self.KEY]
+
+    def test_recent_and_foreign_uploads_are_kept(self, fake_s3, temp_output_dir):
+        """Test that uploads outside the table prefixes or younger than the cutoff survive."""
+        from datetime import timedelta
+
+        from scripts import upload_to_s3
+
+        fake_s3.upload_age = timedelta(days=2)
+        fake_s3.create_multipart_upload(Bucket='test-bucket', Key='exports/report.csv')
+        fake_s3.upload_age = timedelta(minutes=5)
+        fake_s3.create_multipart_upload(Bucket='test-bucket', Key='crm/customers/part-0.parquet')
+
+        aborted = upload_to_s3.abort_orphaned_uploads(fake_s3, 'test-bucket', temp_output_dir)
+        assert aborted == []
+        assert len(fake_s3.list_multipart_uploads(Bucket='test-bucket')['Uploads']) == 2
+
+        aborted = upload_to_s3.abort_orphaned_uploads(
+            fake_s3, 'test-bucket', temp_output_dir, min_age_hours=0
+        )
+        assert [key for key, _ in aborted] == ['crm/customers/part-0.parquet']
+
+    def test_checkpoints_of_vanished_uploads_are_removed(self, temp_output_dir, fake_s3):
+        """Test that cleanup drops checkpoints whose upload no longer exists."""
+        from scripts import upload_to_s3
+
+        local_file = temp_output_dir / 'finance_ledger.parquet'
+        local_file.write_bytes(os.urandom(11 * 1024 * 1024))
+        fake_s3.fail_parts.add(3)
+        self._upload(temp_output_dir, fake_s3, local_file)
+        path = upload_to_s3.checkpoint_path('test-bucket', self.KEY, temp_output_dir)
+        fake_s3.abort_multipart_upload(
+            Bucket='test-bucket', Key=self.KEY,
+            UploadId=upload_to_s3.load_checkpoint(path)['upload_id'],
+        )
+
+        upload_to_s3.abort_orphaned_uploads(fake_s3, 'test-bucket', temp_output_dir)
+
+        assert not path.exists()
+
+
+class TestS3MultipartWriter:
+    """Test suite for the streaming multipart writer."""
+
+    def test_bytes_are_sent_as_bounded_parts(self, fake_s3):
+        """Test that full parts upload while writing, with at most two in flight."""
+        from scripts.upload_to_s3 import S3MultipartWriter
+
+        data = os.urandom(10_000)
+        fake_s3.delay = 0.02
+        writer = S3MultipartWriter(fake_s3, 'test-bucket', 'crm/stream.parquet', 1024, 2)
+        for offset in range(0, len(data), 700):
+            writer.write(data[offset:offset + 700])
+        assert writer.tell() == len(data)
+        writer.close()
+
+        assert fake_s3.read('test-bucket', 'crm/stream.parquet') == data
+        assert len(fake_s3.parts_sent) == 10
+        assert fake_s3.max_parts_in_flight <= 2
+
+    def test_small_objects_use_a_single_put(self, fake_s3):
+        """Test that an object smaller than one part skips the multipart upload."""
+        from scripts.upload_to_s3 import S3MultipartWriter
+
+        writer = S3MultipartWriter(fake_s3, 'test-bucket', 'crm/small.parquet', 1024)
+        writer.write(b'small')
+        writer.close()
+
+        assert fake_s3.read('test-bucket', 'crm/small.parquet') == b'small'
+        assert fake_s3.parts_sent == []
+
+    def test_failed_part_aborts_the_upload(self, fake_s3):
+        """Test that a failing part aborts the upload and leaves no object."""
+        from scripts.upload_to_s3 import S3MultipartWriter
+
+        fake_s3.fail_parts.add(2)
+        writer = S3MultipartWriter(fake_s3, 'test-bucket', 'crm/broken.parquet', 1024)
+        writer.write(os.urandom(3000))
+
+        with pytest.raises(ClientError):
+            writer.close()
+        assert fake_s3.list_multipart_uploads(Bucket='test-bucket')['Uploads'] == []
+        with pytest.raises(ClientError):
+            fake_s3.head_object(Bucket='test-bucket', Key='crm/broken.parquet')